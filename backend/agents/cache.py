@@ -0,0 +1,137 @@
+"""
+Agent 결과 캐시
+정규화된 상품 쿼리를 키로 하는 TTL + LRU 캐시
+"""
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# 캐시 키에서 제거할 쿼리 접미사 (반복 적용)
+QUERY_SUFFIXES = ("알려줘", "찾아줘", "최저가", "최저 가격", "가격")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.~]+$")
+
+
+def normalize_query(query: str) -> str:
+    """
+    상품 쿼리 정규화
+
+    유니코드 정규화(NFKC), 대소문자 통일, 끝 문장부호 및 "최저가" 류 접미사 제거,
+    공백 제거를 순서대로 적용합니다.
+
+    Args:
+        query: 사용자 입력 쿼리
+
+    Returns:
+        캐시 키로 사용할 정규화된 문자열
+    """
+    normalized = unicodedata.normalize("NFKC", query).casefold()
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()
+
+    stripped = True
+    while stripped:
+        stripped = False
+        normalized = _TRAILING_PUNCT_RE.sub("", normalized)
+        for suffix in QUERY_SUFFIXES:
+            if normalized.endswith(suffix) and len(normalized) > len(suffix):
+                normalized = normalized[: -len(suffix)]
+                stripped = True
+                break
+
+    return _WHITESPACE_RE.sub("", normalized)
+
+
+class TTLCache:
+    """TTL 만료와 LRU 크기 제한을 갖는 인메모리 캐시"""
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 600.0):
+        """
+        캐시 초기화
+
+        Args:
+            max_size: 최대 저장 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            ttl_seconds: 항목 유효 시간(초)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            저장된 값 (없거나 만료되었으면 None)
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        캐시 저장
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            ttl_seconds: 항목별 유효 시간 (생략 시 기본값)
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def aget(self, key: Hashable) -> Optional[Any]:
+        """get()의 비동기 버전 (SharedTTLCache와 같은 인터페이스, 메모리 조회라 바로 실행)"""
+        return self.get(key)
+
+    async def aset(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """set()의 비동기 버전 (SharedTTLCache와 같은 인터페이스, 메모리 저장이라 바로 실행)"""
+        self.set(key, value, ttl_seconds)
+
+    def invalidate(self, key: Hashable) -> None:
+        """캐시 항목 삭제"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 (히트/미스 카운터, 크기) 반환"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
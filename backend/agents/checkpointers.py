@@ -0,0 +1,296 @@
+"""
+대화 메모리 Checkpointer
+스레드 수/유휴 시간/메시지 수/바이트 제한을 갖는 LangGraph checkpointer 구현
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import MemorySaver
+
+from .config.agent_config import (
+    CHECKPOINTER_BACKEND,
+    CHECKPOINT_MAX_THREADS,
+    CHECKPOINT_IDLE_TTL_SECONDS,
+    CHECKPOINT_MAX_MESSAGES,
+    CHECKPOINT_MAX_THREAD_BYTES,
+    CHECKPOINT_KEEP_PER_THREAD,
+    CHECKPOINT_SQLITE_PATH,
+    CHECKPOINT_SQLITE_BATCH_SIZE,
+    CHECKPOINT_SQLITE_FLUSH_INTERVAL_SECONDS,
+    CHECKPOINT_SQLITE_COMPACT_INTERVAL_SECONDS,
+    CHECKPOINT_SQLITE_RETENTION_SECONDS
+)
+from .sqlite_checkpointer import SqliteCheckpointSaver
+
+logger = logging.getLogger(__name__)
+
+
+def _message_size(message: Any) -> int:
+    """메시지 크기 추정 (content 길이 기준, 직렬화 없이 계산)"""
+    content = getattr(message, "content", message)
+    if isinstance(content, str):
+        return len(content.encode("utf-8"))
+    return len(str(content).encode("utf-8"))
+
+
+def trim_messages_to_turns(
+    messages: List[BaseMessage],
+    max_messages: int,
+    max_bytes: Optional[int] = None
+) -> List[BaseMessage]:
+    """
+    메시지 목록을 사용자 턴 경계에서 잘라 제한 이내로 축소
+
+    도구 호출(AIMessage)과 결과(ToolMessage) 쌍이 끊기지 않도록 항상 HumanMessage에서
+    시작하는 접미 구간만 남깁니다. 마지막 턴 하나가 제한을 넘더라도 그 턴은 유지합니다.
+
+    Args:
+        messages: 전체 메시지 목록
+        max_messages: 최대 메시지 수
+        max_bytes: 최대 추정 바이트 (선택사항)
+
+    Returns:
+        잘라낸 메시지 목록
+    """
+    human_indices = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    if not human_indices:
+        return messages
+
+    suffix_bytes = None
+    if max_bytes is not None:
+        # 뒤에서부터 누적한 바이트 크기
+        suffix_bytes = [0] * (len(messages) + 1)
+        for i in range(len(messages) - 1, -1, -1):
+            suffix_bytes[i] = suffix_bytes[i + 1] + _message_size(messages[i])
+
+    for start in human_indices:
+        if len(messages) - start > max_messages:
+            continue
+        if suffix_bytes is not None and suffix_bytes[start] > max_bytes:
+            continue
+        return messages[start:] if start else messages
+
+    return messages[human_indices[-1]:]
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    제한된 인메모리 Checkpointer
+
+    - 스레드 LRU: 최대 스레드 수 초과 시 가장 오래 사용되지 않은 스레드 제거
+    - 유휴 TTL: 마지막 접근 후 일정 시간이 지난 스레드 제거
+    - 스레드별 제한: 최근 N개 체크포인트만 유지, 메시지 수/바이트 초과 시 오래된 턴 제거
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 1000,
+        idle_ttl_seconds: float = 3600.0,
+        max_messages: int = 40,
+        max_thread_bytes: int = 2 * 1024 * 1024,
+        keep_checkpoints: int = 2,
+        **kwargs: Any
+    ):
+        """
+        Checkpointer 초기화
+
+        Args:
+            max_threads: 메모리에 유지할 최대 스레드 수
+            idle_ttl_seconds: 유휴 스레드 만료 시간(초)
+            max_messages: 스레드당 최대 메시지 수
+            max_thread_bytes: 스레드당 최대 메시지 바이트 (추정치)
+            keep_checkpoints: 스레드당 유지할 최근 체크포인트 수
+        """
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_messages = max_messages
+        self.max_thread_bytes = max_thread_bytes
+        self.keep_checkpoints = max(1, keep_checkpoints)
+
+        # thread_id -> 마지막 접근 시각 (LRU 순서)
+        self._last_access: "OrderedDict[str, float]" = OrderedDict()
+        # thread_id -> 해당 스레드의 blob 키 (전체 스캔 없이 삭제하기 위한 인덱스)
+        self._thread_blob_keys: Dict[str, Set[tuple]] = {}
+        # thread_id -> 직렬화된 저장 바이트
+        self._thread_bytes: Dict[str, int] = {}
+        self.evicted_threads = 0
+
+    def _touch(self, thread_id: str) -> None:
+        """스레드 접근 시각 갱신"""
+        self._last_access[thread_id] = time.monotonic()
+        self._last_access.move_to_end(thread_id)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """체크포인트 조회 (접근 시각 갱신)"""
+        thread_id = config["configurable"]["thread_id"]
+        result = super().get_tuple(config)
+
+        if result is None:
+            # defaultdict 조회로 생긴 빈 스레드 항목 정리
+            namespaces = self.storage.get(thread_id)
+            if namespaces is not None and not any(namespaces.values()):
+                del self.storage[thread_id]
+        elif thread_id in self._last_access:
+            self._touch(thread_id)
+
+        return result
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        """체크포인트 저장 후 스레드별/전체 제한 적용"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+
+        messages = checkpoint["channel_values"].get("messages")
+        if isinstance(messages, list) and "messages" in new_versions:
+            trimmed = trim_messages_to_turns(messages, self.max_messages, self.max_thread_bytes)
+            if len(trimmed) != len(messages):
+                checkpoint = {
+                    **checkpoint,
+                    "channel_values": {**checkpoint["channel_values"], "messages": trimmed}
+                }
+
+        result = super().put(config, checkpoint, metadata, new_versions)
+
+        blob_keys = self._thread_blob_keys.setdefault(thread_id, set())
+        for channel, version in new_versions.items():
+            blob_keys.add((thread_id, checkpoint_ns, channel, version))
+
+        self._touch(thread_id)
+        self._prune_checkpoints(thread_id)
+        self._evict_threads()
+        return result
+
+    def _prune_checkpoints(self, thread_id: str) -> None:
+        """최근 체크포인트만 남기고 참조되지 않는 blob/쓰기 기록 삭제"""
+        referenced: Set[tuple] = set()
+        total_bytes = 0
+
+        for checkpoint_ns, checkpoints in self.storage[thread_id].items():
+            checkpoint_ids = sorted(checkpoints.keys(), reverse=True)
+            for checkpoint_id in checkpoint_ids[self.keep_checkpoints:]:
+                del checkpoints[checkpoint_id]
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+            for checkpoint_id, (checkpoint, metadata, _) in checkpoints.items():
+                total_bytes += len(checkpoint[1]) + len(metadata[1])
+                channel_versions = self.serde.loads_typed(checkpoint)["channel_versions"]
+                for channel, version in channel_versions.items():
+                    referenced.add((thread_id, checkpoint_ns, channel, version))
+                for _, _, value, _ in self.writes.get((thread_id, checkpoint_ns, checkpoint_id), {}).values():
+                    total_bytes += len(value[1])
+
+        blob_keys = self._thread_blob_keys.get(thread_id, set())
+        for key in list(blob_keys):
+            if key in referenced:
+                total_bytes += len(self.blobs[key][1])
+            else:
+                self.blobs.pop(key, None)
+                blob_keys.discard(key)
+
+        self._thread_bytes[thread_id] = total_bytes
+
+    def _evict_threads(self) -> None:
+        """유휴 TTL 만료 및 최대 스레드 수 초과 스레드 제거"""
+        now = time.monotonic()
+
+        while self._last_access:
+            thread_id, last_access = next(iter(self._last_access.items()))
+            expired = now - last_access > self.idle_ttl_seconds
+            if not expired and len(self._last_access) <= self.max_threads:
+                break
+            logger.info(f"대화 메모리 스레드 제거: {thread_id} ({'유휴 만료' if expired else 'LRU'})")
+            self.delete_thread(thread_id)
+            self.evicted_threads += 1
+
+    def evict_idle_threads(self, idle_seconds: Optional[float] = None) -> List[str]:
+        """
+        유휴 스레드 일괄 제거
+
+        Args:
+            idle_seconds: 유휴 기준 시간(초), 생략 시 설정된 TTL 사용
+
+        Returns:
+            제거된 thread_id 목록
+        """
+        threshold = self.idle_ttl_seconds if idle_seconds is None else idle_seconds
+        now = time.monotonic()
+        idle_threads = [
+            thread_id for thread_id, last_access in self._last_access.items()
+            if now - last_access > threshold
+        ]
+        for thread_id in idle_threads:
+            self.delete_thread(thread_id)
+        self.evicted_threads += len(idle_threads)
+        return idle_threads
+
+    async def aevict_idle_threads(self, idle_seconds: Optional[float] = None) -> List[str]:
+        """evict_idle_threads의 비동기 버전 (메모리 내 정리이고 상태를 이벤트 루프에서만 다루므로 바로 실행)"""
+        return self.evict_idle_threads(idle_seconds)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """스레드의 모든 체크포인트, 쓰기 기록, blob 삭제 (인덱스 기반)"""
+        namespaces = self.storage.pop(thread_id, {})
+        for checkpoint_ns, checkpoints in namespaces.items():
+            for checkpoint_id in checkpoints:
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        for key in self._thread_blob_keys.pop(thread_id, set()):
+            self.blobs.pop(key, None)
+        self._last_access.pop(thread_id, None)
+        self._thread_bytes.pop(thread_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """상주 스레드 수 및 바이트 통계 반환"""
+        return {
+            "backend": "bounded",
+            "threads": len(self._last_access),
+            "bytes": sum(self._thread_bytes.values()),
+            "max_threads": self.max_threads,
+            "evicted_threads": self.evicted_threads
+        }
+
+
+def create_checkpointer(backend: Optional[str] = None) -> BaseCheckpointSaver:
+    """
+    설정에 따른 Checkpointer 생성
+
+    Args:
+        backend: "bounded" | "memory" | "sqlite" (생략 시 CHECKPOINTER_BACKEND 환경변수)
+
+    Returns:
+        LangGraph checkpointer 인스턴스
+    """
+    backend = (backend or CHECKPOINTER_BACKEND).lower()
+
+    if backend == "memory":
+        return MemorySaver()
+    if backend == "bounded":
+        return BoundedMemorySaver(
+            max_threads=CHECKPOINT_MAX_THREADS,
+            idle_ttl_seconds=CHECKPOINT_IDLE_TTL_SECONDS,
+            max_messages=CHECKPOINT_MAX_MESSAGES,
+            max_thread_bytes=CHECKPOINT_MAX_THREAD_BYTES,
+            keep_checkpoints=CHECKPOINT_KEEP_PER_THREAD
+        )
+    if backend == "sqlite":
+        return SqliteCheckpointSaver(
+            path=CHECKPOINT_SQLITE_PATH,
+            batch_size=CHECKPOINT_SQLITE_BATCH_SIZE,
+            flush_interval_seconds=CHECKPOINT_SQLITE_FLUSH_INTERVAL_SECONDS,
+            compact_interval_seconds=CHECKPOINT_SQLITE_COMPACT_INTERVAL_SECONDS,
+            keep_checkpoints=CHECKPOINT_KEEP_PER_THREAD,
+            retention_seconds=CHECKPOINT_SQLITE_RETENTION_SECONDS
+        )
+
+    raise ValueError(f"지원하지 않는 checkpointer 백엔드: {backend}")
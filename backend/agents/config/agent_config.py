@@ -0,0 +1,105 @@
+"""
+Agent 동작 설정
+환경 변수로 조정 가능한 Agent 튜닝 값
+"""
+import os
+from dotenv import load_dotenv
+
+# .env 파일 로드
+load_dotenv()
+
+# 검색 결과 캐시 설정 (가격 정보는 빠르게 바뀌므로 TTL을 짧게 유지)
+QUERY_CACHE_ENABLED = os.getenv("QUERY_CACHE_ENABLED", "true").lower() == "true"
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "600"))
+QUERY_CACHE_MAX_SIZE = int(os.getenv("QUERY_CACHE_MAX_SIZE", "256"))
+
+# MCP 도구 호출 결과 캐시 설정 (세션 간 공유)
+MCP_TOOL_CACHE_ENABLED = os.getenv("MCP_TOOL_CACHE_ENABLED", "true").lower() == "true"
+MCP_TOOL_CACHE_TTL_SECONDS = float(os.getenv("MCP_TOOL_CACHE_TTL_SECONDS", "300"))
+MCP_TOOL_CACHE_MAX_SIZE = int(os.getenv("MCP_TOOL_CACHE_MAX_SIZE", "1024"))
+
+# 대화 메모리(checkpointer) 설정
+# CHECKPOINTER_BACKEND: "bounded" (LRU/TTL 제한 인메모리) | "memory" (무제한 MemorySaver)
+#                       | "sqlite" (디스크 영속화, 재시작/다중 워커 간 공유)
+CHECKPOINTER_BACKEND = os.getenv("CHECKPOINTER_BACKEND", "bounded")
+CHECKPOINT_MAX_THREADS = int(os.getenv("CHECKPOINT_MAX_THREADS", "1000"))
+CHECKPOINT_IDLE_TTL_SECONDS = float(os.getenv("CHECKPOINT_IDLE_TTL_SECONDS", "3600"))
+CHECKPOINT_MAX_MESSAGES = int(os.getenv("CHECKPOINT_MAX_MESSAGES", "40"))
+CHECKPOINT_MAX_THREAD_BYTES = int(os.getenv("CHECKPOINT_MAX_THREAD_BYTES", str(2 * 1024 * 1024)))
+CHECKPOINT_KEEP_PER_THREAD = int(os.getenv("CHECKPOINT_KEEP_PER_THREAD", "2"))
+
+# SQLite checkpointer 설정
+CHECKPOINT_SQLITE_PATH = os.getenv("CHECKPOINT_SQLITE_PATH", "./data/checkpoints.db")
+CHECKPOINT_SQLITE_BATCH_SIZE = int(os.getenv("CHECKPOINT_SQLITE_BATCH_SIZE", "32"))
+CHECKPOINT_SQLITE_FLUSH_INTERVAL_SECONDS = float(os.getenv("CHECKPOINT_SQLITE_FLUSH_INTERVAL_SECONDS", "0.5"))
+CHECKPOINT_SQLITE_COMPACT_INTERVAL_SECONDS = float(os.getenv("CHECKPOINT_SQLITE_COMPACT_INTERVAL_SECONDS", "300"))
+CHECKPOINT_SQLITE_RETENTION_SECONDS = float(os.getenv("CHECKPOINT_SQLITE_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+# 대화 컨텍스트 관리 설정 (턴마다 LLM에 전달되는 프롬프트 크기 제한)
+CONTEXT_MANAGEMENT_ENABLED = os.getenv("CONTEXT_MANAGEMENT_ENABLED", "true").lower() == "true"
+CONTEXT_MAX_RECENT_TURNS = int(os.getenv("CONTEXT_MAX_RECENT_TURNS", "3"))
+CONTEXT_OLD_TOOL_OUTPUT_CHARS = int(os.getenv("CONTEXT_OLD_TOOL_OUTPUT_CHARS", "300"))
+CONTEXT_SUMMARY_ENABLED = os.getenv("CONTEXT_SUMMARY_ENABLED", "true").lower() == "true"
+CONTEXT_SUMMARY_BATCH_TURNS = int(os.getenv("CONTEXT_SUMMARY_BATCH_TURNS", "2"))
+
+# Agent 초기화(MCP 연결/도구 로드) 재시도 설정 (지수 백오프)
+AGENT_INIT_MAX_ATTEMPTS = int(os.getenv("AGENT_INIT_MAX_ATTEMPTS", "3"))
+AGENT_INIT_BACKOFF_SECONDS = float(os.getenv("AGENT_INIT_BACKOFF_SECONDS", "0.5"))
+AGENT_INIT_BACKOFF_MAX_SECONDS = float(os.getenv("AGENT_INIT_BACKOFF_MAX_SECONDS", "5"))
+
+# 관측 가격 인덱스 설정 (최근 관측 가격으로 "최저가" 질의에 즉시 응답)
+PRICE_INDEX_ENABLED = os.getenv("PRICE_INDEX_ENABLED", "true").lower() == "true"
+PRICE_INDEX_PATH = os.getenv("PRICE_INDEX_PATH", "./data/price_index.db")
+PRICE_INDEX_MAX_AGE_SECONDS = float(os.getenv("PRICE_INDEX_MAX_AGE_SECONDS", "1800"))
+PRICE_INDEX_MIN_OFFERS = int(os.getenv("PRICE_INDEX_MIN_OFFERS", "2"))
+PRICE_INDEX_RETENTION_SECONDS = float(os.getenv("PRICE_INDEX_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+# 쇼핑몰 병렬 검색 설정 (쇼핑몰별 검색을 한 번의 도구 호출로 동시에 실행)
+MALL_SEARCH_ENABLED = os.getenv("MALL_SEARCH_ENABLED", "true").lower() == "true"
+MALL_SEARCH_MALLS = [
+    mall.strip()
+    for mall in os.getenv("MALL_SEARCH_MALLS", "네이버쇼핑,쿠팡,11번가,G마켓,옥션").split(",")
+    if mall.strip()
+]
+MALL_SEARCH_TOOL = os.getenv("MALL_SEARCH_TOOL", "web_search_exa")
+MALL_SEARCH_TIMEOUT_SECONDS = float(os.getenv("MALL_SEARCH_TIMEOUT_SECONDS", "8"))
+MALL_SEARCH_MAX_RESULTS = int(os.getenv("MALL_SEARCH_MAX_RESULTS", "5"))
+
+# 요청 제한 시간 설정 (턴 전체 제한 시간, 도구 호출 1회 제한 시간, ReAct 최대 단계 수)
+AGENT_TURN_DEADLINE_SECONDS = float(os.getenv("AGENT_TURN_DEADLINE_SECONDS", "60"))
+AGENT_TURN_MAX_DEADLINE_SECONDS = float(os.getenv("AGENT_TURN_MAX_DEADLINE_SECONDS", "180"))
+AGENT_TOOL_TIMEOUT_SECONDS = float(os.getenv("AGENT_TOOL_TIMEOUT_SECONDS", "20"))
+AGENT_RECURSION_LIMIT = int(os.getenv("AGENT_RECURSION_LIMIT", "12"))
+
+# 채팅 요청 수락 제어 (동시 실행 수는 LLM 요청 한도에 맞춰 조정, 대기열/세션 한도 초과 시 429)
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "8"))
+# 실행 슬롯을 기다릴 수 있는 최대 요청 수
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+# 세션 하나가 동시에 점유(실행 + 대기)할 수 있는 최대 요청 수
+ADMISSION_MAX_PER_SESSION = int(os.getenv("ADMISSION_MAX_PER_SESSION", "2"))
+# 대기열 최대 대기 시간(초)
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "30"))
+# 멀티 워커 모드에서 세션별 점유 기록 유효 시간(초) (워커가 비정상 종료해도 이 시간 뒤 해제)
+ADMISSION_SESSION_LEASE_SECONDS = float(os.getenv("ADMISSION_SESSION_LEASE_SECONDS", "300"))
+
+# 멀티 워커 공유 상태 ("none": 프로세스 내 상태만 사용 | "sqlite": 같은 호스트의 워커들이 SQLite 파일로 공유)
+# 공유 대상: 검색 결과/도구 호출 캐시, 세션 실행 권한(lease), 세션별 요청 수 제한
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "none").lower()
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", "./data/shared_state.db")
+# 다른 워커가 쓰기 잠금을 잡고 있을 때 기다리는 최대 시간(ms) (짧은 트랜잭션만 사용하므로 짧게 유지)
+SHARED_STATE_BUSY_TIMEOUT_MS = int(os.getenv("SHARED_STATE_BUSY_TIMEOUT_MS", "1000"))
+# 세션 실행 권한 유효 시간(초) (실행 중에는 주기적으로 갱신, 워커가 죽으면 만료 후 다른 워커가 이어받음)
+SESSION_LEASE_SECONDS = float(os.getenv("SESSION_LEASE_SECONDS", "30"))
+# 다른 워커가 실행 중인 세션의 대기/새 요청 확인 주기(초)
+SESSION_LEASE_POLL_SECONDS = float(os.getenv("SESSION_LEASE_POLL_SECONDS", "0.1"))
+# 세션 요청 번호 유효 시간(초) (마지막 요청 후 이 시간이 지나면 삭제, 턴 최대 실행 시간보다 길게 설정)
+SESSION_GENERATION_TTL_SECONDS = float(os.getenv("SESSION_GENERATION_TTL_SECONDS", "86400"))
+
+# 모델 라우팅 (잡담/짧은 후속 질문과 도구 호출 인자 생성 단계는 빠른 모델, 비교/추천 등 복합 질문은 강한 모델)
+MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING_ENABLED", "true").lower() == "true"
+MODEL_STRONG_NAME = os.getenv("MODEL_STRONG_NAME", "gemini-2.0-flash-exp")
+MODEL_FAST_NAME = os.getenv("MODEL_FAST_NAME", "gemini-2.0-flash-lite")
+# 일반 상품 검색 턴에서 도구 호출 인자를 만드는 첫 단계에 사용할 모델 ("fast" | "strong")
+MODEL_ROUTING_TOOL_CALL_TIER = os.getenv("MODEL_ROUTING_TOOL_CALL_TIER", "fast").lower()
+# 이 길이(글자 수)를 넘는 질문은 항상 강한 모델 사용
+MODEL_ROUTING_SIMPLE_MAX_CHARS = int(os.getenv("MODEL_ROUTING_SIMPLE_MAX_CHARS", "40"))
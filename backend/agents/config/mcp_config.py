@@ -10,12 +10,14 @@ load_dotenv()
 
 # 환경 변수에서 키 가져오기
 SMITHERY_API_KEY = os.getenv("SMITHERY_API_KEY")
+# Exa MCP 서버 주소 재정의 (로컬 대체 서버로 오프라인 벤치마크 시 사용)
+MCP_EXA_URL = os.getenv("MCP_EXA_URL") or f"https://server.smithery.ai/exa/mcp?api_key={SMITHERY_API_KEY}"
 
 # 기본 MCP 서버 설정
 MCP_SERVER_CONFIG = {
     "exa": {
         "transport": "streamable_http",
-        "url": f"https://server.smithery.ai/exa/mcp?api_key={SMITHERY_API_KEY}"
+        "url": MCP_EXA_URL
     },
     # "browser": {
     #     "command": "npx", 
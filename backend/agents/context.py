@@ -0,0 +1,187 @@
+"""
+대화 컨텍스트 관리
+React Agent의 pre_model_hook으로 동작하며, 턴마다 LLM에 전달되는 메시지를 제한
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.prebuilt.chat_agent_executor import AgentState
+from typing_extensions import NotRequired
+
+from .prompts.shopping_prompts import get_context_summary_prompt
+
+logger = logging.getLogger(__name__)
+
+# 요약 대상 메시지를 요약 프롬프트에 넣을 때 메시지당 최대 길이
+SUMMARY_MESSAGE_MAX_CHARS = 1000
+
+# 요약 LLM 호출 태그 (스트리밍 시 요약 토큰이 사용자 응답으로 전달되지 않도록 구분)
+CONTEXT_SUMMARY_TAG = "context_summary"
+
+
+class ShoppingAgentState(AgentState):
+    """컨텍스트 요약 상태를 포함한 Agent 상태"""
+    context_summary: NotRequired[str]
+    summarized_until_id: NotRequired[Optional[str]]
+
+
+def split_turns(messages: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """
+    메시지 목록을 사용자 턴 단위로 분할
+
+    Args:
+        messages: 전체 메시지 목록
+
+    Returns:
+        HumanMessage로 시작하는 턴 목록 (첫 HumanMessage 이전 메시지는 첫 턴에 포함)
+    """
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """텍스트를 최대 길이로 자르기"""
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... (이하 {len(text) - max_chars}자 생략)"
+
+
+class ContextManager:
+    """
+    턴별 프롬프트 크기 관리
+
+    - 최근 N개 턴은 그대로 유지
+    - 그보다 오래된 턴의 도구 결과는 잘라서 전달
+    - 요약이 활성화되면 오래된 턴을 누적 요약(rolling summary)으로 대체
+    """
+
+    def __init__(
+        self,
+        max_recent_turns: int = 3,
+        old_tool_output_chars: int = 300,
+        summarizer_model: Optional[BaseChatModel] = None,
+        summary_batch_turns: int = 2
+    ):
+        """
+        컨텍스트 관리자 초기화
+
+        Args:
+            max_recent_turns: 그대로 유지할 최근 턴 수 (현재 턴 포함)
+            old_tool_output_chars: 오래된 턴의 도구 결과 최대 길이
+            summarizer_model: 요약에 사용할 LLM (None이면 요약하지 않음)
+            summary_batch_turns: 요약되지 않은 오래된 턴이 이 개수 이상 쌓이면 요약 실행
+        """
+        self.max_recent_turns = max(1, max_recent_turns)
+        self.old_tool_output_chars = old_tool_output_chars
+        self.summarizer_model = summarizer_model
+        self.summary_batch_turns = max(1, summary_batch_turns)
+
+        self.stats: Dict[str, Any] = {
+            "calls": 0,
+            "summaries": 0,
+            "tokens_before_total": 0,
+            "tokens_after_total": 0,
+            "last_tokens_before": 0,
+            "last_tokens_after": 0
+        }
+
+    def _trim_tool_outputs(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """도구 결과 메시지 내용 자르기 (도구 호출/결과 쌍은 유지)"""
+        trimmed = []
+        for message in messages:
+            if isinstance(message, ToolMessage) and isinstance(message.content, str):
+                message = message.model_copy(
+                    update={"content": _truncate(message.content, self.old_tool_output_chars)}
+                )
+            trimmed.append(message)
+        return trimmed
+
+    async def _summarize(self, previous_summary: str, messages: Sequence[BaseMessage]) -> str:
+        """이전 요약과 새 메시지를 합쳐 누적 요약 생성"""
+        conversation = "\n".join(
+            f"[{message.type}] {_truncate(str(message.content), SUMMARY_MESSAGE_MAX_CHARS)}"
+            for message in messages
+            if message.content
+        )
+        # 그래프 콜백(트레이싱)은 유지하되 태그로 구분하여 응답 토큰 스트림에서 제외
+        response = await self.summarizer_model.ainvoke(
+            [HumanMessage(content=get_context_summary_prompt(previous_summary, conversation))],
+            config={"tags": [CONTEXT_SUMMARY_TAG], "run_name": CONTEXT_SUMMARY_TAG}
+        )
+        content = response.content
+        if isinstance(content, list):
+            content = "".join(
+                part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+            )
+        return content.strip()
+
+    async def pre_model_hook(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        LLM 호출 직전 메시지 정리 (create_react_agent의 pre_model_hook)
+
+        저장된 대화 기록(messages)은 변경하지 않고 llm_input_messages로만 축소된 목록을 전달합니다.
+
+        Args:
+            state: Agent 상태
+
+        Returns:
+            llm_input_messages 및 (요약 갱신 시) 요약 상태 업데이트
+        """
+        messages = list(state["messages"])
+        turns = split_turns(messages)
+        recent_turns = turns[-self.max_recent_turns:]
+        old_messages = [message for turn in turns[:-self.max_recent_turns] for message in turn]
+
+        summary = state.get("context_summary") or ""
+        summarized_until_id = state.get("summarized_until_id")
+        update: Dict[str, Any] = {}
+
+        # 이미 요약된 메시지 이후의 오래된 메시지만 남김
+        # (요약 기준 메시지가 목록에 없으면 메모리 정리로 잘려나간 것이므로 전부 미요약 상태)
+        unsummarized = old_messages
+        if summarized_until_id:
+            for index, message in enumerate(old_messages):
+                if message.id == summarized_until_id:
+                    unsummarized = old_messages[index + 1:]
+                    break
+
+        if self.summarizer_model is not None and unsummarized:
+            unsummarized_turns = len(split_turns(unsummarized))
+            if unsummarized_turns >= self.summary_batch_turns:
+                try:
+                    summary = await self._summarize(summary, unsummarized)
+                    update = {
+                        "context_summary": summary,
+                        "summarized_until_id": unsummarized[-1].id
+                    }
+                    unsummarized = []
+                    self.stats["summaries"] += 1
+                except Exception as e:
+                    # 요약 실패 시 도구 결과만 잘라서 전달
+                    logger.warning(f"대화 요약 실패: {str(e)}")
+
+        llm_input_messages: List[BaseMessage] = []
+        if summary:
+            llm_input_messages.append(SystemMessage(content=f"이전 대화 요약:\n{summary}"))
+        llm_input_messages.extend(self._trim_tool_outputs(unsummarized))
+        llm_input_messages.extend(message for turn in recent_turns for message in turn)
+
+        tokens_before = count_tokens_approximately(messages)
+        tokens_after = count_tokens_approximately(llm_input_messages)
+        self.stats["calls"] += 1
+        self.stats["tokens_before_total"] += tokens_before
+        self.stats["tokens_after_total"] += tokens_after
+        self.stats["last_tokens_before"] = tokens_before
+        self.stats["last_tokens_after"] = tokens_after
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"프롬프트 토큰(추정): {tokens_before} -> {tokens_after}")
+
+        return {"llm_input_messages": llm_input_messages, **update}
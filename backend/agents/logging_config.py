@@ -0,0 +1,231 @@
+"""
+구조화 비동기 로깅
+- 로그 호출은 레코드를 메모리 큐에 넣기만 하고, 포맷/출력은 별도 스레드(QueueListener)에서 처리하여
+  이벤트 루프가 표준 출력/파일 쓰기에 막히지 않도록 함
+- LOG_FORMAT=json이면 레코드의 extra 필드와 trace id를 JSON 한 줄로 출력
+- 상세(DEBUG) 로그는 LOG_VERBOSE_SAMPLE_RATE 비율로 표본 추출하고, 큐가 밀리면(부하 상황) 버림
+  (DEBUG가 꺼져 있으면 호출부에서 logger.isEnabledFor()로 확인하여 로그 내용도 만들지 않음)
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, TextIO
+
+from dotenv import load_dotenv
+
+from .metrics import get_registry, stats_families
+from .tracing import current_span
+
+# .env 파일 로드
+load_dotenv()
+
+# 출력할 최소 로그 레벨
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# 출력 형식: "text" | "json" (JSON Lines)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# 출력 스레드로 넘기기 전 보관할 최대 레코드 수 (가득 차면 새 레코드를 버림)
+LOG_QUEUE_MAX_SIZE = int(os.getenv("LOG_QUEUE_MAX_SIZE", "10000"))
+# 상세(DEBUG) 로그 표본 비율 (0~1)
+LOG_VERBOSE_SAMPLE_RATE = float(os.getenv("LOG_VERBOSE_SAMPLE_RATE", "1.0"))
+# 큐에 이만큼 쌓여 있으면 상세 로그를 모두 버림 (부하 시 INFO 이상 로그 우선)
+LOG_VERBOSE_DROP_QUEUE_SIZE = int(os.getenv("LOG_VERBOSE_DROP_QUEUE_SIZE", "1000"))
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(trace_id)s] %(name)s: %(message)s"
+
+# LogRecord 기본 속성 (이외의 속성은 extra로 전달된 구조화 필드)
+_RECORD_ATTRS = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime", "trace_id"}
+
+_stats = {"enqueued": 0, "dropped_queue_full": 0, "dropped_under_load": 0, "sampled_out": 0}
+
+_lock = threading.Lock()
+_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _extra_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """extra로 전달된 구조화 필드 추출"""
+    return {key: value for key, value in record.__dict__.items() if key not in _RECORD_ATTRS}
+
+
+class TraceContextFilter(logging.Filter):
+    """현재 span의 trace id를 레코드에 추가 (로그를 남긴 코루틴에서 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "trace_id"):
+            span = current_span()
+            record.trace_id = span.trace_id if span is not None else "-"
+        return True
+
+
+class VerboseSampler(logging.Filter):
+    """
+    상세(INFO 미만) 로그 표본 추출 및 부하 시 버림
+
+    - 큐에 drop_queue_size 이상 쌓여 있으면 상세 로그를 버림
+    - 그 외에는 sample_rate 비율만큼 균등 간격으로 통과 (난수 대신 카운터 사용)
+    """
+
+    def __init__(self, log_queue: "queue.Queue", sample_rate: float, drop_queue_size: int):
+        super().__init__()
+        self.log_queue = log_queue
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.drop_queue_size = drop_queue_size
+        self._seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.INFO:
+            return True
+        if self.log_queue.qsize() >= self.drop_queue_size:
+            _stats["dropped_under_load"] += 1
+            return False
+        self._seen += 1
+        # 누적 통과 수가 seen × rate를 따라가도록 통과
+        if int(self._seen * self.sample_rate) > int((self._seen - 1) * self.sample_rate):
+            return True
+        _stats["sampled_out"] += 1
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 레코드를 버리는 QueueHandler"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지 인자만 합치고 포맷(시간, 예외 스택 문자열 생성)은 출력 스레드에 맡김
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            _stats["enqueued"] += 1
+        except queue.Full:
+            _stats["dropped_queue_full"] += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드를 JSON 한 줄로 출력 (extra 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "trace_id": getattr(record, "trace_id", "-")
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """사람이 읽는 한 줄 형식 (extra 필드는 key=value로 덧붙임)"""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "trace_id"):
+            record.trace_id = "-"
+        text = super().format(record)
+        extra = _extra_fields(record)
+        if extra:
+            fields = " ".join(f"{key}={value}" for key, value in extra.items())
+            first_line, newline, rest = text.partition("\n")
+            text = f"{first_line} {fields}{newline}{rest}"
+        return text
+
+
+def create_formatter(kind: str) -> logging.Formatter:
+    """LOG_FORMAT 값에 맞는 포맷터 생성"""
+    if kind == "json":
+        return JsonFormatter()
+    return TextFormatter()
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    fmt: str = LOG_FORMAT,
+    stream: Optional[TextIO] = None,
+    max_queue_size: int = LOG_QUEUE_MAX_SIZE,
+    verbose_sample_rate: float = LOG_VERBOSE_SAMPLE_RATE,
+    verbose_drop_queue_size: int = LOG_VERBOSE_DROP_QUEUE_SIZE
+) -> QueueListener:
+    """
+    루트 로거에 비동기 큐 핸들러 설치 (이미 설치되어 있으면 교체)
+
+    Args:
+        level: 최소 로그 레벨
+        fmt: 출력 형식 ("text" | "json")
+        stream: 출력 스트림 (생략 시 표준 에러)
+        max_queue_size: 큐 최대 크기
+        verbose_sample_rate: 상세 로그 표본 비율
+        verbose_drop_queue_size: 상세 로그를 버리기 시작하는 큐 크기
+
+    Returns:
+        출력 스레드 (shutdown_logging()으로 정지)
+    """
+    global _handler, _listener
+
+    with _lock:
+        _shutdown_locked()
+
+        log_queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        output = logging.StreamHandler(stream if stream is not None else sys.stderr)
+        output.setFormatter(create_formatter(fmt))
+
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(VerboseSampler(log_queue, verbose_sample_rate, verbose_drop_queue_size))
+        handler.addFilter(TraceContextFilter())
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(handler)
+
+        _listener = QueueListener(log_queue, output)
+        _listener.start()
+        _handler = handler
+        return _listener
+
+
+def _shutdown_locked() -> None:
+    """설치한 핸들러 제거 후 남은 레코드 출력 (_lock 보유 상태에서 호출)"""
+    global _handler, _listener
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        # 큐에 남은 레코드를 모두 출력한 뒤 스레드 종료
+        _listener.stop()
+        _listener = None
+
+
+def shutdown_logging() -> None:
+    """큐 핸들러 제거 및 남은 로그 출력 (여러 번 호출해도 안전)"""
+    with _lock:
+        _shutdown_locked()
+
+
+def logging_stats() -> Dict[str, Any]:
+    """로깅 큐 통계 반환"""
+    queued = _handler.queue.qsize() if _handler is not None else 0
+    return {**_stats, "queued": queued}
+
+
+atexit.register(shutdown_logging)
+
+get_registry().register_collector(
+    "logging",
+    lambda: stats_families(
+        "log_records", "로그 레코드", logging_stats(),
+        counters=("enqueued", "dropped_queue_full", "dropped_under_load", "sampled_out")
+    )
+)
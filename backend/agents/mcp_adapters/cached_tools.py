@@ -0,0 +1,174 @@
+"""
+MCP 도구 호출 캐시
+(도구 이름, 정규화된 인자) 단위로 결과를 메모이즈하고 동일한 진행 중 호출을 하나로 합침
+"""
+import asyncio
+import json
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+from ..cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _canonicalize(value: Any) -> Any:
+    """인자 값 정규화 (문자열 공백 정리, 중첩 구조 재귀 처리)"""
+    if isinstance(value, str):
+        return _WHITESPACE_RE.sub(" ", value).strip()
+    if isinstance(value, dict):
+        return {key: _canonicalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(item) for item in value]
+    return value
+
+
+def make_tool_cache_key(tool_name: str, arguments: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    도구 호출 캐시 키 생성
+
+    Args:
+        tool_name: 도구 이름
+        arguments: 도구 호출 인자
+
+    Returns:
+        (도구 이름, 키 정렬된 JSON 인자) 튜플
+    """
+    canonical_args = json.dumps(
+        _canonicalize(arguments), sort_keys=True, ensure_ascii=False, default=str
+    )
+    return tool_name, canonical_args
+
+
+class ToolCallCache:
+    """MCP 도구 호출 결과 캐시 + single-flight 호출 병합"""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0, cache: Optional[Any] = None):
+        """
+        도구 호출 캐시 초기화
+
+        Args:
+            max_size: 최대 캐시 항목 수
+            ttl_seconds: 캐시 유효 시간(초)
+            cache: 결과 저장소 (TTLCache 인터페이스, 생략 시 프로세스 내 TTLCache / 워커 간 공유 시 SharedTTLCache)
+        """
+        self.cache = cache if cache is not None else TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # 진행 중 호출별 대기 호출자 수
+        self._waiters: Dict[Tuple[str, str], int] = {}
+        self.coalesced = 0
+        self.cancelled = 0
+
+    async def call(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        upstream: Callable[..., Awaitable[Any]]
+    ) -> Any:
+        """
+        캐시를 거쳐 도구 호출
+
+        캐시 히트 시 즉시 반환하고, 동일한 호출이 진행 중이면 그 결과를 함께 기다립니다.
+        실패한 호출은 캐시하지 않습니다. 기다리던 호출자가 모두 취소되면
+        (클라이언트 연결 종료 등) 진행 중인 upstream 호출도 취소합니다.
+
+        Args:
+            tool_name: 도구 이름
+            arguments: 도구 호출 인자
+            upstream: 실제 도구 코루틴 함수
+
+        Returns:
+            도구 호출 결과
+        """
+        key = make_tool_cache_key(tool_name, arguments)
+
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(key)
+        if future is not None and not future.done():
+            self.coalesced += 1
+        else:
+            async def _fetch() -> Any:
+                # 최초 호출자가 취소되더라도 공유 호출 안에서 캐시 저장 (공유 캐시면 스레드에서 기록)
+                result = await upstream(**arguments)
+                try:
+                    await self.cache.aset(key, result)
+                except Exception as e:
+                    logger.warning(f"도구 호출 결과 캐시 저장 실패: {tool_name}: {str(e)}")
+                return result
+
+            future = asyncio.ensure_future(_fetch())
+            self._inflight[key] = future
+
+            def _on_done(done: asyncio.Future) -> None:
+                if self._inflight.get(key) is done:
+                    self._inflight.pop(key, None)
+
+            future.add_done_callback(_on_done)
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # 일부 호출자가 취소되어도 다른 호출자가 기다리는 동안 공유 호출은 유지
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if self._waiters.get(key, 0) <= 1 and not future.done():
+                logger.info(f"모든 호출자가 취소되어 도구 호출 중단: {tool_name}")
+                if self._inflight.get(key) is future:
+                    self._inflight.pop(key, None)
+                future.cancel()
+                self.cancelled += 1
+            raise
+        finally:
+            remaining = self._waiters.get(key, 0) - 1
+            if remaining > 0:
+                self._waiters[key] = remaining
+            else:
+                self._waiters.pop(key, None)
+
+    def wrap_tool(self, tool: BaseTool) -> BaseTool:
+        """
+        도구를 캐시 호출 래퍼로 감싸기
+
+        Args:
+            tool: MultiServerMCPClient.get_tools()가 반환한 도구
+
+        Returns:
+            동일한 이름/스키마를 가지며 캐시를 거치는 도구 (코루틴이 없으면 원본 반환)
+        """
+        upstream = getattr(tool, "coroutine", None)
+        if upstream is None:
+            return tool
+
+        tool_name = tool.name
+
+        async def cached_call(**arguments: Any) -> Any:
+            return await self.call(tool_name, arguments, upstream)
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            coroutine=cached_call,
+            response_format=tool.response_format,
+            metadata=tool.metadata
+        )
+
+    def wrap_tools(self, tools: List[BaseTool]) -> List[BaseTool]:
+        """도구 목록 전체를 캐시 래퍼로 감싸기"""
+        return [self.wrap_tool(tool) for tool in tools]
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환 (병합된 호출 수, 취소된 호출 수, 진행 중 호출 수 포함)"""
+        return {
+            **self.cache.stats(),
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+            "inflight": len(self._inflight)
+        }
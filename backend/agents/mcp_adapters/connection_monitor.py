@@ -0,0 +1,93 @@
+"""
+MCP 연결 상태 감시
+도구 호출 중 연결 오류가 발생하면 표시하여 다음 요청에서 Agent를 다시 초기화하도록 함
+"""
+import logging
+from typing import Any, List
+
+import anyio
+import httpx
+from langchain_core.tools import BaseTool, StructuredTool
+
+logger = logging.getLogger(__name__)
+
+# MCP 서버 연결 끊김으로 판단하는 예외 타입
+CONNECTION_ERROR_TYPES = (
+    ConnectionError,
+    TimeoutError,
+    httpx.TransportError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream
+)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """
+    연결 오류 여부 확인
+
+    Args:
+        error: 도구 호출 중 발생한 예외 (anyio 태스크 그룹의 ExceptionGroup 포함)
+
+    Returns:
+        연결 오류이면 True
+    """
+    inner_errors = getattr(error, "exceptions", None)
+    if isinstance(inner_errors, (list, tuple)):
+        return any(is_connection_error(inner) for inner in inner_errors)
+    if isinstance(error, CONNECTION_ERROR_TYPES):
+        return True
+    cause = error.__cause__ or error.__context__
+    return cause is not None and is_connection_error(cause)
+
+
+class ConnectionMonitor:
+    """MCP 도구 호출 연결 오류 감시"""
+
+    def __init__(self):
+        """연결 감시 초기화"""
+        self.lost = False
+        self.failures = 0
+
+    def reset(self) -> None:
+        """연결 상태 초기화 (Agent 재초기화 후 호출)"""
+        self.lost = False
+
+    def wrap_tool(self, tool: BaseTool) -> BaseTool:
+        """
+        도구를 연결 감시 래퍼로 감싸기
+
+        Args:
+            tool: MultiServerMCPClient.get_tools()가 반환한 도구
+
+        Returns:
+            동일한 이름/스키마를 가지며 연결 오류를 기록하는 도구 (코루틴이 없으면 원본 반환)
+        """
+        upstream = getattr(tool, "coroutine", None)
+        if upstream is None:
+            return tool
+
+        tool_name = tool.name
+
+        async def monitored_call(**arguments: Any) -> Any:
+            try:
+                return await upstream(**arguments)
+            except Exception as e:
+                if is_connection_error(e):
+                    self.lost = True
+                    self.failures += 1
+                    logger.warning(f"MCP 연결 오류 감지 ({tool_name}): {str(e)}")
+                raise
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            coroutine=monitored_call,
+            response_format=tool.response_format,
+            metadata=tool.metadata
+        )
+
+    def wrap_tools(self, tools: List[BaseTool]) -> List[BaseTool]:
+        """도구 목록 전체를 연결 감시 래퍼로 감싸기"""
+        return [self.wrap_tool(tool) for tool in tools]
@@ -0,0 +1,203 @@
+"""
+쇼핑몰 병렬 검색 도구
+설정된 쇼핑몰들을 웹 검색 도구로 동시에 검색하고 결과를 하나의 관측 결과로 합침
+(쇼핑몰마다 LLM→도구→LLM 왕복을 반복하지 않도록 한 번의 도구 호출로 처리)
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool
+from pydantic import BaseModel, Field
+
+from ..product_parser import choose_products, extract_offers_from_tool_output
+
+logger = logging.getLogger(__name__)
+
+MALL_SEARCH_TOOL_NAME = "search_all_malls"
+
+
+class MallSearchInput(BaseModel):
+    """쇼핑몰 병렬 검색 도구 입력"""
+    query: str = Field(..., description="검색할 상품명 (예: 아이폰 15 128GB)")
+
+
+def find_search_tool(tools: List[BaseTool], preferred_name: Optional[str] = None) -> Optional[BaseTool]:
+    """
+    쇼핑몰 검색에 사용할 웹 검색 도구 선택
+
+    Args:
+        tools: MCP 도구 목록
+        preferred_name: 우선 사용할 도구 이름
+
+    Returns:
+        이름이 preferred_name인 도구, 없으면 이름에 "search"가 들어간 첫 도구 (없으면 None)
+    """
+    if preferred_name:
+        for tool in tools:
+            if tool.name == preferred_name:
+                return tool
+    for tool in tools:
+        if "search" in tool.name.lower() and getattr(tool, "coroutine", None) is not None:
+            return tool
+    return None
+
+
+def _result_text(result: Any) -> str:
+    """도구 결과(content 또는 (content, artifact) 튜플)에서 텍스트 추출"""
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, str):
+        return result
+    if isinstance(result, list):
+        parts = []
+        for part in result:
+            if isinstance(part, str):
+                parts.append(part)
+            elif isinstance(part, dict) and part.get("type") == "text":
+                parts.append(part.get("text", ""))
+            elif hasattr(part, "text"):
+                parts.append(part.text)
+        return "\n".join(parts)
+    return str(result)
+
+
+def _compact_results(text: str, max_results: int, text_chars: int) -> Any:
+    """검색 결과를 제목/URL/본문 앞부분만 남겨 축약 (JSON이 아니면 앞부분 텍스트)"""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return text[:text_chars * max_results]
+
+    items = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return data
+
+    compacted = []
+    for item in items[:max_results]:
+        if not isinstance(item, dict):
+            continue
+        compacted.append({
+            "title": item.get("title"),
+            "url": item.get("url"),
+            "text": str(item.get("text") or "")[:text_chars]
+        })
+    return compacted
+
+
+class MallFanoutSearch:
+    """
+    쇼핑몰 병렬 검색
+
+    - 쇼핑몰별 검색을 동시에 실행하고 각각 제한 시간 적용 (느린 쇼핑몰은 제외하고 진행)
+    - 쇼핑몰별 결과와 가격순 상품 제안을 하나의 JSON 관측 결과로 반환
+    """
+
+    def __init__(
+        self,
+        search_tool: BaseTool,
+        malls: List[str],
+        timeout_seconds: float = 8.0,
+        max_results_per_mall: int = 5,
+        text_chars: int = 300
+    ):
+        """
+        쇼핑몰 병렬 검색 초기화
+
+        Args:
+            search_tool: 쇼핑몰별 검색에 사용할 웹 검색 도구 (캐시/연결 감시 래퍼 포함)
+            malls: 검색할 쇼핑몰 이름 목록
+            timeout_seconds: 쇼핑몰별 검색 제한 시간(초)
+            max_results_per_mall: 쇼핑몰별로 LLM에 전달할 최대 결과 수
+            text_chars: 결과 본문 최대 길이
+        """
+        self.search_tool = search_tool
+        self.malls = malls
+        self.timeout_seconds = timeout_seconds
+        self.max_results_per_mall = max_results_per_mall
+        self.text_chars = text_chars
+
+    def _build_arguments(self, query: str) -> Dict[str, Any]:
+        """검색 도구 입력 스키마에 맞춰 호출 인자 생성"""
+        arguments: Dict[str, Any] = {"query": query}
+        schema = self.search_tool.args_schema
+        properties = schema.get("properties", {}) if isinstance(schema, dict) else {}
+        if "numResults" in properties:
+            arguments["numResults"] = self.max_results_per_mall
+        return arguments
+
+    async def _search_mall(self, mall: str, query: str) -> Dict[str, Any]:
+        """단일 쇼핑몰 검색 (제한 시간 초과/오류는 결과에 상태로 기록)"""
+        started = time.perf_counter()
+        arguments = self._build_arguments(f"{mall} {query} 가격")
+        try:
+            result = await asyncio.wait_for(
+                self.search_tool.coroutine(**arguments),
+                timeout=self.timeout_seconds
+            )
+            text = _result_text(result)
+            status = {"status": "ok", "text": text}
+        except asyncio.TimeoutError:
+            logger.warning(f"쇼핑몰 검색 시간 초과 ({mall}): {self.timeout_seconds}초")
+            status = {"status": "timeout", "text": ""}
+        except Exception as e:
+            logger.warning(f"쇼핑몰 검색 실패 ({mall}): {str(e)}")
+            status = {"status": "error", "text": "", "error": str(e)}
+
+        status["mall"] = mall
+        status["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return status
+
+    async def search(self, query: str) -> str:
+        """
+        모든 쇼핑몰을 동시에 검색하고 결과 병합
+
+        Args:
+            query: 검색할 상품명
+
+        Returns:
+            쇼핑몰별 결과와 가격순 상품 제안을 담은 JSON 문자열
+        """
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(self._search_mall(mall, query) for mall in self.malls))
+
+        offers = []
+        malls = []
+        for outcome in outcomes:
+            text = outcome.pop("text")
+            if text:
+                offers.extend(extract_offers_from_tool_output(text))
+                outcome["results"] = _compact_results(text, self.max_results_per_mall, self.text_chars)
+            malls.append(outcome)
+
+        # 가격순 정렬 및 중복 제거
+        unique_offers = [offer.model_dump() for offer in choose_products([], offers)]
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(
+            f"쇼핑몰 병렬 검색 완료: {query} "
+            f"({sum(mall['status'] == 'ok' for mall in malls)}/{len(malls)}개 성공, {elapsed_ms}ms)"
+        )
+        return json.dumps(
+            {"query": query, "elapsed_ms": elapsed_ms, "offers": unique_offers, "malls": malls},
+            ensure_ascii=False
+        )
+
+    def as_tool(self) -> BaseTool:
+        """
+        LLM이 호출할 수 있는 도구로 변환
+
+        Returns:
+            search_all_malls 도구
+        """
+        return StructuredTool(
+            name=MALL_SEARCH_TOOL_NAME,
+            description=(
+                f"{', '.join(self.malls)}에서 상품을 동시에 검색하여 쇼핑몰별 검색 결과와 "
+                "가격순 상품 제안(offers)을 한 번에 반환합니다. 쇼핑몰별로 따로 검색하지 말고 이 도구를 먼저 사용하세요."
+            ),
+            args_schema=MallSearchInput,
+            coroutine=self.search
+        )
@@ -0,0 +1,59 @@
+"""
+도구 호출 제한 시간
+느린 MCP 호출이 턴 전체를 붙잡지 않도록 도구마다 제한 시간을 적용하고,
+초과 시 LLM이 다른 방법을 시도할 수 있도록 도구 오류로 전달
+"""
+import asyncio
+import logging
+from typing import Any, List
+
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+
+logger = logging.getLogger(__name__)
+
+
+def with_timeout(tool: BaseTool, timeout_seconds: float) -> BaseTool:
+    """
+    도구를 제한 시간 래퍼로 감싸기
+
+    Args:
+        tool: 감쌀 도구 (캐시/연결 감시 래퍼 바깥에 적용)
+        timeout_seconds: 도구 호출 1회 제한 시간(초)
+
+    Returns:
+        동일한 이름/스키마를 가지며 제한 시간을 넘기면 ToolException을 발생시키는 도구
+        (코루틴이 없으면 원본 반환)
+    """
+    upstream = getattr(tool, "coroutine", None)
+    if upstream is None:
+        return tool
+
+    tool_name = tool.name
+
+    async def timed_call(**arguments: Any) -> Any:
+        try:
+            return await asyncio.wait_for(upstream(**arguments), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"도구 호출 시간 초과 ({tool_name}): {timeout_seconds}초")
+            raise ToolException(
+                f"{tool_name} 도구가 {timeout_seconds:g}초 안에 응답하지 않았습니다. "
+                "지금까지 수집한 정보로 답변하거나 다른 검색어를 사용하세요."
+            )
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        coroutine=timed_call,
+        response_format=tool.response_format,
+        metadata=tool.metadata,
+        # 시간 초과 메시지를 도구 결과로 LLM에 전달
+        handle_tool_error=True
+    )
+
+
+def wrap_tools_with_timeout(tools: List[BaseTool], timeout_seconds: float) -> List[BaseTool]:
+    """도구 목록 전체에 제한 시간 적용 (0 이하이면 그대로 반환)"""
+    if timeout_seconds <= 0:
+        return tools
+    return [with_timeout(tool, timeout_seconds) for tool in tools]
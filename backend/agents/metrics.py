@@ -0,0 +1,394 @@
+"""
+프로세스 내 메트릭 레지스트리
+요청 수, 실행 중인 Agent 수, LLM/MCP 지연 시간 히스토그램, 캐시 히트율, SSE 스트림 시간 등을 기록하고
+Prometheus 텍스트 형식(/metrics)으로 출력
+
+- 기록은 이벤트 루프 스레드에서만 일어나므로 잠금 없이 값을 갱신하고, 출력 시점에 합산
+- 지연 시간 히스토그램은 트레이싱 span 종료 시점에 기록 (구간마다 따로 시간을 재지 않음)
+- 기존 stats() 값(캐시, 수락 제어 등)은 수집기로 등록해 /metrics 요청 시에만 읽음
+  (수집기 일부는 SQLite를 읽으므로 /metrics는 arender()로 스레드 풀에서 출력)
+"""
+import asyncio
+import bisect
+import logging
+import math
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from .tracing import STATUS_ERROR, Span, add_span_listener
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램 기본 구간(초)
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 수집기 반환 형식: (이름, 타입, 설명, [(레이블, 값), ...])
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape_label(value: str) -> str:
+    """Prometheus 레이블 값 이스케이프"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """레이블 딕셔너리를 {key="value",...} 형식으로 변환"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    """샘플 값 형식 (정수는 소수점 없이)"""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class _CounterChild:
+    """레이블 조합 하나의 카운터 값"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    """레이블 조합 하나의 게이지 값"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramChild:
+    """레이블 조합 하나의 히스토그램 (구간별 개수는 출력 시 누적)"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        # 마지막 칸은 +Inf 구간
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """레이블별 값을 가진 메트릭 (Counter/Gauge/Histogram 공통)"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        """
+        메트릭 생성 (MetricsRegistry를 통해 생성)
+
+        Args:
+            name: 메트릭 이름
+            help_text: 설명
+            labelnames: 레이블 이름 목록
+        """
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """
+        레이블 값에 해당하는 값 객체 반환 (자주 쓰는 조합은 미리 받아 두면 조회 비용 없음)
+
+        Args:
+            values: labelnames 순서의 레이블 값
+
+        Returns:
+            inc()/observe() 등을 가진 값 객체
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} 레이블 개수 불일치: {self.labelnames}")
+            key = tuple(str(value) for value in values)
+            child = self._children.get(key)
+            if child is None:
+                child = self._new_child()
+                self._children[key] = child
+        return child
+
+    def _label_dict(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """(샘플 이름, 레이블, 값) 목록"""
+        return [
+            (self.name, self._label_dict(values), child.value)
+            for values, child in list(self._children.items())
+        ]
+
+
+class Counter(Metric):
+    """단조 증가 카운터"""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        """레이블 없는 카운터 증가"""
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    """증감 가능한 현재 값"""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+
+class Histogram(Metric):
+    """구간별 관측 횟수 히스토그램"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """레이블 없는 히스토그램에 관측값 기록"""
+        self._default.observe(value)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        samples = []
+        for values, child in list(self._children.items()):
+            labels = self._label_dict(values)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), list(child.counts)):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, child.sum))
+            samples.append((f"{self.name}_count", labels, child.count))
+        return samples
+
+
+class MetricsRegistry:
+    """메트릭과 수집기를 모아 Prometheus 텍스트 형식으로 출력"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[MetricFamily]]] = {}
+
+    def _get_or_create(self, cls: type, name: str, help_text: str, labelnames: Sequence[str], **kwargs: Any) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = cls(name, help_text, labelnames, **kwargs)
+            self._metrics[name] = metric
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"이미 다른 형식으로 등록된 메트릭: {name}")
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        """카운터 등록 (같은 이름이면 기존 메트릭 반환)"""
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """게이지 등록 (같은 이름이면 기존 메트릭 반환)"""
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        """히스토그램 등록 (같은 이름이면 기존 메트릭 반환)"""
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def register_collector(self, key: str, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """
+        출력 시점에 값을 읽는 수집기 등록 (같은 key면 교체)
+
+        Args:
+            key: 수집기 식별자
+            collector: (이름, 타입, 설명, [(레이블, 값), ...]) 목록을 반환하는 함수
+        """
+        self._collectors[key] = collector
+
+    def unregister_collector(self, key: str) -> None:
+        """수집기 등록 해제"""
+        self._collectors.pop(key, None)
+
+    def render(self) -> str:
+        """
+        Prometheus 텍스트 형식(0.0.4)으로 출력
+
+        Returns:
+            /metrics 응답 본문
+        """
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for key, collector in list(self._collectors.items()):
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.warning(f"메트릭 수집기 실패 ({key}): {str(e)}")
+                continue
+            for name, type_name, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {type_name}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    async def arender(self) -> str:
+        """render()의 비동기 버전 (수집기의 디스크 I/O가 이벤트 루프를 막지 않도록 스레드 풀에서 실행)"""
+        return await asyncio.to_thread(self.render)
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """프로세스 공용 메트릭 레지스트리 반환"""
+    return _registry
+
+
+def stats_families(prefix: str, help_prefix: str, stats: Dict[str, Any], counters: Sequence[str] = ()) -> List[MetricFamily]:
+    """
+    stats() 딕셔너리의 숫자 값을 메트릭 목록으로 변환
+
+    Args:
+        prefix: 메트릭 이름 접두사 (예: "tool_cache")
+        help_prefix: 설명 접두사
+        stats: stats() 결과
+        counters: 누적 값인 키 (이름에 _total을 붙이고 counter 타입으로 출력)
+
+    Returns:
+        수집기 반환 형식의 메트릭 목록
+    """
+    families = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if key in counters:
+            families.append((f"{prefix}_{key}_total", "counter", f"{help_prefix} {key}", [({}, value)]))
+        else:
+            families.append((f"{prefix}_{key}", "gauge", f"{help_prefix} {key}", [({}, value)]))
+    return families
+
+
+# span 종료 시 기록하는 지연 시간/사용량 메트릭
+LLM_CALL_SECONDS = _registry.histogram("llm_call_duration_seconds", "LLM 호출 소요 시간", ("model",))
+LLM_TOKENS = _registry.counter("llm_tokens_total", "LLM 토큰 사용량", ("model", "direction"))
+MCP_CALL_SECONDS = _registry.histogram("mcp_call_duration_seconds", "실제 MCP 서버 호출 소요 시간", ("tool", "status"))
+TOOL_CALL_SECONDS = _registry.histogram("tool_call_duration_seconds", "LLM이 요청한 도구 호출 소요 시간", ("tool", "status"))
+GRAPH_STEP_SECONDS = _registry.histogram("graph_step_duration_seconds", "LangGraph 노드 실행 소요 시간", ("node",))
+ADMISSION_WAIT_SECONDS = _registry.histogram("chat_admission_wait_seconds", "실행 슬롯 대기 시간")
+SESSION_WAIT_SECONDS = _registry.histogram("chat_session_wait_seconds", "같은 세션의 이전 요청 대기 시간")
+CHAT_TURN_SECONDS = _registry.histogram("chat_turn_duration_seconds", "턴 처리 소요 시간", ("outcome",))
+SSE_STREAM_SECONDS = _registry.histogram(
+    "sse_stream_duration_seconds", "SSE 스트림 지속 시간",
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 180.0)
+)
+SSE_EVENTS = _registry.counter("sse_events_total", "전송한 SSE 이벤트 수")
+SSE_SERIALIZE_SECONDS = _registry.counter("sse_serialize_seconds_total", "SSE 이벤트 직렬화에 쓴 시간")
+
+
+def _status(span: Span) -> str:
+    if span.attributes.get("cancelled"):
+        return "cancelled"
+    return "error" if span.status_code == STATUS_ERROR else "ok"
+
+
+def record_span(span: Span) -> None:
+    """종료된 span에서 지연 시간/사용량 메트릭 기록"""
+    name = span.name
+    seconds = span.duration_ms / 1000
+    attributes = span.attributes
+
+    if name == "llm.chat":
+        model = attributes.get("gen_ai.request.model") or "unknown"
+        LLM_CALL_SECONDS.labels(model).observe(seconds)
+        input_tokens = attributes.get("gen_ai.usage.input_tokens")
+        output_tokens = attributes.get("gen_ai.usage.output_tokens")
+        if input_tokens:
+            LLM_TOKENS.labels(model, "input").inc(input_tokens)
+        if output_tokens:
+            LLM_TOKENS.labels(model, "output").inc(output_tokens)
+    elif name.startswith("mcp."):
+        MCP_CALL_SECONDS.labels(attributes.get("tool.name", name[4:]), _status(span)).observe(seconds)
+    elif name.startswith("tool."):
+        TOOL_CALL_SECONDS.labels(attributes.get("tool.name", name[5:]), _status(span)).observe(seconds)
+    elif name.startswith("graph.step."):
+        GRAPH_STEP_SECONDS.labels(attributes.get("langgraph.node", name[11:])).observe(seconds)
+    elif name == "admission.wait":
+        ADMISSION_WAIT_SECONDS.observe(seconds)
+    elif name == "session.wait":
+        SESSION_WAIT_SECONDS.observe(seconds)
+    elif name == "chat.turn":
+        CHAT_TURN_SECONDS.labels(attributes.get("chat.outcome") or _status(span)).observe(seconds)
+    elif name == "sse.stream":
+        SSE_STREAM_SECONDS.observe(seconds)
+        SSE_EVENTS.inc(attributes.get("sse.events", 0))
+        SSE_SERIALIZE_SECONDS.inc(attributes.get("sse.serialize_ms", 0) / 1000)
+
+
+add_span_listener(record_span)
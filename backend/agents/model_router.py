@@ -0,0 +1,220 @@
+"""
+LLM 호출 단위 모델 라우팅
+- 턴(마지막 사용자 메시지)을 키워드/길이 휴리스틱으로 분류하여 빠른 모델(fast)과 강한 모델(strong) 중 선택
+  · 인사/감사 등 잡담, 직전 대화를 잇는 짧은 후속 질문("그거 더 싼 거 있어?") → fast
+  · 비교/추천/리뷰/예산 조건 등 복합 질문, 긴 질문 → strong (모든 단계)
+  · 그 외 일반 상품 검색 → 도구 호출 인자를 만드는 첫 단계는 MODEL_ROUTING_TOOL_CALL_TIER, 결과 정리 단계는 strong
+- 분류는 LLM 입력 메시지만 보고 결정하므로 별도 상태를 저장하지 않음
+- 라우팅 결정 수, 티어/단계별 호출 시간, 같은 단계 strong 평균 대비 절약한 추정 시간을 메트릭으로 기록
+"""
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from .metrics import get_registry
+from .prompts.shopping_prompts import USER_SEARCH_MESSAGE_PREFIX
+from .tracing import current_span
+
+logger = logging.getLogger(__name__)
+
+TIER_FAST = "fast"
+TIER_STRONG = "strong"
+
+# 도구 호출 인자를 만드는 단계(마지막 메시지가 사용자 메시지) / 도구 결과를 받아 응답하는 단계
+STEP_TOOL_CALL = "tool_call"
+STEP_ANSWER = "answer"
+
+# 비교/추천/조건 검색 등 강한 모델이 필요한 질문 키워드
+_COMPLEX_RE = re.compile(
+    r"비교|추천|리뷰|후기|장단점|차이|대비|예산|이하|이내|사양|스펙|골라|어떤\s*게|뭐가\s*(더\s*)?(나|좋)|\bvs\b",
+    re.IGNORECASE
+)
+# 인사/감사/맞장구 등 검색이 필요 없는 잡담 (메시지 전체가 잡담일 때만, "하이마트"/"hisense" 등 상품명 제외)
+_SMALLTALK_WORD = (
+    r"(?:(?:안녕|반가|고마|감사|땡큐|수고|잘\s*가|알겠)[가-힣]*|하이|바이(?:바이)?|ㅎㅇ|ㅇㅋ|ㅇㅇ|오케이|좋아요?|네|넵|응|"
+    r"hi|hello|hey|thanks?|thank\s*you|ok(?:ay)?|bye)"
+)
+_SMALLTALK_RE = re.compile(
+    rf"^\s*{_SMALLTALK_WORD}(?:[\s,!.~?ㅎㅋ^]+{_SMALLTALK_WORD})*[\s,!.~?ㅎㅋ^]*$",
+    re.IGNORECASE
+)
+# 직전 대화의 상품을 가리키는 후속 질문
+_FOLLOW_UP_RE = re.compile(r"그거|그것|이거|이것|저거|저것|그\s*중|거기|방금|아까|더\s*(싼|저렴)|다른\s*(거|곳|데|색|용량)")
+
+MODEL_ROUTING_DECISIONS = get_registry().counter(
+    "model_routing_decisions_total", "모델 라우팅 결정 수", ("tier", "step", "reason")
+)
+MODEL_ROUTING_CALL_SECONDS = get_registry().histogram(
+    "model_routing_call_duration_seconds", "라우팅된 LLM 호출 소요 시간", ("tier", "step")
+)
+MODEL_ROUTING_SAVED_SECONDS = get_registry().counter(
+    "model_routing_estimated_saved_seconds_total", "fast 모델 사용으로 절약한 추정 시간 (같은 단계 strong 평균 대비)"
+)
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """LLM 호출 1회의 라우팅 결정"""
+    tier: str
+    step: str
+    reason: str
+
+
+def _text(message: BaseMessage) -> str:
+    """메시지 본문 문자열"""
+    content = message.content
+    if isinstance(content, list):
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return str(content)
+
+
+def classify_turn(messages: Sequence[BaseMessage], simple_max_chars: int = 40) -> tuple:
+    """
+    턴 분류 (마지막 사용자 메시지 기준)
+
+    Args:
+        messages: LLM 입력 메시지 목록
+        simple_max_chars: fast 모델로 처리할 수 있는 최대 질문 길이
+
+    Returns:
+        (티어, 분류 이유)
+    """
+    last_human = None
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            last_human = index
+            break
+    if last_human is None:
+        return TIER_STRONG, "no_user_message"
+
+    # 채팅 요청의 머리말을 제외한 사용자 질문만 분류
+    query = _text(messages[last_human]).strip()
+    if query.startswith(USER_SEARCH_MESSAGE_PREFIX.strip()):
+        query = query[len(USER_SEARCH_MESSAGE_PREFIX.strip()):].strip()
+    if _COMPLEX_RE.search(query):
+        return TIER_STRONG, "complex"
+    if len(query) > simple_max_chars:
+        return TIER_STRONG, "long_message"
+    if _SMALLTALK_RE.search(query):
+        return TIER_FAST, "smalltalk"
+    has_history = any(isinstance(message, AIMessage) for message in messages[:last_human])
+    if has_history and _FOLLOW_UP_RE.search(query):
+        return TIER_FAST, "follow_up"
+    return TIER_STRONG, "search"
+
+
+class ModelRouter(Runnable):
+    """
+    호출마다 fast/strong 모델을 선택하는 채팅 모델 래퍼 (create_react_agent의 model로 사용)
+
+    선택한 모델을 같은 config로 호출하므로 토큰 스트리밍/트레이싱 콜백은 실제 모델 호출에 그대로 전달됩니다.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, Any],
+        tool_call_tier: str = TIER_FAST,
+        simple_max_chars: int = 40,
+        stats: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            models: 티어별 모델 ({"fast": ..., "strong": ...})
+            tool_call_tier: 일반 검색 턴에서 도구 호출 인자를 만드는 단계에 사용할 티어
+            simple_max_chars: fast 모델로 처리할 수 있는 최대 질문 길이
+            stats: 통계 (bind_tools()로 만든 라우터와 공유)
+        """
+        self.models = models
+        self.tool_call_tier = tool_call_tier if tool_call_tier in models else TIER_STRONG
+        self.simple_max_chars = simple_max_chars
+        self._stats = stats if stats is not None else {
+            "calls": {TIER_FAST: 0, TIER_STRONG: 0},
+            # 단계별 strong 모델 평균 호출 시간(초, 지수 이동 평균)
+            "strong_avg_seconds": {},
+            "estimated_saved_seconds": 0.0
+        }
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ModelRouter":
+        """티어별 모델에 도구를 바인딩한 라우터 반환"""
+        return ModelRouter(
+            {tier: model.bind_tools(tools, **kwargs) for tier, model in self.models.items()},
+            tool_call_tier=self.tool_call_tier,
+            simple_max_chars=self.simple_max_chars,
+            stats=self._stats
+        )
+
+    def route(self, messages: Sequence[BaseMessage]) -> RouteDecision:
+        """
+        LLM 호출 1회의 티어 결정
+
+        Args:
+            messages: LLM 입력 메시지 목록
+
+        Returns:
+            라우팅 결정
+        """
+        step = STEP_TOOL_CALL if messages and isinstance(messages[-1], HumanMessage) else STEP_ANSWER
+        tier, reason = classify_turn(messages, self.simple_max_chars)
+        if tier == TIER_STRONG and reason == "search" and step == STEP_TOOL_CALL:
+            tier, reason = self.tool_call_tier, "tool_call_step"
+        if tier not in self.models:
+            tier = TIER_STRONG
+        return RouteDecision(tier=tier, step=step, reason=reason)
+
+    def _messages(self, input: Any) -> List[BaseMessage]:
+        """프롬프트 단계 출력(메시지 목록 또는 PromptValue)을 메시지 목록으로 변환"""
+        if hasattr(input, "to_messages"):
+            return input.to_messages()
+        return list(input) if isinstance(input, (list, tuple)) else []
+
+    def _record(self, decision: RouteDecision, seconds: float) -> None:
+        """라우팅 결정과 호출 시간 기록"""
+        MODEL_ROUTING_DECISIONS.labels(decision.tier, decision.step, decision.reason).inc()
+        MODEL_ROUTING_CALL_SECONDS.labels(decision.tier, decision.step).observe(seconds)
+        self._stats["calls"][decision.tier] = self._stats["calls"].get(decision.tier, 0) + 1
+
+        averages = self._stats["strong_avg_seconds"]
+        if decision.tier == TIER_STRONG:
+            previous = averages.get(decision.step)
+            averages[decision.step] = seconds if previous is None else previous * 0.8 + seconds * 0.2
+        elif decision.step in averages:
+            saved = max(averages[decision.step] - seconds, 0.0)
+            self._stats["estimated_saved_seconds"] += saved
+            MODEL_ROUTING_SAVED_SECONDS.inc(saved)
+
+        span = current_span()
+        if span is not None:
+            span.set_attribute("model.tier", decision.tier)
+            span.set_attribute("model.route_reason", decision.reason)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        decision = self.route(self._messages(input))
+        started = time.perf_counter()
+        result = self.models[decision.tier].invoke(input, config, **kwargs)
+        self._record(decision, time.perf_counter() - started)
+        return result
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        decision = self.route(self._messages(input))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"모델 라우팅: {decision}")
+        started = time.perf_counter()
+        result = await self.models[decision.tier].ainvoke(input, config, **kwargs)
+        self._record(decision, time.perf_counter() - started)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """티어별 호출 수와 절약한 추정 시간"""
+        calls = self._stats["calls"]
+        total = sum(calls.values())
+        return {
+            "fast_calls": calls.get(TIER_FAST, 0),
+            "strong_calls": calls.get(TIER_STRONG, 0),
+            "fast_ratio": round(calls.get(TIER_FAST, 0) / total, 3) if total else 0.0,
+            "estimated_saved_seconds": round(self._stats["estimated_saved_seconds"], 3)
+        }
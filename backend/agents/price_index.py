@@ -0,0 +1,277 @@
+"""
+관측 가격 인덱스
+Agent가 본 상품 제안(상품, 판매처, 가격, URL, 관측 시각)을 로컬 SQLite에 기록하고
+정규화된 상품명으로 최근 최저가를 빠르게 조회
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..schemas.chat import Product
+from .cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    product_key TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    product_name TEXT NOT NULL,
+    store TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    image_url TEXT,
+    observed_at REAL NOT NULL,
+    PRIMARY KEY (product_key, store, url)
+);
+CREATE INDEX IF NOT EXISTS idx_offers_name_store ON offers (name_key, store);
+CREATE INDEX IF NOT EXISTS idx_offers_observed_at ON offers (observed_at);
+"""
+
+# 가격 질의 판별 키워드
+_PRICE_INTENT_RE = re.compile(r"최저가|최저\s*가격|가격|얼마|싸게|저렴")
+# 본품 검색 결과에 섞이는 액세서리/부속품 키워드 (검색어에 없으면 다른 상품으로 간주)
+_ACCESSORY_RE = re.compile(
+    r"케이스|커버|필름|보호|충전기|케이블|어댑터|젠더|거치대|스트랩|파우치|스킨|홀더|리필|"
+    r"case|cover|film|charger|cable|adapter|strap|pouch"
+)
+
+# 판매처별 최저가 (bare column은 MIN(price) 행의 값을 사용)
+_LOOKUP_SQL = """
+SELECT product_name, store, MIN(price) AS price, url, image_url, observed_at
+FROM offers
+WHERE (product_key = :key OR name_key = :key) AND observed_at >= :since
+GROUP BY store
+ORDER BY price
+LIMIT :limit
+"""
+
+
+def is_price_query(query: str) -> bool:
+    """
+    가격 질의 여부 판별
+
+    Args:
+        query: 사용자 검색어
+
+    Returns:
+        "최저가"/"가격" 등 가격을 묻는 질의이면 True
+    """
+    return bool(_PRICE_INTENT_RE.search(query))
+
+
+def matches_query(query: str, product_name: str) -> bool:
+    """
+    상품명이 검색어의 상품인지 판별 (가격 인덱스에 검색어 키로 기록할지 결정)
+
+    정규화된 상품명에 정규화된 검색어가 포함되고, 검색어에 없는 액세서리 키워드가 없어야 합니다.
+
+    Args:
+        query: 사용자 검색어
+        product_name: 관측한 상품명
+
+    Returns:
+        같은 상품이면 True
+    """
+    query_key = normalize_query(query)
+    name_key = normalize_query(product_name)
+    if not query_key or query_key not in name_key:
+        return False
+    return not _ACCESSORY_RE.search(name_key.replace(query_key, " "))
+
+
+def format_price_index_answer(offers: List[Dict[str, Any]]) -> str:
+    """
+    가격 인덱스 조회 결과를 시스템 프롬프트의 TOP 3 응답 형식으로 변환
+
+    Args:
+        offers: PriceIndex.lookup() 결과
+
+    Returns:
+        사용자에게 전달할 답변 (마크다운)
+    """
+    ranks = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
+    lines = [f"🏆 최저가 TOP {len(offers)}", ""]
+    for rank, offer in zip(ranks, offers):
+        lines.append(f"{rank} {offer['name']} - {offer['price']:,}원")
+        lines.append(f"   📍 판매처: {offer['store']}")
+        if offer.get("url"):
+            lines.append(f"   🔗 구매링크: {offer['url']}")
+        lines.append("")
+
+    oldest = min(offer["observed_at"] for offer in offers)
+    lines.append(
+        f"※ {datetime.fromtimestamp(oldest).strftime('%Y-%m-%d %H:%M')} 이후 수집된 가격 기준이며, "
+        "실제 판매 가격은 변동될 수 있습니다."
+    )
+    return "\n".join(lines)
+
+
+class PriceIndex:
+    """
+    관측 가격 저장소
+
+    - (정규화된 검색어, 판매처, URL)마다 가장 최근 관측값만 유지
+    - 검색어 키와 상품명 키 모두로 조회 가능
+    - WAL 모드로 여러 워커 프로세스가 같은 파일을 공유 가능
+    """
+
+    def __init__(
+        self,
+        path: str = "./data/price_index.db",
+        retention_seconds: float = 7 * 24 * 3600,
+        prune_interval_seconds: float = 3600.0
+    ):
+        """
+        가격 인덱스 초기화
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로 (":memory:" 가능)
+            retention_seconds: 관측 후 이 시간이 지난 가격은 prune 시 삭제
+            prune_interval_seconds: 기록 시 자동 prune 주기(초), 0이면 비활성화
+        """
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self.prune_interval_seconds = prune_interval_seconds
+        self._last_prune = time.monotonic()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, query: str, products: Iterable[Product], observed_at: Optional[float] = None) -> int:
+        """
+        관측한 상품 제안 기록
+
+        Args:
+            query: 상품을 찾은 사용자 검색어
+            products: 관측한 상품 목록
+            observed_at: 관측 시각 (생략 시 현재 시각)
+
+        Returns:
+            기록한 행 수
+        """
+        product_key = normalize_query(query)
+        observed_at = time.time() if observed_at is None else observed_at
+        rows = [
+            (
+                product_key,
+                normalize_query(product.name),
+                product.name,
+                product.store,
+                product.price,
+                product.url or "",
+                product.image_url,
+                observed_at
+            )
+            for product in products
+        ]
+        if not product_key or not rows:
+            return 0
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO offers VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if (
+            self.prune_interval_seconds
+            and time.monotonic() - self._last_prune >= self.prune_interval_seconds
+        ):
+            self._last_prune = time.monotonic()
+            self.prune()
+        return len(rows)
+
+    def lookup(self, query: str, max_age_seconds: float, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        최근 관측된 판매처별 최저가 조회
+
+        Args:
+            query: 사용자 검색어 또는 상품명
+            max_age_seconds: 이 시간 안에 관측된 가격만 사용
+            limit: 최대 반환 개수
+
+        Returns:
+            가격 오름차순 상품 목록 (Product 필드 + observed_at)
+        """
+        key = normalize_query(query)
+        with self._lock:
+            rows = self._conn.execute(
+                _LOOKUP_SQL,
+                {"key": key, "since": time.time() - max_age_seconds, "limit": limit}
+            ).fetchall()
+
+        if rows:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return [
+            {
+                "name": row["product_name"],
+                "price": row["price"],
+                "store": row["store"],
+                "url": row["url"],
+                "image_url": row["image_url"],
+                "observed_at": row["observed_at"]
+            }
+            for row in rows
+        ]
+
+    def prune(self, retention_seconds: Optional[float] = None) -> int:
+        """
+        보존 기간이 지난 관측값 삭제
+
+        Args:
+            retention_seconds: 보존 기간 (생략 시 초기화 값)
+
+        Returns:
+            삭제한 행 수
+        """
+        retention = self.retention_seconds if retention_seconds is None else retention_seconds
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM offers WHERE observed_at < ?", (time.time() - retention,)
+            )
+        if cursor.rowcount:
+            logger.info(f"오래된 가격 관측값 {cursor.rowcount}건 삭제")
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """인덱스 통계 반환"""
+        with self._lock:
+            offers, products = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT product_key) FROM offers"
+            ).fetchone()
+        return {
+            "offers": offers,
+            "products": products,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def close(self) -> None:
+        """데이터베이스 연결 닫기"""
+        with self._lock:
+            self._conn.close()
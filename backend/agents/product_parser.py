@@ -0,0 +1,245 @@
+"""
+상품 정보 추출
+Agent 최종 답변(시스템 프롬프트의 TOP 3 형식)과 MCP 검색 결과에서 구조화된 Product 목록을 결정적으로 파싱
+"""
+import json
+import re
+from typing import Any, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from pydantic import ValidationError
+
+from ..schemas.chat import Product
+
+# 가격 표기 (예: 1,200,000원 / 1200000 원)
+_PRICE_RE = re.compile(r"(\d{1,3}(?:,\d{3})+|\d{4,})\s*원")
+_URL_RE = re.compile(r"https?://[^\s)\]>\"']+")
+# 목록 항목 시작 (1️⃣ / 1. / 1) / 들여쓰지 않은 - * •)
+_ITEM_START_RE = re.compile(r"^(?:\s*(?:\d️?⃣|\d+[.)])|[-*•])\s+")
+_STORE_RE = re.compile(r"(?:판매처|쇼핑몰|판매자)\s*[:：]\s*(.+)")
+_IMAGE_RE = re.compile(r"(?:이미지)\s*[:：]\s*(https?://\S+)")
+_MARKDOWN_RE = re.compile(r"[*_`#\[\]]")
+_SPACES_RE = re.compile(r"\s{2,}")
+# 상품명과 가격 사이 구분자
+_NAME_PRICE_SPLIT_RE = re.compile(r"\s*[-–—:|]\s*(?=[\d,]+\s*원)")
+
+# 쇼핑몰 도메인 → 판매처 이름
+STORE_DOMAINS = {
+    "coupang.com": "쿠팡",
+    "shopping.naver.com": "네이버쇼핑",
+    "smartstore.naver.com": "네이버 스마트스토어",
+    "11st.co.kr": "11번가",
+    "gmarket.co.kr": "G마켓",
+    "auction.co.kr": "옥션",
+    "ssg.com": "SSG닷컴",
+    "lotteon.com": "롯데ON",
+    "danawa.com": "다나와",
+    "apple.com": "애플스토어",
+    "samsung.com": "삼성닷컴"
+}
+
+# 상품으로 인정할 최소 가격(원)
+MIN_PRICE = 100
+
+
+def parse_price(text: str) -> Optional[int]:
+    """
+    텍스트에서 첫 번째 원화 가격 추출
+
+    Args:
+        text: 가격이 포함된 텍스트
+
+    Returns:
+        가격(원) 또는 None
+    """
+    match = _PRICE_RE.search(text)
+    if match is None:
+        return None
+    price = int(match.group(1).replace(",", ""))
+    return price if price >= MIN_PRICE else None
+
+
+def store_from_url(url: str) -> Optional[str]:
+    """
+    URL 도메인으로 판매처 이름 추정
+
+    Args:
+        url: 상품 URL
+
+    Returns:
+        판매처 이름 (알 수 없는 도메인이면 None)
+    """
+    host = (urlparse(url).hostname or "").lower()
+    for domain, store in STORE_DOMAINS.items():
+        if host == domain or host.endswith(f".{domain}"):
+            return store
+    return None
+
+
+def _clean(text: str) -> str:
+    """마크다운 기호 및 중복/앞뒤 공백 제거"""
+    return _SPACES_RE.sub(" ", _MARKDOWN_RE.sub("", text)).strip()
+
+
+def _split_items(text: str) -> Iterator[List[str]]:
+    """답변을 목록 항목 단위로 분할 (가격이 있는 항목 줄에서 새 항목 시작)"""
+    block: List[str] = []
+    for line in text.splitlines():
+        if _ITEM_START_RE.match(line) and _PRICE_RE.search(line):
+            if block:
+                yield block
+            block = [line]
+        elif block:
+            block.append(line)
+    if block:
+        yield block
+
+
+def _product_from_block(block: List[str]) -> Optional[Product]:
+    """목록 항목 하나에서 상품 정보 추출"""
+    head = _ITEM_START_RE.sub("", block[0], count=1)
+    price = parse_price(head)
+    if price is None:
+        return None
+
+    name = _clean(_PRICE_RE.sub("", _NAME_PRICE_SPLIT_RE.split(head, maxsplit=1)[0]))
+    if not name:
+        return None
+
+    body = "\n".join(block)
+    url_match = _URL_RE.search(body)
+    url = url_match.group(0).rstrip(".,") if url_match else ""
+
+    store = None
+    image_url = None
+    for line in block[1:]:
+        store_match = _STORE_RE.search(line)
+        if store_match and store is None:
+            store = _clean(store_match.group(1))
+        image_match = _IMAGE_RE.search(line)
+        if image_match and image_url is None:
+            image_url = image_match.group(1)
+
+    if store is None:
+        store = store_from_url(url) if url else None
+    if store is None and not url:
+        # 판매처도 링크도 없는 항목은 상품이 아닌 부가 설명(배송비 등)으로 간주
+        return None
+    store = store or "알 수 없음"
+
+    return Product(name=name, price=price, store=store, url=url, image_url=image_url)
+
+
+def _dedupe(products: List[Product]) -> List[Product]:
+    """동일 상품(이름, 판매처, 가격) 중복 제거 (순서 유지)"""
+    seen = set()
+    unique = []
+    for product in products:
+        key = (product.name, product.store, product.price)
+        if key not in seen:
+            seen.add(key)
+            unique.append(product)
+    return unique
+
+
+def extract_products_from_answer(text: str) -> List[Product]:
+    """
+    Agent 최종 답변에서 추천 상품 목록 추출
+
+    시스템 프롬프트의 응답 형식("1️⃣ [상품명] - 1,200,000원" 다음 줄에 판매처/구매링크)을
+    기준으로 파싱합니다.
+
+    Args:
+        text: Agent 최종 답변 (마크다운)
+
+    Returns:
+        추출된 상품 목록 (답변에 나온 순서)
+    """
+    products = []
+    for block in _split_items(text or ""):
+        product = _product_from_block(block)
+        if product is not None:
+            products.append(product)
+    return _dedupe(products)
+
+
+def _iter_result_dicts(value: Any) -> Iterator[dict]:
+    """중첩된 JSON 구조에서 url을 가진 검색 결과 항목 순회"""
+    if isinstance(value, dict):
+        if isinstance(value.get("url"), str):
+            yield value
+        for item in value.values():
+            yield from _iter_result_dicts(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_result_dicts(item)
+
+
+def _parsed_offers(items: List[Any]) -> List[Product]:
+    """이미 파싱된 상품 딕셔너리 목록을 Product로 변환 (형식이 맞지 않는 항목은 건너뜀)"""
+    offers = []
+    for item in items:
+        try:
+            offers.append(Product.model_validate(item))
+        except ValidationError:
+            continue
+    return offers
+
+
+def extract_offers_from_tool_output(output: str) -> List[Product]:
+    """
+    MCP 검색 도구 결과(JSON)에서 쇼핑몰 상품 제안 추출
+
+    알려진 쇼핑몰 도메인의 결과 중 제목/본문에 가격이 있는 항목만 사용합니다.
+    search_all_malls 결과처럼 파싱된 상품 목록(offers)이 있으면 그 목록을 그대로 사용합니다
+    (쇼핑몰별 results 본문은 잘려 있어 가격이 빠질 수 있음).
+
+    Args:
+        output: 도구 결과 문자열
+
+    Returns:
+        추출된 상품 목록
+    """
+    try:
+        data = json.loads(output)
+    except (TypeError, ValueError):
+        return []
+
+    if isinstance(data, dict) and isinstance(data.get("offers"), list):
+        return _dedupe(_parsed_offers(data["offers"]))
+
+    offers = []
+    for result in _iter_result_dicts(data):
+        url = result["url"]
+        store = store_from_url(url)
+        if store is None:
+            continue
+
+        raw_title = str(result.get("title") or "")
+        price = parse_price(raw_title) or parse_price(str(result.get("text") or ""))
+        title = _clean(_PRICE_RE.sub("", raw_title))
+        if not title or price is None:
+            continue
+
+        image_url = result.get("image") if isinstance(result.get("image"), str) else None
+        offers.append(Product(name=title, price=price, store=store, url=url, image_url=image_url))
+    return _dedupe(offers)
+
+
+def choose_products(answer_products: List[Product], offers: List[Product]) -> List[Product]:
+    """
+    표시할 상품 목록 선택
+
+    최종 답변의 추천 상품을 우선 사용하고, 없으면 도구 결과의 상품 제안을 가격순으로 사용합니다.
+
+    Args:
+        answer_products: 최종 답변에서 추출한 상품 목록
+        offers: 도구 결과에서 추출한 상품 제안 목록
+
+    Returns:
+        상품 목록
+    """
+    if answer_products:
+        return answer_products
+    return sorted(_dedupe(offers), key=lambda offer: offer.price)
+
@@ -18,8 +18,9 @@ SHOPPING_SYSTEM_PROMPT = """
 - filesystem: 임시 데이터 저장 및 관리
 
 검색 전략:
-1. 먼저 "{상품명} 최저가" 키워드로 웹 검색
-2. 주요 쇼핑몰별 검색: "네이버쇼핑 {상품명}", "쿠팡 {상품명}", "11번가 {상품명}"
+1. search_all_malls 도구가 있으면 한 번만 호출하여 주요 쇼핑몰을 동시에 검색 (쇼핑몰별로 따로 검색하지 않음)
+2. search_all_malls 도구가 없으면 "{상품명} 최저가" 키워드로 웹 검색 후
+   주요 쇼핑몰별 검색: "네이버쇼핑 {상품명}", "쿠팡 {상품명}", "11번가 {상품명}"
 3. 브라우저로 상세 페이지 접근하여 정확한 가격 정보 수집
 4. **각 상품의 구매 링크 URL 수집**
 5. 가격 비교 및 최적 상품 선별
@@ -59,8 +60,8 @@ PRODUCT_SEARCH_TEMPLATE = """
 상품 검색 요청: {query}
 
 다음 단계로 진행해주세요:
-1. "{query} 최저가" 키워드로 웹 검색
-2. 주요 쇼핑몰에서 해당 상품 검색
+1. search_all_malls 도구로 아래 쇼핑몰을 한 번에 검색 (도구가 없으면 "{query} 최저가" 키워드로 웹 검색)
+2. 결과가 부족한 쇼핑몰만 추가로 검색
 3. 가격 정보 및 **상품 링크** 수집
 4. 최저가 상품 3개 추천 (구매링크 포함)
 
@@ -120,6 +121,13 @@ REVIEW_ANALYSIS_TEMPLATE = """
 🔗 분석 상품 구매링크: [URL]
 """
 
+# 채팅 요청을 Agent에 전달할 때 붙이는 사용자 메시지 머리말
+USER_SEARCH_MESSAGE_PREFIX = "다음 상품의 최저가를 찾아주세요: "
+
+def get_user_search_message(query: str) -> str:
+    """채팅 요청의 사용자 메시지 생성"""
+    return f"{USER_SEARCH_MESSAGE_PREFIX}{query}"
+
 def get_search_prompt(query: str) -> str:
     """상품 검색용 프롬프트 생성"""
     return PRODUCT_SEARCH_TEMPLATE.format(query=query)
@@ -137,4 +145,28 @@ def get_comparison_prompt(query: str, budget: int = None) -> str:
 
 def get_review_analysis_prompt(query: str) -> str:
     """리뷰 분석용 프롬프트 생성"""
-    return REVIEW_ANALYSIS_TEMPLATE.format(query=query) 
\ No newline at end of file
+    return REVIEW_ANALYSIS_TEMPLATE.format(query=query) 
+
+
+CONTEXT_SUMMARY_PROMPT = """
+다음은 최저가 쇼핑 상담 대화의 이전 부분입니다.
+이후 대화에서 참고할 수 있도록 핵심 정보만 한국어로 간결하게 요약해주세요.
+
+반드시 유지할 정보:
+- 사용자가 찾은 상품명과 조건 (모델, 용량, 색상, 예산 등)
+- 이미 확인한 주요 가격, 판매처, 구매링크
+- 사용자의 선호와 결정 사항
+
+기존 요약:
+{previous_summary}
+
+새로 요약할 대화:
+{conversation}
+"""
+
+def get_context_summary_prompt(previous_summary: str, conversation: str) -> str:
+    """대화 요약용 프롬프트 생성"""
+    return CONTEXT_SUMMARY_PROMPT.format(
+        previous_summary=previous_summary or "없음",
+        conversation=conversation
+    )
@@ -0,0 +1,446 @@
+"""
+멀티 워커 공유 상태 저장소
+같은 호스트의 uvicorn/gunicorn 워커 프로세스들이 캐시, 세션 실행 권한(lease), 세션별 요청 수를
+공유하도록 로컬 SQLite 파일(WAL)에 보관 (외부 서비스 없이 동작하는 기본 백엔드)
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from .config.agent_config import SHARED_STATE_BACKEND, SHARED_STATE_BUSY_TIMEOUT_MS, SHARED_STATE_PATH
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value_type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_kv_expires_at ON kv (namespace, expires_at);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (name, owner)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_counters_expires_at ON counters (expires_at);
+"""
+
+# 최상위 튜플 값 표시 (msgpack 직렬화는 튜플을 리스트로 바꾸므로 별도 표시 후 복원)
+_TUPLE_PREFIX = "tuple:"
+
+
+class SqliteSharedStore:
+    """
+    SQLite 공유 상태 저장소
+
+    - kv: 네임스페이스별 TTL 값 저장 (워커 간 캐시 공유)
+    - leases: 이름별 최대 보유자 수가 있는 만료 시간 있는 권한 (세션 실행 권한, 세션별 요청 수 제한)
+    - counters: 단조 증가 카운터 (세션별 최신 요청 번호, 마지막 증가 후 유효 시간이 지나면 삭제)
+
+    워커 프로세스마다 자체 연결을 사용하며, fork 후 상속된 연결은 쓰지 않고 새로 엽니다.
+    이벤트 루프에서는 a로 시작하는 비동기 메서드를 사용합니다 (SQLite 호출을 스레드에서 실행).
+    """
+
+    def __init__(self, path: str = "./data/shared_state.db", busy_timeout_ms: int = SHARED_STATE_BUSY_TIMEOUT_MS):
+        """
+        공유 저장소 초기화
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+            busy_timeout_ms: 다른 워커의 쓰기 잠금을 기다리는 최대 시간(ms)
+        """
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.serde = JsonPlusSerializer()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """현재 프로세스의 연결 반환 (fork된 워커에서는 새로 연결)"""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _dumps(self, value: Any) -> Tuple[str, bytes]:
+        if isinstance(value, tuple):
+            value_type, blob = self.serde.dumps_typed(list(value))
+            return _TUPLE_PREFIX + value_type, blob
+        return self.serde.dumps_typed(value)
+
+    def _loads(self, value_type: str, blob: bytes) -> Any:
+        if value_type.startswith(_TUPLE_PREFIX):
+            return tuple(self.serde.loads_typed((value_type[len(_TUPLE_PREFIX):], blob)))
+        return self.serde.loads_typed((value_type, blob))
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        값 조회
+
+        Args:
+            namespace: 네임스페이스
+            key: 키
+
+        Returns:
+            저장된 값 (없거나 만료되었으면 None)
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value_type, value FROM kv WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, time.time())
+            ).fetchone()
+        return self._loads(*row) if row else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: float, max_entries: Optional[int] = None) -> int:
+        """
+        값 저장
+
+        Args:
+            namespace: 네임스페이스
+            key: 키
+            value: 저장할 값 (LangGraph 직렬화 가능 값)
+            ttl_seconds: 유효 시간(초)
+            max_entries: 네임스페이스 최대 항목 수 (초과 시 만료가 가장 이른 항목부터 삭제)
+
+        Returns:
+            크기 제한으로 삭제된 항목 수
+        """
+        value_type, blob = self._dumps(value)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO kv VALUES (?, ?, ?, ?, ?)",
+                    (namespace, key, value_type, blob, now + ttl_seconds)
+                )
+                evicted = 0
+                if max_entries is not None:
+                    conn.execute("DELETE FROM kv WHERE namespace = ? AND expires_at <= ?", (namespace, now))
+                    evicted = conn.execute(
+                        "DELETE FROM kv WHERE rowid IN ("
+                        "SELECT rowid FROM kv WHERE namespace = ? ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                        (namespace, max_entries)
+                    ).rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return evicted
+
+    def delete(self, namespace: str, key: str) -> None:
+        """값 삭제"""
+        with self._lock:
+            self._connection().execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def clear(self, namespace: str) -> None:
+        """네임스페이스 전체 삭제"""
+        with self._lock:
+            self._connection().execute("DELETE FROM kv WHERE namespace = ?", (namespace,))
+
+    def count(self, namespace: str) -> int:
+        """네임스페이스의 유효 항목 수"""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM kv WHERE namespace = ? AND expires_at > ?", (namespace, time.time())
+            ).fetchone()[0]
+
+    def try_acquire(self, name: str, owner: str, ttl_seconds: float, limit: int = 1) -> bool:
+        """
+        권한 획득 시도 (만료된 보유자는 정리 후 계산)
+
+        Args:
+            name: 권한 이름 (예: "session:{session_id}")
+            owner: 보유자 ID (이미 보유 중이면 만료 시간만 갱신)
+            ttl_seconds: 유효 시간(초)
+            limit: 동시에 보유할 수 있는 최대 보유자 수
+
+        Returns:
+            획득 여부
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            # 쓰기 잠금을 먼저 잡아 워커 간 보유자 수 계산과 기록을 원자적으로 처리
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM leases WHERE name = ? AND expires_at <= ?", (name, now))
+                holders = conn.execute(
+                    "SELECT COUNT(*), SUM(owner = ?) FROM leases WHERE name = ?", (owner, name)
+                ).fetchone()
+                acquired = bool(holders[1]) or holders[0] < limit
+                if acquired:
+                    conn.execute("INSERT OR REPLACE INTO leases VALUES (?, ?, ?)", (name, owner, now + ttl_seconds))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return acquired
+
+    def renew(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        보유 중인 권한의 만료 시간 연장
+
+        Returns:
+            아직 보유 중이었으면 True (만료되어 다른 보유자에게 넘어갔으면 False)
+        """
+        with self._lock:
+            return self._connection().execute(
+                "UPDATE leases SET expires_at = ? WHERE name = ? AND owner = ? AND expires_at > ?",
+                (time.time() + ttl_seconds, name, owner, time.time())
+            ).rowcount > 0
+
+    def release(self, name: str, owner: str) -> None:
+        """권한 반납 (보유하지 않았으면 무시)"""
+        with self._lock:
+            self._connection().execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def holders(self, name: str) -> int:
+        """권한의 유효 보유자 수"""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM leases WHERE name = ? AND expires_at > ?", (name, time.time())
+            ).fetchone()[0]
+
+    def incr(self, name: str, amount: int = 1, ttl_seconds: Optional[float] = None) -> int:
+        """
+        카운터 증가 후 값 반환 (만료된 카운터는 정리 후 새로 시작)
+
+        Args:
+            name: 카운터 이름
+            amount: 증가량
+            ttl_seconds: 마지막 증가 후 유효 시간(초), 생략 시 만료 없음
+
+        Returns:
+            증가 후 값
+        """
+        now = time.time()
+        expires_at = None if ttl_seconds is None else now + ttl_seconds
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "INSERT INTO counters VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value, expires_at = excluded.expires_at",
+                    (name, amount, expires_at)
+                )
+                value = conn.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()[0]
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return value
+
+    def read(self, name: str) -> int:
+        """카운터 값 조회 (없거나 만료되었으면 0)"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM counters WHERE name = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (name, time.time())
+            ).fetchone()
+        return row[0] if row else 0
+
+    def delete_counter(self, name: str) -> None:
+        """카운터 삭제"""
+        with self._lock:
+            self._connection().execute("DELETE FROM counters WHERE name = ?", (name,))
+
+    async def aget(self, namespace: str, key: str) -> Optional[Any]:
+        """get()의 비동기 버전"""
+        return await asyncio.to_thread(self.get, namespace, key)
+
+    async def aset(
+        self, namespace: str, key: str, value: Any, ttl_seconds: float, max_entries: Optional[int] = None
+    ) -> int:
+        """set()의 비동기 버전"""
+        return await asyncio.to_thread(self.set, namespace, key, value, ttl_seconds, max_entries)
+
+    async def atry_acquire(self, name: str, owner: str, ttl_seconds: float, limit: int = 1) -> bool:
+        """try_acquire()의 비동기 버전"""
+        return await asyncio.to_thread(self.try_acquire, name, owner, ttl_seconds, limit)
+
+    async def arenew(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """renew()의 비동기 버전"""
+        return await asyncio.to_thread(self.renew, name, owner, ttl_seconds)
+
+    async def arelease(self, name: str, owner: str) -> None:
+        """release()의 비동기 버전"""
+        await asyncio.to_thread(self.release, name, owner)
+
+    async def aincr(self, name: str, amount: int = 1, ttl_seconds: Optional[float] = None) -> int:
+        """incr()의 비동기 버전"""
+        return await asyncio.to_thread(self.incr, name, amount, ttl_seconds)
+
+    async def aread(self, name: str) -> int:
+        """read()의 비동기 버전"""
+        return await asyncio.to_thread(self.read, name)
+
+    async def adelete_counter(self, name: str) -> None:
+        """delete_counter()의 비동기 버전"""
+        await asyncio.to_thread(self.delete_counter, name)
+
+    def stats(self) -> Dict[str, Any]:
+        """저장 항목/권한 수 반환"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            entries = conn.execute("SELECT COUNT(*) FROM kv WHERE expires_at > ?", (now,)).fetchone()[0]
+            leases = conn.execute("SELECT COUNT(*) FROM leases WHERE expires_at > ?", (now,)).fetchone()[0]
+        return {"backend": "sqlite", "entries": entries, "leases": leases, "path": self.path}
+
+    def close(self) -> None:
+        """연결 종료"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class SharedTTLCache:
+    """
+    공유 저장소 기반 TTL 캐시 (TTLCache와 같은 인터페이스)
+
+    값은 모든 워커가 공유하고 히트/미스 통계는 워커별로 집계합니다.
+    """
+
+    def __init__(self, store: SqliteSharedStore, namespace: str, max_size: int = 256, ttl_seconds: float = 600.0):
+        """
+        공유 캐시 초기화
+
+        Args:
+            store: 공유 저장소
+            namespace: 저장소 네임스페이스 (캐시마다 다르게 지정)
+            max_size: 최대 저장 항목 수 (초과 시 만료가 가장 이른 항목부터 제거)
+            ttl_seconds: 항목 유효 시간(초)
+        """
+        self.store = store
+        self.namespace = namespace
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        """캐시 키를 저장소 문자열 키로 변환"""
+        if isinstance(key, str):
+            return key
+        return json.dumps(key, ensure_ascii=False, default=str)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되었으면 None)"""
+        value = self.store.get(self.namespace, self._key(key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """캐시 저장 (항목별 유효 시간 생략 시 기본값)"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.evictions += self.store.set(self.namespace, self._key(key), value, ttl, max_entries=self.max_size)
+
+    async def aget(self, key: Hashable) -> Optional[Any]:
+        """get()의 비동기 버전 (저장소 조회를 스레드에서 실행)"""
+        value = await self.store.aget(self.namespace, self._key(key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def aset(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """set()의 비동기 버전 (저장소 기록을 스레드에서 실행)"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.evictions += await self.store.aset(self.namespace, self._key(key), value, ttl, max_entries=self.max_size)
+
+    def invalidate(self, key: Hashable) -> None:
+        """캐시 항목 삭제"""
+        self.store.delete(self.namespace, self._key(key))
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        self.store.clear(self.namespace)
+
+    def __len__(self) -> int:
+        return self.store.count(self.namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 (히트/미스 카운터는 이 워커 기준, 크기는 공유 저장소 기준) 반환"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+            "shared": True
+        }
+
+
+_store: Optional[SqliteSharedStore] = None
+_store_lock = threading.Lock()
+
+
+def create_shared_store(backend: Optional[str] = None, path: Optional[str] = None) -> Optional[SqliteSharedStore]:
+    """
+    설정에 따른 공유 저장소 생성
+
+    Args:
+        backend: "none" | "sqlite" (생략 시 SHARED_STATE_BACKEND 환경변수)
+        path: SQLite 파일 경로 (생략 시 SHARED_STATE_PATH)
+
+    Returns:
+        공유 저장소 ("none"이면 None - 단일 워커 모드)
+    """
+    backend = (backend or SHARED_STATE_BACKEND).lower()
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        return SqliteSharedStore(path or SHARED_STATE_PATH)
+    raise ValueError(f"지원하지 않는 공유 상태 백엔드: {backend}")
+
+
+def get_shared_store() -> Optional[SqliteSharedStore]:
+    """프로세스 공용 공유 저장소 반환 (설정에 따라 최초 호출 시 생성, 단일 워커 모드면 None)"""
+    global _store
+    if _store is None and SHARED_STATE_BACKEND != "none":
+        with _store_lock:
+            if _store is None:
+                _store = create_shared_store()
+                logger.info(f"공유 상태 저장소 사용: {SHARED_STATE_BACKEND} ({SHARED_STATE_PATH})")
+    return _store
@@ -1,59 +1,309 @@
 """
 최저가 쇼핑 전문 React Agent
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import time
+import uuid
+from typing import Dict, Any, Optional, List, AsyncGenerator
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.errors import GraphRecursionError
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
+from .cache import TTLCache, normalize_query
+from .checkpointers import create_checkpointer
+from .context import CONTEXT_SUMMARY_TAG, ContextManager, ShoppingAgentState
+from .config.agent_config import (
+    QUERY_CACHE_ENABLED,
+    QUERY_CACHE_TTL_SECONDS,
+    QUERY_CACHE_MAX_SIZE,
+    MCP_TOOL_CACHE_ENABLED,
+    MCP_TOOL_CACHE_TTL_SECONDS,
+    MCP_TOOL_CACHE_MAX_SIZE,
+    CONTEXT_MANAGEMENT_ENABLED,
+    CONTEXT_MAX_RECENT_TURNS,
+    CONTEXT_OLD_TOOL_OUTPUT_CHARS,
+    CONTEXT_SUMMARY_ENABLED,
+    CONTEXT_SUMMARY_BATCH_TURNS,
+    AGENT_INIT_MAX_ATTEMPTS,
+    AGENT_INIT_BACKOFF_SECONDS,
+    AGENT_INIT_BACKOFF_MAX_SECONDS,
+    PRICE_INDEX_ENABLED,
+    PRICE_INDEX_PATH,
+    PRICE_INDEX_MAX_AGE_SECONDS,
+    PRICE_INDEX_MIN_OFFERS,
+    PRICE_INDEX_RETENTION_SECONDS,
+    MALL_SEARCH_ENABLED,
+    MALL_SEARCH_MALLS,
+    MALL_SEARCH_TOOL,
+    MALL_SEARCH_TIMEOUT_SECONDS,
+    MALL_SEARCH_MAX_RESULTS,
+    AGENT_TURN_DEADLINE_SECONDS,
+    AGENT_TOOL_TIMEOUT_SECONDS,
+    AGENT_RECURSION_LIMIT,
+    MODEL_ROUTING_ENABLED,
+    MODEL_STRONG_NAME,
+    MODEL_FAST_NAME,
+    MODEL_ROUTING_TOOL_CALL_TIER,
+    MODEL_ROUTING_SIMPLE_MAX_CHARS
+)
 from .config.mcp_config import get_mcp_config_with_api_keys
+from .mcp_adapters.cached_tools import ToolCallCache
+from .mcp_adapters.connection_monitor import ConnectionMonitor
+from .mcp_adapters.mall_search import MallFanoutSearch, find_search_tool
+from .mcp_adapters.tool_timeout import wrap_tools_with_timeout
+from .model_router import TIER_FAST, TIER_STRONG, ModelRouter
+from .price_index import PriceIndex, format_price_index_answer, is_price_query, matches_query
+from .shared_store import SharedTTLCache, SqliteSharedStore, get_shared_store
+from .sqlite_checkpointer import SqliteCheckpointSaver
+from .product_parser import choose_products, extract_offers_from_tool_output, extract_products_from_answer
 from .prompts.shopping_prompts import (
     SHOPPING_SYSTEM_PROMPT,
     get_search_prompt,
+    get_user_search_message,
     get_comparison_prompt,
     get_review_analysis_prompt
 )
+from .metrics import get_registry
+from .tracing import TracingCallbackHandler, current_span, get_tracer, trace_tools
 
 logger = logging.getLogger(__name__)
 
+# 응답 경로별 응답 수 (query_cache | price_index | graph | partial | error)
+AGENT_RESPONSES = get_registry().counter("agent_responses_total", "Agent 응답 수 (응답 경로별)", ("source",))
+
+# 재초기화 시 이전 MCP 클라이언트 종료를 기다리는 최대 시간(초)
+MCP_CLIENT_CLOSE_TIMEOUT_SECONDS = 5.0
+
+# create_react_agent가 남은 단계가 부족할 때 도구 호출 대신 반환하는 메시지
+STEP_LIMIT_MESSAGE = "Sorry, need more steps to process this request."
+
+# 턴이 중단된 이유별 안내 문구
+PARTIAL_ANSWER_NOTICES = {
+    "deadline": "⏱️ 제한 시간 안에 검색을 마치지 못해 지금까지 찾은 결과를 보여드립니다.",
+    "step_limit": "🔁 검색 단계가 최대 횟수에 도달하여 지금까지 찾은 결과를 보여드립니다."
+}
+
+
+def format_partial_answer(products: List[Dict[str, Any]], reason: str) -> str:
+    """
+    중단된 턴의 부분 답변 생성 (지금까지 찾은 상품 가격순)
+    
+    Args:
+        products: 지금까지 수집한 상품 딕셔너리 목록
+        reason: 중단 이유 ("deadline" | "step_limit")
+        
+    Returns:
+        사용자에게 전달할 답변 (마크다운)
+    """
+    lines = [PARTIAL_ANSWER_NOTICES.get(reason, PARTIAL_ANSWER_NOTICES["deadline"]), ""]
+    if not products:
+        lines.append("아직 확인된 상품 정보가 없습니다. 검색어를 더 구체적으로 입력하거나 잠시 후 다시 시도해주세요.")
+        return "\n".join(lines)
+    
+    ranks = ["1️⃣", "2️⃣", "3️⃣"]
+    for rank, product in zip(ranks, products):
+        lines.append(f"{rank} {product['name']} - {product['price']:,}원")
+        lines.append(f"   📍 판매처: {product['store']}")
+        if product.get("url"):
+            lines.append(f"   🔗 구매링크: {product['url']}")
+        lines.append("")
+    lines.append("※ 검색이 끝나지 않은 상태의 결과이므로 더 저렴한 판매처가 있을 수 있습니다.")
+    return "\n".join(lines)
+
 
 class ShoppingReactAgent:
     """최저가 쇼핑 전문 React Agent"""
     
-    def __init__(self, google_api_key: str, brave_api_key: str = None):
+    def __init__(
+        self,
+        google_api_key: str,
+        brave_api_key: str = None,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+        price_index: Optional[PriceIndex] = None,
+        model: Optional[BaseChatModel] = None,
+        store: Optional[SqliteSharedStore] = None,
+        fast_model: Optional[BaseChatModel] = None
+    ):
         """
         Agent 초기화
         
         Args:
             google_api_key: Google Gemini API 키
             brave_api_key: Brave Search API 키 (선택사항)
+            checkpointer: 대화 메모리 저장소 (생략 시 CHECKPOINTER_BACKEND 설정에 따라 생성)
+            price_index: 관측 가격 인덱스 (생략 시 PRICE_INDEX_* 설정에 따라 생성)
+            model: 사용할 채팅 모델 (생략 시 Gemini, 벤치마크에서는 스크립트 모델 주입)
+            store: 워커 간 공유 상태 저장소 (생략 시 SHARED_STATE_BACKEND 설정, 있으면 캐시를 워커 간 공유)
+            fast_model: 간단한 턴/단계에 사용할 빠른 모델 (생략 시 model을 주입하지 않았고
+                MODEL_ROUTING_ENABLED이면 MODEL_FAST_NAME으로 생성, 없으면 라우팅하지 않음)
         """
         self.google_api_key = google_api_key
         self.brave_api_key = brave_api_key
         
-        # LLM 모델 초기화
-        self.model = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash-exp",
-            google_api_key=google_api_key,
-            temperature=0.1
+        # LLM 모델 초기화 (강한 모델)
+        self.model = model or self._create_model(MODEL_STRONG_NAME)
+        
+        # 간단한 턴/단계용 빠른 모델 (있으면 LLM 호출마다 모델 선택)
+        if fast_model is None and model is None and MODEL_ROUTING_ENABLED:
+            fast_model = self._create_model(MODEL_FAST_NAME)
+        self.fast_model = fast_model
+        self.model_router = ModelRouter(
+            {TIER_FAST: fast_model, TIER_STRONG: self.model},
+            tool_call_tier=MODEL_ROUTING_TOOL_CALL_TIER,
+            simple_max_chars=MODEL_ROUTING_SIMPLE_MAX_CHARS
+        ) if fast_model is not None else None
+        
+        # 멀티턴 대화를 위한 메모리 초기화 (기본: 스레드 수/크기가 제한된 인메모리 저장소)
+        self.memory = checkpointer or create_checkpointer()
+        
+        # 멀티 워커 모드면 캐시를 공유 저장소에 보관
+        self.store = store or get_shared_store()
+        if self.store is not None and not isinstance(self.memory, SqliteCheckpointSaver):
+            logger.warning(
+                "대화 메모리가 프로세스 내 저장소라 워커 간에 공유되지 않습니다. "
+                "멀티 워커 모드에서는 CHECKPOINTER_BACKEND=sqlite로 설정하세요."
+            )
+        
+        # 정규화된 쿼리 기반 검색 결과 캐시 (첫 턴 쿼리에만 적용)
+        self.query_cache = self._create_cache(
+            "query_cache", QUERY_CACHE_MAX_SIZE, QUERY_CACHE_TTL_SECONDS
+        ) if QUERY_CACHE_ENABLED else None
+        
+        # MCP 도구 호출 결과 캐시 (세션 간 공유, 동일 호출 병합)
+        self.tool_cache = ToolCallCache(
+            cache=self._create_cache("tool_cache", MCP_TOOL_CACHE_MAX_SIZE, MCP_TOOL_CACHE_TTL_SECONDS)
+        ) if MCP_TOOL_CACHE_ENABLED else None
+        
+        # 관측 가격 인덱스 (최근 관측 가격으로 "최저가" 질의에 LLM/MCP 호출 없이 응답)
+        self.price_index = price_index or (
+            PriceIndex(PRICE_INDEX_PATH, retention_seconds=PRICE_INDEX_RETENTION_SECONDS)
+            if PRICE_INDEX_ENABLED else None
         )
         
-        # 멀티턴 대화를 위한 메모리 초기화
-        self.memory = MemorySaver()
+        # 턴별 프롬프트 크기 관리 (최근 턴 유지 + 오래된 턴 요약)
+        self.context_manager = ContextManager(
+            max_recent_turns=CONTEXT_MAX_RECENT_TURNS,
+            old_tool_output_chars=CONTEXT_OLD_TOOL_OUTPUT_CHARS,
+            # 누적 요약은 빠른 모델로 충분
+            summarizer_model=(self.fast_model or self.model) if CONTEXT_SUMMARY_ENABLED else None,
+            summary_batch_turns=CONTEXT_SUMMARY_BATCH_TURNS
+        ) if CONTEXT_MANAGEMENT_ENABLED else None
         
-        # MCP 클라이언트와 Agent는 지연 초기화
+        # MCP 도구 호출 연결 오류 감시 (연결 끊김 시 다음 요청에서 재초기화)
+        self.connection_monitor = ConnectionMonitor()
+        
+        # MCP 클라이언트와 Agent는 지연 초기화 (동시 요청은 하나의 초기화 작업을 공유)
         self.client = None
         self.agent = None
+        self.tools = []
+        self._init_task: Optional[asyncio.Task] = None
+        # 단계별 초기화 소요 시간(초)
+        self.init_timings: Dict[str, Any] = {}
         
         logger.info("ShoppingReactAgent 초기화 완료")
     
+    def _create_model(self, model_name: str) -> BaseChatModel:
+        """Gemini 채팅 모델 생성"""
+        return ChatGoogleGenerativeAI(
+            model=model_name,
+            google_api_key=self.google_api_key,
+            temperature=0.1
+        )
+    
+    async def _load_server_tools(self, server_name: str) -> tuple:
+        """
+        단일 MCP 서버의 도구 로드
+        
+        Args:
+            server_name: MCP 서버 이름
+            
+        Returns:
+            (도구 목록, 소요 시간(초))
+        """
+        started = time.perf_counter()
+        tools = await self.client.get_tools(server_name=server_name)
+        return tools, time.perf_counter() - started
+    
     async def _initialize_agent(self):
-        """Agent 지연 초기화 (MCP 서버 연결 및 도구 설정)"""
+        """
+        Agent 지연 초기화 (MCP 서버 연결 및 도구 설정)
+        
+        동시에 들어온 첫 요청들은 하나의 초기화 작업을 함께 기다립니다.
+        MCP 연결 끊김이 감지되었으면 Agent를 버리고 다시 초기화합니다.
+        """
         if self.agent is not None:
-            return
+            if not self.connection_monitor.lost:
+                return
+            logger.warning("MCP 연결 끊김 감지 - Agent 재초기화")
+            await self._reset_agent()
+        
+        task = self._init_task
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._initialize_with_retry())
+            self._init_task = task
+        
+        # 대기 중인 요청이 취소되어도 공유 초기화 작업은 유지
+        await asyncio.shield(task)
+    
+    async def _reset_agent(self) -> None:
+        """초기화된 Agent와 MCP 클라이언트 폐기 (이전 클라이언트의 세션/전송은 가능한 만큼 정리)"""
+        client = self.client
+        self.agent = None
+        self.client = None
+        self.tools = []
+        self._init_task = None
+        self.connection_monitor.reset()
+        if client is not None:
+            await self._close_client(client)
+    
+    @staticmethod
+    async def _close_client(client: Any) -> None:
+        """
+        MCP 클라이언트 종료 (실패해도 재초기화는 계속 진행하고 오류만 기록)
         
+        세션을 유지하는 클라이언트는 exit_stack에 세션/전송을 보관하므로 이를 닫고,
+        aclose()를 제공하면 호출합니다. 호출마다 세션을 여는 클라이언트는 정리할 것이 없습니다.
+        
+        Args:
+            client: 폐기할 MultiServerMCPClient
+        """
+        exit_stack = getattr(client, "exit_stack", None)
+        close = getattr(client, "aclose", None)
+        try:
+            if exit_stack is not None:
+                await asyncio.wait_for(exit_stack.aclose(), timeout=MCP_CLIENT_CLOSE_TIMEOUT_SECONDS)
+            elif close is not None:
+                await asyncio.wait_for(close(), timeout=MCP_CLIENT_CLOSE_TIMEOUT_SECONDS)
+            else:
+                return
+            logger.info("이전 MCP 클라이언트 종료")
+        except Exception as e:
+            logger.error(f"이전 MCP 클라이언트 종료 실패: {str(e)}")
+    
+    async def _initialize_with_retry(self) -> None:
+        """실패 시 지수 백오프로 재시도하며 Agent 초기화"""
+        for attempt in range(1, AGENT_INIT_MAX_ATTEMPTS + 1):
+            try:
+                await self._build_agent()
+                self.init_timings["attempts"] = attempt
+                return
+            except Exception as e:
+                if attempt >= AGENT_INIT_MAX_ATTEMPTS:
+                    raise
+                delay = min(AGENT_INIT_BACKOFF_SECONDS * 2 ** (attempt - 1), AGENT_INIT_BACKOFF_MAX_SECONDS)
+                logger.warning(
+                    f"Agent 초기화 실패 ({attempt}/{AGENT_INIT_MAX_ATTEMPTS}), "
+                    f"{delay}초 후 재시도: {str(e)}"
+                )
+                await asyncio.sleep(delay)
+    
+    async def _build_agent(self) -> None:
+        """MCP 서버 연결, 도구 로드, React Agent 그래프 생성"""
         try:
             # MCP 설정 가져오기
             mcp_config = get_mcp_config_with_api_keys(self.brave_api_key)
@@ -61,76 +311,587 @@ class ShoppingReactAgent:
             # MultiServerMCPClient 초기화
             self.client = MultiServerMCPClient(mcp_config)
             
-            # MCP 도구 로드
-            tools = await self.client.get_tools()
+            # MCP 서버별 도구를 동시에 로드 (get_tools()는 서버를 순차 연결)
+            started = time.perf_counter()
+            server_names = list(mcp_config.keys())
+            results = await asyncio.gather(
+                *(self._load_server_tools(server_name) for server_name in server_names)
+            )
+            tools = [tool for server_tools, _ in results for tool in server_tools]
+            mcp_seconds = time.perf_counter() - started
             logger.info(f"사용 가능한 도구 수: {len(tools)}")
             
+            # 실제 MCP 서버 호출 구간 기록 (캐시 히트는 기록되지 않음)
+            tools = trace_tools(tools, span_prefix="mcp")
+            tools = self.connection_monitor.wrap_tools(tools)
+            if self.tool_cache is not None:
+                tools = self.tool_cache.wrap_tools(tools)
+            
+            # 쇼핑몰별 순차 검색 대신 한 번에 동시 검색하는 도구 추가
+            if MALL_SEARCH_ENABLED:
+                search_tool = find_search_tool(tools, MALL_SEARCH_TOOL)
+                if search_tool is not None:
+                    tools = [MallFanoutSearch(
+                        search_tool,
+                        MALL_SEARCH_MALLS,
+                        timeout_seconds=MALL_SEARCH_TIMEOUT_SECONDS,
+                        max_results_per_mall=MALL_SEARCH_MAX_RESULTS
+                    ).as_tool()] + tools
+                    logger.info(f"쇼핑몰 병렬 검색 도구 사용: {search_tool.name} → {MALL_SEARCH_MALLS}")
+                else:
+                    logger.warning("쇼핑몰 병렬 검색에 사용할 검색 도구가 없습니다.")
+            
+            # 느린 도구 호출이 턴 전체를 붙잡지 않도록 도구별 제한 시간 적용 (가장 바깥 래퍼)
+            tools = wrap_tools_with_timeout(tools, AGENT_TOOL_TIMEOUT_SECONDS)
+            # LLM이 요청한 도구 호출 구간 기록 (시간 초과 포함)
+            tools = trace_tools(tools)
+            self.tools = tools
+            
             # React Agent 생성 (메모리 포함)
+            started = time.perf_counter()
             self.agent = create_react_agent(
-                model=self.model,
+                model=self.model_router or self.model,
                 tools=tools,
                 prompt=SHOPPING_SYSTEM_PROMPT,
-                checkpointer=self.memory  # 멀티턴 대화를 위한 메모리 추가
+                checkpointer=self.memory,  # 멀티턴 대화를 위한 메모리 추가
+                state_schema=ShoppingAgentState,
+                pre_model_hook=self.context_manager.pre_model_hook if self.context_manager else None
             )
+            graph_seconds = time.perf_counter() - started
             
-            logger.info("React Agent 초기화 완료")
+            self.init_timings = {
+                "mcp_servers": {
+                    server_name: round(seconds, 3)
+                    for server_name, (_, seconds) in zip(server_names, results)
+                },
+                "mcp_tools_seconds": round(mcp_seconds, 3),
+                "graph_compile_seconds": round(graph_seconds, 3)
+            }
+            logger.info(f"React Agent 초기화 완료: {self.init_timings}")
             
         except Exception as e:
             logger.error(f"Agent 초기화 실패: {str(e)}")
             raise
     
-    async def search_products(self, query: str, session_id: str) -> Dict[str, Any]:
+    async def warmup(self) -> Dict[str, Any]:
+        """
+        Agent 사전 초기화 (서버 시작 시 호출)
+        
+        Returns:
+            단계별 초기화 소요 시간
+        """
+        await self._initialize_agent()
+        return self.init_timings
+    
+    def _create_cache(self, namespace: str, max_size: int, ttl_seconds: float) -> Any:
+        """캐시 생성 (공유 저장소가 있으면 워커 간 공유 캐시, 없으면 프로세스 내 캐시)"""
+        if self.store is not None:
+            return SharedTTLCache(self.store, namespace, max_size=max_size, ttl_seconds=ttl_seconds)
+        return TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+    
+    async def _is_first_turn(self, config: Dict[str, Any]) -> bool:
+        """
+        세션 간 공유 응답(검색 캐시, 가격 인덱스) 적용 가능 여부 확인
+        
+        이전 대화가 없는 첫 턴만 대화 맥락과 무관하므로 세션 간 응답을 공유할 수 있습니다.
+        """
+        if self.query_cache is None and self.price_index is None:
+            return False
+        return await self.memory.aget_tuple(config) is None
+    
+    async def _record_cached_turn(self, config: Dict[str, Any], user_message: str, content: str) -> None:
+        """캐시 응답을 세션 메모리에 기록하여 이후 멀티턴 대화 맥락 유지"""
+        try:
+            await self.agent.aupdate_state(
+                config,
+                {"messages": [HumanMessage(content=user_message), AIMessage(content=content)]},
+                as_node="agent"
+            )
+        except Exception as e:
+            logger.warning(f"캐시 응답 메모리 기록 실패: {str(e)}")
+    
+    @staticmethod
+    def _turn_config(session_id: str) -> Dict[str, Any]:
+        """세션별 실행 설정 (ReAct 최대 단계 수 포함)"""
+        return {"configurable": {"thread_id": session_id}, "recursion_limit": AGENT_RECURSION_LIMIT}
+    
+    @staticmethod
+    def _traced_config(config: Dict[str, Any]) -> Dict[str, Any]:
+        """현재 span이 있으면 그래프 단계/LLM 호출 span을 기록하는 콜백 추가"""
+        span = current_span()
+        if span is None:
+            return config
+        return {**config, "callbacks": [TracingCallbackHandler(span)]}
+    
+    async def _initialize_until(self, deadline: float) -> bool:
+        """
+        제한 시각 안에 Agent 초기화
+        
+        Args:
+            deadline: 턴 제한 시각 (time.monotonic() 기준)
+            
+        Returns:
+            제한 시각 안에 초기화되었으면 True
+        """
+        try:
+            if self.agent is None or self.connection_monitor.lost:
+                with get_tracer().start_as_current_span("agent.initialize"):
+                    # 공유 초기화 작업은 shield로 보호되므로 이 요청만 대기를 멈춤
+                    await asyncio.wait_for(self._initialize_agent(), timeout=max(deadline - time.monotonic(), 0))
+            return True
+        except asyncio.TimeoutError:
+            if time.monotonic() < deadline:
+                raise
+            logger.warning("제한 시간 안에 Agent 초기화를 마치지 못했습니다.")
+            return False
+    
+    async def _finish_interrupted_turn(
+        self,
+        config: Dict[str, Any],
+        query: str,
+        user_message: str,
+        reason: str,
+        tool_outputs: Optional[List[str]] = None
+    ) -> tuple:
+        """
+        제한 시간/단계 초과로 중단된 턴을 부분 답변으로 마무리
+        
+        지금까지의 도구 결과로 부분 답변을 만들고, 응답 없이 끝난 도구 호출을 닫아
+        다음 턴에서도 대화 기록이 유효하도록 세션 메모리에 기록합니다.
+        
+        Args:
+            config: 세션 실행 설정
+            query: 사용자 검색어
+            user_message: 이번 턴의 사용자 메시지
+            reason: 중단 이유 ("deadline" | "step_limit")
+            tool_outputs: 이번 턴의 도구 결과 (생략 시 세션 메모리에서 조회)
+            
+        Returns:
+            (부분 답변, 상품 목록)
+        """
+        turn: List[Any] = []
+        try:
+            snapshot = await self.agent.aget_state(config)
+            messages = snapshot.values.get("messages", [])
+            last_human_index = max(
+                (index for index, message in enumerate(messages) if isinstance(message, HumanMessage)),
+                default=-1
+            )
+            if last_human_index >= 0 and messages[last_human_index].content == user_message:
+                turn = messages[last_human_index + 1:]
+        except Exception as e:
+            logger.warning(f"중단된 턴 상태 조회 실패: {str(e)}")
+        
+        if tool_outputs is None:
+            tool_outputs = [self._message_text(message) for message in turn if isinstance(message, ToolMessage)]
+        
+        products = await self._products_payload("", tool_outputs, query=query)
+        content = format_partial_answer(products, reason)
+        logger.warning(f"턴 중단 ({reason}) - 부분 답변 반환: {query} (상품 {len(products)}개)")
+        
+        if turn:
+            answered = {message.tool_call_id for message in turn if isinstance(message, ToolMessage)}
+            updates: List[Any] = [
+                ToolMessage(content="제한 시간 초과로 취소되었습니다.", tool_call_id=call["id"], name=call["name"])
+                for message in turn if isinstance(message, AIMessage)
+                for call in message.tool_calls if call["id"] not in answered
+            ]
+            last = turn[-1]
+            # 단계 초과 안내 메시지는 부분 답변으로 교체
+            replace_id = last.id if isinstance(last, AIMessage) and last.content == STEP_LIMIT_MESSAGE else None
+            updates.append(AIMessage(content=content, id=replace_id) if replace_id else AIMessage(content=content))
+            try:
+                await self.agent.aupdate_state(config, {"messages": updates}, as_node="agent")
+            except Exception as e:
+                logger.warning(f"부분 답변 메모리 기록 실패: {str(e)}")
+        
+        return content, products
+    
+    async def search_products(
+        self,
+        query: str,
+        session_id: str,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         상품 검색 (멀티턴 대화 지원)
         
         Args:
             query: 검색 쿼리
             session_id: 세션 ID (thread_id로 사용)
+            deadline: 턴 제한 시각 (time.monotonic() 기준, 생략 시 AGENT_TURN_DEADLINE_SECONDS 후)
             
         Returns:
-            검색 결과
+            검색 결과 (제한 시간/단계 초과 시 partial=True와 지금까지의 결과)
         """
-        await self._initialize_agent()
+        if deadline is None:
+            deadline = time.monotonic() + AGENT_TURN_DEADLINE_SECONDS
+        if not await self._initialize_until(deadline):
+            AGENT_RESPONSES.labels("error").inc()
+            return {
+                "query": query,
+                "session_id": session_id,
+                "error": "제한 시간 안에 검색 준비를 마치지 못했습니다. 잠시 후 다시 시도해주세요."
+            }
         
         try:
             # 검색용 프롬프트 생성
             search_prompt = get_search_prompt(query)
             
             # 세션별 컨텍스트 설정
-            config = {"configurable": {"thread_id": session_id}}
+            config = self._turn_config(session_id)
+            user_message = get_user_search_message(query)
             
-            response = await self.agent.ainvoke({
-                "messages": [("user", f"다음 상품의 최저가를 찾아주세요: {query}")]
-            }, config=config)
+            # 캐시 조회 (히트 시 LLM/MCP 호출 없이 즉시 응답)
+            first_turn = await self._is_first_turn(config)
+            cacheable = first_turn and self.query_cache is not None
+            if cacheable:
+                cached = await self.query_cache.aget(normalize_query(query))
+                if cached is not None:
+                    logger.info(f"검색 캐시 히트: {query}")
+                    AGENT_RESPONSES.labels("query_cache").inc()
+                    await self._record_cached_turn(config, user_message, cached)
+                    return {
+                        "query": query,
+                        "session_id": session_id,
+                        "response": cached,
+                        "products": await self._products_payload(cached, []),
+                        "full_messages": [],
+                        "cached": True
+                    }
             
-            # LangGraph 응답에서 마지막 메시지 추출
-            messages = response.get("messages", [])
-            if messages:
-                last_message = messages[-1]
-                if hasattr(last_message, 'content'):
-                    content = last_message.content
-                elif isinstance(last_message, dict):
-                    content = last_message.get('content', str(last_message))
+            # 가격 인덱스 조회 (최근 관측 가격이 충분하면 즉시 응답)
+            if first_turn:
+                indexed = await self._price_index_answer(query)
+                if indexed is not None:
+                    content, products = indexed
+                    AGENT_RESPONSES.labels("price_index").inc()
+                    await self._record_cached_turn(config, user_message, content)
+                    return {
+                        "query": query,
+                        "session_id": session_id,
+                        "response": content,
+                        "products": products,
+                        "full_messages": [],
+                        "price_index": True
+                    }
+            
+            interrupted = None
+            try:
+                response = await asyncio.wait_for(
+                    self.agent.ainvoke({"messages": [("user", user_message)]}, config=self._traced_config(config)),
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+            except asyncio.TimeoutError:
+                if time.monotonic() < deadline:
+                    raise
+                interrupted = "deadline"
+            except GraphRecursionError:
+                interrupted = "step_limit"
+            
+            if interrupted is None:
+                # LangGraph 응답에서 마지막 메시지 추출
+                messages = response.get("messages", [])
+                if messages:
+                    last_message = messages[-1]
+                    if hasattr(last_message, 'content'):
+                        content = last_message.content
+                    elif isinstance(last_message, dict):
+                        content = last_message.get('content', str(last_message))
+                    else:
+                        content = str(last_message)
                 else:
-                    content = str(last_message)
-            else:
-                content = "응답을 받지 못했습니다."
+                    content = "응답을 받지 못했습니다."
+                if content == STEP_LIMIT_MESSAGE:
+                    interrupted = "step_limit"
+            
+            if interrupted is not None:
+                AGENT_RESPONSES.labels("partial").inc()
+                content, products = await self._finish_interrupted_turn(config, query, user_message, interrupted)
+                return {
+                    "query": query,
+                    "session_id": session_id,
+                    "response": content,
+                    "products": products,
+                    "full_messages": [],
+                    "partial": True,
+                    "partial_reason": interrupted
+                }
+            
+            AGENT_RESPONSES.labels("graph").inc()
+            if cacheable and messages:
+                await self.query_cache.aset(normalize_query(query), content)
+            
+            # 이번 턴(마지막 사용자 메시지 이후)의 도구 결과
+            last_human_index = max(
+                (index for index, message in enumerate(messages) if isinstance(message, HumanMessage)),
+                default=-1
+            )
+            tool_outputs = [
+                self._message_text(message)
+                for message in messages[last_human_index + 1:]
+                if isinstance(message, ToolMessage)
+            ]
             
             return {
                 "query": query,
                 "session_id": session_id,
                 "response": content,
+                "products": await self._products_payload(content, tool_outputs, query=query),
                 "full_messages": messages
             }
             
         except Exception as e:
             logger.error(f"상품 검색 실패: {str(e)}")
+            AGENT_RESPONSES.labels("error").inc()
             return {
                 "query": query,
                 "session_id": session_id,
                 "error": f"검색 중 오류가 발생했습니다: {str(e)}"
             }
     
+    async def stream_search_products(
+        self,
+        query: str,
+        session_id: str,
+        deadline: Optional[float] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        상품 검색 (토큰 단위 스트리밍, 멀티턴 대화 지원)
+
+        LangGraph 이벤트 스트림(astream_events)을 구독하여 LLM 토큰, 도구 호출 시작,
+        도구 결과를 발생 즉시 전달합니다.
+
+        Args:
+            query: 검색 쿼리
+            session_id: 세션 ID (thread_id로 사용)
+            deadline: 턴 제한 시각 (time.monotonic() 기준, 생략 시 AGENT_TURN_DEADLINE_SECONDS 후)
+
+        Yields:
+            스트리밍 이벤트 딕셔너리
+            - {"type": "token", "content": str}
+            - {"type": "tool_start", "tool_name": str, "tool_input": Any}
+            - {"type": "tool_end", "tool_name": str, "output": str}
+            - {"type": "final", "content": str, "products": List[dict]}
+            - {"type": "partial", "content": str, "products": List[dict], "reason": str}
+              (제한 시간/단계 초과 시 지금까지의 결과)
+            - {"type": "error", "error": str}
+        """
+        if deadline is None:
+            deadline = time.monotonic() + AGENT_TURN_DEADLINE_SECONDS
+        if not await self._initialize_until(deadline):
+            AGENT_RESPONSES.labels("error").inc()
+            yield {"type": "error", "error": "제한 시간 안에 검색 준비를 마치지 못했습니다. 잠시 후 다시 시도해주세요."}
+            return
+
+        try:
+            # 세션별 컨텍스트 설정
+            config = self._turn_config(session_id)
+            user_message = get_user_search_message(query)
+
+            # 캐시 조회 (히트 시 최종 답변만 즉시 전달)
+            first_turn = await self._is_first_turn(config)
+            cacheable = first_turn and self.query_cache is not None
+            if cacheable:
+                cached = await self.query_cache.aget(normalize_query(query))
+                if cached is not None:
+                    logger.info(f"검색 캐시 히트: {query}")
+                    AGENT_RESPONSES.labels("query_cache").inc()
+                    await self._record_cached_turn(config, user_message, cached)
+                    yield {
+                        "type": "final",
+                        "content": cached,
+                        "products": await self._products_payload(cached, []),
+                        "cached": True
+                    }
+                    return
+
+            # 가격 인덱스 조회 (최근 관측 가격이 충분하면 즉시 응답)
+            if first_turn:
+                indexed = await self._price_index_answer(query)
+                if indexed is not None:
+                    content, products = indexed
+                    AGENT_RESPONSES.labels("price_index").inc()
+                    await self._record_cached_turn(config, user_message, content)
+                    yield {"type": "final", "content": content, "products": products, "price_index": True}
+                    return
+
+            final_content = ""
+            tool_outputs: List[str] = []
+            interrupted = None
+            events = aiter(self.agent.astream_events({
+                "messages": [("user", user_message)]
+            }, config=self._traced_config(config), version="v2"))
+            try:
+                while True:
+                    # 남은 제한 시간 안에 다음 이벤트가 오지 않으면 그래프 실행 중단
+                    try:
+                        event = await asyncio.wait_for(
+                            anext(events), timeout=max(deadline - time.monotonic(), 0)
+                        )
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        if time.monotonic() < deadline:
+                            raise
+                        interrupted = "deadline"
+                        break
+                    kind = event.get("event")
+                    
+                    # 응답 모델(agent 노드) 외의 LLM 호출(대화 요약 등)은 사용자에게 전달하지 않음
+                    if kind in ("on_chat_model_stream", "on_chat_model_end") and not self._is_answer_model_event(event):
+                        continue
+
+                    if kind == "on_chat_model_stream":
+                        text = self._message_text(event["data"].get("chunk"))
+                        if text:
+                            yield {"type": "token", "content": text}
+
+                    elif kind == "on_chat_model_end":
+                        # 도구 호출이 없는 마지막 모델 응답이 최종 답변
+                        output = event["data"].get("output")
+                        if output is not None and not getattr(output, "tool_calls", None):
+                            final_content = self._message_text(output)
+
+                    elif kind == "on_tool_start":
+                        yield {
+                            "type": "tool_start",
+                            "tool_name": event.get("name", ""),
+                            "tool_input": event["data"].get("input")
+                        }
+
+                    elif kind == "on_tool_end":
+                        output = event["data"].get("output")
+                        output_text = self._message_text(output) if output is not None else ""
+                        tool_outputs.append(output_text)
+                        yield {
+                            "type": "tool_end",
+                            "tool_name": event.get("name", ""),
+                            "output": output_text
+                        }
+            except GraphRecursionError:
+                interrupted = "step_limit"
+            finally:
+                if hasattr(events, "aclose"):
+                    await events.aclose()
+
+            # 최종 답변 없이 끝났으면 단계 초과로 도구 호출이 중단된 것
+            if interrupted is None and not final_content and tool_outputs:
+                interrupted = "step_limit"
+
+            if interrupted is not None:
+                AGENT_RESPONSES.labels("partial").inc()
+                content, products = await self._finish_interrupted_turn(
+                    config, query, user_message, interrupted, tool_outputs=tool_outputs
+                )
+                yield {"type": "partial", "content": content, "products": products, "reason": interrupted}
+                return
+
+            AGENT_RESPONSES.labels("graph").inc()
+            if cacheable and final_content:
+                await self.query_cache.aset(normalize_query(query), final_content)
+
+            yield {
+                "type": "final",
+                "content": final_content or "응답을 받지 못했습니다.",
+                "products": await self._products_payload(final_content, tool_outputs, query=query)
+            }
+
+        except Exception as e:
+            logger.error(f"상품 검색 스트리밍 실패: {str(e)}")
+            AGENT_RESPONSES.labels("error").inc()
+            yield {"type": "error", "error": f"검색 중 오류가 발생했습니다: {str(e)}"}
+
+    @staticmethod
+    def _is_answer_model_event(event: Dict[str, Any]) -> bool:
+        """agent 노드의 응답 모델 호출 이벤트 여부 (pre_model_hook의 요약 호출 제외)"""
+        if CONTEXT_SUMMARY_TAG in (event.get("tags") or []):
+            return False
+        return (event.get("metadata") or {}).get("langgraph_node") == "agent"
+    
+    async def _products_payload(
+        self,
+        answer: str,
+        tool_outputs: List[str],
+        query: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        최종 답변/도구 결과에서 구조화된 상품 목록 추출 (실패해도 응답에는 영향 없음)
+        
+        query가 주어지면 답변과 도구 결과의 상품 중 상품명이 검색어와 일치하는 상품만 가격 인덱스에 기록합니다.
+        (답변이나 검색 결과에 함께 나온 액세서리 등 다른 상품이 검색어의 최저가로 조회되지 않도록)
+        
+        Args:
+            answer: Agent 최종 답변
+            tool_outputs: 이번 턴의 도구 결과 문자열 목록
+            query: 사용자 검색어 (가격 인덱스 기록용)
+            
+        Returns:
+            상품 딕셔너리 목록
+        """
+        try:
+            answer_products = extract_products_from_answer(answer)
+            offers = [offer for output in tool_outputs for offer in extract_offers_from_tool_output(output)]
+            
+            if query and self.price_index is not None:
+                observed = [product for product in answer_products + offers if matches_query(query, product.name)]
+                await asyncio.to_thread(self.price_index.record, query, observed)
+            
+            return [product.model_dump() for product in choose_products(answer_products, offers)]
+        except Exception as e:
+            logger.warning(f"상품 정보 추출 실패: {str(e)}")
+            return []
+    
+    async def _price_index_answer(self, query: str) -> Optional[tuple]:
+        """
+        가격 인덱스의 최근 관측 가격으로 최저가 질의에 응답
+        
+        Args:
+            query: 사용자 검색어
+            
+        Returns:
+            (답변, 상품 목록) 또는 관측값이 없거나 오래되었으면 None
+        """
+        if self.price_index is None or not is_price_query(query):
+            return None
+        
+        try:
+            offers = await asyncio.to_thread(
+                self.price_index.lookup, query, max_age_seconds=PRICE_INDEX_MAX_AGE_SECONDS
+            )
+        except Exception as e:
+            logger.warning(f"가격 인덱스 조회 실패: {str(e)}")
+            return None
+        
+        if len(offers) < PRICE_INDEX_MIN_OFFERS:
+            return None
+        
+        logger.info(f"가격 인덱스 응답: {query} ({len(offers)}개 판매처)")
+        products = [
+            {key: offer[key] for key in ("name", "price", "store", "url", "image_url")}
+            for offer in offers
+        ]
+        return format_price_index_answer(offers), products
+    
+    @staticmethod
+    def _message_text(message: Any) -> str:
+        """메시지(또는 청크)에서 텍스트 내용 추출"""
+        if message is None:
+            return ""
+        content = getattr(message, "content", message)
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            # Gemini는 content를 파트 리스트로 반환하기도 함
+            parts = []
+            for part in content:
+                if isinstance(part, str):
+                    parts.append(part)
+                elif isinstance(part, dict) and part.get("type") == "text":
+                    parts.append(part.get("text", ""))
+            return "".join(parts)
+        return str(content)
+
     async def compare_and_recommend(self, query: str, budget: float, session_id: str) -> Dict[str, Any]:
         """
         상품 비교 및 추천 (멀티턴 대화 지원)
@@ -292,16 +1053,101 @@ class ShoppingReactAgent:
                 "error": f"상세 정보 조회 중 오류가 발생했습니다: {str(e)}"
             }
     
-    async def health_check(self, session_id: str) -> Dict[str, Any]:
+    async def clear_session(self, session_id: str) -> None:
+        """
+        세션 대화 기록 삭제 (해당 thread_id의 모든 체크포인트 제거)
+        
+        Args:
+            session_id: 세션 ID
+        """
+        await self.memory.adelete_thread(session_id)
+        logger.info(f"세션 {session_id}의 대화 메모리 삭제 완료")
+    
+    async def purge_idle_sessions(self, idle_seconds: Optional[float] = None) -> List[str]:
+        """
+        유휴 세션 일괄 삭제
+        
+        Args:
+            idle_seconds: 마지막 활동 후 경과 시간 기준(초), 생략 시 checkpointer 기본값
+            
+        Returns:
+            삭제된 세션 ID 목록 (유휴 추적을 지원하지 않는 checkpointer면 빈 목록)
+        """
+        evict_idle_threads = getattr(self.memory, "aevict_idle_threads", None)
+        if evict_idle_threads is None:
+            logger.warning("현재 checkpointer는 유휴 세션 정리를 지원하지 않습니다.")
+            return []
+        
+        # SQLite checkpointer는 삭제를 스레드에서 실행 (이벤트 루프를 막지 않도록)
+        purged = await evict_idle_threads(idle_seconds)
+        logger.info(f"유휴 세션 {len(purged)}개 삭제 완료")
+        return purged
+    
+    async def flush_memory(self) -> None:
+        """
+        버퍼링된 대화 메모리 기록을 저장소에 반영 (배치 쓰기를 지원하는 checkpointer만)
+        
+        멀티 워커 모드에서 세션 실행 권한을 넘기기 전에 호출하여 다음 턴을 처리할 워커가
+        이번 턴까지의 대화를 읽을 수 있도록 합니다.
+        """
+        flush = getattr(self.memory, "flush", None)
+        if flush is not None:
+            await asyncio.to_thread(flush)
+    
+    def memory_stats(self) -> Dict[str, Any]:
+        """대화 메모리 사용량 통계 반환"""
+        stats = getattr(self.memory, "stats", None)
+        return stats() if stats is not None else {"backend": type(self.memory).__name__}
+    
+    async def amemory_stats(self) -> Dict[str, Any]:
+        """memory_stats()의 비동기 버전 (SQLite checkpointer 조회는 스레드 풀에서 실행)"""
+        return await asyncio.to_thread(self.memory_stats)
+    
+    async def check_tools(self) -> Dict[str, Any]:
+        """
+        MCP 도구 사용 가능 여부 확인 (LLM 호출 없음)
+        
+        Returns:
+            로드된 도구 수와 이름 목록
+        """
+        await self._initialize_agent()
+        return {
+            "tool_count": len(self.tools),
+            "tools": [tool.name for tool in self.tools]
+        }
+    
+    async def get_session_info(self, session_id: str) -> Dict[str, Any]:
         """
-        Agent 상태 확인 (멀티턴 대화 지원)
+        세션 대화 메모리 조회 (LLM 호출 없음)
         
         Args:
             session_id: 세션 ID
             
+        Returns:
+            세션 존재 여부 및 저장된 메시지 수
+        """
+        config = {"configurable": {"thread_id": session_id}}
+        checkpoint_tuple = await self.memory.aget_tuple(config)
+        if checkpoint_tuple is None:
+            return {"exists": False, "message_count": 0}
+        
+        messages = checkpoint_tuple.checkpoint.get("channel_values", {}).get("messages", [])
+        return {"exists": True, "message_count": len(messages)}
+    
+    async def health_check(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Agent 상태 확인 (실제 LLM 호출을 포함한 심층 점검)
+        
+        Args:
+            session_id: 세션 ID (생략 시 일회용 스레드를 사용하고 점검 후 삭제)
+            
         Returns:
             상태 정보
         """
+        throwaway = session_id is None
+        if throwaway:
+            session_id = f"health-{uuid.uuid4()}"
+        
         try:
             await self._initialize_agent()
             
@@ -341,4 +1187,9 @@ class ShoppingReactAgent:
                 "error": str(e),
                 "session_id": session_id,
                 "memory_enabled": False
-            } 
\ No newline at end of file
+            }
+        
+        finally:
+            if throwaway:
+                # 점검용 대화가 메모리에 남지 않도록 삭제
+                await self.memory.adelete_thread(session_id)
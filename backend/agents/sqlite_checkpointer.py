@@ -0,0 +1,548 @@
+"""
+SQLite 기반 대화 메모리 Checkpointer
+외부 서비스 없이 로컬 디스크에 대화 상태를 영속화 (WAL 모드, 배치 쓰기, 주기적 압축)
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata
+)
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    value_type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_thread_id ON checkpoints (thread_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_writes_thread_id ON writes (thread_id);
+"""
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver):
+    """
+    SQLite Checkpointer
+
+    - WAL 모드: 읽기와 쓰기가 서로를 막지 않으며 여러 프로세스가 같은 파일을 공유 가능
+    - 배치 쓰기: put/put_writes는 버퍼에 쌓고, 크기/시간 임계값 또는 읽기 시점에 한 트랜잭션으로 기록
+    - 압축: 스레드별 최근 N개 체크포인트만 남기고 보존 기간이 지난 스레드를 주기적으로 삭제
+    - 비동기 인터페이스는 디스크 I/O와 압축을 모두 스레드 풀에서 실행 (이벤트 루프에서는 버퍼 추가만 수행)
+    """
+
+    def __init__(
+        self,
+        path: str = "./data/checkpoints.db",
+        batch_size: int = 32,
+        flush_interval_seconds: float = 0.5,
+        compact_interval_seconds: float = 300.0,
+        keep_checkpoints: int = 2,
+        retention_seconds: float = 7 * 24 * 3600,
+        **kwargs: Any
+    ):
+        """
+        Checkpointer 초기화
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로 (":memory:" 가능)
+            batch_size: 버퍼가 이 개수에 도달하면 즉시 기록
+            flush_interval_seconds: 가장 오래된 버퍼 항목이 이 시간을 넘으면 기록
+            compact_interval_seconds: 자동 압축 주기(초), 0이면 비활성화
+            keep_checkpoints: 압축 시 스레드당 유지할 최근 체크포인트 수
+            retention_seconds: 마지막 기록 후 이 시간이 지난 스레드는 압축 시 삭제
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.compact_interval_seconds = compact_interval_seconds
+        self.keep_checkpoints = max(1, keep_checkpoints)
+        self.retention_seconds = retention_seconds
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # 버퍼 잠금 (짧게만 보유, 이벤트 루프에서도 사용) / 연결 잠금 (디스크 I/O 동안 보유)
+        self._lock = threading.Lock()
+        self._db_lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+        self._pending_checkpoints: List[tuple] = []
+        self._pending_writes: List[tuple] = []
+        self._pending_since: Optional[float] = None
+        self._last_compaction = time.monotonic()
+        self._compaction_task: Optional[asyncio.Future] = None
+
+    def _pending_count(self) -> int:
+        return len(self._pending_checkpoints) + len(self._pending_writes)
+
+    def _should_flush(self) -> bool:
+        if self._pending_count() >= self.batch_size:
+            return True
+        return (
+            self._pending_since is not None
+            and time.monotonic() - self._pending_since >= self.flush_interval_seconds
+        )
+
+    def _compaction_due(self) -> bool:
+        return bool(
+            self.compact_interval_seconds
+            and time.monotonic() - self._last_compaction >= self.compact_interval_seconds
+        )
+
+    def _write_pending(self) -> None:
+        """버퍼에 쌓인 체크포인트/쓰기 기록을 한 트랜잭션으로 저장 (압축은 하지 않음)"""
+        # 연결 잠금을 먼저 잡아 버퍼를 꺼낸 순서대로 기록 (진행 중인 기록이 끝난 뒤 읽기가 실행되도록 보장)
+        with self._db_lock:
+            with self._lock:
+                if not self._pending_count():
+                    return
+                checkpoints, self._pending_checkpoints = self._pending_checkpoints, []
+                writes, self._pending_writes = self._pending_writes, []
+                self._pending_since = None
+
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    checkpoints
+                )
+                # 특수 채널(idx < 0)은 덮어쓰고, 일반 쓰기는 최초 기록만 유지
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [row for row in writes if row[4] < 0]
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [row for row in writes if row[4] >= 0]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def flush(self) -> None:
+        """버퍼 기록 후 압축 주기가 지났으면 압축 (동기 호출, 디스크 I/O 포함)"""
+        self._write_pending()
+        if self._compaction_due():
+            self.compact()
+
+    def _buffer_checkpoint(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata) -> tuple:
+        """체크포인트를 버퍼에 추가하고 (반환할 config, 기록 필요 여부) 반환"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        with self._lock:
+            self._pending_checkpoints.append((
+                thread_id,
+                checkpoint_ns,
+                checkpoint["id"],
+                config["configurable"].get("checkpoint_id"),
+                checkpoint_type,
+                checkpoint_blob,
+                metadata_type,
+                metadata_blob,
+                time.time()
+            ))
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            should_flush = self._should_flush()
+
+        next_config = {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"]
+            }
+        }
+        return next_config, should_flush
+
+    def _buffer_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str
+    ) -> bool:
+        """중간 쓰기 기록을 버퍼에 추가하고 기록 필요 여부 반환"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, value_blob = self.serde.dumps_typed(value)
+            rows.append((
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                value_type,
+                value_blob,
+                task_path
+            ))
+
+        with self._lock:
+            self._pending_writes.extend(rows)
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            return self._should_flush()
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        """체크포인트 저장 (버퍼링)"""
+        next_config, should_flush = self._buffer_checkpoint(config, checkpoint, metadata)
+        if should_flush:
+            self._write_pending()
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        """중간 쓰기 기록 저장 (버퍼링)"""
+        if self._buffer_writes(config, writes, task_id, task_path):
+            self._write_pending()
+
+    def _row_to_tuple(self, row: tuple) -> CheckpointTuple:
+        """checkpoints 테이블 행을 CheckpointTuple로 변환"""
+        (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+         checkpoint_type, checkpoint_blob, metadata_type, metadata_blob) = row
+
+        write_rows = self._conn.execute(
+            "SELECT task_id, channel, value_type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id
+                }
+            },
+            checkpoint=self.serde.loads_typed((checkpoint_type, checkpoint_blob)),
+            metadata=self.serde.loads_typed((metadata_type, metadata_blob)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in write_rows
+            ]
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """체크포인트 조회 (지정 ID 또는 스레드의 최신 체크포인트)"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        self.flush()
+        with self._db_lock:
+            query = (
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                "checkpoint_type, checkpoint, metadata_type, metadata FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? "
+            )
+            if checkpoint_id:
+                row = self._conn.execute(
+                    query + "AND checkpoint_id = ?", (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    query + "ORDER BY checkpoint_id DESC LIMIT 1", (thread_id, checkpoint_ns)
+                ).fetchone()
+
+            return self._row_to_tuple(row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[CheckpointTuple]:
+        """체크포인트 목록 조회 (최신순)"""
+        clauses = []
+        params: List[Any] = []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if config["configurable"].get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(config["configurable"]["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_checkpoint_id)
+
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "checkpoint_type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(query, params).fetchall()
+            results = []
+            for row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                checkpoint_tuple = self._row_to_tuple(row)
+                if filter and not all(
+                    checkpoint_tuple.metadata.get(key) == value for key, value in filter.items()
+                ):
+                    continue
+                results.append(checkpoint_tuple)
+
+        yield from results
+
+    def delete_thread(self, thread_id: str) -> None:
+        """스레드의 모든 체크포인트와 쓰기 기록 삭제"""
+        self._write_pending()
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def evict_idle_threads(self, idle_seconds: Optional[float] = None) -> List[str]:
+        """
+        유휴 스레드 일괄 삭제
+
+        Args:
+            idle_seconds: 마지막 기록 후 경과 시간 기준(초), 생략 시 보존 기간 사용
+
+        Returns:
+            삭제된 thread_id 목록
+        """
+        threshold = self.retention_seconds if idle_seconds is None else idle_seconds
+        self._write_pending()
+        with self._db_lock:
+            idle_threads = [
+                row[0] for row in self._conn.execute(
+                    "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?",
+                    (time.time() - threshold,)
+                ).fetchall()
+            ]
+            self._conn.execute("BEGIN")
+            try:
+                for thread_id in idle_threads:
+                    self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                    self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return idle_threads
+
+    def compact(self) -> Dict[str, int]:
+        """
+        오래된 체크포인트 정리
+
+        스레드별 최근 keep_checkpoints개만 남기고, 보존 기간이 지난 스레드를 삭제한 뒤
+        WAL 파일을 잘라냅니다.
+
+        Returns:
+            삭제된 체크포인트/스레드 수
+        """
+        self._last_compaction = time.monotonic()
+        expired_threads = self.evict_idle_threads()
+
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                deleted = self._conn.execute(
+                    """
+                    DELETE FROM checkpoints WHERE rowid IN (
+                        SELECT rowid FROM (
+                            SELECT rowid, ROW_NUMBER() OVER (
+                                PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+                            ) AS rank FROM checkpoints
+                        ) WHERE rank > ?
+                    )
+                    """,
+                    (self.keep_checkpoints,)
+                ).rowcount
+                self._conn.execute(
+                    """
+                    DELETE FROM writes WHERE NOT EXISTS (
+                        SELECT 1 FROM checkpoints c
+                        WHERE c.thread_id = writes.thread_id
+                          AND c.checkpoint_ns = writes.checkpoint_ns
+                          AND c.checkpoint_id = writes.checkpoint_id
+                    )
+                    """
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        if deleted or expired_threads:
+            logger.info(f"체크포인트 압축 완료: 체크포인트 {deleted}개, 만료 스레드 {len(expired_threads)}개 삭제")
+        return {"deleted_checkpoints": deleted, "expired_threads": len(expired_threads)}
+
+    def stats(self) -> Dict[str, Any]:
+        """저장된 스레드 수 및 데이터베이스 크기 반환 (읽기 전용, 버퍼 기록/압축은 하지 않음)"""
+        with self._lock:
+            pending = self._pending_count()
+        with self._db_lock:
+            threads = self._conn.execute("SELECT COUNT(DISTINCT thread_id) FROM checkpoints").fetchone()[0]
+            page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "threads": threads,
+            "bytes": page_count * page_size,
+            "pending_writes": pending,
+            "path": self.path
+        }
+
+    def close(self) -> None:
+        """버퍼를 기록하고 연결 종료"""
+        self._write_pending()
+        with self._db_lock:
+            self._conn.close()
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """get_tuple의 비동기 버전 (디스크 I/O는 스레드 풀에서 실행)"""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        """list의 비동기 버전"""
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in results:
+            yield item
+
+    def _schedule_compaction(self) -> None:
+        """압축 주기가 지났으면 백그라운드 작업으로 압축 시작 (이미 진행 중이면 건너뜀)"""
+        if not self._compaction_due():
+            return
+        if self._compaction_task is not None and not self._compaction_task.done():
+            return
+        # 다음 요청에서 다시 예약하지 않도록 시작 시점에 기록
+        self._last_compaction = time.monotonic()
+        self._compaction_task = asyncio.ensure_future(asyncio.to_thread(self.compact))
+        self._compaction_task.add_done_callback(self._log_compaction_error)
+
+    @staticmethod
+    def _log_compaction_error(task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"체크포인트 압축 실패: {str(task.exception())}")
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        """put의 비동기 버전 (버퍼 추가만 루프에서 하고, 기록/압축은 스레드 풀에서 실행)"""
+        next_config, should_flush = self._buffer_checkpoint(config, checkpoint, metadata)
+        if should_flush:
+            await asyncio.to_thread(self._write_pending)
+        self._schedule_compaction()
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        """put_writes의 비동기 버전"""
+        if self._buffer_writes(config, writes, task_id, task_path):
+            await asyncio.to_thread(self._write_pending)
+        self._schedule_compaction()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """delete_thread의 비동기 버전"""
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def aevict_idle_threads(self, idle_seconds: Optional[float] = None) -> List[str]:
+        """evict_idle_threads의 비동기 버전"""
+        return await asyncio.to_thread(self.evict_idle_threads, idle_seconds)
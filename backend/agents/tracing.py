@@ -0,0 +1,569 @@
+"""
+요청 단위 트레이싱
+턴마다 대기열 대기, 그래프 단계, LLM 호출(토큰 수), 도구/MCP 호출, SSE 직렬화 구간을 span으로 기록하고
+OpenTelemetry 호환 형식(OTLP/JSON)으로 콘솔 또는 파일에 내보냄
+(OpenTelemetry SDK 없이 동작하며, 파일 출력은 OTel Collector의 otlpjsonfile 수신기로 그대로 읽을 수 있음)
+"""
+import asyncio
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from dotenv import load_dotenv
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.tools import BaseTool, StructuredTool
+
+# .env 파일 로드
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# span 내보내기 방식: "none" (기록만, trace id는 응답에 포함) | "console" (표준 출력) | "file" (JSON Lines)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()
+TRACING_FILE_PATH = os.getenv("TRACING_FILE_PATH", "./data/traces.jsonl")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "pricefinder-agent")
+# 루트 span이 끝나지 않은 채 보관할 최대 trace 수 (초과 시 오래된 trace부터 버림)
+TRACING_MAX_PENDING_TRACES = int(os.getenv("TRACING_MAX_PENDING_TRACES", "1024"))
+
+# OTLP 상태 코드
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+# span 종료 시 호출할 함수 (메트릭 기록 등)
+_span_listeners: List[Callable[["Span"], None]] = []
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """속성 값을 OTLP/JSON AnyValue로 변환"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON은 64비트 정수를 문자열로 표기
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """속성 딕셔너리를 OTLP/JSON KeyValue 목록으로 변환 (None 값 제외)"""
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items() if value is not None
+    ]
+
+
+class Span:
+    """시간 구간 하나 (OpenTelemetry span과 같은 필드 구성)"""
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        """
+        span 시작 (Tracer.start_span()으로만 생성)
+
+        Args:
+            tracer: span을 발급한 Tracer
+            name: span 이름
+            trace_id: 32자리 16진수 trace id
+            parent_span_id: 부모 span id (루트 span이면 None)
+            attributes: 초기 속성
+        """
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        # 구간 길이는 단조 시계로 측정
+        self._started = time.perf_counter_ns()
+
+    @property
+    def ended(self) -> bool:
+        """종료 여부"""
+        return self.end_time_ns is not None
+
+    @property
+    def duration_ms(self) -> float:
+        """구간 길이(ms), 진행 중이면 지금까지의 길이"""
+        if self.end_time_ns is not None:
+            return (self.end_time_ns - self.start_time_ns) / 1_000_000
+        return (time.perf_counter_ns() - self._started) / 1_000_000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """속성 설정"""
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        """속성 여러 개 설정"""
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """구간 안의 시점 이벤트 기록"""
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes or {}})
+
+    def set_status(self, code: int, message: str = "") -> None:
+        """상태 설정 (STATUS_OK | STATUS_ERROR)"""
+        self.status_code = code
+        self.status_message = message
+
+    def record_exception(self, error: BaseException) -> None:
+        """예외를 exception 이벤트로 기록하고 오류 상태로 표시 (취소/연결 종료는 cancelled 속성으로 구분)"""
+        if isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+            self.set_attribute("cancelled", True)
+            self.set_status(STATUS_ERROR, "cancelled")
+            return
+        self.add_event("exception", {
+            "exception.type": type(error).__name__,
+            "exception.message": str(error)
+        })
+        self.set_status(STATUS_ERROR, str(error))
+
+    def end(self) -> None:
+        """span 종료 (여러 번 호출해도 한 번만 기록)"""
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = self.start_time_ns + (time.perf_counter_ns() - self._started)
+        for listener in _span_listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                logger.warning(f"span 종료 처리 실패 ({self.name}): {str(e)}")
+        self.tracer._on_end(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON Span 표현"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            # SPAN_KIND_INTERNAL
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or time.time_ns()),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        if self.events:
+            span["events"] = [
+                {
+                    "name": event["name"],
+                    "timeUnixNano": str(event["time_ns"]),
+                    "attributes": _otlp_attributes(event["attributes"])
+                }
+                for event in self.events
+            ]
+        return span
+
+
+def otlp_payload(spans: List[Span], service_name: str = TRACING_SERVICE_NAME) -> Dict[str, Any]:
+    """
+    span 목록을 OTLP/JSON ExportTraceServiceRequest로 변환
+
+    Args:
+        spans: 종료된 span 목록
+        service_name: resource의 service.name
+
+    Returns:
+        {"resourceSpans": [...]} 딕셔너리
+    """
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [span.to_otlp() for span in spans]
+            }]
+        }]
+    }
+
+
+class ConsoleSpanExporter:
+    """trace 하나를 OTLP/JSON 한 줄로 표준 출력에 기록"""
+
+    def __init__(self, service_name: str = TRACING_SERVICE_NAME):
+        self.service_name = service_name
+
+    def export(self, spans: List[Span]) -> None:
+        sys.stdout.write(json.dumps(otlp_payload(spans, self.service_name), ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
+class FileSpanExporter:
+    """trace 하나를 OTLP/JSON 한 줄로 파일에 추가 (JSON Lines)"""
+
+    def __init__(self, path: str = TRACING_FILE_PATH, service_name: str = TRACING_SERVICE_NAME):
+        """
+        파일 exporter 초기화
+
+        Args:
+            path: 출력 파일 경로 (상위 디렉터리가 없으면 생성)
+            service_name: resource의 service.name
+        """
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(otlp_payload(spans, self.service_name), ensure_ascii=False) + "\n"
+        # trace당 한 줄만 쓰므로 이벤트 루프에서 직접 기록 (수 KB 추가 쓰기)
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(line)
+
+
+class InMemorySpanExporter:
+    """내보낸 span을 메모리에 보관 (테스트/벤치마크용)"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, spans: List[Span]) -> None:
+        self.spans.extend(spans)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+def create_exporter(kind: str = TRACING_EXPORTER) -> Optional[Any]:
+    """
+    설정에 맞는 exporter 생성
+
+    Args:
+        kind: "none" | "console" | "file"
+
+    Returns:
+        exporter (none이면 None)
+    """
+    if kind == "console":
+        return ConsoleSpanExporter()
+    if kind == "file":
+        return FileSpanExporter()
+    if kind not in ("", "none"):
+        logger.warning(f"알 수 없는 TRACING_EXPORTER 값: {kind} (내보내기 비활성화)")
+    return None
+
+
+class Tracer:
+    """
+    span 생성 및 내보내기
+
+    - 루트 span이 끝날 때까지 같은 trace의 span을 모아 한 번에 내보냄 (trace당 한 줄)
+    - 현재 span은 contextvar로 전달되어 같은 태스크와 그 하위 태스크의 span이 자식으로 연결됨
+    """
+
+    def __init__(self, exporter: Optional[Any] = None):
+        """
+        Tracer 초기화
+
+        Args:
+            exporter: export(spans) 메서드를 가진 객체 (None이면 내보내지 않음)
+        """
+        self.exporter = exporter
+        # 루트 span이 진행 중인 trace의 종료된 span
+        self._pending: Dict[str, List[Span]] = {}
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        root: bool = False
+    ) -> Span:
+        """
+        span 시작 (종료는 호출자가 end()로)
+
+        Args:
+            name: span 이름
+            parent: 부모 span (생략 시 현재 span)
+            attributes: 초기 속성
+            root: True면 현재 span과 무관하게 새 trace 시작
+
+        Returns:
+            시작된 span
+        """
+        if parent is None and not root:
+            parent = _current_span.get()
+        if parent is None:
+            span = Span(self, name, secrets.token_hex(16), attributes=attributes)
+            if self.exporter is not None:
+                if len(self._pending) >= TRACING_MAX_PENDING_TRACES:
+                    dropped = next(iter(self._pending))
+                    del self._pending[dropped]
+                    logger.warning(f"끝나지 않은 trace 버림: {dropped}")
+                self._pending[span.trace_id] = []
+            return span
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+    @contextmanager
+    def start_as_current_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Span]:
+        """
+        span을 시작하고 블록 안에서 현재 span으로 사용 (예외는 span에 기록 후 다시 발생)
+
+        비동기 제너레이터의 yield를 가로지르지 않는 블록에서만 사용합니다.
+        """
+        span = self.start_span(name, parent=parent, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    @contextmanager
+    def use_span(self, span: Span) -> Iterator[Span]:
+        """이미 시작된 span을 블록 안에서 현재 span으로 사용 (종료하지 않음)"""
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+
+    def _on_end(self, span: Span) -> None:
+        """종료된 span을 trace 단위로 모아 내보내기"""
+        if self.exporter is None:
+            return
+        pending = self._pending.get(span.trace_id)
+        if pending is None:
+            # 루트 span이 이미 끝난 trace의 늦은 span은 단독으로 내보냄
+            self._export([span])
+            return
+        pending.append(span)
+        if span.parent_span_id is None:
+            self._export(self._pending.pop(span.trace_id))
+
+    def _export(self, spans: List[Span]) -> None:
+        try:
+            self.exporter.export(spans)
+        except Exception as e:
+            logger.warning(f"span 내보내기 실패: {str(e)}")
+
+
+_tracer = Tracer(create_exporter())
+
+
+def get_tracer() -> Tracer:
+    """프로세스 공용 Tracer 반환"""
+    return _tracer
+
+
+def add_span_listener(listener: Callable[[Span], None]) -> None:
+    """
+    span 종료 시 호출할 함수 등록 (exporter 설정과 무관하게 모든 span에 호출)
+
+    Args:
+        listener: 종료된 span을 받는 함수 (이벤트 루프에서 호출되므로 가볍게 유지)
+    """
+    if listener not in _span_listeners:
+        _span_listeners.append(listener)
+
+
+def current_span() -> Optional[Span]:
+    """현재 span 반환 (없으면 None)"""
+    return _current_span.get()
+
+
+def _payload_size(value: Any) -> int:
+    """도구 인자/결과의 직렬화 크기(바이트)"""
+    if isinstance(value, tuple):
+        value = value[0]
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, default=str)
+    return len(value.encode("utf-8"))
+
+
+def trace_tool(tool: BaseTool, span_prefix: str = "tool", tracer: Optional[Tracer] = None) -> BaseTool:
+    """
+    도구 호출마다 span을 기록하는 래퍼로 감싸기
+
+    Args:
+        tool: 감쌀 도구
+        span_prefix: span 이름 접두사 ("tool": LLM이 호출한 도구, "mcp": 실제 MCP 서버 호출)
+        tracer: 사용할 Tracer (생략 시 공용 Tracer)
+
+    Returns:
+        동일한 이름/스키마를 가지며 호출 구간(인자/결과 크기, 소요 시간)을 기록하는 도구
+        (코루틴이 없으면 원본 반환)
+    """
+    upstream = getattr(tool, "coroutine", None)
+    if upstream is None:
+        return tool
+
+    tool_name = tool.name
+
+    async def traced_call(**arguments: Any) -> Any:
+        active = tracer or get_tracer()
+        with active.start_as_current_span(
+            f"{span_prefix}.{tool_name}",
+            attributes={"tool.name": tool_name, "tool.args_bytes": _payload_size(arguments)}
+        ) as span:
+            result = await upstream(**arguments)
+            span.set_attribute("tool.result_bytes", _payload_size(result))
+            return result
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        coroutine=traced_call,
+        response_format=tool.response_format,
+        metadata=tool.metadata,
+        handle_tool_error=tool.handle_tool_error
+    )
+
+
+def trace_tools(tools: List[BaseTool], span_prefix: str = "tool") -> List[BaseTool]:
+    """도구 목록 전체에 span 기록 래퍼 적용"""
+    return [trace_tool(tool, span_prefix) for tool in tools]
+
+
+class TracingCallbackHandler(AsyncCallbackHandler):
+    """
+    LangGraph 실행의 그래프 단계와 LLM 호출을 span으로 기록
+
+    턴마다 새로 만들어 실행 설정의 callbacks로 전달합니다.
+    LangChain 실행 트리(run_id/parent_run_id)로 부모 span을 찾습니다.
+    """
+
+    def __init__(self, parent: Span, tracer: Optional[Tracer] = None):
+        """
+        콜백 핸들러 초기화
+
+        Args:
+            parent: 턴 span (그래프 단계 span의 부모)
+            tracer: 사용할 Tracer (생략 시 공용 Tracer)
+        """
+        self.parent = parent
+        self.tracer = tracer or get_tracer()
+        self._spans: Dict[UUID, Span] = {}
+        self._parents: Dict[UUID, Optional[UUID]] = {}
+        self._first_token: Dict[UUID, bool] = {}
+
+    def _parent_span(self, parent_run_id: Optional[UUID]) -> Span:
+        """실행 트리를 거슬러 올라가 가장 가까운 span 찾기"""
+        while parent_run_id is not None:
+            span = self._spans.get(parent_run_id)
+            if span is not None:
+                return span
+            parent_run_id = self._parents.get(parent_run_id)
+        return self.parent
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[Span]:
+        self._parents.pop(run_id, None)
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            if error is not None:
+                span.record_exception(error)
+            span.end()
+        return span
+
+    async def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> None:
+        self._parents[run_id] = parent_run_id
+        node = (metadata or {}).get("langgraph_node")
+        # 그래프 노드 실행 자체만 span으로 기록 (노드 내부 체인 제외)
+        if node is None or kwargs.get("name") != node:
+            return
+        self._spans[run_id] = self.tracer.start_span(
+            f"graph.step.{node}",
+            parent=self._parent_span(parent_run_id),
+            attributes={"langgraph.node": node, "langgraph.step": metadata.get("langgraph_step")}
+        )
+
+    async def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    async def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    async def on_chat_model_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> None:
+        self._parents[run_id] = parent_run_id
+        invocation_params = kwargs.get("invocation_params") or {}
+        self._first_token[run_id] = True
+        self._spans[run_id] = self.tracer.start_span(
+            "llm.chat",
+            parent=self._parent_span(parent_run_id),
+            attributes={
+                "gen_ai.operation.name": "chat",
+                "gen_ai.request.model": (metadata or {}).get("ls_model_name") or invocation_params.get("model"),
+                "llm.input_messages": sum(len(batch) for batch in messages)
+            }
+        )
+
+    async def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        if self._first_token.pop(run_id, False):
+            span = self._spans.get(run_id)
+            if span is not None:
+                span.set_attribute("llm.time_to_first_token_ms", round(span.duration_ms, 1))
+
+    async def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._first_token.pop(run_id, None)
+        span = self._spans.get(run_id)
+        if span is not None:
+            message = None
+            generations = getattr(response, "generations", None) or []
+            if generations and generations[0]:
+                message = getattr(generations[0][0], "message", None)
+            usage = getattr(message, "usage_metadata", None) or {}
+            span.set_attributes({
+                "gen_ai.usage.input_tokens": usage.get("input_tokens"),
+                "gen_ai.usage.output_tokens": usage.get("output_tokens"),
+                "llm.tool_calls": len(getattr(message, "tool_calls", None) or [])
+            })
+        self._end(run_id)
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._first_token.pop(run_id, None)
+        self._end(run_id, error)
@@ -1,12 +1,72 @@
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from .agents.logging_config import configure_logging, shutdown_logging
+from .agents.metrics import get_registry
+from .routers.chat import get_chat_service, router as chat_router
+from .services.health_service import HealthService
+
+logger = logging.getLogger(__name__)
+
+# 서버 시작 시 Agent 사전 초기화 여부 (false면 첫 요청 시 지연 초기화)
+AGENT_WARMUP_ENABLED = os.getenv("AGENT_WARMUP_ENABLED", "true").lower() == "true"
+
+# 단계별 헬스 체크 (live: 프로세스, ready: Agent/MCP 도구, deep: 실제 LLM 왕복)
+health_service = HealthService(get_chat_service)
+
+
+async def warmup_agent() -> dict:
+    """
+    ChatService 생성, MCP 서버 연결, 도구 로드, 그래프 컴파일을 미리 수행
+    
+    Returns:
+        단계별 소요 시간(초)
+    """
+    timings = {}
+    started = time.perf_counter()
+    
+    try:
+        chat_service = get_chat_service()
+        timings["chat_service_seconds"] = round(time.perf_counter() - started, 3)
+        
+        timings.update(await chat_service.shopping_agent.warmup())
+        timings["status"] = "ready"
+    except Exception as e:
+        # 사전 초기화 실패 시에도 서버는 기동하고 첫 요청에서 다시 초기화
+        detail = getattr(e, "detail", None) or str(e)
+        logger.error(f"Agent 사전 초기화 실패: {detail}")
+        timings["status"] = "failed"
+        timings["error"] = detail
+    
+    timings["total_seconds"] = round(time.perf_counter() - started, 3)
+    logger.info(f"Agent 사전 초기화 소요 시간: {timings}")
+    return timings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 비동기 로깅 설치 및 Agent를 미리 초기화하여 첫 요청의 콜드 스타트 제거"""
+    configure_logging()
+    try:
+        if AGENT_WARMUP_ENABLED:
+            health_service.startup_timings = await warmup_agent()
+        yield
+    finally:
+        # 큐에 남은 로그 출력
+        shutdown_logging()
 
-from .routers.chat import router as chat_router
 
 app = FastAPI(
     title="PriceFinder Agent API",
     description="최저가 쇼핑 Agent API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -28,6 +88,27 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/live")
+async def health_live():
+    return health_service.liveness()
+
+@app.get("/health/ready")
+async def health_ready():
+    result = await health_service.readiness()
+    status_code = 200 if result["status"] == "ready" else 503
+    return JSONResponse(content=result, status_code=status_code)
+
+@app.get("/health/deep")
+async def health_deep():
+    result = await health_service.deep()
+    status_code = 200 if result["status"] == "healthy" else 503
+    return JSONResponse(content=result, status_code=status_code)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return PlainTextResponse(await get_registry().arender(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -1,19 +1,49 @@
 """채팅 관련 API 라우터"""
+import asyncio
 import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+import os
+import time
+from contextlib import aclosing
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from sse_starlette.sse import EventSourceResponse
+from starlette.background import BackgroundTask
 
-from ..schemas.chat import ChatRequest
+from ..agents.config.agent_config import ADMISSION_QUEUE_TIMEOUT_SECONDS
+from ..agents.metrics import get_registry, stats_families
+from ..agents.shared_store import get_shared_store
+from ..agents.tracing import STATUS_ERROR, get_tracer
+from ..schemas.chat import ChatRequest, StreamingEvent
+from ..services.admission_service import AdmissionRejected, AdmissionService
 from ..services.chat_service import ChatService
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# DEBUG 로그에 남길 SSE 이벤트 데이터 최대 길이
+SSE_LOG_PREVIEW_LENGTH = 200
+
 # ChatService 싱글톤 인스턴스
 _chat_service_instance = None
 
+# Agent 실행 수락 제어 (프로세스당 하나, 멀티 워커 모드면 세션별 점유 한도는 워커 간 공유)
+admission_service = AdmissionService(store=get_shared_store())
+
+CHAT_REQUESTS = get_registry().counter("chat_requests_total", "POST /chat 요청 수", ("status",))
+CHAT_REQUESTS_ACCEPTED = CHAT_REQUESTS.labels("accepted")
+CHAT_REQUESTS_REJECTED = CHAT_REQUESTS.labels("rejected")
+CHAT_STREAMS_IN_FLIGHT = get_registry().gauge("chat_streams_in_flight", "진행 중인 SSE 응답 수 (대기 포함)")
+
+get_registry().register_collector(
+    "admission",
+    lambda: stats_families(
+        "chat_admission", "수락 제어", admission_service.stats(),
+        counters=("admitted", "rejected", "timed_out")
+    )
+)
+
 
 def get_chat_service() -> ChatService:
     """ChatService 의존성 주입 (싱글톤)"""
@@ -32,44 +62,204 @@ def get_chat_service() -> ChatService:
     return _chat_service_instance
 
 
+def get_admission_service() -> AdmissionService:
+    """AdmissionService 의존성 주입 (싱글톤)"""
+    return admission_service
+
+
+def verify_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """관리자 API 토큰 검증 (ADMIN_API_TOKEN 미설정 시 검증 생략)"""
+    admin_token = os.getenv("ADMIN_API_TOKEN")
+    if admin_token and x_admin_token != admin_token:
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
+
+
 @router.post("")
 async def chat(
     request: ChatRequest,
-    chat_service: ChatService = Depends(get_chat_service)
+    chat_service: ChatService = Depends(get_chat_service),
+    admission: AdmissionService = Depends(get_admission_service)
 ) -> EventSourceResponse:
     """
     채팅 메시지를 처리하고 스트리밍 응답을 반환
     
+    실행 슬롯이 없으면 대기열에서 기다리며 queued 이벤트로 대기 순번을 전달하고,
+    대기열이 가득 찼으면 429로 즉시 거절합니다.
+    클라이언트 연결이 끊기면 Agent 실행(LLM, 진행 중인 MCP 도구 호출 포함)을 취소합니다.
+    요청마다 trace를 시작하며 trace id를 X-Trace-Id 헤더와 각 이벤트의 trace_id로 전달합니다.
+    
     Args:
         request: 채팅 요청 데이터
         chat_service: 채팅 서비스 인스턴스
+        admission: 수락 제어 인스턴스
         
     Returns:
         EventSourceResponse: 스트리밍 응답
     """
-    logger.info(f"Chat request received: {request.message}")
+    logger.info(f"Chat request received - 세션: {request.session_id} ({len(request.message)}자)")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Chat request message - 세션: {request.session_id}: {request.message}")
+    
+    tracer = get_tracer()
+    request_span = tracer.start_span(
+        "POST /chat",
+        root=True,
+        attributes={"http.route": "/chat", "session.id": request.session_id}
+    )
+    trace_id = request_span.trace_id
+    
+    try:
+        ticket = await admission.aenqueue(request.session_id)
+    except AdmissionRejected as e:
+        CHAT_REQUESTS_REJECTED.inc()
+        request_span.set_attribute("http.status_code", 429)
+        request_span.set_status(STATUS_ERROR, str(e))
+        request_span.end()
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after_seconds), "X-Trace-Id": trace_id}
+        )
+    
+    request_span.set_attribute("http.status_code", 200)
+    wait_span = tracer.start_span("admission.wait", parent=request_span)
+    CHAT_REQUESTS_ACCEPTED.inc()
+    CHAT_STREAMS_IN_FLIGHT.inc()
     
     async def event_generator():
+        sse_span = None
+        sse_stats = {"sse.events": 0, "sse.bytes": 0, "sse.serialize_ns": 0}
         try:
-            async for event in chat_service.process_message(request):
-                # StreamingEvent를 JSON으로 직렬화하여 SSE 이벤트로 전송
-                print("yield event from process_message", event)
-                print("yield event from process_message.model_dump_json()", event.model_dump_json())
-                yield {
-                    "event": "message",
-                    "data": event.model_dump_json()
-                }
+            try:
+                async for position in ticket.updates(timeout_seconds=ADMISSION_QUEUE_TIMEOUT_SECONDS):
+                    wait_span.set_attribute("admission.position", position)
+                    queued_event = StreamingEvent(
+                        event_type="queued",
+                        data=f"요청이 많아 대기 중입니다. (대기 순번: {position})",
+                        metadata={"position": position},
+                        trace_id=trace_id
+                    )
+                    yield {"event": "message", "data": queued_event.model_dump_json()}
+            except asyncio.TimeoutError:
+                logger.warning(f"대기열 대기 시간 초과 - 세션: {request.session_id}")
+                wait_span.set_status(STATUS_ERROR, "queue timeout")
+                timeout_event = StreamingEvent(
+                    event_type="error",
+                    data="대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.",
+                    trace_id=trace_id
+                )
+                yield {"event": "message", "data": timeout_event.model_dump_json()}
+                return
+            finally:
+                wait_span.end()
+            
+            sse_span = tracer.start_span("sse.stream", parent=request_span)
+            # 이벤트별 상세 로그는 DEBUG일 때만 기록 (스트림마다 한 번 확인)
+            log_events = logger.isEnabledFor(logging.DEBUG)
+            # 스트림이 중단되면 process_message도 즉시 닫아 Agent 실행 태스크 취소
+            async with aclosing(chat_service.process_message(request, trace=request_span)) as events:
+                async for event in events:
+                    # StreamingEvent를 JSON으로 한 번만 직렬화하여 SSE 이벤트로 전송
+                    started = time.perf_counter_ns()
+                    event.trace_id = trace_id
+                    data = event.model_dump_json()
+                    sse_stats["sse.serialize_ns"] += time.perf_counter_ns() - started
+                    sse_stats["sse.events"] += 1
+                    sse_stats["sse.bytes"] += len(data)
+                    if log_events:
+                        logger.debug(
+                            "SSE event",
+                            extra={
+                                "session_id": request.session_id,
+                                "event_type": event.event_type,
+                                "event_bytes": len(data),
+                                "event_data": data[:SSE_LOG_PREVIEW_LENGTH]
+                            }
+                        )
+                    yield {
+                        "event": "message",
+                        "data": data
+                    }
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            logger.error(f"Error in chat stream: {str(e)}")
+            logger.exception(f"Error in chat stream: {str(e)}")
+            request_span.record_exception(e)
             yield {
                 "event": "error",
                 "data": json.dumps({
                     "event_type": "error",
                     "data": f"스트리밍 중 오류가 발생했습니다: {str(e)}",
-                    "session_id": request.session_id
+                    "session_id": request.session_id,
+                    "trace_id": trace_id
                 })
             }
+        except BaseException as e:
+            # 연결 종료로 인한 취소 기록
+            request_span.record_exception(e)
+            raise
+        finally:
+            if sse_span is not None:
+                serialize_ns = sse_stats.pop("sse.serialize_ns")
+                sse_span.set_attributes({**sse_stats, "sse.serialize_ms": round(serialize_ns / 1_000_000, 3)})
+                sse_span.end()
+            finish()
+    
+    def finish() -> None:
+        # 완료/오류/연결 종료 시 슬롯 반납 (대기 중이었으면 대기열에서 제거) 및 trace 종료
+        if request_span.ended:
+            return
+        ticket.release()
+        wait_span.end()
+        request_span.end()
+        CHAT_STREAMS_IN_FLIGHT.dec()
+    
+    events = event_generator()
+    
+    async def close_stream() -> None:
+        # 연결 종료로 전송이 중단되어 제너레이터가 yield에서 멈췄거나 시작되지 않은 경우에도 정리
+        await events.aclose()
+        finish()
+    
+    return EventSourceResponse(
+        events,
+        headers={"X-Trace-Id": trace_id},
+        background=BackgroundTask(close_stream)
+    )
+
+
+@router.delete("/sessions/{session_id}")
+async def clear_session(
+    session_id: str,
+    chat_service: ChatService = Depends(get_chat_service)
+) -> dict:
+    """
+    세션 대화 기록 삭제
+    
+    Args:
+        session_id: 삭제할 세션 ID
+        chat_service: 채팅 서비스 인스턴스
+        
+    Returns:
+        삭제 결과
+    """
+    result = await chat_service.clear_conversation(session_id)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=500, detail=result["error"])
+    return result
+
+
+@router.delete("/sessions", dependencies=[Depends(verify_admin_token)])
+async def purge_idle_sessions(
+    idle_seconds: Optional[float] = Query(None, ge=0, description="유휴 기준 시간(초)"),
+    chat_service: ChatService = Depends(get_chat_service)
+) -> dict:
+    """
+    유휴 세션 일괄 삭제 (관리자용)
     
-    return EventSourceResponse(event_generator()) 
\ No newline at end of file
+    Args:
+        idle_seconds: 마지막 활동 후 경과 시간 기준(초), 생략 시 서버 설정값
+        chat_service: 채팅 서비스 인스턴스
+        
+    Returns:
+        삭제된 세션 수와 목록
+    """
+    return await chat_service.purge_idle_sessions(idle_seconds)
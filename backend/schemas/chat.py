@@ -1,5 +1,5 @@
 """채팅 관련 데이터 스키마 정의"""
-from typing import List, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 from pydantic import BaseModel, Field
 
 
@@ -17,6 +17,9 @@ class ChatRequest(BaseModel):
     message: str = Field(..., description="사용자 메시지")
     session_id: str = Field(..., description="세션 ID")
     image_url: Optional[str] = Field(None, description="이미지 URL (이미지 검색 시)")
+    deadline_seconds: Optional[float] = Field(
+        None, gt=0, description="응답 제한 시간(초), 생략 시 서버 기본값 (서버 최대값으로 제한)"
+    )
 
 
 class ChatResponse(BaseModel):
@@ -27,8 +30,18 @@ class ChatResponse(BaseModel):
 
 
 class StreamingEvent(BaseModel):
-    """스트리밍 이벤트 스키마"""
-    event_type: Literal["message", "products", "error", "thinking", "search"] = Field(
-        ..., description="이벤트 타입"
-    )
-    data: str = Field(..., description="이벤트 데이터") 
\ No newline at end of file
+    """스트리밍 이벤트 스키마
+
+    - message_delta: LLM 토큰 단위 응답 조각 (data에 증분 텍스트)
+    - tool_start: 도구 호출 시작 (metadata에 tool_name, tool_input)
+    - tool_end: 도구 호출 결과 (metadata에 tool_name, data에 결과 요약)
+    - partial_message: 제한 시간/단계 초과로 중단된 턴의 부분 답변 (metadata에 reason)
+    - queued: 실행 슬롯 대기 중 (metadata에 대기 순번 position)
+    """
+    event_type: Literal[
+        "message", "message_delta", "partial_message", "products", "error", "thinking", "search",
+        "tool_start", "tool_end", "queued"
+    ] = Field(..., description="이벤트 타입")
+    data: str = Field(..., description="이벤트 데이터")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="이벤트 부가 정보")
+    trace_id: Optional[str] = Field(None, description="요청 trace id (서버 로그/trace 조회용)")
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+백엔드 서버 실행 진입점 (멀티 워커 지원)
+
+워커가 2개 이상이면 대화 메모리, 캐시, 세션 실행 권한, 세션별 요청 수 제한을 워커 간에 공유하도록
+SQLite 기반 공유 상태를 기본으로 켭니다 (같은 세션의 요청이 어느 워커로 가도 이어서 대화 가능).
+
+실행:
+    python -m backend.serve --workers 4 --port 8000
+
+gunicorn 사용 시에는 같은 환경 변수를 직접 설정합니다 (--preload 없이 실행):
+    SHARED_STATE_BACKEND=sqlite CHECKPOINTER_BACKEND=sqlite \\
+        gunicorn backend.main:app -k uvicorn.workers.UvicornWorker -w 4 -b 0.0.0.0:8000
+"""
+import argparse
+import os
+
+import uvicorn
+
+
+def configure_workers(workers: int) -> None:
+    """
+    워커 수에 맞는 공유 상태 환경 변수 기본값 설정 (이미 설정된 값은 유지)
+
+    워커 프로세스는 이 환경 변수를 상속받아 backend 모듈을 import합니다.
+
+    Args:
+        workers: 워커 프로세스 수
+    """
+    if workers > 1:
+        os.environ.setdefault("SHARED_STATE_BACKEND", "sqlite")
+        os.environ.setdefault("CHECKPOINTER_BACKEND", "sqlite")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PriceFinder 백엔드 서버")
+    parser.add_argument("--app", default="backend.main:app", help="ASGI 앱 경로")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+        help="워커 프로세스 수 (기본: WEB_CONCURRENCY 또는 1)"
+    )
+    parser.add_argument("--log-level", default="info", help="uvicorn 로그 레벨")
+    args = parser.parse_args()
+
+    configure_workers(args.workers)
+    uvicorn.run(args.app, host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""채팅 요청 수락 제어(admission control) 모듈"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from ..agents.config.agent_config import (
+    ADMISSION_MAX_CONCURRENT,
+    ADMISSION_MAX_PER_SESSION,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_SESSION_LEASE_SECONDS
+)
+from ..agents.shared_store import SqliteSharedStore
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 차 요청을 수락할 수 없음"""
+
+    def __init__(self, message: str, retry_after_seconds: int = 1):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+class AdmissionTicket:
+    """요청 하나의 실행 슬롯 예약"""
+
+    def __init__(self, controller: "AdmissionService", session_id: str):
+        """
+        예약 생성 (AdmissionService.enqueue()로만 생성)
+
+        Args:
+            controller: 예약을 발급한 AdmissionService
+            session_id: 요청 세션 ID
+        """
+        self.controller = controller
+        self.session_id = session_id
+        self.ticket_id = uuid.uuid4().hex
+        self.granted = False
+        self.released = False
+        self.enqueued_at = time.monotonic()
+        self.granted_at: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def wait_seconds(self) -> float:
+        """슬롯을 얻기까지 기다린 시간(초)"""
+        end = self.granted_at if self.granted_at is not None else time.monotonic()
+        return end - self.enqueued_at
+
+    def position(self) -> int:
+        """대기 순번 (1부터, 실행 중이면 0)"""
+        return self.controller.position(self)
+
+    async def updates(self, timeout_seconds: Optional[float] = None) -> AsyncIterator[int]:
+        """
+        슬롯을 얻을 때까지 대기하며 대기 순번이 바뀔 때마다 반환
+
+        Args:
+            timeout_seconds: 최대 대기 시간(초), 생략 시 무제한
+
+        Yields:
+            대기 순번 (즉시 실행 가능하면 아무것도 반환하지 않음)
+
+        Raises:
+            asyncio.TimeoutError: 최대 대기 시간 초과
+        """
+        deadline = None if timeout_seconds is None else self.enqueued_at + timeout_seconds
+        last_position = None
+        while not self.granted:
+            position = self.position()
+            if position != last_position:
+                last_position = position
+                yield position
+            self._changed.clear()
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                self.controller.timed_out += 1
+                raise
+
+    def release(self) -> None:
+        """실행 슬롯 반납 또는 대기 취소 (여러 번 호출해도 안전)"""
+        self.controller.release(self)
+
+
+class AdmissionService:
+    """
+    Agent 실행 수락 제어
+
+    - 동시 실행 수를 제한하고 나머지는 제한된 크기의 대기열에서 대기
+    - 대기열이 가득 차면 즉시 거절 (HTTP 429)
+    - 세션별 점유 요청 수를 제한하고 세션 간 라운드 로빈으로 슬롯을 배정하여
+      한 사용자가 슬롯을 독점하지 못하도록 함
+    - 동시 실행 수/대기열은 워커별, 세션별 점유 한도는 공유 저장소가 있으면 전체 워커 기준
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = ADMISSION_MAX_CONCURRENT,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        max_per_session: int = ADMISSION_MAX_PER_SESSION,
+        store: Optional[SqliteSharedStore] = None
+    ):
+        """
+        AdmissionService 초기화
+
+        Args:
+            max_concurrent: 최대 동시 실행 수
+            max_queue: 최대 대기 요청 수
+            max_per_session: 세션별 최대 점유(실행 + 대기) 요청 수
+            store: 워커 간 공유 상태 저장소 (있으면 세션별 점유 수를 모든 워커에서 합산)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_per_session = max_per_session
+        self.store = store
+
+        self.running = 0
+        self._held_by_session: Dict[str, int] = {}
+        # 세션별 대기열 (세션 순서대로 라운드 로빈 배정)
+        self._waiting: "OrderedDict[str, Deque[AdmissionTicket]]" = OrderedDict()
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait_seconds = 0.0
+        # 진행 중인 공유 저장소 점유 해제와 취소된 요청의 점유 기록 (이벤트 루프를 막지 않도록 스레드에서 실행)
+        self._unhold_tasks: set = set()
+
+    @property
+    def queued(self) -> int:
+        """대기 중인 요청 수"""
+        return sum(len(tickets) for tickets in self._waiting.values())
+
+    def enqueue(self, session_id: str) -> AdmissionTicket:
+        """
+        실행 슬롯 예약
+
+        슬롯이 비어 있으면 바로 배정하고, 아니면 대기열에 넣습니다.
+
+        Args:
+            session_id: 요청 세션 ID
+
+        Returns:
+            예약 (granted가 False이면 updates()로 대기)
+
+        Raises:
+            AdmissionRejected: 세션 점유 한도 초과 또는 대기열이 가득 참
+        """
+        ticket = AdmissionTicket(self, session_id)
+        return self._admit(ticket, self._hold_session(ticket))
+
+    async def aenqueue(self, session_id: str) -> AdmissionTicket:
+        """
+        enqueue()의 비동기 버전 (공유 저장소의 세션 점유 기록을 스레드에서 실행)
+
+        Args:
+            session_id: 요청 세션 ID
+
+        Returns:
+            예약 (granted가 False이면 updates()로 대기)
+
+        Raises:
+            AdmissionRejected: 세션 점유 한도 초과 또는 대기열이 가득 참
+        """
+        ticket = AdmissionTicket(self, session_id)
+        if self.store is None:
+            return self._admit(ticket, self._hold_session(ticket))
+        acquire = asyncio.ensure_future(self.store.atry_acquire(
+            f"admission:{ticket.session_id}", ticket.ticket_id,
+            ADMISSION_SESSION_LEASE_SECONDS, limit=self.max_per_session
+        ))
+        try:
+            held = await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # 스레드의 점유 기록이 끝난 뒤 해제 (먼저 해제하면 늦게 기록된 점유가 남음)
+            self._unhold_tasks.add(acquire)
+            acquire.add_done_callback(lambda task: self._on_acquire_abandoned(task, ticket))
+            raise
+        return self._admit(ticket, held)
+
+    def _on_acquire_abandoned(self, task: asyncio.Future, ticket: AdmissionTicket) -> None:
+        """취소된 요청의 점유 기록이 끝나면 해제"""
+        self._unhold_tasks.discard(task)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error(f"세션 점유 기록 실패: {str(task.exception())}")
+        elif task.result():
+            self._unhold_session(ticket)
+
+    def _admit(self, ticket: AdmissionTicket, held: bool) -> AdmissionTicket:
+        """세션 점유 확인 결과에 따라 예약을 대기열에 넣거나 거절"""
+        session_id = ticket.session_id
+        if not held:
+            self.rejected += 1
+            raise AdmissionRejected(
+                f"세션당 동시 요청 한도({self.max_per_session}개)를 초과했습니다. 이전 요청이 끝난 뒤 다시 시도해주세요."
+            )
+        if self.running >= self.max_concurrent and self.queued >= self.max_queue:
+            self._unhold_session(ticket)
+            self.rejected += 1
+            logger.warning(f"대기열 가득 참 - 요청 거절 (실행 {self.running}, 대기 {self.queued})")
+            raise AdmissionRejected("요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.", retry_after_seconds=5)
+
+        self._held_by_session[session_id] = self._held_by_session.get(session_id, 0) + 1
+        self._waiting.setdefault(session_id, deque()).append(ticket)
+        self._dispatch()
+        return ticket
+
+    def _hold_session(self, ticket: AdmissionTicket) -> bool:
+        """세션 점유 한도 확인 및 점유 기록 (공유 저장소가 있으면 전체 워커 기준)"""
+        if self.store is not None:
+            return self.store.try_acquire(
+                f"admission:{ticket.session_id}", ticket.ticket_id,
+                ADMISSION_SESSION_LEASE_SECONDS, limit=self.max_per_session
+            )
+        return self._held_by_session.get(ticket.session_id, 0) < self.max_per_session
+
+    def _unhold_session(self, ticket: AdmissionTicket) -> None:
+        """공유 저장소의 세션 점유 기록 해제 (이벤트 루프에서는 스레드에서 실행하고 기다리지 않음)"""
+        if self.store is None:
+            return
+        name = f"admission:{ticket.session_id}"
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.store.release(name, ticket.ticket_id)
+            return
+        task = asyncio.ensure_future(self.store.arelease(name, ticket.ticket_id))
+        self._unhold_tasks.add(task)
+        task.add_done_callback(self._on_unheld)
+
+    def _on_unheld(self, task: asyncio.Future) -> None:
+        """점유 해제 완료 처리 (실패해도 ADMISSION_SESSION_LEASE_SECONDS 뒤 만료)"""
+        self._unhold_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"세션 점유 기록 해제 실패: {str(task.exception())}")
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 세션 간 라운드 로빈으로 배정하고 대기 순번 변경 알림"""
+        while self.running < self.max_concurrent and self._waiting:
+            session_id, tickets = next(iter(self._waiting.items()))
+            ticket = tickets.popleft()
+            if tickets:
+                # 같은 세션의 다음 요청은 다른 세션들 뒤로
+                self._waiting.move_to_end(session_id)
+            else:
+                del self._waiting[session_id]
+
+            ticket.granted = True
+            ticket.granted_at = time.monotonic()
+            self.running += 1
+            self.admitted += 1
+            self.total_wait_seconds += ticket.wait_seconds
+            ticket._changed.set()
+
+        for tickets in self._waiting.values():
+            for ticket in tickets:
+                ticket._changed.set()
+
+    def position(self, ticket: AdmissionTicket) -> int:
+        """
+        예약의 대기 순번 계산 (라운드 로빈 배정 순서 기준)
+
+        Args:
+            ticket: 예약
+
+        Returns:
+            대기 순번 (1부터, 실행 중이거나 반납되었으면 0)
+        """
+        if ticket.granted or ticket.released:
+            return 0
+        queues = [list(tickets) for tickets in self._waiting.values()]
+        position = 0
+        for depth in range(max((len(tickets) for tickets in queues), default=0)):
+            for tickets in queues:
+                if depth < len(tickets):
+                    position += 1
+                    if tickets[depth] is ticket:
+                        return position
+        return 0
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        """
+        실행 슬롯 반납 또는 대기 취소
+
+        Args:
+            ticket: 예약
+        """
+        if ticket.released:
+            return
+        ticket.released = True
+        self._unhold_session(ticket)
+
+        held = self._held_by_session.get(ticket.session_id, 0) - 1
+        if held > 0:
+            self._held_by_session[ticket.session_id] = held
+        else:
+            self._held_by_session.pop(ticket.session_id, None)
+
+        if ticket.granted:
+            self.running -= 1
+        else:
+            tickets = self._waiting.get(ticket.session_id)
+            if tickets is not None and ticket in tickets:
+                tickets.remove(ticket)
+                if not tickets:
+                    del self._waiting[ticket.session_id]
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """수락 제어 통계 반환"""
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.admitted, 4) if self.admitted else 0.0
+        }
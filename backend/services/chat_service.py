@@ -1,24 +1,79 @@
 """채팅 서비스 모듈"""
+import asyncio
 import json
 import logging
 import os
-from typing import AsyncGenerator
+import time
+import uuid
+from typing import AsyncGenerator, Dict, List, Optional
 from dotenv import load_dotenv
 
 from ..schemas.chat import ChatRequest, StreamingEvent
 from ..agents.shopping_agent import ShoppingReactAgent
+from ..agents.metrics import MetricFamily, get_registry, stats_families
+from ..agents.shared_store import SqliteSharedStore, get_shared_store
+from ..agents.tracing import Span, current_span, get_tracer
+from ..agents.config.agent_config import (
+    AGENT_TURN_DEADLINE_SECONDS,
+    AGENT_TURN_MAX_DEADLINE_SECONDS,
+    SESSION_GENERATION_TTL_SECONDS,
+    SESSION_LEASE_POLL_SECONDS,
+    SESSION_LEASE_SECONDS
+)
 
 # .env 파일 로드
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# tool_end 이벤트로 전달할 도구 결과 미리보기 최대 길이
+TOOL_OUTPUT_PREVIEW_LENGTH = 500
+
+# 같은 세션에 새 요청이 들어오면 진행 중/대기 중인 이전 요청 중단 (false면 순서대로 처리)
+SESSION_SUPERSEDE_ENABLED = os.getenv("SESSION_SUPERSEDE_ENABLED", "true").lower() == "true"
+
+# Agent 실행 태스크 종료 표시
+_TURN_END = object()
+
+AGENT_RUNS_IN_FLIGHT = get_registry().gauge("agent_runs_in_flight", "실행 중인 Agent 턴 수")
+
+
+class SessionTurn:
+    """세션에서 처리 중이거나 대기 중인 요청 하나"""
+    
+    def __init__(self, session_id: str):
+        """
+        SessionTurn 초기화
+        
+        Args:
+            session_id: 세션 ID
+        """
+        self.session_id = session_id
+        self.superseded = False
+        # 실행 중인 Agent 태스크 (대기 중이면 None)
+        self.task: Optional[asyncio.Future] = None
+        # 멀티 워커 모드: 세션 실행 권한 보유자 ID, 세션 요청 번호 (더 큰 번호가 생기면 대체됨)
+        self.owner = uuid.uuid4().hex
+        self.generation: Optional[int] = None
+        self.lease_held = False
+    
+    def supersede(self) -> None:
+        """새 요청으로 대체 (실행 중이면 Agent 태스크 취소)"""
+        self.superseded = True
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
 
 class ChatService:
     """채팅 관련 비즈니스 로직을 처리하는 서비스 클래스"""
     
-    def __init__(self):
-        """ChatService 초기화"""
+    def __init__(self, store: Optional[SqliteSharedStore] = None):
+        """
+        ChatService 초기화
+        
+        Args:
+            store: 워커 간 공유 상태 저장소 (생략 시 SHARED_STATE_BACKEND 설정, 없으면 단일 워커 모드)
+        """
         # 환경변수에서 API 키 가져오기
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
         self.brave_api_key = os.getenv("BRAVE_API_KEY")
@@ -26,26 +81,92 @@ class ChatService:
         if not self.google_api_key:
             raise ValueError("GOOGLE_API_KEY 환경변수가 설정되지 않았습니다.")
         
+        # 멀티 워커 모드면 세션 실행 권한과 캐시를 워커 간 공유
+        self.store = store or get_shared_store()
+        
         # 단일 ShoppingReactAgent 인스턴스 (멀티턴 대화 지원)
         self.shopping_agent = ShoppingReactAgent(
             google_api_key=self.google_api_key,
-            brave_api_key=self.brave_api_key
+            brave_api_key=self.brave_api_key,
+            store=self.store
         )
         
+        # 토큰 단위 스트리밍 모드 (기본 활성화)
+        self.streaming_enabled = os.getenv("AGENT_STREAMING_ENABLED", "true").lower() == "true"
+        
+        # 세션별 직렬화 (같은 thread_id에 대한 동시 실행 방지)
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._session_turns: Dict[str, List[SessionTurn]] = {}
+        self.superseded_turns = 0
+        
+        # 캐시/메모리 통계는 /metrics 요청 시에만 읽음
+        get_registry().register_collector("chat_service", self._collect_metrics)
+        
         logger.info("ChatService 초기화 완료 (멀티턴 대화 지원)")
     
-    async def process_message(self, request: ChatRequest) -> AsyncGenerator[StreamingEvent, None]:
+    def _collect_metrics(self) -> List[MetricFamily]:
+        """세션/캐시/가격 인덱스/대화 메모리/모델 라우팅 통계를 메트릭으로 변환"""
+        agent = self.shopping_agent
+        families: List[MetricFamily] = [
+            ("chat_superseded_turns_total", "counter", "새 요청으로 중단된 턴 수", [({}, self.superseded_turns)]),
+            ("chat_active_sessions", "gauge", "처리 중이거나 대기 중인 요청이 있는 세션 수", [({}, len(self._session_turns))])
+        ]
+        cache_counters = ("hits", "misses", "evictions", "coalesced", "cancelled")
+        if agent.query_cache is not None:
+            families += stats_families("query_cache", "검색 결과 캐시", agent.query_cache.stats(), cache_counters)
+        if agent.tool_cache is not None:
+            families += stats_families("tool_cache", "MCP 도구 호출 캐시", agent.tool_cache.stats(), cache_counters)
+        if agent.price_index is not None:
+            families += stats_families("price_index", "관측 가격 인덱스", agent.price_index.stats(), cache_counters)
+        families += stats_families(
+            "checkpoint", "대화 메모리", agent.memory_stats(), ("evicted_threads",)
+        )
+        if agent.model_router is not None:
+            stats = agent.model_router.stats()
+            families.append(("model_routing_fast_ratio", "gauge", "빠른 모델로 처리한 LLM 호출 비율", [({}, stats["fast_ratio"])]))
+        return families
+    
+    async def process_message(
+        self,
+        request: ChatRequest,
+        trace: Optional[Span] = None
+    ) -> AsyncGenerator[StreamingEvent, None]:
         """
         메시지 처리 및 스트리밍 응답 생성 (멀티턴 대화 지원)
         
+        같은 세션의 요청은 한 번에 하나씩 처리합니다. SESSION_SUPERSEDE_ENABLED이면
+        새 요청이 들어올 때 같은 세션에서 진행 중이거나 대기 중인 이전 요청을 중단합니다.
+        멀티 워커 모드(공유 저장소 사용)에서는 세션 실행 권한으로 워커 간에도 한 번에 하나씩 처리하고,
+        다른 워커로 들어온 새 요청도 이전 요청을 중단합니다 (세션 고정 라우팅 불필요).
+        턴 처리 구간(세션 대기, Agent 실행)은 trace 아래에 span으로 기록합니다.
+        
         Args:
             request: 채팅 요청
+            trace: 부모 span (생략 시 새 trace 시작)
             
         Yields:
             StreamingEvent: 스트리밍 이벤트
         """
+        tracer = get_tracer()
+        turn_span = tracer.start_span(
+            "chat.turn",
+            parent=trace,
+            root=trace is None,
+            attributes={"session.id": request.session_id, "chat.streaming": self.streaming_enabled}
+        )
+        wait_span = None
+        turn = self._begin_turn(request.session_id)
         try:
-            logger.info(f"메시지 처리 시작 - 세션: {request.session_id}, 메시지: {request.message}")
+            if SESSION_SUPERSEDE_ENABLED and self.store is not None:
+                # 다른 워커의 이전 턴은 세션 요청 번호가 바뀐 것을 보고 스스로 중단
+                turn.generation = await self.store.aincr(
+                    self._session_key("session_generation", request.session_id),
+                    ttl_seconds=SESSION_GENERATION_TTL_SECONDS
+                )
+            logger.info(f"메시지 처리 시작 - 세션: {request.session_id} ({len(request.message)}자)")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"메시지 내용 - 세션: {request.session_id}: {request.message}")
+            deadline = self._deadline(request)
             
             # 처리 시작 이벤트
             yield StreamingEvent(
@@ -53,42 +174,410 @@ class ChatService:
                 data="요청을 분석하고 있습니다..."
             )
             
-            # 검색 시작 이벤트
+            lock = self._session_locks[request.session_id]
+            busy = lock.locked()
+            if busy:
+                yield self._session_busy_event()
+            
+            wait_span = tracer.start_span("session.wait", parent=turn_span, attributes={"session.busy": busy})
+            async with lock:
+                if self.store is not None and not turn.superseded and not await self._try_session_lease(turn):
+                    # 다른 워커가 같은 세션을 처리 중
+                    wait_span.set_attribute("session.remote_busy", True)
+                    if not busy:
+                        yield self._session_busy_event()
+                    await self._wait_session_lease(turn)
+                wait_span.end()
+                if turn.superseded:
+                    turn_span.set_attribute("chat.outcome", "superseded")
+                    yield self._superseded_event()
+                    return
+                
+                # 검색 시작 이벤트
+                yield StreamingEvent(
+                    event_type="search",
+                    data="상품 정보를 검색하고 있습니다..."
+                )
+                
+                async for event in self._run_turn(turn, request, deadline, turn_span):
+                    if event.event_type in ("message", "partial_message", "error"):
+                        turn_span.set_attribute("chat.outcome", (event.metadata or {}).get("reason") or event.event_type)
+                    yield event
+            
+        except Exception as e:
+            logger.error(f"메시지 처리 중 오류 발생: {str(e)}")
+            turn_span.record_exception(e)
             yield StreamingEvent(
-                event_type="search",
-                data="상품 정보를 검색하고 있습니다..."
+                event_type="error",
+                data=f"처리 중 오류가 발생했습니다: {str(e)}"
             )
+        except BaseException as e:
+            # 연결 종료/대체로 인한 취소 기록
+            turn_span.record_exception(e)
+            raise
+        finally:
+            if turn.lease_held:
+                await self._release_session_lease(turn)
+            self._end_turn(turn)
+            if wait_span is not None:
+                wait_span.end()
+            turn_span.end()
+    
+    def _begin_turn(self, session_id: str) -> SessionTurn:
+        """
+        세션 턴 등록 (설정 시 같은 세션의 이전 턴 중단)
+        
+        Args:
+            session_id: 세션 ID
             
-            # ShoppingReactAgent를 통해 처리 (세션 컨텍스트 포함)
-            result = await self.shopping_agent.search_products(
-                query=request.message,
-                session_id=request.session_id
+        Returns:
+            등록된 턴
+        """
+        turns = self._session_turns.setdefault(session_id, [])
+        if SESSION_SUPERSEDE_ENABLED:
+            for previous in turns:
+                if not previous.superseded:
+                    logger.info(f"같은 세션의 새 요청으로 이전 턴 중단 - 세션: {session_id}")
+                    previous.supersede()
+                    self.superseded_turns += 1
+        
+        turn = SessionTurn(session_id)
+        turns.append(turn)
+        self._session_locks.setdefault(session_id, asyncio.Lock())
+        return turn
+    
+    def _end_turn(self, turn: SessionTurn) -> None:
+        """세션 턴 등록 해제 (남은 턴이 없으면 세션 잠금도 정리)"""
+        turns = self._session_turns.get(turn.session_id)
+        if turns is None:
+            return
+        if turn in turns:
+            turns.remove(turn)
+        if not turns:
+            del self._session_turns[turn.session_id]
+            self._session_locks.pop(turn.session_id, None)
+    
+    @staticmethod
+    def _session_key(kind: str, session_id: str) -> str:
+        """공유 저장소의 세션별 키"""
+        return f"{kind}:{session_id}"
+    
+    async def _try_session_lease(self, turn: SessionTurn) -> bool:
+        """세션 실행 권한 획득 시도 (멀티 워커 모드)"""
+        try:
+            turn.lease_held = await self.store.atry_acquire(
+                self._session_key("session", turn.session_id), turn.owner, SESSION_LEASE_SECONDS
             )
-            
-            # 에러 처리
-            if "error" in result:
-                logger.error(f"Agent 처리 오류: {result['error']}")
-                yield StreamingEvent(
-                    event_type="error",
-                    data=result["error"]
-                )
+        except asyncio.CancelledError:
+            # 스레드에서는 획득했을 수 있으므로 종료 시 반납 대상으로 표시
+            turn.lease_held = True
+            raise
+        return turn.lease_held
+    
+    async def _check_remote_supersede(self, turn: SessionTurn) -> bool:
+        """
+        다른 워커로 같은 세션의 새 요청이 들어왔는지 확인하고, 그렇다면 턴을 대체 처리
+        
+        Returns:
+            턴이 대체되었으면 True
+        """
+        if turn.superseded:
+            return True
+        if turn.generation is None:
+            return False
+        latest = await self.store.aread(self._session_key("session_generation", turn.session_id))
+        # 0: 대화 초기화/유휴 정리로 요청 번호가 삭제된 뒤 새 요청이 아직 없음
+        if latest in (0, turn.generation):
+            return False
+        logger.info(f"다른 워커로 들어온 새 요청으로 이전 턴 중단 - 세션: {turn.session_id}")
+        turn.supersede()
+        self.superseded_turns += 1
+        return True
+    
+    async def _wait_session_lease(self, turn: SessionTurn) -> None:
+        """다른 워커가 세션 실행 권한을 반납할 때까지 대기 (그동안 대체되면 종료)"""
+        while not await self._check_remote_supersede(turn):
+            await asyncio.sleep(SESSION_LEASE_POLL_SECONDS)
+            if await self._try_session_lease(turn):
                 return
+    
+    async def _watch_session(self, turn: SessionTurn) -> None:
+        """실행 중 세션 실행 권한 갱신 및 다른 워커로 들어온 새 요청 확인"""
+        renew_interval = SESSION_LEASE_SECONDS / 3
+        renewed_at = time.monotonic()
+        while not await self._check_remote_supersede(turn):
+            await asyncio.sleep(SESSION_LEASE_POLL_SECONDS)
+            if time.monotonic() - renewed_at >= renew_interval:
+                renewed_at = time.monotonic()
+                if not await self.store.arenew(
+                    self._session_key("session", turn.session_id), turn.owner, SESSION_LEASE_SECONDS
+                ):
+                    logger.warning(f"세션 실행 권한 만료 - 세션: {turn.session_id}")
+    
+    async def _release_session_lease(self, turn: SessionTurn) -> None:
+        """대화 메모리 기록을 반영한 뒤 세션 실행 권한 반납 (다음 워커가 이번 턴까지의 대화를 읽도록)"""
+        try:
+            await self.shopping_agent.flush_memory()
+        except Exception as e:
+            logger.error(f"대화 메모리 기록 실패 - 세션: {turn.session_id}: {str(e)}")
+        finally:
+            turn.lease_held = False
+            await self.store.arelease(self._session_key("session", turn.session_id), turn.owner)
+    
+    @staticmethod
+    def _session_busy_event() -> StreamingEvent:
+        """같은 세션의 이전 요청 대기 이벤트"""
+        return StreamingEvent(
+            event_type="queued",
+            data="같은 대화의 이전 요청이 끝나기를 기다리고 있습니다...",
+            metadata={"reason": "session_busy"}
+        )
+    
+    @staticmethod
+    def _superseded_event() -> StreamingEvent:
+        """새 요청으로 대체되어 중단된 턴의 이벤트"""
+        return StreamingEvent(
+            event_type="error",
+            data="같은 대화의 새 요청이 들어와 이전 요청 처리를 중단했습니다.",
+            metadata={"reason": "superseded"}
+        )
+    
+    async def _run_turn(
+        self,
+        turn: SessionTurn,
+        request: ChatRequest,
+        deadline: float,
+        parent: Optional[Span] = None
+    ) -> AsyncGenerator[StreamingEvent, None]:
+        """
+        Agent 실행을 별도 태스크로 돌리며 이벤트 전달
+        
+        턴이 대체되면 실행 태스크를 취소하여 LangGraph 실행과 도구 호출을 함께 중단합니다.
+        실행 태스크 안에서는 agent.run span이 현재 span이 되어 그래프 단계/LLM/도구 span의 부모가 됩니다.
+        
+        Args:
+            turn: 세션 턴
+            request: 채팅 요청
+            deadline: 턴 제한 시각 (time.monotonic() 기준)
+            parent: 부모 span
+            
+        Yields:
+            StreamingEvent: Agent 이벤트
+        """
+        if turn.superseded:
+            yield self._superseded_event()
+            return
+        
+        events: asyncio.Queue = asyncio.Queue()
+        
+        async def pump() -> None:
+            AGENT_RUNS_IN_FLIGHT.inc()
+            try:
+                with get_tracer().start_as_current_span("agent.run", parent=parent):
+                    async for event in self._agent_events(request, deadline):
+                        events.put_nowait(event)
+            finally:
+                AGENT_RUNS_IN_FLIGHT.dec()
+                events.put_nowait(_TURN_END)
+        
+        task = asyncio.ensure_future(pump())
+        turn.task = task
+        watcher = asyncio.ensure_future(self._watch_session(turn)) if turn.lease_held else None
+        try:
+            while True:
+                event = await events.get()
+                if event is _TURN_END:
+                    break
+                yield event
             
-            # 성공 응답
-            response_text = result.get("response", "응답을 생성하지 못했습니다.")
-            logger.info(f"응답 생성 완료 - 세션: {request.session_id}")
+            if task.cancelled():
+                yield self._superseded_event()
+            else:
+                # 실행 중 발생한 예외 전달
+                task.result()
+        finally:
+            turn.task = None
+            if watcher is not None:
+                watcher.cancel()
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+    
+    async def _agent_events(self, request: ChatRequest, deadline: float) -> AsyncGenerator[StreamingEvent, None]:
+        """
+        Agent 실행 결과를 StreamingEvent로 변환 (스트리밍 설정에 따라 토큰/일괄 응답)
+        
+        Args:
+            request: 채팅 요청
+            deadline: 턴 제한 시각 (time.monotonic() 기준)
             
+        Yields:
+            StreamingEvent: Agent 이벤트
+        """
+        if self.streaming_enabled:
+            # LangGraph 이벤트 스트림을 그대로 StreamingEvent로 전달
+            async for event in self._stream_agent(request, deadline):
+                yield event
+            return
+        
+        # ShoppingReactAgent를 통해 처리 (세션 컨텍스트 포함)
+        result = await self.shopping_agent.search_products(
+            query=request.message,
+            session_id=request.session_id,
+            deadline=deadline
+        )
+        
+        # 에러 처리
+        if "error" in result:
+            logger.error(f"Agent 처리 오류: {result['error']}")
+            yield StreamingEvent(
+                event_type="error",
+                data=result["error"]
+            )
+            return
+        
+        self._annotate_run(result)
+        
+        # 성공 응답
+        response_text = result.get("response", "응답을 생성하지 못했습니다.")
+        logger.info(f"응답 생성 완료 - 세션: {request.session_id}")
+        
+        if result.get("partial"):
+            yield self._partial_event(response_text, result.get("partial_reason"))
+        else:
             yield StreamingEvent(
                 event_type="message",
                 data=response_text
             )
+        
+        products_event = self._products_event(result.get("products"))
+        if products_event is not None:
+            yield products_event
+    
+    @staticmethod
+    def _annotate_run(result: dict) -> None:
+        """Agent 실행 결과의 응답 경로(캐시, 가격 인덱스, 부분 응답)를 현재 span에 기록"""
+        span = current_span()
+        if span is None:
+            return
+        span.set_attributes({
+            "agent.cached": bool(result.get("cached")),
+            "agent.price_index": bool(result.get("price_index")),
+            "agent.partial_reason": result.get("reason") or result.get("partial_reason"),
+            "agent.products": len(result.get("products") or [])
+        })
+    
+    @staticmethod
+    def _deadline(request: ChatRequest) -> float:
+        """
+        요청의 턴 제한 시각 계산
+        
+        Args:
+            request: 채팅 요청 (deadline_seconds 생략 시 서버 기본값)
             
-        except Exception as e:
-            logger.error(f"메시지 처리 중 오류 발생: {str(e)}")
-            yield StreamingEvent(
-                event_type="error",
-                data=f"처리 중 오류가 발생했습니다: {str(e)}"
-            )
+        Returns:
+            제한 시각 (time.monotonic() 기준, 서버 최대값으로 제한)
+        """
+        budget = min(request.deadline_seconds or AGENT_TURN_DEADLINE_SECONDS, AGENT_TURN_MAX_DEADLINE_SECONDS)
+        return time.monotonic() + budget
+    
+    @staticmethod
+    def _partial_event(content: str, reason: Optional[str]) -> StreamingEvent:
+        """제한 시간/단계 초과로 중단된 턴의 부분 답변 이벤트 생성"""
+        return StreamingEvent(
+            event_type="partial_message",
+            data=content,
+            metadata={"reason": reason}
+        )
+    
+    @staticmethod
+    def _products_event(products: Optional[list]) -> Optional[StreamingEvent]:
+        """
+        구조화된 상품 목록을 products 이벤트로 변환
+        
+        Args:
+            products: Product 필드를 가진 딕셔너리 목록
+            
+        Returns:
+            products 이벤트 (상품이 없으면 None)
+        """
+        if not products:
+            return None
+        return StreamingEvent(
+            event_type="products",
+            data=json.dumps(products, ensure_ascii=False),
+            metadata={"count": len(products)}
+        )
+    
+    async def _stream_agent(self, request: ChatRequest, deadline: float) -> AsyncGenerator[StreamingEvent, None]:
+        """
+        Agent 스트리밍 이벤트를 StreamingEvent로 변환
+        
+        Args:
+            request: 채팅 요청
+            deadline: 턴 제한 시각 (time.monotonic() 기준)
+            
+        Yields:
+            StreamingEvent: 토큰/도구 진행/최종 메시지 이벤트
+        """
+        async for item in self.shopping_agent.stream_search_products(
+            query=request.message,
+            session_id=request.session_id,
+            deadline=deadline
+        ):
+            item_type = item.get("type")
+            
+            if item_type == "token":
+                yield StreamingEvent(
+                    event_type="message_delta",
+                    data=item["content"]
+                )
+            
+            elif item_type == "tool_start":
+                yield StreamingEvent(
+                    event_type="tool_start",
+                    data=f"{item['tool_name']} 도구를 실행하고 있습니다...",
+                    metadata={
+                        "tool_name": item["tool_name"],
+                        "tool_input": item.get("tool_input")
+                    }
+                )
+            
+            elif item_type == "tool_end":
+                yield StreamingEvent(
+                    event_type="tool_end",
+                    data=item.get("output", "")[:TOOL_OUTPUT_PREVIEW_LENGTH],
+                    metadata={"tool_name": item["tool_name"]}
+                )
+            
+            elif item_type == "final":
+                logger.info(f"응답 생성 완료 - 세션: {request.session_id}")
+                self._annotate_run(item)
+                yield StreamingEvent(
+                    event_type="message",
+                    data=item["content"]
+                )
+                
+                products_event = self._products_event(item.get("products"))
+                if products_event is not None:
+                    yield products_event
+            
+            elif item_type == "partial":
+                logger.warning(f"부분 응답 반환 ({item.get('reason')}) - 세션: {request.session_id}")
+                self._annotate_run(item)
+                yield self._partial_event(item["content"], item.get("reason"))
+                
+                products_event = self._products_event(item.get("products"))
+                if products_event is not None:
+                    yield products_event
+            
+            elif item_type == "error":
+                logger.error(f"Agent 처리 오류: {item['error']}")
+                yield StreamingEvent(
+                    event_type="error",
+                    data=item["error"]
+                )
+                return
     
     async def get_conversation_history(self, session_id: str) -> dict:
         """
@@ -101,13 +590,14 @@ class ChatService:
             대화 기록 정보
         """
         try:
-            # Agent의 상태 확인을 통해 세션 정보 확인
-            health_status = await self.shopping_agent.health_check(session_id)
+            # 저장된 대화 메모리만 조회 (LLM 호출 없음)
+            session_info = await self.shopping_agent.get_session_info(session_id)
             
             return {
                 "session_id": session_id,
-                "status": "active" if health_status.get("status") == "healthy" else "inactive",
-                "memory_enabled": health_status.get("memory_enabled", False),
+                "status": "active" if session_info["exists"] else "inactive",
+                "memory_enabled": True,
+                "message_count": session_info["message_count"],
                 "message": "멀티턴 대화가 활성화되어 있습니다."
             }
             
@@ -130,9 +620,10 @@ class ChatService:
             초기화 결과
         """
         try:
-            # 새로운 Agent 인스턴스로 교체하여 메모리 초기화
-            # (실제로는 LangGraph의 메모리에서 해당 thread_id 삭제가 더 효율적이지만,
-            # 현재 MemorySaver는 간단한 구현이므로 이 방법 사용)
+            # LangGraph 메모리에서 해당 thread_id의 체크포인트 전체 삭제
+            await self.shopping_agent.clear_session(session_id)
+            if self.store is not None:
+                await self.store.adelete_counter(self._session_key("session_generation", session_id))
             logger.info(f"세션 {session_id}의 대화 기록 초기화")
             
             return {
@@ -147,4 +638,26 @@ class ChatService:
                 "session_id": session_id,
                 "status": "error",
                 "error": str(e)
-            } 
\ No newline at end of file
+            }
+    
+    async def purge_idle_sessions(self, idle_seconds: Optional[float] = None) -> dict:
+        """
+        유휴 세션 일괄 정리
+        
+        Args:
+            idle_seconds: 마지막 활동 후 경과 시간 기준(초), 생략 시 checkpointer 기본값
+            
+        Returns:
+            정리 결과 (삭제된 세션 수/목록, 정리 후 메모리 통계)
+        """
+        purged = await self.shopping_agent.purge_idle_sessions(idle_seconds)
+        if self.store is not None:
+            for session_id in purged:
+                await self.store.adelete_counter(self._session_key("session_generation", session_id))
+        
+        return {
+            "status": "purged",
+            "purged_count": len(purged),
+            "session_ids": purged,
+            "memory": await self.shopping_agent.amemory_stats()
+        }
@@ -0,0 +1,145 @@
+"""헬스 체크 서비스 모듈"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+from dotenv import load_dotenv
+
+from ..agents.cache import TTLCache
+from .chat_service import ChatService
+
+# .env 파일 로드
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# readiness 결과 캐시 시간 (로드밸런서 프로브가 매번 MCP를 점검하지 않도록)
+HEALTH_READINESS_CACHE_SECONDS = float(os.getenv("HEALTH_READINESS_CACHE_SECONDS", "10"))
+# deep 점검(실제 LLM 호출) 최소 간격
+HEALTH_DEEP_MIN_INTERVAL_SECONDS = float(os.getenv("HEALTH_DEEP_MIN_INTERVAL_SECONDS", "60"))
+# 점검 1회당 제한 시간
+HEALTH_PROBE_TIMEOUT_SECONDS = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "10"))
+
+
+class HealthService:
+    """
+    단계별 헬스 체크
+
+    - liveness: 프로세스 내부 상태만 확인 (외부 호출 없음)
+    - readiness: Agent/MCP 도구 로드 여부 확인 (LLM 호출 없음, 결과 캐시)
+    - deep: 일회용 세션으로 실제 LLM 왕복 확인 (호출 간격 제한)
+    """
+
+    def __init__(
+        self,
+        chat_service_provider: Callable[[], ChatService],
+        readiness_cache_seconds: float = HEALTH_READINESS_CACHE_SECONDS,
+        deep_min_interval_seconds: float = HEALTH_DEEP_MIN_INTERVAL_SECONDS,
+        probe_timeout_seconds: float = HEALTH_PROBE_TIMEOUT_SECONDS
+    ):
+        """
+        HealthService 초기화
+
+        Args:
+            chat_service_provider: ChatService 인스턴스를 반환하는 함수
+            readiness_cache_seconds: readiness 결과 캐시 시간(초)
+            deep_min_interval_seconds: deep 점검 최소 간격(초)
+            probe_timeout_seconds: 점검 1회당 제한 시간(초)
+        """
+        self.chat_service_provider = chat_service_provider
+        self.deep_min_interval_seconds = deep_min_interval_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+
+        self._started_at = time.monotonic()
+        self._readiness_cache = TTLCache(max_size=1, ttl_seconds=readiness_cache_seconds)
+        self._deep_lock = asyncio.Lock()
+        self._last_deep_at: Optional[float] = None
+        self._last_deep_result: Optional[Dict[str, Any]] = None
+        # 서버 시작 시 사전 초기화 단계별 소요 시간 (lifespan에서 기록)
+        self.startup_timings: Dict[str, Any] = {}
+
+    def liveness(self) -> Dict[str, Any]:
+        """
+        프로세스 생존 여부 확인
+
+        Returns:
+            상태 및 가동 시간
+        """
+        return {
+            "status": "alive",
+            "uptime_seconds": round(time.monotonic() - self._started_at, 3)
+        }
+
+    async def readiness(self) -> Dict[str, Any]:
+        """
+        요청 처리 준비 여부 확인 (Agent 초기화 및 MCP 도구 로드)
+
+        Returns:
+            상태 정보 (status가 "ready"가 아니면 트래픽을 받지 않아야 함)
+        """
+        cached = self._readiness_cache.get("readiness")
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        try:
+            chat_service = self.chat_service_provider()
+            tools_info = await asyncio.wait_for(
+                chat_service.shopping_agent.check_tools(),
+                timeout=self.probe_timeout_seconds
+            )
+            if tools_info["tool_count"] > 0:
+                result = {"status": "ready", **tools_info}
+            else:
+                result = {"status": "not_ready", "error": "사용 가능한 MCP 도구가 없습니다.", **tools_info}
+
+        except asyncio.TimeoutError:
+            result = {"status": "not_ready", "error": "readiness 점검 시간 초과"}
+        except Exception as e:
+            logger.error(f"readiness 점검 실패: {str(e)}")
+            result = {"status": "not_ready", "error": str(e)}
+
+        if self.startup_timings:
+            result["startup"] = self.startup_timings
+        self._readiness_cache.set("readiness", result)
+        return {**result, "cached": False}
+
+    async def deep(self) -> Dict[str, Any]:
+        """
+        실제 LLM 호출을 포함한 심층 점검
+
+        호출 간격 제한 내에서는 마지막 결과를 그대로 반환합니다.
+
+        Returns:
+            상태 정보
+        """
+        async with self._deep_lock:
+            now = time.monotonic()
+            if (
+                self._last_deep_result is not None
+                and now - self._last_deep_at < self.deep_min_interval_seconds
+            ):
+                return {**self._last_deep_result, "rate_limited": True}
+
+            try:
+                chat_service = self.chat_service_provider()
+                # session_id 생략 시 일회용 스레드를 사용하고 점검 후 삭제
+                agent_status = await asyncio.wait_for(
+                    chat_service.shopping_agent.health_check(),
+                    timeout=self.probe_timeout_seconds
+                )
+                result = {
+                    "status": agent_status.get("status", "unhealthy"),
+                    "error": agent_status.get("error")
+                }
+
+            except asyncio.TimeoutError:
+                result = {"status": "unhealthy", "error": "deep 점검 시간 초과"}
+            except Exception as e:
+                logger.error(f"deep 점검 실패: {str(e)}")
+                result = {"status": "unhealthy", "error": str(e)}
+
+            result["checked_at"] = time.time()
+            self._last_deep_at = now
+            self._last_deep_result = result
+            return {**result, "rate_limited": False}
@@ -0,0 +1,112 @@
+"""
+프론트엔드 API 클라이언트 요청 지연 시간 벤치마크
+- 요청마다 새 이벤트 루프/연결을 만드는 방식과 공유 연결 풀 방식을 비교
+- SSE 응답을 모두 모은 뒤 렌더링하는 방식과 도착 즉시 렌더링하는 방식의 첫 화면 갱신 시간 비교
+(로컬 서버 사용, API 키 불필요)
+
+실행:
+    python -m benchmarks.api_client_benchmark --requests 200 --stream-events 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from sse_starlette.sse import EventSourceResponse
+
+from frontend.utils import api_client
+
+app = FastAPI()
+
+
+# SSE 이벤트 간격(초)
+STREAM_EVENT_INTERVAL_SECONDS = 0.05
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy"}
+
+
+@app.post("/chat")
+async def chat():
+    async def events():
+        for index in range(app.state.stream_events):
+            await asyncio.sleep(STREAM_EVENT_INTERVAL_SECONDS)
+            yield {"data": json.dumps({"event_type": "message_delta", "data": f"토큰{index} "})}
+    return EventSourceResponse(events())
+
+
+def _start_server(port: int) -> uvicorn.Server:
+    """로컬 테스트 서버를 백그라운드 스레드에서 실행"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def _legacy_health_check(url: str) -> dict:
+    """기존 방식: 요청마다 asyncio.run() + 새 httpx.AsyncClient"""
+    async def request():
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(url)
+            return response.json()
+    return asyncio.run(request())
+
+
+def _measure(label: str, func, count: int) -> None:
+    """요청 count회 지연 시간 측정 및 출력"""
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        result = func()
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert result.get("status") == "healthy", result
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:>8}: mean={statistics.mean(latencies):.2f}ms "
+          f"p50={statistics.median(latencies):.2f}ms p95={p95:.2f}ms")
+
+
+def _measure_first_paint(label: str, events_factory) -> None:
+    """첫 이벤트를 받기까지의 시간과 전체 완료 시간 측정"""
+    started = time.perf_counter()
+    first_paint = None
+    for _ in events_factory():
+        if first_paint is None:
+            first_paint = (time.perf_counter() - started) * 1000
+    total = (time.perf_counter() - started) * 1000
+    print(f"{label:>8}: first_paint={first_paint:.1f}ms total={total:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API 클라이언트 요청 지연 시간 비교")
+    parser.add_argument("--requests", type=int, default=200, help="방식별 요청 수")
+    parser.add_argument("--port", type=int, default=8765, help="로컬 서버 포트")
+    parser.add_argument("--stream-events", type=int, default=20, help="SSE 응답 이벤트 수")
+    args = parser.parse_args()
+    app.state.stream_events = args.stream_events
+
+    server = _start_server(args.port)
+    base_url = f"http://127.0.0.1:{args.port}"
+    api_client.get_shared_client().base_url = base_url
+
+    _measure("legacy", lambda: _legacy_health_check(f"{base_url}/health"), args.requests)
+    _measure("pooled", api_client.sync_health_check, args.requests)
+
+    print()
+    _measure_first_paint("buffered", lambda: api_client.sync_send_message_stream("아이폰", "bench"))
+    _measure_first_paint("stream", lambda: api_client.iter_send_message_stream("아이폰", "bench"))
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+채팅 처리량/지연 시간 부하 벤치마크
+- 실제 ShoppingReactAgent 그래프(도구 래퍼, 쇼핑몰 병렬 검색, 체크포인터 포함)를
+  스크립트 LLM과 로컬 검색 MCP 서버로 실행하여 동시 클라이언트 N개의 부하를 측정
+- service 모드: ChatService.process_message 직접 호출
+- http 모드: uvicorn으로 띄운 backend.main:app의 POST /chat에 SSE 클라이언트로 요청 (수락 제어 포함)
+- 총 지연/첫 토큰 지연의 p50/p95/p99, 처리량, 오류 수, 메모리(RSS) 보고
+(API 키 불필요, 검색 서버가 같은 프로세스에서 실행되므로 메모리에는 검색 서버 사용량도 포함)
+
+실행:
+    python -m benchmarks.chat_load_benchmark --mode service --clients 16 --requests 5
+    python -m benchmarks.chat_load_benchmark --mode http --clients 32 --requests 3 --llm-latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from benchmarks.offline_stack import (
+    PRODUCTS,
+    build_offline_chat_service,
+    configure_offline_env,
+    free_port,
+    start_search_server,
+    start_server
+)
+
+
+def _rss_mb() -> float:
+    """현재 프로세스 RSS(MB), /proc가 없으면 0"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 (밀리초)"""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    if len(values) == 1:
+        value = round(values[0] * 1000, 1)
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {name: round(cuts[index] * 1000, 1) for name, index in (("p50", 49), ("p95", 94), ("p99", 98))}
+
+
+class RequestResult:
+    """요청 1회 측정 결과"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.outcome = "error"
+
+    def on_event(self, event_type: str) -> None:
+        """이벤트 수신 시각 기록"""
+        if self.first_token is None and event_type in ("message_delta", "message"):
+            self.first_token = time.perf_counter() - self.started
+        if event_type in ("message", "partial_message"):
+            self.outcome = "ok" if event_type == "message" else "partial"
+        elif event_type == "error":
+            self.outcome = "error"
+
+    def finish(self) -> None:
+        self.finished = time.perf_counter() - self.started
+
+
+async def _service_request(service: Any, session_id: str, product: str) -> RequestResult:
+    """ChatService.process_message 직접 호출"""
+    from backend.schemas.chat import ChatRequest
+
+    result = RequestResult()
+    try:
+        async for event in service.process_message(ChatRequest(message=product, session_id=session_id)):
+            result.on_event(event.event_type)
+    except Exception:
+        result.outcome = "error"
+    result.finish()
+    return result
+
+
+async def _http_request(client: Any, url: str, session_id: str, product: str) -> RequestResult:
+    """POST /chat SSE 스트림 수신"""
+    result = RequestResult()
+    try:
+        async with client.stream("POST", url, json={"message": product, "session_id": session_id}) as response:
+            if response.status_code == 429:
+                result.outcome = "rejected"
+            else:
+                async for line in response.aiter_lines():
+                    if line.startswith("data:"):
+                        result.on_event(json.loads(line[5:]).get("event_type", ""))
+    except Exception:
+        result.outcome = "error"
+    result.finish()
+    return result
+
+
+async def run_load(args: argparse.Namespace, send) -> Dict[str, Any]:
+    """
+    클라이언트별로 요청을 순차 전송하는 동시 클라이언트 부하 실행
+
+    Args:
+        args: 명령행 인자
+        send: (session_id, product) → RequestResult 코루틴 함수
+
+    Returns:
+        측정 결과 요약
+    """
+    async def client(index: int) -> List[RequestResult]:
+        session_id = f"load-{index}-{uuid.uuid4().hex[:6]}"
+        results = []
+        for turn in range(args.requests):
+            results.append(await send(session_id, PRODUCTS[(index + turn) % len(PRODUCTS)]))
+        return results
+
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    per_client = await asyncio.gather(*(client(index) for index in range(args.clients)))
+    elapsed = time.perf_counter() - started
+
+    results = [result for results in per_client for result in results]
+    completed = [result for result in results if result.outcome in ("ok", "partial")]
+    outcomes: Dict[str, int] = {}
+    for result in results:
+        outcomes[result.outcome] = outcomes.get(result.outcome, 0) + 1
+
+    return {
+        "mode": args.mode,
+        "clients": args.clients,
+        "requests": len(results),
+        "outcomes": outcomes,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(completed) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": _percentiles([result.finished for result in completed]),
+        "first_token_ms": _percentiles([result.first_token for result in completed if result.first_token is not None]),
+        "rss_mb_before": round(rss_before, 1),
+        "rss_mb_after": round(_rss_mb(), 1),
+        # Linux에서 ru_maxrss 단위는 KB
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+async def run_service_mode(args: argparse.Namespace) -> Dict[str, Any]:
+    """service 모드: ChatService를 직접 호출"""
+    service = build_offline_chat_service(args.llm_latency, args.token_delay)
+    await service.shopping_agent.warmup()
+    return await run_load(args, lambda session_id, product: _service_request(service, session_id, product))
+
+
+async def run_http_mode(args: argparse.Namespace) -> Dict[str, Any]:
+    """http 모드: backend.main:app을 uvicorn으로 실행하고 SSE 클라이언트로 요청"""
+    import httpx
+
+    from backend.main import app
+    from backend.routers import chat as chat_router
+
+    # 서버 기동(lifespan 사전 초기화) 전에 오프라인 ChatService 주입
+    chat_router._chat_service_instance = build_offline_chat_service(args.llm_latency, args.token_delay)
+    port = free_port()
+    server = await asyncio.to_thread(start_server, app, port)
+    try:
+        limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+        async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+            url = f"http://127.0.0.1:{port}/chat"
+            return await run_load(args, lambda session_id, product: _http_request(client, url, session_id, product))
+    finally:
+        server.should_exit = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="오프라인 채팅 부하 벤치마크")
+    parser.add_argument("--mode", choices=["service", "http"], default="service")
+    parser.add_argument("--clients", type=int, default=8, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=3, help="클라이언트당 요청 수 (순차)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="LLM 호출 1회 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="스트리밍 토큰 간격(초)")
+    parser.add_argument("--tool-latency", type=float, default=0.3, help="검색 MCP 호출 1회 평균 지연(초)")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="http 모드 ADMISSION_MAX_CONCURRENT")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    search_server, mcp_url = start_search_server(args.tool_latency)
+    overrides = {}
+    if args.max_concurrent is not None:
+        overrides["ADMISSION_MAX_CONCURRENT"] = str(args.max_concurrent)
+    configure_offline_env(mcp_url, overrides)
+
+    runner = run_http_mode if args.mode == "http" else run_service_mode
+    try:
+        summary = asyncio.run(runner(args))
+    finally:
+        search_server.should_exit = True
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False))
+        return
+
+    print(f"모드: {summary['mode']}, 클라이언트 {summary['clients']}개, 요청 {summary['requests']}개")
+    print(f"결과: {summary['outcomes']}")
+    print(f"소요 시간: {summary['elapsed_seconds']}초, 처리량: {summary['throughput_rps']} req/s")
+    print(f"총 지연(ms): {summary['latency_ms']}")
+    print(f"첫 토큰 지연(ms): {summary['first_token_ms']}")
+    print(
+        f"메모리(MB): RSS {summary['rss_mb_before']} → {summary['rss_mb_after']}, "
+        f"최대 RSS {summary['max_rss_mb']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Checkpointer 부하 벤치마크
+가짜 LLM 기반 React Agent로 턴당 지연 시간을 checkpointer 백엔드별로 비교
+
+실행:
+    python -m benchmarks.checkpointer_benchmark --threads 50 --turns 10
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.prebuilt import create_react_agent
+
+from backend.agents.checkpointers import BoundedMemorySaver
+from backend.agents.sqlite_checkpointer import SqliteCheckpointSaver
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    """백분위 지연 시간 계산"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_backend(name: str, checkpointer, threads: int, turns: int, reply_size: int) -> Dict[str, float]:
+    """
+    하나의 checkpointer로 부하 실행
+
+    Args:
+        name: 백엔드 이름
+        checkpointer: 측정할 checkpointer
+        threads: 동시 대화 스레드 수
+        turns: 스레드당 턴 수
+        reply_size: 가짜 응답 길이 (도구 결과가 큰 대화를 흉내냄)
+
+    Returns:
+        턴당 지연 시간 통계(ms)
+    """
+    reply = "가" * reply_size
+    model = GenericFakeChatModel(messages=(AIMessage(content=reply) for _ in itertools.count()))
+    graph = create_react_agent(model=model, tools=[], prompt="벤치마크", checkpointer=checkpointer)
+
+    latencies: List[float] = []
+
+    async def conversation(thread_index: int) -> None:
+        config = {"configurable": {"thread_id": f"bench-{thread_index}"}}
+        for turn in range(turns):
+            started = time.perf_counter()
+            await graph.ainvoke({"messages": [("user", f"질문 {turn}")]}, config=config)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[conversation(i) for i in range(threads)])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "backend": name,
+        "turns": len(latencies),
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "turns_per_sec": len(latencies) / elapsed
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Checkpointer 턴당 지연 시간 벤치마크")
+    parser.add_argument("--threads", type=int, default=50, help="동시 대화 스레드 수")
+    parser.add_argument("--turns", type=int, default=10, help="스레드당 턴 수")
+    parser.add_argument("--reply-size", type=int, default=2000, help="응답 길이(문자)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        backends = {
+            "memory": MemorySaver(),
+            "bounded": BoundedMemorySaver(),
+            "sqlite": SqliteCheckpointSaver(path=os.path.join(tmp_dir, "bench.db")),
+        }
+
+        print(f"threads={args.threads} turns={args.turns} reply_size={args.reply_size}")
+        print(f"{'backend':<10}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'turns/s':>12}")
+        for name, checkpointer in backends.items():
+            result = await run_backend(name, checkpointer, args.threads, args.turns, args.reply_size)
+            print(
+                f"{name:<10}{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['turns_per_sec']:>12.1f}"
+            )
+            if hasattr(checkpointer, "stats"):
+                print(f"  stats: {checkpointer.stats()}")
+            if hasattr(checkpointer, "close"):
+                checkpointer.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
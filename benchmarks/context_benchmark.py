@@ -0,0 +1,69 @@
+"""
+컨텍스트 관리 프롬프트 크기 벤치마크
+대화 길이에 따른 턴당 프롬프트 토큰(추정)을 컨텍스트 관리 전/후로 비교
+
+실행:
+    python -m benchmarks.context_benchmark --turns 15 --tool-output-size 4000
+"""
+import argparse
+import asyncio
+import itertools
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from backend.agents.context import ContextManager
+
+
+def _turn_messages(index: int, tool_output_size: int) -> list:
+    """도구 호출 두 번을 포함한 한 턴의 메시지"""
+    messages = [HumanMessage(content=f"{index}번째 상품 최저가 찾아줘", id=f"h{index}")]
+    for call in range(2):
+        call_id = f"c{index}-{call}"
+        messages.append(AIMessage(
+            content="",
+            tool_calls=[{"name": "web_search", "args": {"query": f"상품 {index}"}, "id": call_id}],
+            id=f"a{index}-{call}"
+        ))
+        messages.append(ToolMessage(content="검색결과 " * (tool_output_size // 5), tool_call_id=call_id, id=f"t{index}-{call}"))
+    messages.append(AIMessage(content="최저가 TOP 3 안내 " * 40, id=f"r{index}"))
+    return messages
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="턴당 프롬프트 토큰 비교")
+    parser.add_argument("--turns", type=int, default=15, help="대화 턴 수")
+    parser.add_argument("--tool-output-size", type=int, default=4000, help="도구 결과 길이(문자)")
+    parser.add_argument("--recent-turns", type=int, default=3, help="그대로 유지할 최근 턴 수")
+    args = parser.parse_args()
+
+    summarizer = GenericFakeChatModel(
+        messages=(AIMessage(content="사용자는 여러 상품의 최저가를 비교 중 " * 10) for _ in itertools.count())
+    )
+    trim_only = ContextManager(max_recent_turns=args.recent_turns)
+    with_summary = ContextManager(max_recent_turns=args.recent_turns, summarizer_model=summarizer)
+
+    history = []
+    state = {}
+    print(f"{'turn':>5}{'baseline':>12}{'trim':>12}{'summary':>12}")
+    for turn in range(args.turns):
+        history.extend(_turn_messages(turn, args.tool_output_size))
+
+        await trim_only.pre_model_hook({"messages": history})
+        update = await with_summary.pre_model_hook({**state, "messages": history})
+        state.update({key: value for key, value in update.items() if key != "llm_input_messages"})
+
+        print(
+            f"{turn + 1:>5}{trim_only.stats['last_tokens_before']:>12}"
+            f"{trim_only.stats['last_tokens_after']:>12}{with_summary.stats['last_tokens_after']:>12}"
+        )
+
+    baseline_total = trim_only.stats["tokens_before_total"]
+    print(f"\n누적 프롬프트 토큰: baseline={baseline_total} "
+          f"trim={trim_only.stats['tokens_after_total']} "
+          f"summary={with_summary.stats['tokens_after_total']} "
+          f"(요약 {with_summary.stats['summaries']}회)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+쇼핑몰 검색 지연 시간 벤치마크
+- 쇼핑몰마다 LLM→도구→LLM 왕복을 반복하는 순차 ReAct 루프와
+  search_all_malls 도구 한 번으로 동시에 검색하는 방식 비교
+(스크립트로 응답하는 가짜 LLM과 지연 시간을 흉내 내는 검색 도구 사용, API 키 불필요)
+
+실행:
+    python -m benchmarks.mall_search_benchmark --llm-latency 0.8 --tool-latency 0.6 --runs 3
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import create_react_agent
+
+from backend.agents.config.agent_config import MALL_SEARCH_MALLS
+from backend.agents.mcp_adapters.mall_search import MALL_SEARCH_TOOL_NAME, MallFanoutSearch
+
+MALL_DOMAINS = {
+    "네이버쇼핑": "https://shopping.naver.com/products/",
+    "쿠팡": "https://www.coupang.com/vp/products/",
+    "11번가": "https://www.11st.co.kr/products/",
+    "G마켓": "https://item.gmarket.co.kr/",
+    "옥션": "https://itempage3.auction.co.kr/"
+}
+
+FINAL_ANSWER = "🏆 최저가 TOP 3\n\n1️⃣ 아이폰 15 128GB - 1,120,000원\n   📍 판매처: G마켓"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """정해진 응답을 순서대로 반환하는 가짜 LLM (호출마다 고정 지연)"""
+
+    responses: List[AIMessage]
+    latency: float = 0.5
+    index: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise NotImplementedError
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        message = self.responses[self.index]
+        self.index += 1
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _make_search_tool(latency: float) -> StructuredTool:
+    """쇼핑몰별 지연 시간(latency의 0.5~1.5배)을 흉내 내는 검색 도구"""
+    async def web_search_exa(query: str) -> str:
+        mall = query.split(" ", 1)[0]
+        index = MALL_SEARCH_MALLS.index(mall) if mall in MALL_SEARCH_MALLS else 0
+        await asyncio.sleep(latency * (0.5 + index / max(len(MALL_SEARCH_MALLS) - 1, 1)))
+        url = MALL_DOMAINS.get(mall, "https://www.coupang.com/vp/products/") + str(index)
+        return json.dumps(
+            {"results": [{"title": f"아이폰 15 128GB {1_100_000 + index * 10_000:,}원", "url": url}]},
+            ensure_ascii=False
+        )
+
+    return StructuredTool.from_function(coroutine=web_search_exa, name="web_search_exa", description="웹 검색")
+
+
+def _tool_call(name: str, query: str, index: int) -> AIMessage:
+    """도구 호출 하나를 요청하는 모델 응답"""
+    return AIMessage(content="", tool_calls=[{"name": name, "args": {"query": query}, "id": f"call_{index}"}])
+
+
+async def _run_sequential(llm_latency: float, tool_latency: float) -> float:
+    """쇼핑몰마다 도구를 한 번씩 순차 호출하는 ReAct 루프"""
+    responses = [
+        _tool_call("web_search_exa", f"{mall} 아이폰 15 가격", index)
+        for index, mall in enumerate(MALL_SEARCH_MALLS)
+    ] + [AIMessage(content=FINAL_ANSWER)]
+    agent = create_react_agent(
+        ScriptedChatModel(responses=responses, latency=llm_latency),
+        [_make_search_tool(tool_latency)]
+    )
+    started = time.perf_counter()
+    await agent.ainvoke({"messages": [("user", "아이폰 15 최저가")]})
+    return time.perf_counter() - started
+
+
+async def _run_fanout(llm_latency: float, tool_latency: float, timeout: float) -> float:
+    """search_all_malls 한 번으로 모든 쇼핑몰을 동시에 검색"""
+    fanout = MallFanoutSearch(_make_search_tool(tool_latency), MALL_SEARCH_MALLS, timeout_seconds=timeout)
+    responses = [_tool_call(MALL_SEARCH_TOOL_NAME, "아이폰 15", 0), AIMessage(content=FINAL_ANSWER)]
+    agent = create_react_agent(
+        ScriptedChatModel(responses=responses, latency=llm_latency),
+        [fanout.as_tool()]
+    )
+    started = time.perf_counter()
+    await agent.ainvoke({"messages": [("user", "아이폰 15 최저가")]})
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="순차 쇼핑몰 검색과 병렬 검색 지연 시간 비교")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="LLM 호출 1회 지연(초)")
+    parser.add_argument("--tool-latency", type=float, default=0.6, help="쇼핑몰 검색 1회 평균 지연(초)")
+    parser.add_argument("--timeout", type=float, default=8.0, help="쇼핑몰별 검색 제한 시간(초)")
+    parser.add_argument("--runs", type=int, default=3, help="방식별 반복 횟수")
+    args = parser.parse_args()
+
+    print(f"쇼핑몰 {len(MALL_SEARCH_MALLS)}곳: {', '.join(MALL_SEARCH_MALLS)}")
+    for label, run in (
+        ("sequential", lambda: _run_sequential(args.llm_latency, args.tool_latency)),
+        ("fanout", lambda: _run_fanout(args.llm_latency, args.tool_latency, args.timeout))
+    ):
+        latencies = [await run() for _ in range(args.runs)]
+        print(f"{label:>10}: mean={statistics.mean(latencies):.2f}s "
+              f"min={min(latencies):.2f}s max={max(latencies):.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
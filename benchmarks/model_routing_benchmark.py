@@ -0,0 +1,108 @@
+"""
+모델 라우팅 전/후 턴 지연 시간 비교 벤치마크
+- 실제 ShoppingReactAgent 그래프를 스크립트 LLM + 로컬 검색 MCP 서버로 실행
+- 세션마다 상품 검색 → 후속 질문 → 감사 인사 → 비교 질문 순서의 대화를 진행하고
+  강한 모델만 사용할 때와 빠른 모델로 라우팅할 때의 질문 유형별 평균 지연 시간 비교
+(API 키 불필요, 빠른/강한 모델의 차이는 LLM 호출 지연 시간으로만 모사)
+
+실행:
+    python -m benchmarks.model_routing_benchmark --sessions 8 --llm-latency 0.8 --fast-llm-latency 0.3
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from benchmarks.offline_stack import PRODUCTS, build_offline_chat_service, configure_offline_env, start_search_server
+
+# (질문 유형, 메시지 템플릿)
+CONVERSATION = [
+    ("search", "{product}"),
+    ("follow_up", "그거 더 싼 거 있어?"),
+    ("smalltalk", "고마워"),
+    ("compare", "{product}랑 {other} 비교해줘")
+]
+
+
+async def run_conversations(args: argparse.Namespace, fast_llm_latency: Optional[float]) -> Dict[str, Any]:
+    """
+    세션별 대화를 동시에 실행하고 질문 유형별 지연 시간 측정
+
+    Args:
+        args: 명령행 인자
+        fast_llm_latency: 빠른 모델 지연(초) (None이면 라우팅 없이 강한 모델만 사용)
+
+    Returns:
+        질문 유형별 평균 지연(ms)과 라우팅 통계
+    """
+    from backend.schemas.chat import ChatRequest
+
+    service = build_offline_chat_service(args.llm_latency, args.token_delay, fast_llm_latency=fast_llm_latency)
+    await service.shopping_agent.warmup()
+    latencies: Dict[str, List[float]] = {kind: [] for kind, _ in CONVERSATION}
+
+    async def conversation(index: int) -> None:
+        session_id = f"routing-{index}-{uuid.uuid4().hex[:6]}"
+        product = PRODUCTS[index % len(PRODUCTS)]
+        other = PRODUCTS[(index + 1) % len(PRODUCTS)]
+        for kind, template in CONVERSATION:
+            message = template.format(product=product, other=other)
+            started = time.perf_counter()
+            async for _ in service.process_message(ChatRequest(message=message, session_id=session_id)):
+                pass
+            latencies[kind].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(conversation(index) for index in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+
+    router = service.shopping_agent.model_router
+    return {
+        "routing": router is not None,
+        "elapsed_seconds": round(elapsed, 3),
+        "mean_turn_ms": {kind: round(statistics.mean(values) * 1000, 1) for kind, values in latencies.items()},
+        "router": router.stats() if router is not None else {}
+    }
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    baseline = await run_conversations(args, None)
+    routed = await run_conversations(args, args.fast_llm_latency)
+    return [baseline, routed]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="모델 라우팅 전/후 턴 지연 시간 비교")
+    parser.add_argument("--sessions", type=int, default=8, help="동시 대화 세션 수")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="강한 모델 호출 1회 지연(초)")
+    parser.add_argument("--fast-llm-latency", type=float, default=0.3, help="빠른 모델 호출 1회 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="스트리밍 토큰 간격(초)")
+    parser.add_argument("--tool-latency", type=float, default=0.2, help="검색 MCP 호출 1회 평균 지연(초)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    search_server, mcp_url = start_search_server(args.tool_latency)
+    configure_offline_env(mcp_url)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        search_server.should_exit = True
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False))
+        return
+
+    kinds = [kind for kind, _ in CONVERSATION]
+    print(f"세션 {args.sessions}개, 강한 모델 {args.llm_latency}s / 빠른 모델 {args.fast_llm_latency}s")
+    print(f"{'라우팅':>6} | " + " | ".join(f"{kind:>10}" for kind in kinds) + " | 전체(s) | 라우팅 통계")
+    for result in results:
+        row = " | ".join(f"{result['mean_turn_ms'][kind]:>10}" for kind in kinds)
+        label = "on" if result["routing"] else "off"
+        print(f"{label:>6} | {row} | {result['elapsed_seconds']:>7} | {result['router']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+오프라인 벤치마크용 ASGI 앱
+backend.main:app에 스크립트 LLM을 쓰는 ChatService를 주입 (멀티 워커 실행 시 워커마다 import됨)
+
+환경 변수(부모 프로세스에서 configure_offline_env()로 설정 후 상속):
+    OFFLINE_LLM_LATENCY, OFFLINE_TOKEN_DELAY, OFFLINE_CPU_SECONDS
+"""
+import os
+
+from backend.main import app
+from backend.routers import chat as chat_router
+from benchmarks.offline_stack import build_offline_chat_service
+
+chat_router._chat_service_instance = build_offline_chat_service(
+    float(os.getenv("OFFLINE_LLM_LATENCY", "0.3")),
+    float(os.getenv("OFFLINE_TOKEN_DELAY", "0.01")),
+    float(os.getenv("OFFLINE_CPU_SECONDS", "0"))
+)
+
+__all__ = ["app"]
@@ -0,0 +1,267 @@
+"""
+오프라인 벤치마크 구성 요소 (API 키 불필요)
+- ScriptedShoppingModel: 검색 도구 호출 → 가격순 답변을 결정적으로 생성하는 가짜 LLM (토큰 스트리밍 포함)
+- 로컬 검색 MCP 서버: web_search_exa 도구로 쇼핑몰별 가짜 검색 결과를 지연 시간과 함께 반환
+- build_offline_chat_service(): 실제 ShoppingReactAgent 그래프를 가짜 LLM/로컬 MCP 서버로 구성한 ChatService
+
+환경 변수(MCP_EXA_URL, 캐시 설정 등)는 backend 모듈을 import하기 전에 configure_offline_env()로 설정합니다.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import socket
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import uvicorn
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from backend.agents.product_parser import extract_offers_from_tool_output
+
+MALL_DOMAINS = {
+    "네이버쇼핑": "https://shopping.naver.com/products/",
+    "쿠팡": "https://www.coupang.com/vp/products/",
+    "11번가": "https://www.11st.co.kr/products/",
+    "G마켓": "https://item.gmarket.co.kr/",
+    "옥션": "https://itempage3.auction.co.kr/"
+}
+
+PRODUCTS = [
+    "아이폰 15 128GB", "갤럭시 S24 256GB", "에어팟 프로 2", "맥북 에어 M3", "다이슨 V15",
+    "닌텐도 스위치 OLED", "LG 그램 16", "소니 WH-1000XM5", "아이패드 에어 6", "갤럭시 워치 7"
+]
+
+# 사용자 메시지에서 검색어 추출 (ShoppingReactAgent의 턴 메시지 형식)
+_QUERY_RE = re.compile(r"최저가를 찾아주세요:\s*(.+)$")
+
+
+def _stable_int(text: str) -> int:
+    """문자열에서 결정적인 정수 생성 (실행마다 같은 가격/지연)"""
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def configure_offline_env(mcp_url: str, overrides: Optional[Dict[str, str]] = None) -> None:
+    """
+    오프라인 실행용 환경 변수 설정 (backend import 전에 호출)
+
+    Args:
+        mcp_url: 로컬 검색 MCP 서버 주소
+        overrides: 추가로 덮어쓸 환경 변수
+    """
+    defaults = {
+        "GOOGLE_API_KEY": "offline-benchmark",
+        "MCP_EXA_URL": mcp_url,
+        # 같은 검색어 반복으로 캐시만 측정하지 않도록 응답 캐시/도구 캐시/가격 인덱스는 끔
+        "QUERY_CACHE_ENABLED": "false",
+        "MCP_TOOL_CACHE_ENABLED": "false",
+        "PRICE_INDEX_ENABLED": "false",
+        "AGENT_WARMUP_ENABLED": "true",
+        "TRACING_EXPORTER": "none"
+    }
+    defaults.update(overrides or {})
+    os.environ.update(defaults)
+
+
+class ScriptedShoppingModel(BaseChatModel):
+    """
+    결정적인 쇼핑 Agent용 가짜 LLM
+
+    - 사용자 메시지에는 search_all_malls(없으면 web_search_exa) 도구 호출로 응답
+    - 도구 결과에는 가격순 TOP 3 답변을 토큰 단위로 스트리밍
+    - 도구가 바인딩되지 않은 호출(대화 요약)에는 짧은 요약 반환
+    """
+
+    latency: float = 0.3
+    token_delay: float = 0.01
+    # 호출마다 소비할 CPU 시간(초) (프롬프트 렌더링/응답 파싱 등 워커 CPU 부하 모사)
+    cpu_seconds: float = 0.0
+    chars_per_token: int = 4
+    tool_name: str = "search_all_malls"
+    tools_bound: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-shopping"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedShoppingModel":
+        names = [getattr(tool, "name", None) for tool in tools]
+        tool_name = self.tool_name if self.tool_name in names else "web_search_exa"
+        return self.model_copy(update={"tools_bound": True, "tool_name": tool_name})
+
+    def _respond(self, messages: List[Any]) -> AIMessage:
+        """마지막 메시지에 맞는 응답 생성"""
+        busy_until = time.perf_counter() + self.cpu_seconds
+        while time.perf_counter() < busy_until:
+            pass
+
+        if not self.tools_bound:
+            return AIMessage(content="사용자는 여러 상품의 최저가를 비교하고 있습니다.")
+
+        last = messages[-1]
+        if isinstance(last, HumanMessage):
+            match = _QUERY_RE.search(str(last.content))
+            query = match.group(1) if match else str(last.content)
+            call_id = f"call_{_stable_int(query + str(len(messages))):08x}"
+            return AIMessage(content="", tool_calls=[{"name": self.tool_name, "args": {"query": query}, "id": call_id}])
+
+        offers: List[Dict[str, Any]] = []
+        if isinstance(last, ToolMessage):
+            try:
+                offers = json.loads(str(last.content)).get("offers", [])
+            except (ValueError, AttributeError):
+                offers = []
+            if not offers:
+                # web_search_exa 결과를 직접 받은 경우
+                offers = [offer.model_dump() for offer in extract_offers_from_tool_output(str(last.content))]
+                offers.sort(key=lambda offer: offer["price"])
+        lines = ["🏆 최저가 TOP 3", ""]
+        for rank, offer in zip(["1️⃣", "2️⃣", "3️⃣"], offers):
+            lines += [
+                f"{rank} {offer['name']} - {offer['price']:,}원",
+                f"   📍 판매처: {offer['store']}",
+                f"   🔗 구매링크: {offer['url']}",
+                ""
+            ]
+        if not offers:
+            lines.append("검색 결과가 없습니다.")
+        return AIMessage(content="\n".join(lines))
+
+    def _usage(self, messages: List[Any], message: AIMessage) -> Dict[str, int]:
+        """문자 수 기반 토큰 사용량 추정"""
+        input_tokens = sum(len(str(getattr(item, "content", ""))) for item in messages) // self.chars_per_token
+        output_tokens = max(len(str(message.content)) // self.chars_per_token, 1)
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise NotImplementedError("ScriptedShoppingModel은 비동기 호출만 지원합니다.")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        message = self._respond(messages)
+        message.usage_metadata = self._usage(messages, message)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        message = self._respond(messages)
+        usage = self._usage(messages, message)
+
+        if message.tool_calls:
+            call = message.tool_calls[0]
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[{
+                    "name": call["name"], "args": json.dumps(call["args"], ensure_ascii=False),
+                    "id": call["id"], "index": 0
+                }],
+                usage_metadata=usage
+            ))
+            return
+
+        text = str(message.content)
+        step = self.chars_per_token
+        for start in range(0, len(text), step):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text[start:start + step]))
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage))
+
+
+def create_search_server(latency: float = 0.3, jitter: float = 0.5, results: int = 3) -> Any:
+    """
+    로컬 검색 MCP 서버 생성 (Exa의 web_search_exa 도구 대체)
+
+    Args:
+        latency: 검색 1회 평균 지연(초)
+        jitter: 지연 변동 비율 (검색어별로 latency × (1 ± jitter) 범위에서 결정적으로 선택)
+        results: 검색 1회당 결과 수
+
+    Returns:
+        FastMCP 서버
+    """
+    from mcp.server.fastmcp import FastMCP
+
+    server = FastMCP("offline-exa", stateless_http=True, json_response=True, log_level="WARNING")
+
+    @server.tool()
+    async def web_search_exa(query: str, numResults: int = 5) -> str:
+        """웹 검색 (쇼핑몰별 가짜 상품 결과)"""
+        seed = _stable_int(query)
+        await asyncio.sleep(latency * (1 - jitter + 2 * jitter * (seed % 1000) / 1000))
+
+        mall = next((name for name in MALL_DOMAINS if query.startswith(name)), "쿠팡")
+        product = query[len(mall):].replace("가격", "").strip() if query.startswith(mall) else query
+        items = []
+        for index in range(min(results, numResults)):
+            price = 100_000 + (seed >> index) % 1_900_000 // 1000 * 1000
+            items.append({
+                "title": f"{product} {price:,}원",
+                "url": f"{MALL_DOMAINS[mall]}{seed % 100000 + index}",
+                "text": f"{mall} 판매 {product} 정가 대비 할인가 {price:,}원, 무료배송"
+            })
+        return json.dumps({"results": items}, ensure_ascii=False)
+
+    return server
+
+
+def free_port() -> int:
+    """사용 가능한 로컬 포트"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app: Any, port: int) -> uvicorn.Server:
+    """ASGI 앱을 백그라운드 스레드의 uvicorn으로 실행"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def start_search_server(latency: float, jitter: float = 0.5, port: Optional[int] = None) -> tuple:
+    """
+    로컬 검색 MCP 서버 실행
+
+    Returns:
+        (uvicorn 서버, MCP 엔드포인트 URL)
+    """
+    port = port or free_port()
+    server = start_server(create_search_server(latency, jitter).streamable_http_app(), port)
+    return server, f"http://127.0.0.1:{port}/mcp"
+
+
+def build_offline_chat_service(
+    llm_latency: float,
+    token_delay: float,
+    cpu_seconds: float = 0.0,
+    fast_llm_latency: Optional[float] = None
+) -> Any:
+    """
+    실제 ShoppingReactAgent 그래프를 사용하는 ChatService 생성 (LLM만 스크립트 모델로 교체)
+
+    configure_offline_env() 이후에 호출해야 합니다.
+    fast_llm_latency를 지정하면 그 지연 시간의 빠른 모델도 주입하여 모델 라우팅을 사용합니다.
+    """
+    from backend.agents.shopping_agent import ShoppingReactAgent
+    from backend.services.chat_service import ChatService
+
+    service = ChatService()
+    service.shopping_agent = ShoppingReactAgent(
+        google_api_key=os.environ["GOOGLE_API_KEY"],
+        model=ScriptedShoppingModel(latency=llm_latency, token_delay=token_delay, cpu_seconds=cpu_seconds),
+        store=service.store,
+        fast_model=ScriptedShoppingModel(
+            latency=fast_llm_latency, token_delay=token_delay, cpu_seconds=cpu_seconds
+        ) if fast_llm_latency is not None else None
+    )
+    return service
@@ -0,0 +1,145 @@
+"""
+워커 수별 처리량 확장 벤치마크
+- backend.serve로 오프라인 앱(스크립트 LLM + 로컬 검색 MCP 서버)을 워커 수를 바꿔가며 실행하고
+  POST /chat SSE 부하의 처리량/지연 시간 비교
+- 세션 고정 라우팅 없이 같은 세션의 연속 요청이 임의의 워커로 분산되며,
+  워커가 2개 이상이면 SQLite 공유 상태(대화 메모리, 캐시, 세션 실행 권한)를 사용
+- --cpu-ms로 LLM 호출마다 워커 CPU 부하를 주어 단일 프로세스(코어 1개) 한계를 재현
+(API 키 불필요)
+
+실행:
+    python -m benchmarks.worker_scaling_benchmark --workers 1,2,4 --clients 32 --requests 3 --cpu-ms 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.chat_load_benchmark import _http_request, run_load
+from benchmarks.offline_stack import configure_offline_env, free_port, start_search_server
+
+# 서버 기동 대기 최대 시간(초)
+STARTUP_TIMEOUT_SECONDS = 60.0
+
+
+def _wait_ready(base_url: str, workers: int) -> None:
+    """모든 워커가 요청을 받을 수 있을 때까지 readiness 확인 반복"""
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    consecutive = 0
+    while consecutive < workers * 4:
+        if time.monotonic() > deadline:
+            raise RuntimeError("서버가 제한 시간 안에 준비되지 않았습니다.")
+        try:
+            # 새 연결로 요청하여 여러 워커에 분산
+            response = httpx.get(f"{base_url}/health/ready", timeout=5.0)
+            consecutive = consecutive + 1 if response.status_code == 200 else 0
+        except httpx.HTTPError:
+            consecutive = 0
+        time.sleep(0.1)
+
+
+def run_workers(workers: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    워커 수 하나에 대해 서버 실행 후 부하 측정
+
+    Args:
+        workers: 워커 프로세스 수
+        args: 명령행 인자
+
+    Returns:
+        run_load() 결과 요약
+    """
+    data_dir = tempfile.mkdtemp(prefix="worker-bench-")
+    port = free_port()
+    env = {
+        **os.environ,
+        "SHARED_STATE_PATH": os.path.join(data_dir, "shared_state.db"),
+        "CHECKPOINT_SQLITE_PATH": os.path.join(data_dir, "checkpoints.db"),
+        "OFFLINE_LLM_LATENCY": str(args.llm_latency),
+        "OFFLINE_TOKEN_DELAY": str(args.token_delay),
+        "OFFLINE_CPU_SECONDS": str(args.cpu_ms / 1000),
+        "LOG_LEVEL": "WARNING"
+    }
+    if workers > 1:
+        env.update({"SHARED_STATE_BACKEND": "sqlite", "CHECKPOINTER_BACKEND": "sqlite"})
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "backend.serve",
+            "--app", "benchmarks.offline_app:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning"
+        ],
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base_url, workers)
+
+        async def drive() -> Dict[str, Any]:
+            limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=0)
+            # keep-alive 없이 요청마다 새 연결을 열어 같은 세션의 요청도 임의의 워커로 분산
+            async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+                url = f"{base_url}/chat"
+                load_args = argparse.Namespace(mode=f"http x{workers}", clients=args.clients, requests=args.requests)
+                return await run_load(load_args, lambda session_id, product: _http_request(client, url, session_id, product))
+
+        return asyncio.run(drive())
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="워커 수별 처리량 확장 벤치마크")
+    parser.add_argument("--workers", default="1,2,4", help="비교할 워커 수 목록 (쉼표 구분)")
+    parser.add_argument("--clients", type=int, default=32, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=3, help="클라이언트당 요청 수 (같은 세션으로 순차 전송)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="LLM 호출 1회 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="스트리밍 토큰 간격(초)")
+    parser.add_argument("--tool-latency", type=float, default=0.2, help="검색 MCP 호출 1회 평균 지연(초)")
+    parser.add_argument("--cpu-ms", type=float, default=20.0, help="LLM 호출마다 워커가 소비할 CPU 시간(ms)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    search_server, mcp_url = start_search_server(args.tool_latency)
+    configure_offline_env(mcp_url)
+
+    results: List[Dict[str, Any]] = []
+    try:
+        for workers in (int(value) for value in args.workers.split(",")):
+            summary = run_workers(workers, args)
+            summary["workers"] = workers
+            results.append(summary)
+    finally:
+        search_server.should_exit = True
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False))
+        return
+
+    baseline = results[0]["throughput_rps"] or 1.0
+    print(f"클라이언트 {args.clients}개 x 요청 {args.requests}개, LLM CPU {args.cpu_ms}ms/호출")
+    print(f"{'워커':>4} | {'처리량(req/s)':>13} | {'배율':>5} | {'p50(ms)':>8} | {'p95(ms)':>8} | {'p99(ms)':>8} | 결과")
+    for summary in results:
+        latency = summary["latency_ms"]
+        print(
+            f"{summary['workers']:>4} | {summary['throughput_rps']:>13} | "
+            f"{summary['throughput_rps'] / baseline:>5.2f} | {latency['p50']:>8} | "
+            f"{latency['p95']:>8} | {latency['p99']:>8} | {summary['outcomes']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
 """
 채팅 인터페이스 컴포넌트
 """
+import json
+import logging
 import streamlit as st
 import time
+from contextlib import closing
 from typing import List, Dict, Any
 from frontend.config.settings import UIMessages
 from frontend.utils.session_manager import SessionManager
-from frontend.utils.api_client import sync_send_message, sync_send_message_stream
+from frontend.utils.api_client import sync_send_message, iter_send_message_stream, sync_clear_session
+
+logger = logging.getLogger(__name__)
 
 class ChatInterface:
     """채팅 인터페이스 클래스"""
@@ -44,46 +49,87 @@ class ChatInterface:
             response_container = st.empty()
             status_container = st.empty()
             
+            # 응답 체감 속도 측정 (첫 화면 갱신 / 첫 응답 텍스트 / 전체 완료)
+            started = time.perf_counter()
+            timing = {"first_paint_ms": None, "first_token_ms": None, "total_ms": None, "trace_id": None}
+            
+            def elapsed_ms() -> float:
+                return round((time.perf_counter() - started) * 1000, 1)
+            
             try:
-                # 스트리밍 응답 처리
-                events = sync_send_message_stream(user_message, st.session_state.session_id)
-                
                 current_message = ""
                 current_status = "처리 중..."
                 
-                for event in events:
-                    if "error" in event:
-                        # 에러 처리
-                        error_message = f"❌ 오류: {event['error']}"
-                        response_container.markdown(error_message)
-                        self.session_manager.add_message("assistant", error_message)
-                        return
-                    
-                    event_type = event.get("event_type", "")
-                    event_data = event.get("data", "")
-                    
-                    if event_type == "thinking":
-                        current_status = f"🤔 {event_data}"
-                        status_container.info(current_status)
-                    
-                    elif event_type == "search":
-                        current_status = f"🔍 {event_data}"
-                        status_container.info(current_status)
-                    
-                    elif event_type == "message":
-                        current_message = event_data
-                        status_container.empty()  # 상태 메시지 제거
-                        response_container.markdown(current_message)
-                    
-                    elif event_type == "error":
-                        error_message = f"❌ {event_data}"
-                        status_container.empty()
-                        response_container.markdown(error_message)
-                        self.session_manager.add_message("assistant", error_message)
-                        return
-                    
-                    # 약간의 지연으로 스트리밍 효과
-                    time.sleep(0.1)
+                # 이벤트가 도착하는 즉시 렌더링 (백그라운드 루프가 큐로 전달)
+                with closing(iter_send_message_stream(user_message, st.session_state.session_id)) as events:
+                    for event in events:
+                        if timing["first_paint_ms"] is None:
+                            timing["first_paint_ms"] = elapsed_ms()
+                        if timing["trace_id"] is None and event.get("trace_id"):
+                            # 서버 trace와 대조할 수 있도록 응답 시간 로그에 trace id 기록
+                            timing["trace_id"] = event["trace_id"]
+                        
+                        if "error" in event:
+                            # 에러 처리
+                            error_message = f"❌ 오류: {event['error']}"
+                            response_container.markdown(error_message)
+                            self.session_manager.add_message("assistant", error_message)
+                            return
+                        
+                        event_type = event.get("event_type", "")
+                        event_data = event.get("data", "")
+                        
+                        if event_type == "thinking":
+                            current_status = f"🤔 {event_data}"
+                            status_container.info(current_status)
+                        
+                        elif event_type == "search":
+                            current_status = f"🔍 {event_data}"
+                            status_container.info(current_status)
+                        
+                        elif event_type == "queued":
+                            current_status = f"⏳ {event_data}"
+                            status_container.info(current_status)
+                        
+                        elif event_type == "tool_start":
+                            current_status = f"🛠️ {event_data}"
+                            status_container.info(current_status)
+                        
+                        elif event_type == "message_delta":
+                            # 토큰 단위 응답 조각 누적
+                            if timing["first_token_ms"] is None:
+                                timing["first_token_ms"] = elapsed_ms()
+                            current_message += event_data
+                            response_container.markdown(current_message)
+                        
+                        elif event_type == "message":
+                            if timing["first_token_ms"] is None:
+                                timing["first_token_ms"] = elapsed_ms()
+                            current_message = event_data
+                            status_container.empty()  # 상태 메시지 제거
+                            response_container.markdown(current_message)
+                        
+                        elif event_type == "partial_message":
+                            # 제한 시간/단계 초과로 중단된 턴의 지금까지 결과
+                            if timing["first_token_ms"] is None:
+                                timing["first_token_ms"] = elapsed_ms()
+                            current_message = event_data
+                            status_container.warning("검색이 제한 시간 안에 끝나지 않아 지금까지 찾은 결과를 표시합니다.")
+                            response_container.markdown(current_message)
+                        
+                        elif event_type == "products":
+                            # 구조화된 상품 목록 (상품 섹션에서 정렬/필터링)
+                            try:
+                                self.session_manager.set_current_products(json.loads(event_data))
+                            except json.JSONDecodeError as e:
+                                logger.warning(f"상품 목록 파싱 오류: {e}")
+                        
+                        elif event_type == "error":
+                            error_message = f"❌ {event_data}"
+                            status_container.empty()
+                            response_container.markdown(error_message)
+                            self.session_manager.add_message("assistant", error_message)
+                            return
                 
                 # 최종 메시지가 있으면 저장
                 if current_message:
@@ -100,6 +146,11 @@ class ChatInterface:
                 status_container.empty()
                 response_container.markdown(error_message)
                 self.session_manager.add_message("assistant", error_message)
+            
+            finally:
+                timing["total_ms"] = elapsed_ms()
+                st.session_state.last_response_timing = timing
+                logger.info(f"응답 렌더링 시간: {timing}")
     
     def _handle_bot_response(self, user_message: str) -> None:
         """봇 응답 처리 (기존 방식 - 백업용)"""
@@ -144,6 +195,8 @@ class ChatInterface:
             
             # 세션 초기화 버튼
             if st.button("🗑️ 대화 초기화"):
+                # 서버 측 대화 메모리도 함께 삭제 (새 세션 ID 발급 전)
+                sync_clear_session(st.session_state.session_id)
                 self.session_manager.clear_session()
                 st.rerun()
     
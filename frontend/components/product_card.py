@@ -4,6 +4,26 @@
 import streamlit as st
 from typing import Dict, Any, List
 
+def price_value(product: Dict[str, Any]) -> float:
+    """상품 가격을 숫자로 변환 (정수 또는 "1,200,000원" 형식 문자열)"""
+    price = product.get("price")
+    if isinstance(price, (int, float)):
+        return float(price)
+    if isinstance(price, str):
+        digits = price.replace(",", "").replace("원", "").strip()
+        try:
+            return float(digits)
+        except ValueError:
+            return 0.0
+    return 0.0
+
+def format_price(product: Dict[str, Any]) -> str:
+    """상품 가격 표시 문자열"""
+    price = product.get("price")
+    if isinstance(price, (int, float)):
+        return f"{price:,.0f}원"
+    return price or "N/A"
+
 class ProductCard:
     """상품 카드 클래스"""
     
@@ -25,7 +45,7 @@ class ProductCard:
             with col2:
                 # 상품 정보
                 st.subheader(product.get("name", "상품명 없음"))
-                st.write(f"**가격:** {product.get('price', 'N/A')}")
+                st.write(f"**가격:** {format_price(product)}")
                 st.write(f"**쇼핑몰:** {product.get('store', 'N/A')}")
                 
                 if product.get("rating"):
@@ -39,7 +59,8 @@ class ProductCard:
                 if product.get("url"):
                     st.link_button("🛒 구매하기", product["url"])
                 
-                if st.button("❤️ 찜하기", key=f"like_{product.get('id', 'unknown')}"):
+                like_key = product.get('id') or f"{product.get('store', '')}_{product.get('url') or product.get('name', 'unknown')}"
+                if st.button("❤️ 찜하기", key=f"like_{like_key}"):
                     st.success("찜 목록에 추가되었습니다!")
     
     def render_product_grid(self, products: List[Dict[str, Any]]) -> None:
@@ -72,10 +93,7 @@ class ProductCard:
         st.subheader("💰 가격 비교")
         
         # 가격순 정렬
-        sorted_products = sorted(
-            products, 
-            key=lambda x: float(x.get('price', '0').replace(',', '').replace('원', '')) if x.get('price') else 0
-        )
+        sorted_products = sorted(products, key=price_value)
         
         # 테이블 데이터 준비
         table_data = []
@@ -84,7 +102,7 @@ class ProductCard:
             table_data.append({
                 "순위": rank,
                 "상품명": product.get("name", "N/A")[:30] + "..." if len(product.get("name", "")) > 30 else product.get("name", "N/A"),
-                "가격": product.get("price", "N/A"),
+                "가격": format_price(product),
                 "쇼핑몰": product.get("store", "N/A"),
                 "평점": product.get("rating", "N/A")
             })
@@ -103,10 +121,7 @@ class ProductCard:
             st.metric("총 상품 수", len(products))
         
         with col2:
-            prices = [
-                float(p.get('price', '0').replace(',', '').replace('원', '')) 
-                for p in products if p.get('price')
-            ]
+            prices = [price_value(p) for p in products if p.get('price')]
             if prices:
                 avg_price = sum(prices) / len(prices)
                 st.metric("평균 가격", f"{avg_price:,.0f}원")
@@ -1,6 +1,7 @@
 """
 앱 설정 및 상수 정의
 """
+import os
 from dataclasses import dataclass
 from typing import Dict, Any
 
@@ -19,6 +20,13 @@ class AppConfig:
     
     # API 설정
     API_BASE_URL: str = "http://localhost:8000"
+    API_TIMEOUT_SECONDS: float = float(os.getenv("API_TIMEOUT_SECONDS", "30"))
+    
+    # API 연결 풀 설정 (Streamlit 서버 프로세스당 하나의 클라이언트를 공유)
+    API_MAX_CONNECTIONS: int = int(os.getenv("API_MAX_CONNECTIONS", "20"))
+    API_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("API_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    API_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("API_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    API_HTTP2: bool = os.getenv("API_HTTP2", "false").lower() == "true"  # h2 패키지 필요
     
     # 채팅 설정
     MAX_MESSAGES: int = 100
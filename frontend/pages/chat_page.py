@@ -3,7 +3,7 @@
 """
 import streamlit as st
 from frontend.components.chat_interface import ChatInterface
-from frontend.components.product_card import ProductCard
+from frontend.components.product_card import ProductCard, price_value
 from frontend.utils.session_manager import SessionManager
 
 class ChatPage:
@@ -66,6 +66,23 @@ class ChatPage:
         if current_products:
             st.divider()
             
+            # 판매처 필터 및 정렬 (LLM 재호출 없이 구조화된 상품 목록에서 처리)
+            stores = sorted({product.get("store", "N/A") for product in current_products})
+            col1, col2 = st.columns(2)
+            with col1:
+                selected_stores = st.multiselect("판매처", stores, default=stores)
+            with col2:
+                sort_order = st.selectbox("정렬", ["가격 낮은순", "가격 높은순", "추천순"])
+            
+            current_products = [
+                product for product in current_products
+                if product.get("store", "N/A") in selected_stores
+            ]
+            if sort_order != "추천순":
+                current_products = sorted(
+                    current_products, key=price_value, reverse=sort_order == "가격 높은순"
+                )
+            
             # 탭으로 다양한 뷰 제공
             tab1, tab2, tab3 = st.tabs(["🛍️ 상품 목록", "💰 가격 비교", "📊 요약"])
             
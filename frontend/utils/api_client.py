@@ -3,17 +3,65 @@ API 클라이언트 유틸리티
 """
 import httpx
 import asyncio
+import atexit
+import importlib.util
 import json
-from typing import Dict, Any, Optional, AsyncGenerator
+import logging
+import queue
+import threading
+from contextlib import AsyncExitStack
+from typing import Dict, Any, Optional, AsyncGenerator, Awaitable, Iterator, TypeVar
 from frontend.config.settings import AppConfig
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
 class APIClient:
-    """API 클라이언트 클래스"""
+    """API 클라이언트 클래스 (연결 풀을 유지하는 httpx.AsyncClient 재사용)"""
     
     def __init__(self):
         self.config = AppConfig()
         self.base_url = self.config.API_BASE_URL
-        self.timeout = 30.0
+        self.timeout = self.config.API_TIMEOUT_SECONDS
+        self._client: Optional[httpx.AsyncClient] = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+    
+    def _http2_enabled(self) -> bool:
+        """HTTP/2 사용 여부 (h2 패키지가 없으면 HTTP/1.1 keep-alive로 대체)"""
+        if not self.config.API_HTTP2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("API_HTTP2가 설정되었지만 h2 패키지가 없어 HTTP/1.1을 사용합니다.")
+            return False
+        return True
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        연결 풀 클라이언트 반환 (최초 호출 시 생성)
+        
+        httpx.AsyncClient는 생성된 이벤트 루프에 묶이므로 같은 루프에서만 사용해야 합니다.
+        """
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.config.API_MAX_CONNECTIONS,
+                max_keepalive_connections=self.config.API_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.config.API_KEEPALIVE_EXPIRY_SECONDS
+            )
+            exit_stack = AsyncExitStack()
+            self._client = await exit_stack.enter_async_context(
+                httpx.AsyncClient(timeout=self.timeout, limits=limits, http2=self._http2_enabled())
+            )
+            self._exit_stack = exit_stack
+        return self._client
+    
+    async def aclose(self) -> None:
+        """연결 풀 닫기"""
+        if self._exit_stack is not None:
+            exit_stack = self._exit_stack
+            self._client = None
+            self._exit_stack = None
+            await exit_stack.aclose()
     
     async def _make_request(
         self, 
@@ -25,29 +73,29 @@ class APIClient:
         url = f"{self.base_url}{endpoint}"
         
         try:
-            import logging
-            logger = logging.getLogger(__name__)
+            client = await self._get_client()
+            
+            logger.info(f"API 요청 시작: {method.upper()} {url}")
+            if data:
+                logger.debug(f"요청 데이터: {data}")
+            
+            if method.upper() == "GET":
+                response = await client.get(url, params=data)
+            elif method.upper() == "POST":
+                response = await client.post(url, json=data)
+            elif method.upper() == "DELETE":
+                response = await client.delete(url, params=data)
+            else:
+                raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
+            
+            logger.info(f"API 응답 상태: {response.status_code}")
+            logger.debug(f"응답 헤더: {dict(response.headers)}")
+            
+            response.raise_for_status()
+            response_data = response.json()
+            logger.debug(f"응답 데이터: {response_data}")
+            return response_data
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info(f"API 요청 시작: {method.upper()} {url}")
-                if data:
-                    logger.debug(f"요청 데이터: {data}")
-                
-                if method.upper() == "GET":
-                    response = await client.get(url, params=data)
-                elif method.upper() == "POST":
-                    response = await client.post(url, json=data)
-                else:
-                    raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
-                
-                logger.info(f"API 응답 상태: {response.status_code}")
-                logger.debug(f"응답 헤더: {dict(response.headers)}")
-                
-                response.raise_for_status()
-                response_data = response.json()
-                logger.debug(f"응답 데이터: {response_data}")
-                return response_data
-                
         except httpx.TimeoutException:
             return {"error": "요청 시간이 초과되었습니다."}
         except httpx.HTTPStatusError as e:
@@ -65,36 +113,37 @@ class APIClient:
         url = f"{self.base_url}{endpoint}"
         
         try:
-            import logging
-            logger = logging.getLogger(__name__)
+            client = await self._get_client()
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info(f"SSE 스트리밍 요청 시작: {method.upper()} {url}")
-                if data:
-                    logger.debug(f"요청 데이터: {data}")
-                
-                if method.upper() == "POST":
-                    async with client.stream("POST", url, json=data) as response:
-                        response.raise_for_status()
-                        
-                        async for line in response.aiter_lines():
-                            if line.startswith("data: "):
-                                try:
-                                    # SSE 데이터 파싱
-                                    data_str = line[6:]  # "data: " 제거
-                                    if data_str.strip():
-                                        event_data = json.loads(data_str)
-                                        yield event_data
-                                except json.JSONDecodeError as e:
-                                    logger.warning(f"JSON 파싱 오류: {e}, 데이터: {data_str}")
-                                    continue
-                else:
-                    raise ValueError(f"스트리밍은 POST 메서드만 지원합니다: {method}")
+            logger.info(f"SSE 스트리밍 요청 시작: {method.upper()} {url}")
+            if data:
+                logger.debug(f"요청 데이터: {data}")
+            
+            if method.upper() == "POST":
+                async with client.stream("POST", url, json=data) as response:
+                    response.raise_for_status()
                     
+                    async for line in response.aiter_lines():
+                        if line.startswith("data: "):
+                            try:
+                                # SSE 데이터 파싱
+                                data_str = line[6:]  # "data: " 제거
+                                if data_str.strip():
+                                    event_data = json.loads(data_str)
+                                    yield event_data
+                            except json.JSONDecodeError as e:
+                                logger.warning(f"JSON 파싱 오류: {e}, 데이터: {data_str}")
+                                continue
+            else:
+                raise ValueError(f"스트리밍은 POST 메서드만 지원합니다: {method}")
+                
         except httpx.TimeoutException:
             yield {"error": "요청 시간이 초과되었습니다."}
         except httpx.HTTPStatusError as e:
-            yield {"error": f"HTTP 오류: {e.response.status_code}"}
+            if e.response.status_code == 429:
+                yield {"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."}
+            else:
+                yield {"error": f"HTTP 오류: {e.response.status_code}"}
         except Exception as e:
             yield {"error": f"연결 오류: {str(e)}"}
     
@@ -128,35 +177,139 @@ class APIClient:
         
         return final_response
     
+    async def clear_session(self, session_id: str) -> Dict[str, Any]:
+        """서버의 세션 대화 기록 삭제"""
+        return await self._make_request("DELETE", f"/chat/sessions/{session_id}")
+    
     async def search_products(self, query: str) -> Dict[str, Any]:
         """상품 검색"""
         data = {"query": query}
         return await self._make_request("POST", "/search", data)
 
+class _BackgroundLoop:
+    """
+    프로세스당 하나의 백그라운드 이벤트 루프
+    
+    Streamlit 스크립트는 동기 코드이므로 매 요청마다 asyncio.run()으로 새 루프를 만들면
+    연결 풀을 재사용할 수 없습니다. 전용 스레드의 루프에서 공유 APIClient를 실행합니다.
+    """
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """실행 중인 루프 반환 (최초 호출 시 스레드 시작)"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="api-client-loop", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+    
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """코루틴을 백그라운드 루프에서 실행하고 결과 대기"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+    
+    def stop(self) -> None:
+        """루프 정지"""
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._loop = None
+                self._thread = None
+
+
+_background_loop = _BackgroundLoop()
+_shared_client: Optional[APIClient] = None
+_shared_client_lock = threading.Lock()
+
+def get_shared_client() -> APIClient:
+    """프로세스 공유 APIClient 반환 (연결 풀 재사용)"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = APIClient()
+        return _shared_client
+
+def _run_sync(coro: Awaitable[T]) -> T:
+    """공유 백그라운드 루프에서 코루틴 실행"""
+    return _background_loop.run(coro)
+
+@atexit.register
+def _shutdown() -> None:
+    """프로세스 종료 시 연결 풀과 백그라운드 루프 정리"""
+    if _shared_client is not None and _background_loop._loop is not None:
+        try:
+            _background_loop.run(_shared_client.aclose(), timeout=5)
+        except Exception as e:
+            logger.warning(f"API 클라이언트 종료 실패: {str(e)}")
+    _background_loop.stop()
+
+# 스트림 종료 표시
+_STREAM_END = object()
+
+def iter_send_message_stream(message: str, session_id: str) -> Iterator[Dict[str, Any]]:
+    """
+    SSE 이벤트를 도착하는 즉시 하나씩 반환하는 동기 이터레이터 (Streamlit에서 사용)
+    
+    백그라운드 루프에서 스트림을 읽어 큐에 넣고, 호출한 스크립트 스레드는 큐에서 꺼내 렌더링합니다.
+    이터레이터를 중간에 닫으면 백그라운드 스트림 요청도 취소됩니다.
+    
+    Args:
+        message: 사용자 메시지
+        session_id: 세션 ID
+        
+    Yields:
+        SSE 이벤트 데이터
+    """
+    client = get_shared_client()
+    events: "queue.Queue[Any]" = queue.Queue()
+    
+    async def pump():
+        try:
+            async for event in client.send_message_stream(message, session_id):
+                events.put(event)
+        except Exception as e:
+            events.put({"error": f"연결 오류: {str(e)}"})
+        finally:
+            events.put(_STREAM_END)
+    
+    future = asyncio.run_coroutine_threadsafe(pump(), _background_loop.loop)
+    try:
+        while True:
+            event = events.get()
+            if event is _STREAM_END:
+                break
+            yield event
+    finally:
+        if not future.done():
+            future.cancel()
+
 # 동기 래퍼 함수들 (Streamlit에서 사용)
 def sync_health_check() -> Dict[str, Any]:
     """동기 헬스체크"""
-    client = APIClient()
-    return asyncio.run(client.health_check())
+    return _run_sync(get_shared_client().health_check())
 
 def sync_send_message(message: str, session_id: str) -> Dict[str, Any]:
     """동기 메시지 전송"""
-    client = APIClient()
-    return asyncio.run(client.send_message(message, session_id))
+    return _run_sync(get_shared_client().send_message(message, session_id))
 
 def sync_send_message_stream(message: str, session_id: str):
-    """동기 메시지 전송 (스트리밍)"""
-    client = APIClient()
-    
-    async def stream_wrapper():
-        events = []
-        async for event in client.send_message_stream(message, session_id):
-            events.append(event)
-        return events
-    
-    return asyncio.run(stream_wrapper())
+    """동기 메시지 전송 (스트리밍, 전체 이벤트 목록 반환)"""
+    return list(iter_send_message_stream(message, session_id))
+
+def sync_clear_session(session_id: str) -> Dict[str, Any]:
+    """동기 세션 대화 기록 삭제"""
+    return _run_sync(get_shared_client().clear_session(session_id))
 
 def sync_search_products(query: str) -> Dict[str, Any]:
     """동기 상품 검색"""
-    client = APIClient()
-    return asyncio.run(client.search_products(query)) 
\ No newline at end of file
+    return _run_sync(get_shared_client().search_products(query))
@@ -0,0 +1,36 @@
+"""
+테스트 공통 설정
+"""
+import itertools
+import os
+
+import pytest
+
+# 테스트 간 관측 가격이 디스크에 남아 다른 테스트 결과에 영향을 주지 않도록 인메모리 사용
+os.environ.setdefault("PRICE_INDEX_PATH", ":memory:")
+
+
+@pytest.fixture
+def make_graph():
+    """고정 응답을 반환하는 가짜 LLM 기반 React Agent 생성 함수 (checkpointer 테스트용)"""
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+    from langgraph.prebuilt import create_react_agent
+
+    def factory(checkpointer, reply="응답"):
+        model = GenericFakeChatModel(messages=(AIMessage(content=reply) for _ in itertools.count()))
+        return create_react_agent(model=model, tools=[], prompt="테스트", checkpointer=checkpointer)
+
+    return factory
+
+
+@pytest.fixture
+def run_turns():
+    """동일 스레드에서 여러 턴을 실행하는 함수"""
+    async def runner(graph, thread_id, turns):
+        config = {"configurable": {"thread_id": thread_id}}
+        for i in range(turns):
+            await graph.ainvoke({"messages": [("user", f"질문 {i}")]}, config=config)
+        return config
+
+    return runner
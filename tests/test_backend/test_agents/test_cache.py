@@ -0,0 +1,72 @@
+"""
+Agent 결과 캐시 테스트
+"""
+import pytest
+from unittest.mock import patch
+
+from backend.agents.cache import TTLCache, normalize_query
+
+
+class TestNormalizeQuery:
+    """쿼리 정규화 테스트 클래스"""
+    
+    @pytest.mark.parametrize("query", [
+        "아이폰 15 최저가",
+        "아이폰15",
+        "  아이폰   15  ",
+        "아이폰 15 최저가 알려줘?",
+        "아이폰 15 가격",
+    ])
+    def test_equivalent_queries_share_key(self, query):
+        """동일 상품 쿼리는 같은 키로 정규화"""
+        assert normalize_query(query) == "아이폰15"
+    
+    def test_latin_casing_and_width(self):
+        """라틴 대소문자 및 전각 문자 통일"""
+        assert normalize_query("삼성 갤럭시 S24") == normalize_query("삼성 갤럭시 ｓ２４")
+    
+    def test_suffix_only_query_kept(self):
+        """접미사만 있는 쿼리는 비워지지 않음"""
+        assert normalize_query("최저가") == "최저가"
+
+
+class TestTTLCache:
+    """TTLCache 테스트 클래스"""
+    
+    def test_hit_and_miss_counters(self):
+        """히트/미스 카운터 테스트"""
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+    
+    def test_lru_eviction(self):
+        """크기 초과 시 가장 오래 사용되지 않은 항목 제거"""
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+    
+    def test_ttl_expiry(self):
+        """TTL 경과 시 만료"""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        
+        with patch("backend.agents.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("backend.agents.cache.time.monotonic", return_value=109.0):
+            assert cache.get("a") == 1
+        with patch("backend.agents.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
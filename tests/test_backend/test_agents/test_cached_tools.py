@@ -0,0 +1,123 @@
+"""
+MCP 도구 호출 캐시 테스트
+"""
+import asyncio
+import pytest
+from langchain_core.tools import StructuredTool
+
+from backend.agents.mcp_adapters.cached_tools import ToolCallCache, make_tool_cache_key
+
+
+def _make_search_tool(calls):
+    """호출 횟수를 기록하는 검색 도구"""
+    async def web_search(query: str) -> str:
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return f"{query} 검색 결과"
+    
+    return StructuredTool.from_function(
+        coroutine=web_search,
+        name="web_search",
+        description="웹 검색"
+    )
+
+
+class TestToolCallCache:
+    """ToolCallCache 테스트 클래스"""
+    
+    def test_cache_key_canonicalizes_arguments(self):
+        """인자 순서/공백이 달라도 같은 키 생성"""
+        key1 = make_tool_cache_key("web_search", {"query": "쿠팡  아이폰 15 ", "num": 5})
+        key2 = make_tool_cache_key("web_search", {"num": 5, "query": "쿠팡 아이폰 15"})
+        assert key1 == key2
+        assert key1 != make_tool_cache_key("crawl", {"num": 5, "query": "쿠팡 아이폰 15"})
+    
+    @pytest.mark.asyncio
+    async def test_wrapped_tool_memoizes_results(self):
+        """동일 호출은 캐시에서 반환"""
+        # Given: 캐시로 감싼 도구
+        calls = []
+        tool_cache = ToolCallCache(max_size=10, ttl_seconds=60)
+        tool = tool_cache.wrap_tool(_make_search_tool(calls))
+        
+        # When: 같은 쿼리로 두 번 호출
+        result1 = await tool.ainvoke({"query": "네이버쇼핑 아이폰 15"})
+        result2 = await tool.ainvoke({"query": "네이버쇼핑  아이폰 15"})
+        
+        # Then: 실제 호출은 한 번
+        assert result1 == result2 == "네이버쇼핑 아이폰 15 검색 결과"
+        assert calls == ["네이버쇼핑 아이폰 15"]
+        assert tool.name == "web_search"
+        assert tool_cache.stats()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_coalesced(self):
+        """동시에 들어온 동일 호출은 하나의 upstream 요청으로 병합"""
+        # Given: 캐시로 감싼 도구
+        calls = []
+        tool_cache = ToolCallCache(max_size=10, ttl_seconds=60)
+        tool = tool_cache.wrap_tool(_make_search_tool(calls))
+        
+        # When: 동일 호출 10개를 동시에 실행
+        results = await asyncio.gather(*[
+            tool.ainvoke({"query": "쿠팡 아이폰 15"}) for _ in range(10)
+        ])
+        
+        # Then: upstream 호출은 한 번, 나머지는 병합
+        assert len(calls) == 1
+        assert set(results) == {"쿠팡 아이폰 15 검색 결과"}
+        assert tool_cache.stats()["coalesced"] == 9
+        assert tool_cache.stats()["inflight"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        """실패한 호출은 캐시하지 않음"""
+        attempts = []
+        
+        async def flaky(query: str) -> str:
+            attempts.append(query)
+            if len(attempts) == 1:
+                raise RuntimeError("일시적 오류")
+            return "성공"
+        
+        tool_cache = ToolCallCache(max_size=10, ttl_seconds=60)
+        
+        with pytest.raises(RuntimeError):
+            await tool_cache.call("web_search", {"query": "q"}, flaky)
+        assert await tool_cache.call("web_search", {"query": "q"}, flaky) == "성공"
+        assert len(attempts) == 2
+    
+    @pytest.mark.asyncio
+    async def test_upstream_cancelled_when_all_callers_cancelled(self):
+        """기다리던 호출자가 모두 취소되면 진행 중인 upstream 호출도 취소"""
+        # Given: 응답이 느린 upstream
+        cancelled = []
+        
+        async def slow(query: str) -> str:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(query)
+                raise
+            return "완료"
+        
+        tool_cache = ToolCallCache(max_size=10, ttl_seconds=60)
+        first = asyncio.ensure_future(tool_cache.call("web_search", {"query": "q"}, slow))
+        second = asyncio.ensure_future(tool_cache.call("web_search", {"query": "q"}, slow))
+        await asyncio.sleep(0.01)
+        
+        # When: 한 호출자만 취소하면 공유 호출은 유지
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert cancelled == []
+        assert tool_cache.stats()["inflight"] == 1
+        
+        # When: 마지막 호출자까지 취소
+        second.cancel()
+        await asyncio.sleep(0.01)
+        
+        # Then: upstream 호출 취소 및 정리 (결과는 캐시하지 않음)
+        assert cancelled == ["q"]
+        assert tool_cache.stats()["inflight"] == 0
+        assert tool_cache.stats()["cancelled"] == 1
+        assert tool_cache.cache.get(make_tool_cache_key("web_search", {"query": "q"})) is None
@@ -0,0 +1,119 @@
+"""
+대화 메모리 Checkpointer 테스트
+"""
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from backend.agents.checkpointers import BoundedMemorySaver, create_checkpointer, trim_messages_to_turns
+
+
+class TestTrimMessages:
+    """턴 경계 메시지 자르기 테스트 클래스"""
+    
+    def test_trim_keeps_tool_pairs_together(self):
+        """도구 호출/결과 쌍을 끊지 않고 HumanMessage에서 시작"""
+        messages = [
+            HumanMessage(content="q1"),
+            AIMessage(content="", tool_calls=[{"name": "web_search", "args": {}, "id": "1"}]),
+            ToolMessage(content="결과", tool_call_id="1"),
+            AIMessage(content="a1"),
+            HumanMessage(content="q2"),
+            AIMessage(content="a2"),
+        ]
+        
+        trimmed = trim_messages_to_turns(messages, max_messages=3)
+        
+        assert [m.content for m in trimmed] == ["q2", "a2"]
+    
+    def test_trim_by_bytes(self):
+        """바이트 제한 초과 시 오래된 턴 제거"""
+        messages = [
+            HumanMessage(content="q1"),
+            AIMessage(content="x" * 1000),
+            HumanMessage(content="q2"),
+            AIMessage(content="a2"),
+        ]
+        
+        trimmed = trim_messages_to_turns(messages, max_messages=100, max_bytes=100)
+        
+        assert [m.content for m in trimmed] == ["q2", "a2"]
+    
+    def test_last_turn_always_kept(self):
+        """마지막 턴 하나가 제한을 넘어도 유지"""
+        messages = [HumanMessage(content="q1"), AIMessage(content="a1"), AIMessage(content="a2")]
+        assert trim_messages_to_turns(messages, max_messages=1) == messages
+
+
+class TestBoundedMemorySaver:
+    """BoundedMemorySaver 테스트 클래스"""
+    
+    @pytest.mark.asyncio
+    async def test_message_cap_applied_to_thread(self, make_graph, run_turns):
+        """스레드 메시지 수 제한 적용"""
+        # Given: 메시지 4개까지만 유지하는 checkpointer
+        saver = BoundedMemorySaver(max_messages=4)
+        graph = make_graph(saver)
+        
+        # When: 5턴 대화
+        config = await run_turns(graph, "thread-1", 5)
+        
+        # Then: 최근 2턴(4개 메시지)만 남음
+        state = await graph.aget_state(config)
+        assert [m.content for m in state.values["messages"]] == ["질문 3", "응답", "질문 4", "응답"]
+    
+    @pytest.mark.asyncio
+    async def test_old_checkpoints_and_blobs_pruned(self, make_graph, run_turns):
+        """최근 체크포인트만 유지하고 참조되지 않는 blob 제거"""
+        saver = BoundedMemorySaver(keep_checkpoints=2)
+        graph = make_graph(saver)
+        
+        await run_turns(graph, "thread-1", 5)
+        
+        assert len(saver.storage["thread-1"][""]) == 2
+        assert all(key[0] == "thread-1" for key in saver.blobs)
+        assert len(saver.blobs) == len(saver._thread_blob_keys["thread-1"])
+        assert saver.stats()["bytes"] > 0
+    
+    @pytest.mark.asyncio
+    async def test_lru_thread_eviction(self, make_graph, run_turns):
+        """최대 스레드 수 초과 시 가장 오래된 스레드 제거"""
+        saver = BoundedMemorySaver(max_threads=2)
+        graph = make_graph(saver)
+        
+        for thread_id in ["a", "b", "c"]:
+            await run_turns(graph, thread_id, 1)
+        
+        stats = saver.stats()
+        assert stats["threads"] == 2
+        assert stats["evicted_threads"] == 1
+        assert await saver.aget_tuple({"configurable": {"thread_id": "a"}}) is None
+        assert "a" not in saver.storage
+    
+    @pytest.mark.asyncio
+    async def test_idle_threads_evicted(self, make_graph, run_turns):
+        """유휴 TTL 경과 스레드 제거"""
+        saver = BoundedMemorySaver(idle_ttl_seconds=60)
+        graph = make_graph(saver)
+        
+        with patch("backend.agents.checkpointers.time.monotonic", return_value=1000.0):
+            await run_turns(graph, "old", 1)
+        with patch("backend.agents.checkpointers.time.monotonic", return_value=1100.0):
+            await run_turns(graph, "new", 1)
+        
+        assert saver.stats()["threads"] == 1
+        assert "old" not in saver.storage
+        assert not any(key[0] == "old" for key in saver.blobs)
+    
+    def test_lookup_of_unknown_thread_does_not_leak(self):
+        """존재하지 않는 스레드 조회가 빈 항목을 남기지 않음"""
+        saver = BoundedMemorySaver()
+        assert saver.get_tuple({"configurable": {"thread_id": "unknown"}}) is None
+        assert "unknown" not in saver.storage
+    
+    def test_create_checkpointer_backends(self):
+        """설정에 따른 checkpointer 생성"""
+        assert isinstance(create_checkpointer("bounded"), BoundedMemorySaver)
+        assert not isinstance(create_checkpointer("memory"), BoundedMemorySaver)
+        with pytest.raises(ValueError):
+            create_checkpointer("unknown")
@@ -0,0 +1,62 @@
+"""
+MCP 연결 감시 테스트
+"""
+import anyio
+import httpx
+import pytest
+from langchain_core.tools import StructuredTool
+
+from backend.agents.mcp_adapters.connection_monitor import ConnectionMonitor, is_connection_error
+
+
+def _make_tool(error):
+    """지정한 예외를 발생시키는 도구"""
+    async def web_search(query: str) -> str:
+        raise error
+    
+    return StructuredTool.from_function(
+        coroutine=web_search,
+        name="web_search",
+        description="웹 검색"
+    )
+
+
+class TestConnectionMonitor:
+    """ConnectionMonitor 테스트 클래스"""
+    
+    def test_is_connection_error(self):
+        """연결 오류 유형 판별 (원인 체인 포함)"""
+        assert is_connection_error(httpx.ConnectError("연결 실패"))
+        assert is_connection_error(anyio.ClosedResourceError())
+        assert not is_connection_error(ValueError("잘못된 인자"))
+        
+        try:
+            try:
+                raise ConnectionResetError("연결 끊김")
+            except ConnectionResetError as e:
+                raise RuntimeError("도구 호출 실패") from e
+        except RuntimeError as wrapped:
+            assert is_connection_error(wrapped)
+    
+    @pytest.mark.asyncio
+    async def test_wrapped_tool_marks_connection_lost(self):
+        """연결 오류 발생 시 lost 표시, 일반 오류는 무시"""
+        # Given: 연결 감시 래퍼
+        monitor = ConnectionMonitor()
+        
+        # When: 일반 오류 발생
+        with pytest.raises(ValueError):
+            await monitor.wrap_tool(_make_tool(ValueError("잘못된 인자"))).ainvoke({"query": "아이폰"})
+        
+        # Then: 연결 상태 유지
+        assert monitor.lost is False
+        
+        # When: 연결 오류 발생
+        with pytest.raises(httpx.ConnectError):
+            await monitor.wrap_tool(_make_tool(httpx.ConnectError("연결 실패"))).ainvoke({"query": "아이폰"})
+        
+        # Then: 연결 끊김 표시 후 reset으로 복구
+        assert monitor.lost is True
+        assert monitor.failures == 1
+        monitor.reset()
+        assert monitor.lost is False
@@ -0,0 +1,111 @@
+"""
+대화 컨텍스트 관리 테스트
+"""
+import itertools
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.prebuilt import create_react_agent
+from langgraph.checkpoint.memory import MemorySaver
+
+from backend.agents.context import ContextManager, ShoppingAgentState, split_turns
+
+
+def _make_history(turns, tool_output_size=2000):
+    """도구 호출이 포함된 대화 기록 생성"""
+    messages = []
+    for i in range(turns):
+        messages.extend([
+            HumanMessage(content=f"질문 {i}", id=f"h{i}"),
+            AIMessage(content="", tool_calls=[{"name": "web_search", "args": {"query": f"q{i}"}, "id": f"c{i}"}], id=f"a{i}"),
+            ToolMessage(content="x" * tool_output_size, tool_call_id=f"c{i}", id=f"t{i}"),
+            AIMessage(content=f"답변 {i}", id=f"r{i}"),
+        ])
+    return messages
+
+
+def _fake_model(content="요약"):
+    """고정 응답을 반환하는 가짜 LLM"""
+    return GenericFakeChatModel(messages=(AIMessage(content=content) for _ in itertools.count()))
+
+
+class TestContextManager:
+    """ContextManager 테스트 클래스"""
+    
+    def test_split_turns(self):
+        """사용자 턴 단위 분할"""
+        turns = split_turns(_make_history(3))
+        assert len(turns) == 3
+        assert all(isinstance(turn[0], HumanMessage) for turn in turns)
+    
+    @pytest.mark.asyncio
+    async def test_recent_turns_verbatim_and_old_tool_outputs_trimmed(self):
+        """최근 턴은 그대로, 오래된 턴의 도구 결과는 잘라서 전달"""
+        # Given: 요약 없이 최근 2턴만 유지하는 관리자
+        manager = ContextManager(max_recent_turns=2, old_tool_output_chars=100)
+        messages = _make_history(5)
+        
+        # When: 훅 실행
+        result = await manager.pre_model_hook({"messages": messages})
+        llm_input = result["llm_input_messages"]
+        
+        # Then: 최근 2턴(8개)은 원본, 오래된 도구 결과는 잘림
+        assert llm_input[-8:] == messages[-8:]
+        old_tool_messages = [m for m in llm_input[:-8] if isinstance(m, ToolMessage)]
+        assert len(old_tool_messages) == 3
+        assert all(len(m.content) < 200 for m in old_tool_messages)
+        assert manager.stats["last_tokens_after"] < manager.stats["last_tokens_before"]
+    
+    @pytest.mark.asyncio
+    async def test_old_turns_replaced_by_rolling_summary(self):
+        """오래된 턴이 누적 요약으로 대체"""
+        # Given: 요약 모델이 있는 관리자
+        manager = ContextManager(max_recent_turns=2, summarizer_model=_fake_model("아이폰 15 최저가 논의"), summary_batch_turns=2)
+        messages = _make_history(5)
+        
+        # When: 훅 실행
+        result = await manager.pre_model_hook({"messages": messages})
+        llm_input = result["llm_input_messages"]
+        
+        # Then: 요약 + 최근 2턴만 전달되고 요약 상태가 갱신됨
+        assert isinstance(llm_input[0], SystemMessage)
+        assert "아이폰 15 최저가 논의" in llm_input[0].content
+        assert llm_input[1:] == messages[-8:]
+        assert result["context_summary"] == "아이폰 15 최저가 논의"
+        assert result["summarized_until_id"] == "r2"
+        assert manager.stats["summaries"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_summary_reused_until_batch_threshold(self):
+        """요약 이후 새로 밀려난 턴이 기준 미만이면 재요약하지 않음"""
+        manager = ContextManager(max_recent_turns=2, summarizer_model=_fake_model(), summary_batch_turns=2)
+        messages = _make_history(6)
+        state = {"messages": messages, "context_summary": "기존 요약", "summarized_until_id": "r2"}
+        
+        result = await manager.pre_model_hook(state)
+        
+        assert "context_summary" not in result
+        assert manager.stats["summaries"] == 0
+        assert "기존 요약" in result["llm_input_messages"][0].content
+        assert result["llm_input_messages"][1].content == "질문 3"
+    
+    @pytest.mark.asyncio
+    async def test_hook_in_react_agent(self):
+        """React Agent에 연결된 상태로 다중 턴 실행"""
+        manager = ContextManager(max_recent_turns=1, summarizer_model=_fake_model("요약본"), summary_batch_turns=1)
+        graph = create_react_agent(
+            model=_fake_model("응답"),
+            tools=[],
+            checkpointer=MemorySaver(),
+            state_schema=ShoppingAgentState,
+            pre_model_hook=manager.pre_model_hook
+        )
+        config = {"configurable": {"thread_id": "t"}}
+        
+        for i in range(3):
+            await graph.ainvoke({"messages": [("user", f"질문 {i}")]}, config=config)
+        
+        state = await graph.aget_state(config)
+        assert len(state.values["messages"]) == 6
+        assert state.values["context_summary"] == "요약본"
+        assert manager.stats["summaries"] == 2
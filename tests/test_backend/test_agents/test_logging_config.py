@@ -0,0 +1,122 @@
+"""
+구조화 비동기 로깅 테스트
+"""
+import io
+import json
+import logging
+import queue
+
+from backend.agents import logging_config, tracing
+from backend.agents.logging_config import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    TextFormatter,
+    VerboseSampler,
+    configure_logging,
+    shutdown_logging
+)
+
+
+def _record(level: int = logging.INFO, msg: str = "메시지", **extra) -> logging.LogRecord:
+    record = logging.LogRecord("backend.test", level, __file__, 1, msg, (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestFormatters:
+    """포맷터 테스트 클래스"""
+
+    def test_json_formatter_includes_extra_fields_and_trace_id(self):
+        """JSON 한 줄에 extra 필드와 trace id 포함"""
+        # Given: extra 필드가 있는 레코드
+        record = _record(msg="SSE event", event_type="message_delta", event_bytes=42, trace_id="abc")
+
+        # When: JSON 포맷
+        entry = json.loads(JsonFormatter().format(record))
+
+        # Then: 기본 필드와 구조화 필드 모두 포함
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "backend.test"
+        assert entry["message"] == "SSE event"
+        assert entry["trace_id"] == "abc"
+        assert entry["event_type"] == "message_delta"
+        assert entry["event_bytes"] == 42
+
+    def test_text_formatter_appends_extra_fields(self):
+        """텍스트 형식은 extra 필드를 key=value로 덧붙임"""
+        # Given: extra 필드가 있는 레코드
+        record = _record(msg="SSE event", event_type="message")
+
+        # When: 텍스트 포맷
+        text = TextFormatter().format(record)
+
+        # Then: trace id 자리와 필드 포함
+        assert "INFO [-] backend.test: SSE event event_type=message" in text
+
+
+class TestQueueHandler:
+    """큐 핸들러/표본 추출 테스트 클래스"""
+
+    def test_drops_records_when_queue_is_full(self):
+        """큐가 가득 차면 기다리지 않고 버린 수를 기록"""
+        # Given: 크기 1인 큐
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        dropped_before = logging_config._stats["dropped_queue_full"]
+
+        # When: 레코드 두 개 기록
+        handler.handle(_record(msg="첫 번째"))
+        handler.handle(_record(msg="두 번째"))
+
+        # Then: 하나만 큐에 들어가고 하나는 버림
+        assert handler.queue.qsize() == 1
+        assert logging_config._stats["dropped_queue_full"] == dropped_before + 1
+
+    def test_verbose_records_are_sampled_and_dropped_under_load(self):
+        """DEBUG 로그는 비율만큼 통과하고 큐가 밀리면 모두 버림"""
+        # Given: 표본 비율 0.25, 큐 크기 2부터 상세 로그를 버리는 필터
+        log_queue = queue.Queue()
+        sampler = VerboseSampler(log_queue, sample_rate=0.25, drop_queue_size=2)
+
+        # When/Then: DEBUG는 4개 중 1개만 통과, INFO는 항상 통과
+        passed = [sampler.filter(_record(logging.DEBUG)) for _ in range(8)]
+        assert sum(passed) == 2
+        assert sampler.filter(_record(logging.INFO))
+
+        # When/Then: 큐가 밀리면 DEBUG는 모두 버리고 WARNING은 통과
+        log_queue.put(None)
+        log_queue.put(None)
+        assert not any(sampler.filter(_record(logging.DEBUG)) for _ in range(8))
+        assert sampler.filter(_record(logging.WARNING))
+
+
+class TestConfigureLogging:
+    """configure_logging 테스트 클래스"""
+
+    def test_records_are_written_by_listener_with_trace_id(self):
+        """로그는 출력 스레드에서 기록되고 현재 span의 trace id 포함"""
+        # Given: JSON 형식으로 StringIO에 출력하도록 설치
+        stream = io.StringIO()
+        root = logging.getLogger()
+        previous_level = root.level
+        configure_logging(level="DEBUG", fmt="json", stream=stream)
+        logger = logging.getLogger("backend.test_logging")
+        tracer = tracing.Tracer(tracing.InMemorySpanExporter())
+
+        try:
+            # When: span 안에서 인자/extra가 있는 로그 기록
+            with tracer.start_as_current_span("chat.turn") as span:
+                logger.info("세션 %s 처리", "user123", extra={"event_type": "message"})
+            logger.debug("span 밖 로그")
+        finally:
+            # 남은 레코드 출력 후 핸들러 제거
+            shutdown_logging()
+            root.setLevel(previous_level)
+
+        # Then: 두 레코드 모두 출력, 첫 레코드에 trace id와 extra 포함
+        entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert entries[0]["message"] == "세션 user123 처리"
+        assert entries[0]["trace_id"] == span.trace_id
+        assert entries[0]["event_type"] == "message"
+        assert entries[1]["message"] == "span 밖 로그"
+        assert entries[1]["trace_id"] == "-"
+        assert logging_config._handler is None
@@ -0,0 +1,115 @@
+"""
+쇼핑몰 병렬 검색 도구 테스트
+"""
+import asyncio
+import json
+import time
+import pytest
+from langchain_core.tools import StructuredTool
+
+from backend.agents.mcp_adapters.mall_search import (
+    MALL_SEARCH_TOOL_NAME,
+    MallFanoutSearch,
+    find_search_tool
+)
+
+MALL_RESULTS = {
+    "쿠팡": {"title": "아이폰 15 128GB 1,150,000원", "url": "https://www.coupang.com/vp/products/1"},
+    "11번가": {"title": "아이폰 15 128GB 1,180,000원", "url": "https://www.11st.co.kr/products/2"},
+    "G마켓": {"title": "아이폰 15 128GB 1,120,000원", "url": "https://item.gmarket.co.kr/3"}
+}
+
+
+def _make_search_tool(calls, delays=None, failures=()):
+    """쇼핑몰별 지연 시간/실패를 흉내 내는 검색 도구"""
+    delays = delays or {}
+
+    async def web_search_exa(query: str) -> str:
+        mall = query.split(" ", 1)[0]
+        calls.append(query)
+        await asyncio.sleep(delays.get(mall, 0.05))
+        if mall in failures:
+            raise RuntimeError("검색 실패")
+        return json.dumps({"results": [MALL_RESULTS[mall]]}, ensure_ascii=False)
+
+    return StructuredTool.from_function(
+        coroutine=web_search_exa,
+        name="web_search_exa",
+        description="웹 검색"
+    )
+
+
+class TestMallFanoutSearch:
+    """MallFanoutSearch 테스트 클래스"""
+
+    def test_find_search_tool(self):
+        """우선 도구 이름이 없으면 이름에 search가 들어간 도구 선택"""
+        tool = _make_search_tool([])
+        assert find_search_tool([tool], "web_search_exa") is tool
+        assert find_search_tool([tool], "missing") is tool
+        assert find_search_tool([], "web_search_exa") is None
+
+    @pytest.mark.asyncio
+    async def test_searches_malls_concurrently_and_merges(self):
+        """모든 쇼핑몰을 동시에 검색하고 가격순 상품 제안으로 병합"""
+        # Given: 쇼핑몰당 0.05초 걸리는 검색 도구
+        calls = []
+        fanout = MallFanoutSearch(_make_search_tool(calls), ["쿠팡", "11번가", "G마켓"])
+        tool = fanout.as_tool()
+
+        # When: 병합 도구 한 번 호출
+        started = time.perf_counter()
+        result = json.loads(await tool.ainvoke({"query": "아이폰 15"}))
+        elapsed = time.perf_counter() - started
+
+        # Then: 순차 실행(0.15초)보다 빠르고 하나의 관측 결과로 병합
+        assert tool.name == MALL_SEARCH_TOOL_NAME
+        assert sorted(calls) == sorted(["쿠팡 아이폰 15 가격", "11번가 아이폰 15 가격", "G마켓 아이폰 15 가격"])
+        assert elapsed < 0.12
+        assert [offer["store"] for offer in result["offers"]] == ["G마켓", "쿠팡", "11번가"]
+        assert [mall["status"] for mall in result["malls"]] == ["ok", "ok", "ok"]
+        assert result["malls"][0]["results"][0]["url"] == "https://www.coupang.com/vp/products/1"
+
+    @pytest.mark.asyncio
+    async def test_slow_and_failed_malls_do_not_block(self):
+        """제한 시간을 넘기거나 실패한 쇼핑몰은 제외하고 나머지 결과 반환"""
+        # Given: 11번가는 느리고 G마켓은 실패하는 검색 도구
+        fanout = MallFanoutSearch(
+            _make_search_tool([], delays={"11번가": 1.0}, failures={"G마켓"}),
+            ["쿠팡", "11번가", "G마켓"],
+            timeout_seconds=0.2
+        )
+
+        # When: 병렬 검색
+        started = time.perf_counter()
+        result = json.loads(await fanout.search("아이폰 15"))
+        elapsed = time.perf_counter() - started
+
+        # Then: 제한 시간 안에 쿠팡 결과만으로 응답
+        assert elapsed < 0.5
+        assert {mall["mall"]: mall["status"] for mall in result["malls"]} == {
+            "쿠팡": "ok", "11번가": "timeout", "G마켓": "error"
+        }
+        assert [offer["store"] for offer in result["offers"]] == ["쿠팡"]
+
+    @pytest.mark.asyncio
+    async def test_fanout_offers_reach_products_payload(self):
+        """본문 뒤쪽에만 가격이 있어도 병합 결과의 상품 제안이 상품 목록으로 전달"""
+        from backend.agents.shopping_agent import ShoppingReactAgent
+
+        # Given: 가격이 300자 이후에 나오는 검색 결과
+        async def web_search_exa(query: str) -> str:
+            text = "아이폰 15 128GB 상세 설명 " + "무료배송 " * 80 + "판매가 1,234,000원"
+            result = {"title": "아이폰 15 128GB", "url": "https://www.coupang.com/vp/products/9", "text": text}
+            return json.dumps({"results": [result]}, ensure_ascii=False)
+
+        search_tool = StructuredTool.from_function(coroutine=web_search_exa, name="web_search_exa", description="웹 검색")
+        output = await MallFanoutSearch(search_tool, ["쿠팡"]).search("아이폰 15")
+        agent = ShoppingReactAgent("test-key")
+        agent.price_index = None
+
+        # When: 병합 결과를 도구 결과로 상품 목록 추출
+        products = await agent._products_payload("", [output])
+
+        # Then: 잘린 본문이 아닌 병합 단계에서 파싱한 상품 제안 사용
+        assert [(product["store"], product["price"]) for product in products] == [("쿠팡", 1234000)]
@@ -0,0 +1,117 @@
+"""
+메트릭 레지스트리 테스트
+"""
+import threading
+import pytest
+
+from backend.agents import metrics, tracing
+from backend.agents.metrics import MetricsRegistry, stats_families
+
+
+class TestMetricsRegistry:
+    """MetricsRegistry 테스트 클래스"""
+    
+    def test_render_counter_gauge_and_histogram(self):
+        """Prometheus 텍스트 형식으로 카운터/게이지/누적 히스토그램 출력"""
+        # Given: 레이블이 있는 카운터, 게이지, 히스토그램
+        registry = MetricsRegistry()
+        requests = registry.counter("chat_requests_total", "요청 수", ("status",))
+        in_flight = registry.gauge("agent_runs_in_flight", "실행 중 턴 수")
+        latency = registry.histogram("llm_call_duration_seconds", "LLM 지연", ("model",), buckets=(0.1, 1.0))
+        
+        # When: 값 기록
+        requests.labels("accepted").inc()
+        requests.labels("accepted").inc()
+        requests.labels('re"jected').inc()
+        in_flight.inc()
+        in_flight.inc()
+        in_flight.dec()
+        for seconds in (0.05, 0.5, 0.7, 3.0):
+            latency.labels("gemini").observe(seconds)
+        text = registry.render()
+        
+        # Then: 형식과 값 확인 (히스토그램 구간은 누적, 레이블 값은 이스케이프)
+        assert "# TYPE chat_requests_total counter" in text
+        assert 'chat_requests_total{status="accepted"} 2' in text
+        assert 'chat_requests_total{status="re\\"jected"} 1' in text
+        assert "agent_runs_in_flight 1" in text
+        assert "# TYPE llm_call_duration_seconds histogram" in text
+        assert 'llm_call_duration_seconds_bucket{model="gemini",le="0.1"} 1' in text
+        assert 'llm_call_duration_seconds_bucket{model="gemini",le="1.0"} 3' in text
+        assert 'llm_call_duration_seconds_bucket{model="gemini",le="+Inf"} 4' in text
+        assert 'llm_call_duration_seconds_count{model="gemini"} 4' in text
+        assert 'llm_call_duration_seconds_sum{model="gemini"} 4.25' in text
+        assert text.endswith("\n")
+    
+    def test_same_name_returns_existing_metric(self):
+        """같은 이름으로 다시 등록하면 기존 메트릭 반환"""
+        registry = MetricsRegistry()
+        assert registry.counter("a_total", "a") is registry.counter("a_total", "a")
+    
+    def test_collectors_read_stats_on_render(self):
+        """수집기는 출력 시점에 stats()를 읽고, 누적 값은 counter로 출력"""
+        # Given: 호출될 때마다 값이 바뀌는 stats
+        registry = MetricsRegistry()
+        stats = {"hits": 3, "misses": 1, "hit_rate": 0.75, "size": 2, "backend": "bounded"}
+        registry.register_collector(
+            "tool_cache",
+            lambda: stats_families("tool_cache", "도구 캐시", stats, counters=("hits", "misses"))
+        )
+        
+        # When: 값 변경 후 출력
+        stats["hits"] = 4
+        text = registry.render()
+        
+        # Then: 최신 값, 숫자가 아닌 값 제외
+        assert "# TYPE tool_cache_hits_total counter" in text
+        assert "tool_cache_hits_total 4" in text
+        assert "# TYPE tool_cache_hit_rate gauge" in text
+        assert "tool_cache_hit_rate 0.75" in text
+        assert "backend" not in text
+    
+    @pytest.mark.asyncio
+    async def test_arender_runs_collectors_off_loop(self):
+        """arender()는 수집기를 이벤트 루프가 아닌 스레드 풀에서 실행"""
+        registry = MetricsRegistry()
+        collector_threads = []
+        
+        def collector():
+            collector_threads.append(threading.get_ident())
+            return [("db_rows", "gauge", "행 수", [({}, 3)])]
+        
+        registry.register_collector("db", collector)
+        text = await registry.arender()
+        
+        assert "db_rows 3" in text
+        assert collector_threads and collector_threads[0] != threading.get_ident()
+
+
+def test_span_end_records_latency_and_tokens(monkeypatch):
+    """span이 끝나면 LLM/MCP 지연 시간과 토큰 사용량을 기록"""
+    # Given: 새 레지스트리의 메트릭으로 교체
+    registry = MetricsRegistry()
+    for name, metric in (
+        ("LLM_CALL_SECONDS", registry.histogram("llm_call_duration_seconds", "LLM 지연", ("model",))),
+        ("LLM_TOKENS", registry.counter("llm_tokens_total", "토큰", ("model", "direction"))),
+        ("MCP_CALL_SECONDS", registry.histogram("mcp_call_duration_seconds", "MCP 지연", ("tool", "status")))
+    ):
+        monkeypatch.setattr(metrics, name, metric)
+    tracer = tracing.Tracer()
+    
+    # When: LLM span과 실패한 MCP span 종료
+    llm = tracer.start_span("llm.chat", root=True, attributes={
+        "gen_ai.request.model": "gemini-2.0-flash-exp",
+        "gen_ai.usage.input_tokens": 120,
+        "gen_ai.usage.output_tokens": 8
+    })
+    llm.end()
+    mcp = tracer.start_span("mcp.web_search_exa", parent=llm, attributes={"tool.name": "web_search_exa"})
+    mcp.record_exception(RuntimeError("연결 실패"))
+    mcp.end()
+    text = registry.render()
+    
+    # Then: 히스토그램과 토큰 카운터 기록
+    assert 'llm_call_duration_seconds_count{model="gemini-2.0-flash-exp"} 1' in text
+    assert 'llm_tokens_total{model="gemini-2.0-flash-exp",direction="input"} 120' in text
+    assert 'llm_tokens_total{model="gemini-2.0-flash-exp",direction="output"} 8' in text
+    assert 'mcp_call_duration_seconds_count{tool="web_search_exa",status="error"} 1' in text
@@ -0,0 +1,112 @@
+"""
+모델 라우팅 테스트
+"""
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from backend.agents.model_router import (
+    STEP_ANSWER,
+    STEP_TOOL_CALL,
+    TIER_FAST,
+    TIER_STRONG,
+    ModelRouter,
+    classify_turn
+)
+from backend.agents.prompts.shopping_prompts import get_user_search_message
+
+
+class NamedModel(BaseChatModel):
+    """호출되면 자신의 이름으로 답하는 테스트용 모델"""
+
+    name: str = "model"
+    bound_tools: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "named"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"bound_tools": len(tools)})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"{self.name}:{self.bound_tools}"))])
+
+
+def _history(*messages):
+    return [SystemMessage(content="시스템 프롬프트"), *messages]
+
+
+class TestClassifyTurn:
+    """classify_turn 테스트 클래스"""
+
+    def test_simple_turns_go_to_fast_tier(self):
+        """잡담과 이전 대화를 잇는 짧은 후속 질문은 빠른 모델"""
+        previous = [HumanMessage(content=get_user_search_message("아이폰 15")), AIMessage(content="최저가 TOP 3 ...")]
+
+        assert classify_turn(_history(HumanMessage(content=get_user_search_message("고마워")))) == (TIER_FAST, "smalltalk")
+        assert classify_turn(
+            _history(*previous, HumanMessage(content=get_user_search_message("그거 더 싼 거 있어?")))
+        ) == (TIER_FAST, "follow_up")
+
+    def test_complex_and_new_searches_go_to_strong_tier(self):
+        """비교/추천 질문, 긴 질문, 이전 대화 없는 후속 표현은 강한 모델"""
+        assert classify_turn(_history(HumanMessage(content="아이폰 15랑 갤럭시 S24 비교해줘"))) == (TIER_STRONG, "complex")
+        assert classify_turn(
+            _history(HumanMessage(content="노트북 " * 20)), simple_max_chars=40
+        ) == (TIER_STRONG, "long_message")
+        assert classify_turn(_history(HumanMessage(content="그거 더 싼 거 있어?"))) == (TIER_STRONG, "search")
+        assert classify_turn(_history(HumanMessage(content=get_user_search_message("에어팟 프로")))) == (TIER_STRONG, "search")
+
+    @pytest.mark.parametrize("query", [
+        "네스프레소 버츄오 캡슐", "하이마트 냉장고", "네이버 아이폰 15", "바이레도 향수",
+        "응원봉", "Hello Kitty 인형", "hisense TV", "okinawa"
+    ])
+    def test_searches_starting_with_greeting_word_are_not_smalltalk(self, query):
+        """인사말로 시작하는 상품명 검색은 잡담이 아닌 일반 검색"""
+        assert classify_turn(_history(HumanMessage(content=get_user_search_message(query)))) == (TIER_STRONG, "search")
+
+    @pytest.mark.parametrize("query", ["감사합니다!", "안녕하세요~", "네 알겠어요ㅎㅎ", "ok", "Thank you!"])
+    def test_whole_message_smalltalk_goes_to_fast_tier(self, query):
+        """메시지 전체가 인사/감사/맞장구이면 잡담"""
+        assert classify_turn(_history(HumanMessage(content=get_user_search_message(query)))) == (TIER_FAST, "smalltalk")
+
+
+class TestModelRouter:
+    """ModelRouter 테스트 클래스"""
+
+    @pytest.fixture
+    def router(self):
+        return ModelRouter({TIER_FAST: NamedModel(name="fast"), TIER_STRONG: NamedModel(name="strong")})
+
+    def test_route_selects_tier_per_step(self, router):
+        """일반 검색 턴은 도구 호출 단계만 빠른 모델, 결과 정리 단계는 강한 모델"""
+        question = HumanMessage(content=get_user_search_message("에어팟 프로"))
+        tool_call = AIMessage(content="", tool_calls=[{"name": "search_all_malls", "args": {}, "id": "call_1"}])
+        tool_result = ToolMessage(content="{}", tool_call_id="call_1")
+
+        first = router.route(_history(question))
+        second = router.route(_history(question, tool_call, tool_result))
+
+        assert (first.tier, first.step, first.reason) == (TIER_FAST, STEP_TOOL_CALL, "tool_call_step")
+        assert (second.tier, second.step, second.reason) == (TIER_STRONG, STEP_ANSWER, "search")
+
+    @pytest.mark.asyncio
+    async def test_bound_router_invokes_selected_model_and_records_savings(self, router):
+        """도구가 바인딩된 라우터는 선택한 모델로 호출하고 통계를 원래 라우터와 공유"""
+        # Given: 도구 2개를 바인딩한 라우터
+        bound = router.bind_tools([object(), object()])
+
+        # When: 강한 모델 턴 후 빠른 모델 턴 호출
+        strong = await bound.ainvoke(_history(HumanMessage(content="아이폰 15랑 갤럭시 비교해줘")))
+        fast = await bound.ainvoke(_history(HumanMessage(content="감사합니다")))
+
+        # Then: 티어별 모델에 도구가 바인딩된 채로 호출, 통계는 원래 라우터에서 조회
+        assert strong.content == "strong:2"
+        assert fast.content == "fast:2"
+        stats = router.stats()
+        assert stats["fast_calls"] == 1
+        assert stats["strong_calls"] == 1
+        assert stats["fast_ratio"] == 0.5
+        assert stats["estimated_saved_seconds"] >= 0
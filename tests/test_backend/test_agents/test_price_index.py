@@ -0,0 +1,94 @@
+"""
+관측 가격 인덱스 테스트
+"""
+import time
+
+from backend.agents.price_index import PriceIndex, format_price_index_answer, is_price_query, matches_query
+from backend.agents.product_parser import extract_products_from_answer
+from backend.schemas.chat import Product
+
+
+def _product(name, price, store, url):
+    return Product(name=name, price=price, store=store, url=url)
+
+
+class TestPriceIndex:
+    """PriceIndex 테스트 클래스"""
+    
+    def test_lookup_returns_lowest_price_per_store(self):
+        """판매처별 최저가를 가격순으로 반환"""
+        # Given: 같은 검색어로 관측된 여러 판매처 가격
+        index = PriceIndex(":memory:")
+        index.record("아이폰 15 최저가", [
+            _product("아이폰 15", 1250000, "쿠팡", "https://www.coupang.com/1"),
+            _product("아이폰 15 자급제", 1200000, "쿠팡", "https://www.coupang.com/2"),
+            _product("아이폰 15", 1230000, "11번가", "https://www.11st.co.kr/1"),
+            _product("아이폰 15", 1300000, "G마켓", "https://www.gmarket.co.kr/1")
+        ])
+        
+        # When: 표현이 다른 같은 검색어로 조회
+        offers = index.lookup("아이폰15 가격 알려줘", max_age_seconds=60)
+        
+        # Then: 판매처별 최저가 3개가 가격순으로 반환
+        assert [(o["store"], o["price"]) for o in offers] == [
+            ("쿠팡", 1200000), ("11번가", 1230000), ("G마켓", 1300000)
+        ]
+        assert offers[0]["url"] == "https://www.coupang.com/2"
+        assert index.stats()["hits"] == 1
+    
+    def test_lookup_by_product_name_and_staleness(self):
+        """상품명 키로도 조회되며, 오래된 관측값은 제외"""
+        index = PriceIndex(":memory:")
+        index.record("폰 추천", [_product("갤럭시 S24", 1100000, "쿠팡", "https://www.coupang.com/3")])
+        index.record(
+            "갤럭시 S24",
+            [_product("갤럭시 S24", 900000, "옥션", "https://www.auction.co.kr/1")],
+            observed_at=time.time() - 3600
+        )
+        
+        offers = index.lookup("갤럭시 S24 최저가", max_age_seconds=600)
+        
+        assert [o["store"] for o in offers] == ["쿠팡"]
+        assert index.lookup("없는 상품", max_age_seconds=600) == []
+    
+    def test_record_keeps_latest_observation_and_prunes(self):
+        """같은 판매처/URL은 최신 관측값으로 갱신하고, 보존 기간이 지나면 삭제"""
+        index = PriceIndex(":memory:")
+        url = "https://www.coupang.com/1"
+        index.record("아이폰 15", [_product("아이폰 15", 1300000, "쿠팡", url)], observed_at=time.time() - 100)
+        index.record("아이폰 15", [_product("아이폰 15", 1250000, "쿠팡", url)])
+        
+        assert index.stats()["offers"] == 1
+        assert index.lookup("아이폰 15", max_age_seconds=60)[0]["price"] == 1250000
+        
+        assert index.prune(retention_seconds=-1) == 1
+        assert index.stats()["offers"] == 0
+    
+    def test_matches_query_excludes_other_products(self):
+        """검색어를 포함한 본품만 일치, 검색어에 없는 액세서리 키워드가 있으면 불일치"""
+        assert matches_query("아이폰 15 최저가", "Apple 아이폰 15 128GB 자급제")
+        assert not matches_query("아이폰 15", "아이폰 15 실리콘 케이스")
+        assert not matches_query("아이폰 15", "아이폰15 강화유리 보호필름")
+        assert not matches_query("아이폰 15", "갤럭시 S24")
+        assert matches_query("아이폰 15 케이스", "아이폰 15 케이스 투명")
+    
+    def test_format_answer_is_parseable(self):
+        """인덱스 답변은 상품 파서가 다시 읽을 수 있는 TOP 3 형식"""
+        offers = [
+            {"name": "아이폰 15", "price": 1200000, "store": "쿠팡",
+             "url": "https://www.coupang.com/1", "observed_at": time.time()},
+            {"name": "아이폰 15", "price": 1230000, "store": "11번가",
+             "url": "https://www.11st.co.kr/1", "observed_at": time.time()}
+        ]
+        
+        answer = format_price_index_answer(offers)
+        
+        assert [(p.price, p.store) for p in extract_products_from_answer(answer)] == [
+            (1200000, "쿠팡"), (1230000, "11번가")
+        ]
+    
+    def test_is_price_query(self):
+        """가격 질의 판별"""
+        assert is_price_query("아이폰 15 최저가")
+        assert is_price_query("갤럭시 S24 얼마야?")
+        assert not is_price_query("아이폰 15 리뷰 요약해줘")
@@ -0,0 +1,82 @@
+"""
+상품 정보 추출 테스트
+"""
+import json
+
+from backend.agents.product_parser import (
+    choose_products,
+    extract_offers_from_tool_output,
+    extract_products_from_answer,
+    parse_price,
+    store_from_url
+)
+
+ANSWER = """🏆 최저가 TOP 3
+
+1️⃣ **Apple 아이폰 15 128GB** - 1,200,000원
+   📍 판매처: 쿠팡
+   - 할인가: 1,100,000원
+   🔗 구매링크: https://www.coupang.com/vp/products/123
+
+2️⃣ [아이폰 15 자급제] - 1,250,000원
+   🔗 구매링크: [바로가기](https://shopping.naver.com/abc)
+
+3. 아이폰 15: 1,300,000원 (https://www.11st.co.kr/products/9)
+- 배송비 3,000원 별도
+"""
+
+
+class TestProductParser:
+    """상품 정보 추출 테스트 클래스"""
+    
+    def test_parse_price_and_store(self):
+        """가격 표기와 쇼핑몰 도메인 해석"""
+        assert parse_price("최저가 1,200,000원 (무료배송)") == 1200000
+        assert parse_price("가격 문의") is None
+        assert store_from_url("https://m.coupang.com/vp/1") == "쿠팡"
+        assert store_from_url("https://blog.example.com") is None
+    
+    def test_extract_products_from_answer(self):
+        """시스템 프롬프트 형식의 답변에서 추천 상품 추출"""
+        products = extract_products_from_answer(ANSWER)
+        
+        assert [(p.name, p.price, p.store) for p in products] == [
+            ("Apple 아이폰 15 128GB", 1200000, "쿠팡"),
+            ("아이폰 15 자급제", 1250000, "네이버쇼핑"),
+            ("아이폰 15", 1300000, "11번가")
+        ]
+        assert products[0].url == "https://www.coupang.com/vp/products/123"
+        assert products[1].url == "https://shopping.naver.com/abc"
+    
+    def test_extract_products_from_plain_answer(self):
+        """상품 목록이 없는 답변은 빈 목록"""
+        assert extract_products_from_answer("안녕하세요! 어떤 상품을 찾으시나요?") == []
+    
+    def test_extract_offers_from_tool_output(self):
+        """검색 도구 JSON 결과에서 쇼핑몰 상품만 추출"""
+        output = json.dumps({"results": [
+            {"title": "아이폰 15 1,190,000원", "url": "https://item.gmarket.co.kr/1", "text": ""},
+            {"title": "아이폰 15 리뷰", "url": "https://blog.example.com/1", "text": "1,000,000원"},
+            {"title": "아이폰 15 자급제", "url": "https://www.11st.co.kr/2", "text": "판매가 1,210,000원"}
+        ]}, ensure_ascii=False)
+        
+        offers = extract_offers_from_tool_output(output)
+        
+        assert [(o.name, o.price, o.store) for o in offers] == [
+            ("아이폰 15", 1190000, "G마켓"),
+            ("아이폰 15 자급제", 1210000, "11번가")
+        ]
+        assert extract_offers_from_tool_output("JSON이 아닌 결과") == []
+    
+    def test_choose_products_falls_back_to_tool_offers(self):
+        """답변에 상품이 없으면 도구 결과의 상품을 가격순으로 사용"""
+        output = json.dumps({"results": [
+            {"title": "B 1,300,000원", "url": "https://www.coupang.com/2"},
+            {"title": "A 1,100,000원", "url": "https://www.ssg.com/1"}
+        ]}, ensure_ascii=False)
+        
+        offers = extract_offers_from_tool_output(output)
+        products = choose_products(extract_products_from_answer("가격 정보를 정리했습니다."), offers)
+        
+        assert [p.price for p in products] == [1100000, 1300000]
+        assert choose_products(extract_products_from_answer(ANSWER), offers)[0].store == "쿠팡"
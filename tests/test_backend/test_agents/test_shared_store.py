@@ -0,0 +1,132 @@
+"""
+멀티 워커 공유 상태 저장소 테스트
+"""
+import threading
+import time
+
+import pytest
+
+from backend.agents.shared_store import SharedTTLCache, SqliteSharedStore
+
+
+class TestSqliteSharedStore:
+    """SqliteSharedStore 테스트 클래스"""
+
+    def test_values_are_shared_between_connections(self, tmp_path):
+        """한 워커가 저장한 값을 다른 워커가 조회 (튜플 결과 유지, TTL 만료)"""
+        # Given: 같은 파일을 여는 두 저장소 (워커 두 개)
+        path = str(tmp_path / "shared.db")
+        worker_a = SqliteSharedStore(path)
+        worker_b = SqliteSharedStore(path)
+
+        # When: 워커 A가 값 저장
+        worker_a.set("tool_cache", "key", ("본문", [{"type": "text"}]), ttl_seconds=60)
+        worker_a.set("tool_cache", "expired", "값", ttl_seconds=0.01)
+        time.sleep(0.02)
+
+        # Then: 워커 B에서 같은 값(튜플 형태 포함) 조회, 만료된 값은 None
+        assert worker_b.get("tool_cache", "key") == ("본문", [{"type": "text"}])
+        assert worker_b.get("tool_cache", "expired") is None
+        assert worker_b.get("query_cache", "key") is None
+
+    def test_lease_limits_holders_across_workers(self, tmp_path):
+        """권한은 최대 보유자 수까지만 획득되고 반납/만료 후 다른 워커가 획득"""
+        # Given: 두 워커
+        path = str(tmp_path / "shared.db")
+        worker_a = SqliteSharedStore(path)
+        worker_b = SqliteSharedStore(path)
+
+        # When/Then: A가 보유 중이면 B는 획득 실패, 보유자는 다시 획득(갱신) 가능
+        assert worker_a.try_acquire("session:user123", "a", ttl_seconds=60)
+        assert not worker_b.try_acquire("session:user123", "b", ttl_seconds=60)
+        assert worker_a.try_acquire("session:user123", "a", ttl_seconds=60)
+
+        # When/Then: 반납 후 B 획득
+        worker_a.release("session:user123", "a")
+        assert worker_b.try_acquire("session:user123", "b", ttl_seconds=0.01)
+
+        # When/Then: B의 권한이 만료되면 갱신 실패, A가 이어받음
+        time.sleep(0.02)
+        assert not worker_b.renew("session:user123", "b", ttl_seconds=60)
+        assert worker_a.try_acquire("session:user123", "a", ttl_seconds=60)
+        assert worker_b.holders("session:user123") == 1
+
+    def test_counter_is_shared(self, tmp_path):
+        """카운터는 워커 간에 단조 증가"""
+        path = str(tmp_path / "shared.db")
+        worker_a = SqliteSharedStore(path)
+        worker_b = SqliteSharedStore(path)
+
+        assert worker_a.incr("session_generation:user123") == 1
+        assert worker_b.incr("session_generation:user123") == 2
+        assert worker_a.read("session_generation:user123") == 2
+        assert worker_a.read("session_generation:other") == 0
+
+    def test_counter_expires_after_ttl(self, tmp_path):
+        """유효 시간이 지난 카운터는 0으로 조회되고 다음 증가 때 정리 후 새로 시작"""
+        # Given: 유효 시간이 짧은 카운터와 만료 없는 카운터
+        store = SqliteSharedStore(str(tmp_path / "shared.db"))
+        store.incr("session_generation:user123", ttl_seconds=0.01)
+        store.incr("session_generation:user123", ttl_seconds=0.01)
+        store.incr("total")
+
+        # When: 유효 시간 경과
+        time.sleep(0.02)
+
+        # Then: 만료된 카운터는 0, 다시 증가하면 1부터, 만료 없는 카운터는 유지
+        assert store.read("session_generation:user123") == 0
+        assert store.incr("session_generation:other", ttl_seconds=60) == 1
+        assert store._connection().execute(
+            "SELECT COUNT(*) FROM counters WHERE name = ?", ("session_generation:user123",)
+        ).fetchone()[0] == 0
+        assert store.incr("session_generation:user123", ttl_seconds=60) == 1
+        assert store.read("total") == 1
+
+    @pytest.mark.asyncio
+    async def test_async_methods_run_off_event_loop(self, tmp_path):
+        """비동기 메서드는 SQLite 호출을 이벤트 루프 스레드가 아닌 스레드에서 실행"""
+        # Given: 호출 스레드를 기록하는 저장소
+        store = SqliteSharedStore(str(tmp_path / "shared.db"))
+        threads = []
+        for name in ("try_acquire", "incr", "read", "release"):
+            original = getattr(store, name)
+
+            def recording(*args, _original=original, **kwargs):
+                threads.append(threading.get_ident())
+                return _original(*args, **kwargs)
+
+            setattr(store, name, recording)
+
+        # When: 비동기 메서드 호출
+        assert await store.atry_acquire("session:user123", "a", ttl_seconds=60)
+        assert await store.aincr("session_generation:user123", ttl_seconds=60) == 1
+        assert await store.aread("session_generation:user123") == 1
+        await store.arelease("session:user123", "a")
+
+        # Then: 모든 호출이 다른 스레드에서 실행되고 결과는 동기 메서드와 같음
+        assert len(threads) == 4
+        assert threading.get_ident() not in threads
+        assert store.holders("session:user123") == 0
+
+
+class TestSharedTTLCache:
+    """SharedTTLCache 테스트 클래스"""
+
+    def test_shared_cache_respects_max_size(self, tmp_path):
+        """최대 크기를 넘으면 만료가 가장 이른 항목부터 제거"""
+        # Given: 최대 2개 캐시
+        store = SqliteSharedStore(str(tmp_path / "shared.db"))
+        cache = SharedTTLCache(store, "query_cache", max_size=2, ttl_seconds=60)
+
+        # When: 튜플 키 포함 3개 저장
+        cache.set("아이폰15", "답변1", ttl_seconds=10)
+        cache.set(("search", '{"query": "갤럭시"}'), "답변2")
+        cache.set("에어팟", "답변3")
+
+        # Then: 가장 먼저 만료될 항목 제거, 히트/미스 집계
+        assert cache.get("아이폰15") is None
+        assert cache.get(("search", '{"query": "갤럭시"}')) == "답변2"
+        assert len(cache) == 2
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 1 and stats["misses"] == 1
@@ -201,6 +201,20 @@ class TestShoppingReactAgent:
         assert agent.google_api_key == google_key
         assert agent.memory is not None  # 메모리 초기화 확인
     
+    def test_agent_creation_with_model_routing(self):
+        """기본 생성 시 빠른/강한 모델 라우터 구성, 모델을 주입하면 라우팅하지 않음"""
+        # Given/When: 기본 모델로 생성
+        agent = ShoppingReactAgent("test-google-key")
+        
+        # Then: 두 티어의 Gemini 모델로 라우터 구성
+        assert agent.model_router is not None
+        assert agent.fast_model.model.endswith("gemini-2.0-flash-lite")
+        assert agent.model.model.endswith("gemini-2.0-flash-exp")
+        
+        # When/Then: 모델만 주입하면 그 모델 하나만 사용
+        injected = ShoppingReactAgent("test-google-key", model=agent.model)
+        assert injected.model_router is None
+    
     @pytest.mark.asyncio
     async def test_search_products_success(self):
         """상품 검색 성공 테스트 (멀티턴 대화 지원)"""
@@ -456,6 +470,601 @@ class TestShoppingReactAgent:
         assert result1["session_id"] == session_id_1
         assert result2["session_id"] == session_id_2
 
+    @pytest.mark.asyncio
+    async def test_stream_search_products_forwards_events(self):
+        """토큰/도구 이벤트 스트리밍 테스트"""
+        # Given: LangGraph 이벤트 스트림을 흉내내는 Agent
+        agent = ShoppingReactAgent("test-key")
+        session_id = "test-session-stream"
+        metadata = {"langgraph_node": "agent"}
+        
+        async def fake_events(*args, **kwargs):
+            yield {"event": "on_tool_start", "name": "web_search", "data": {"input": {"query": "아이폰 15"}}}
+            yield {"event": "on_tool_end", "name": "web_search", "data": {"output": MagicMock(content="검색 결과")}}
+            yield {"event": "on_chat_model_stream", "data": {"chunk": MagicMock(content="최저가는 ")}, "metadata": metadata}
+            yield {"event": "on_chat_model_stream", "data": {"chunk": MagicMock(content="1,000,000원")}, "metadata": metadata}
+            yield {
+                "event": "on_chat_model_end",
+                "data": {"output": MagicMock(content="최저가는 1,000,000원", tool_calls=[])},
+                "metadata": metadata
+            }
+        
+        mock_agent = MagicMock()
+        mock_agent.astream_events = MagicMock(side_effect=fake_events)
+        agent.agent = mock_agent
+        
+        # When: 스트리밍 검색 실행
+        events = [event async for event in agent.stream_search_products("아이폰 15", session_id)]
+        
+        # Then: 이벤트가 순서대로 전달되고 최종 답변으로 끝남
+        assert [event["type"] for event in events] == ["tool_start", "tool_end", "token", "token", "final"]
+        assert events[0]["tool_name"] == "web_search"
+        assert events[1]["output"] == "검색 결과"
+        assert events[-1]["content"] == "최저가는 1,000,000원"
+        
+        call_args = mock_agent.astream_events.call_args
+        assert call_args[1]["config"]["configurable"]["thread_id"] == session_id
+    
+    @pytest.mark.asyncio
+    async def test_stream_search_products_error(self):
+        """스트리밍 중 예외 발생 시 error 이벤트 테스트"""
+        # Given: 스트리밍 도중 실패하는 Agent
+        agent = ShoppingReactAgent("test-key")
+        
+        async def failing_events(*args, **kwargs):
+            yield {"event": "on_chat_model_stream", "data": {"chunk": MagicMock(content="검색")}}
+            raise Exception("네트워크 오류")
+        
+        mock_agent = MagicMock()
+        mock_agent.astream_events = MagicMock(side_effect=failing_events)
+        agent.agent = mock_agent
+        
+        # When: 스트리밍 검색 실행
+        events = [event async for event in agent.stream_search_products("아이폰 15", "s1")]
+        
+        # Then: 마지막 이벤트가 에러
+        assert events[-1]["type"] == "error"
+        assert "네트워크 오류" in events[-1]["error"]
+    
+    def test_message_text_with_content_parts(self):
+        """파트 리스트 형태 content 텍스트 추출 테스트"""
+        message = MagicMock(content=[{"type": "text", "text": "안녕"}, "하세요"])
+        assert ShoppingReactAgent._message_text(message) == "안녕하세요"
+
+    @pytest.mark.asyncio
+    async def test_search_products_cache_hit_across_sessions(self):
+        """정규화된 쿼리 캐시 히트 테스트"""
+        # Given: 첫 검색 결과가 캐시된 Agent
+        agent = ShoppingReactAgent("test-key")
+        mock_agent = AsyncMock()
+        mock_agent.ainvoke.return_value = {
+            "messages": [MagicMock(content="아이폰 15 최저가는 1,081,410원입니다.")]
+        }
+        agent.agent = mock_agent
+        await agent.search_products("아이폰 15 최저가", "session-a")
+        
+        # When: 다른 세션에서 표기만 다른 동일 쿼리 검색
+        result = await agent.search_products("아이폰15", "session-b")
+        
+        # Then: Agent 재호출 없이 캐시 응답 반환 및 세션 메모리에 기록
+        assert mock_agent.ainvoke.call_count == 1
+        assert result["cached"] is True
+        assert result["response"] == "아이폰 15 최저가는 1,081,410원입니다."
+        mock_agent.aupdate_state.assert_called_once()
+        assert agent.query_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_clear_session_frees_memory(self):
+        """세션 초기화 시 해당 스레드의 체크포인트가 실제로 해제됨"""
+        # Given: 가짜 LLM으로 실제 그래프를 실행해 메모리에 대화가 쌓인 Agent
+        import itertools
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+        from langgraph.prebuilt import create_react_agent
+        from backend.agents.checkpointers import BoundedMemorySaver
+        
+        agent = ShoppingReactAgent("test-key", checkpointer=BoundedMemorySaver())
+        agent.query_cache = None
+        model = GenericFakeChatModel(messages=(AIMessage(content="응답") for _ in itertools.count()))
+        agent.agent = create_react_agent(model=model, tools=[], checkpointer=agent.memory)
+        
+        await agent.search_products("아이폰 15", "session-clear")
+        await agent.search_products("갤럭시 S24", "session-keep")
+        assert agent.memory_stats()["threads"] == 2
+        bytes_before = agent.memory_stats()["bytes"]
+        
+        # When: 한 세션 초기화
+        await agent.clear_session("session-clear")
+        
+        # Then: 해당 스레드의 체크포인트/blob이 모두 제거되고 다른 세션은 유지
+        stats = agent.memory_stats()
+        assert stats["threads"] == 1
+        assert stats["bytes"] < bytes_before
+        assert not any(key[0] == "session-clear" for key in agent.memory.blobs)
+        assert await agent.memory.aget_tuple({"configurable": {"thread_id": "session-clear"}}) is None
+        assert await agent.memory.aget_tuple({"configurable": {"thread_id": "session-keep"}}) is not None
+    
+    @pytest.mark.asyncio
+    async def test_purge_idle_sessions(self):
+        """유휴 세션 일괄 삭제"""
+        from backend.agents.checkpointers import BoundedMemorySaver
+        
+        agent = ShoppingReactAgent("test-key", checkpointer=BoundedMemorySaver())
+        agent.memory._last_access.update({"idle": 0.0})
+        
+        purged = await agent.purge_idle_sessions(idle_seconds=60)
+        
+        assert purged == ["idle"]
+    
+    @pytest.mark.asyncio
+    async def test_purge_idle_sessions_runs_sqlite_eviction_off_loop(self, tmp_path):
+        """SQLite checkpointer의 유휴 세션 삭제는 이벤트 루프가 아닌 스레드에서 실행"""
+        import threading
+        from backend.agents.sqlite_checkpointer import SqliteCheckpointSaver
+        
+        # Given: 삭제 실행 스레드를 기록하는 SQLite checkpointer
+        saver = SqliteCheckpointSaver(path=str(tmp_path / "checkpoints.db"))
+        agent = ShoppingReactAgent("test-key", checkpointer=saver)
+        threads = []
+        original = saver.evict_idle_threads
+        
+        def traced(idle_seconds=None):
+            threads.append(threading.get_ident())
+            return original(idle_seconds)
+        
+        saver.evict_idle_threads = traced
+        
+        # When: 유휴 세션 정리
+        purged = await agent.purge_idle_sessions(idle_seconds=60)
+        
+        # Then: 루프 스레드가 아닌 스레드에서 한 번 실행
+        assert purged == []
+        assert len(threads) == 1 and threads[0] != threading.get_ident()
+        saver.close()
+    
+    @pytest.mark.asyncio
+    async def test_amemory_stats_runs_off_loop(self, tmp_path):
+        """비동기 메모리 통계 조회는 이벤트 루프가 아닌 스레드에서 실행"""
+        import threading
+        from backend.agents.sqlite_checkpointer import SqliteCheckpointSaver
+        
+        saver = SqliteCheckpointSaver(path=str(tmp_path / "checkpoints.db"))
+        agent = ShoppingReactAgent("test-key", checkpointer=saver)
+        threads = []
+        original = saver.stats
+        
+        def traced():
+            threads.append(threading.get_ident())
+            return original()
+        
+        saver.stats = traced
+        
+        stats = await agent.amemory_stats()
+        
+        assert stats["threads"] == 0
+        assert len(threads) == 1 and threads[0] != threading.get_ident()
+        saver.close()
+    
+    @pytest.mark.asyncio
+    async def test_health_check_throwaway_session_is_deleted(self):
+        """session_id 없이 상태 확인 시 일회용 스레드를 사용하고 점검 후 삭제"""
+        # Given: 가짜 LLM으로 실제 그래프를 실행하는 Agent
+        import itertools
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+        from langgraph.prebuilt import create_react_agent
+        from backend.agents.checkpointers import BoundedMemorySaver
+        
+        agent = ShoppingReactAgent("test-key", checkpointer=BoundedMemorySaver())
+        model = GenericFakeChatModel(messages=(AIMessage(content="안녕하세요") for _ in itertools.count()))
+        agent.agent = create_react_agent(model=model, tools=[], checkpointer=agent.memory)
+        
+        # When: session_id 없이 상태 확인
+        result = await agent.health_check()
+        
+        # Then: 정상 응답이며 메모리에 점검용 스레드가 남지 않음
+        assert result["status"] == "healthy"
+        assert result["session_id"].startswith("health-")
+        assert agent.memory_stats()["threads"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_get_session_info_without_llm_call(self):
+        """세션 정보 조회는 LLM을 호출하지 않고 메모리만 읽음"""
+        # Given: 대화가 저장된 세션과 호출 감시용 Agent
+        import itertools
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+        from langgraph.prebuilt import create_react_agent
+        
+        agent = ShoppingReactAgent("test-key")
+        agent.query_cache = None
+        model = GenericFakeChatModel(messages=(AIMessage(content="응답") for _ in itertools.count()))
+        agent.agent = create_react_agent(model=model, tools=[], checkpointer=agent.memory)
+        await agent.search_products("아이폰 15", "session-info")
+        
+        with patch.object(agent.agent, "ainvoke", new_callable=AsyncMock) as mock_ainvoke:
+            # When: 세션 정보 조회
+            info = await agent.get_session_info("session-info")
+            missing = await agent.get_session_info("unknown-session")
+            
+            # Then: 저장된 메시지 수 반환, LLM 호출 없음
+            assert info == {"exists": True, "message_count": 2}
+            assert missing == {"exists": False, "message_count": 0}
+            mock_ainvoke.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_warmup_loads_mcp_servers_concurrently(self):
+        """사전 초기화 시 MCP 서버별 도구를 동시에 로드하고 단계별 시간 기록"""
+        # Given: 서버당 0.2초 걸리는 MCP 클라이언트 (서버 3개)
+        import asyncio
+        import time
+        
+        async def slow_get_tools(server_name=None):
+            await asyncio.sleep(0.2)
+            tool = MagicMock(coroutine=None)
+            tool.name = f"{server_name}_search"
+            return [tool]
+        
+        mock_client = MagicMock()
+        mock_client.get_tools = AsyncMock(side_effect=slow_get_tools)
+        mcp_config = {"a": {}, "b": {}, "c": {}}
+        
+        agent = ShoppingReactAgent("test-key")
+        agent.tool_cache = None
+        
+        with patch("backend.agents.shopping_agent.get_mcp_config_with_api_keys", return_value=mcp_config), \
+             patch("backend.agents.shopping_agent.MultiServerMCPClient", return_value=mock_client), \
+             patch("backend.agents.shopping_agent.create_react_agent", return_value=MagicMock()):
+            # When: 사전 초기화
+            started = time.perf_counter()
+            timings = await agent.warmup()
+            elapsed = time.perf_counter() - started
+        
+        # Then: 순차 로드(0.6초)보다 빠르게 완료되고 서버별 시간이 기록됨
+        assert elapsed < 0.5
+        assert [tool.name for tool in agent.tools] == ["a_search", "b_search", "c_search"]
+        assert set(timings["mcp_servers"]) == {"a", "b", "c"}
+        assert "graph_compile_seconds" in timings
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_first_requests_initialize_once(self):
+        """동시에 들어온 첫 요청 100개가 하나의 초기화 작업을 공유"""
+        # Given: 도구 로드에 시간이 걸리는 MCP 클라이언트
+        import asyncio
+        
+        async def slow_get_tools(server_name=None):
+            await asyncio.sleep(0.05)
+            return []
+        
+        mock_client = MagicMock()
+        mock_client.get_tools = AsyncMock(side_effect=slow_get_tools)
+        mock_graph = AsyncMock()
+        mock_graph.ainvoke.return_value = {"messages": [MagicMock(content="최저가 응답")]}
+        
+        agent = ShoppingReactAgent("test-key")
+        agent.query_cache = None
+        
+        with patch("backend.agents.shopping_agent.get_mcp_config_with_api_keys", return_value={"exa": {}}), \
+             patch("backend.agents.shopping_agent.MultiServerMCPClient", return_value=mock_client) as mock_client_cls, \
+             patch("backend.agents.shopping_agent.create_react_agent", return_value=mock_graph) as mock_create:
+            # When: 100개의 첫 요청을 동시에 실행
+            results = await asyncio.gather(*(
+                agent.search_products("아이폰 15", f"session-{i}") for i in range(100)
+            ))
+        
+        # Then: MCP 클라이언트와 그래프는 한 번만 생성되고 모든 요청이 성공
+        assert mock_client_cls.call_count == 1
+        assert mock_create.call_count == 1
+        assert all(result["response"] == "최저가 응답" for result in results)
+        assert mock_graph.ainvoke.await_count == 100
+    
+    @pytest.mark.asyncio
+    async def test_initialize_retries_with_backoff(self):
+        """초기화 실패 시 백오프 후 재시도"""
+        # Given: 첫 도구 로드가 실패하는 MCP 클라이언트
+        mock_client = MagicMock()
+        mock_client.get_tools = AsyncMock(side_effect=[ConnectionError("연결 실패"), []])
+        agent = ShoppingReactAgent("test-key")
+        
+        with patch("backend.agents.shopping_agent.get_mcp_config_with_api_keys", return_value={"exa": {}}), \
+             patch("backend.agents.shopping_agent.MultiServerMCPClient", return_value=mock_client), \
+             patch("backend.agents.shopping_agent.create_react_agent", return_value=MagicMock()), \
+             patch("backend.agents.shopping_agent.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            # When: 초기화
+            await agent._initialize_agent()
+        
+        # Then: 한 번 대기 후 두 번째 시도에서 성공
+        assert agent.agent is not None
+        assert agent.init_timings["attempts"] == 2
+        mock_sleep.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_initialize_failure_is_shared_and_retried_later(self):
+        """재시도 모두 실패 시 대기 중인 요청 모두 실패하고, 이후 요청에서 다시 초기화"""
+        import asyncio
+        
+        mock_client = MagicMock()
+        mock_client.get_tools = AsyncMock(side_effect=ConnectionError("연결 실패"))
+        agent = ShoppingReactAgent("test-key")
+        
+        with patch("backend.agents.shopping_agent.get_mcp_config_with_api_keys", return_value={"exa": {}}), \
+             patch("backend.agents.shopping_agent.MultiServerMCPClient", return_value=mock_client), \
+             patch("backend.agents.shopping_agent.create_react_agent", return_value=MagicMock()), \
+             patch("backend.agents.shopping_agent.AGENT_INIT_MAX_ATTEMPTS", 2), \
+             patch("backend.agents.shopping_agent.asyncio.sleep", new_callable=AsyncMock):
+            results = await asyncio.gather(
+                *(agent._initialize_agent() for _ in range(10)), return_exceptions=True
+            )
+            assert all(isinstance(result, ConnectionError) for result in results)
+            assert mock_client.get_tools.await_count == 2
+            
+            # 연결 복구 후 다음 요청에서 초기화 성공
+            mock_client.get_tools = AsyncMock(return_value=[])
+            await agent._initialize_agent()
+            assert agent.agent is not None
+    
+    @pytest.mark.asyncio
+    async def test_reinitialize_after_connection_lost(self):
+        """MCP 연결 끊김 감지 후 다음 요청에서 Agent 재초기화"""
+        mock_client = MagicMock()
+        mock_client.get_tools = AsyncMock(return_value=[])
+        agent = ShoppingReactAgent("test-key")
+        
+        with patch("backend.agents.shopping_agent.get_mcp_config_with_api_keys", return_value={"exa": {}}), \
+             patch("backend.agents.shopping_agent.MultiServerMCPClient", return_value=mock_client) as mock_client_cls, \
+             patch("backend.agents.shopping_agent.create_react_agent", side_effect=lambda **kwargs: MagicMock()):
+            await agent._initialize_agent()
+            first_graph = agent.agent
+            
+            # 연결이 유지되면 재사용
+            await agent._initialize_agent()
+            assert agent.agent is first_graph
+            
+            # When: 도구 호출 중 연결 끊김 감지
+            agent.connection_monitor.lost = True
+            await agent._initialize_agent()
+        
+        # Then: 새 클라이언트와 그래프로 재초기화
+        assert mock_client_cls.call_count == 2
+        assert agent.agent is not first_graph
+        assert agent.connection_monitor.lost is False
+    
+    @pytest.mark.asyncio
+    async def test_reinitialize_closes_previous_client(self):
+        """재초기화 시 이전 MCP 클라이언트의 세션을 닫고, 종료에 실패해도 새 클라이언트로 초기화"""
+        # Given: 세션 종료가 실패하는 첫 클라이언트와 정상 클라이언트
+        old_client = MagicMock()
+        old_client.get_tools = AsyncMock(return_value=[])
+        old_client.exit_stack.aclose = AsyncMock(side_effect=RuntimeError("이미 닫힌 전송"))
+        new_client = MagicMock()
+        new_client.get_tools = AsyncMock(return_value=[])
+        agent = ShoppingReactAgent("test-key")
+        
+        with patch("backend.agents.shopping_agent.get_mcp_config_with_api_keys", return_value={"exa": {}}), \
+             patch("backend.agents.shopping_agent.MultiServerMCPClient", side_effect=[old_client, new_client]), \
+             patch("backend.agents.shopping_agent.create_react_agent", side_effect=lambda **kwargs: MagicMock()):
+            await agent._initialize_agent()
+            
+            # When: 연결 끊김 감지 후 다음 요청
+            agent.connection_monitor.lost = True
+            await agent._initialize_agent()
+        
+        # Then: 이전 클라이언트 종료를 시도하고 새 클라이언트 사용
+        old_client.exit_stack.aclose.assert_awaited_once()
+        assert agent.client is new_client
+        assert agent.agent is not None
+    
+    @pytest.mark.asyncio
+    async def test_search_products_answers_from_price_index(self):
+        """최근 관측 가격이 있으면 LLM/MCP 호출 없이 가격 인덱스로 응답"""
+        # Given: 이전 검색에서 관측된 가격이 있는 인덱스
+        from backend.agents.price_index import PriceIndex
+        from backend.schemas.chat import Product
+        
+        price_index = PriceIndex(":memory:")
+        price_index.record("아이폰 15", [
+            Product(name="아이폰 15", price=1200000, store="쿠팡", url="https://www.coupang.com/1"),
+            Product(name="아이폰 15", price=1230000, store="11번가", url="https://www.11st.co.kr/1")
+        ])
+        agent = ShoppingReactAgent("test-key", price_index=price_index)
+        agent.query_cache = None
+        agent.agent = AsyncMock()
+        
+        # When: 최저가 질의
+        result = await agent.search_products("아이폰 15 최저가", "session-index")
+        
+        # Then: Agent 실행 없이 인덱스 기반 답변과 상품 목록 반환
+        agent.agent.ainvoke.assert_not_called()
+        assert result["price_index"] is True
+        assert [p["store"] for p in result["products"]] == ["쿠팡", "11번가"]
+        assert "1,200,000원" in result["response"]
+        agent.agent.aupdate_state.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_search_products_records_observed_offers(self):
+        """Agent 답변의 상품 정보를 가격 인덱스에 기록"""
+        from backend.agents.price_index import PriceIndex
+        
+        price_index = PriceIndex(":memory:")
+        agent = ShoppingReactAgent("test-key", price_index=price_index)
+        agent.query_cache = None
+        mock_agent = AsyncMock()
+        mock_agent.ainvoke.return_value = {"messages": [MagicMock(content=(
+            "1️⃣ 갤럭시 S24 - 1,100,000원\n   📍 판매처: 쿠팡\n   🔗 구매링크: https://www.coupang.com/9"
+        ))]}
+        agent.agent = mock_agent
+        
+        result = await agent.search_products("갤럭시 S24", "session-record")
+        
+        assert result["products"][0]["price"] == 1100000
+        assert price_index.lookup("갤럭시 S24 최저가", max_age_seconds=60)[0]["store"] == "쿠팡"
+    
+    @pytest.mark.asyncio
+    async def test_search_products_records_only_matching_offers(self):
+        """도구 결과 중 상품명이 검색어와 일치하지 않는 상품(액세서리 등)은 가격 인덱스에 기록하지 않음"""
+        import json
+        from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+        from backend.agents.price_index import PriceIndex
+        
+        # Given: 본품과 더 싼 케이스가 함께 검색된 도구 결과
+        price_index = PriceIndex(":memory:")
+        agent = ShoppingReactAgent("test-key", price_index=price_index)
+        agent.query_cache = None
+        tool_output = json.dumps({"offers": [
+            {"name": "아이폰 15 128GB", "price": 1200000, "store": "쿠팡", "url": "https://www.coupang.com/1"},
+            {"name": "아이폰 15 실리콘 케이스", "price": 15000, "store": "11번가", "url": "https://www.11st.co.kr/2"}
+        ]}, ensure_ascii=False)
+        mock_agent = AsyncMock()
+        mock_agent.ainvoke.return_value = {"messages": [
+            HumanMessage(content="아이폰 15"),
+            ToolMessage(content=tool_output, tool_call_id="call_1"),
+            AIMessage(content="아이폰 15 검색 결과입니다.")
+        ]}
+        agent.agent = mock_agent
+        
+        # When: 검색
+        await agent.search_products("아이폰 15", "session-match")
+        
+        # Then: 검색어 최저가 조회에는 본품만 반환
+        assert [o["name"] for o in price_index.lookup("아이폰 15 최저가", max_age_seconds=60)] == ["아이폰 15 128GB"]
+    
+    @pytest.mark.asyncio
+    async def test_search_products_skips_accessories_in_answer(self):
+        """최종 답변에 나온 액세서리도 가격 인덱스에 기록하지 않음"""
+        from backend.agents.price_index import PriceIndex
+        
+        # Given: 본품과 더 싼 케이스를 함께 추천한 답변
+        price_index = PriceIndex(":memory:")
+        agent = ShoppingReactAgent("test-key", price_index=price_index)
+        agent.query_cache = None
+        mock_agent = AsyncMock()
+        mock_agent.ainvoke.return_value = {"messages": [MagicMock(content=(
+            "1️⃣ 아이폰 15 128GB - 1,200,000원\n   📍 판매처: 쿠팡\n   🔗 구매링크: https://www.coupang.com/1\n\n"
+            "2️⃣ 아이폰 15 실리콘 케이스 - 15,000원\n   📍 판매처: 11번가\n   🔗 구매링크: https://www.11st.co.kr/2"
+        ))]}
+        agent.agent = mock_agent
+        
+        # When: 검색
+        result = await agent.search_products("아이폰 15", "session-answer-accessory")
+        
+        # Then: 답변 상품은 그대로 표시하되 최저가 조회에는 본품만 반환
+        assert len(result["products"]) == 2
+        assert [o["name"] for o in price_index.lookup("아이폰 15 최저가", max_age_seconds=60)] == ["아이폰 15 128GB"]
+
+    
+    @staticmethod
+    def _scripted_graph(agent, responses, tools):
+        """정해진 응답을 순서대로 반환하는 모델로 실제 ReAct 그래프 생성"""
+        from langchain_core.language_models.chat_models import BaseChatModel
+        from langchain_core.outputs import ChatGeneration, ChatResult
+        from langgraph.prebuilt import create_react_agent
+        
+        class ScriptedModel(BaseChatModel):
+            index: int = 0
+            
+            @property
+            def _llm_type(self):
+                return "scripted"
+            
+            def bind_tools(self, tools, **kwargs):
+                return self
+            
+            def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+                message = responses[min(self.index, len(responses) - 1)]
+                self.index += 1
+                return ChatResult(generations=[ChatGeneration(message=message)])
+        
+        agent.agent = create_react_agent(model=ScriptedModel(), tools=tools, checkpointer=agent.memory)
+    
+    @staticmethod
+    def _mall_tools():
+        """빠른 검색 도구와 응답하지 않는 느린 검색 도구"""
+        import asyncio
+        import json
+        from langchain_core.tools import StructuredTool
+        
+        async def fast_search(query: str) -> str:
+            return json.dumps({"results": [{
+                "title": "아이폰 15 128GB 1,150,000원", "url": "https://www.coupang.com/vp/products/1"
+            }]}, ensure_ascii=False)
+        
+        async def slow_search(query: str) -> str:
+            await asyncio.sleep(10)
+            return ""
+        
+        return [
+            StructuredTool.from_function(coroutine=fast_search, name="fast_search", description="검색"),
+            StructuredTool.from_function(coroutine=slow_search, name="slow_search", description="검색")
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_stream_deadline_returns_partial_answer(self):
+        """제한 시간이 지나면 지금까지의 도구 결과로 부분 답변을 반환하고 대화 기록을 유지"""
+        import time
+        from langchain_core.messages import AIMessage, ToolMessage
+        from backend.agents.price_index import PriceIndex
+        
+        # Given: 빠른 검색 후 응답하지 않는 검색을 호출하는 Agent
+        agent = ShoppingReactAgent("test-key", price_index=PriceIndex(":memory:"))
+        agent.query_cache = None
+        agent.context_manager = None
+        self._scripted_graph(agent, [
+            AIMessage(content="", tool_calls=[{"name": "fast_search", "args": {"query": "아이폰 15"}, "id": "call_1"}]),
+            AIMessage(content="", tool_calls=[{"name": "slow_search", "args": {"query": "아이폰 15"}, "id": "call_2"}]),
+            AIMessage(content="두 번째 답변입니다.")
+        ], self._mall_tools())
+        
+        # When: 0.5초 제한 시간으로 스트리밍 검색
+        started = time.perf_counter()
+        items = [
+            item async for item in agent.stream_search_products(
+                "아이폰 15", "session-deadline", deadline=time.monotonic() + 0.5
+            )
+        ]
+        elapsed = time.perf_counter() - started
+        
+        # Then: 제한 시간 직후 지금까지 찾은 상품으로 부분 답변
+        assert elapsed < 2
+        assert items[-1]["type"] == "partial"
+        assert items[-1]["reason"] == "deadline"
+        assert [p["store"] for p in items[-1]["products"]] == ["쿠팡"]
+        assert "1,150,000원" in items[-1]["content"]
+        
+        # Then: 응답 없이 끝난 도구 호출이 닫혀 다음 턴이 정상 동작
+        state = await agent.agent.aget_state({"configurable": {"thread_id": "session-deadline"}})
+        messages = state.values["messages"]
+        assert isinstance(messages[-2], ToolMessage) and messages[-2].tool_call_id == "call_2"
+        assert messages[-1].content == items[-1]["content"]
+        
+        result = await agent.search_products("아이폰 15 128GB", "session-deadline")
+        assert result["response"] == "두 번째 답변입니다."
+    
+    @pytest.mark.asyncio
+    async def test_search_products_step_limit_returns_partial_answer(self, monkeypatch):
+        """ReAct 최대 단계 수를 넘으면 무한 도구 호출 대신 부분 답변 반환"""
+        from langchain_core.messages import AIMessage
+        from backend.agents import shopping_agent as shopping_agent_module
+        from backend.agents.price_index import PriceIndex
+        
+        # Given: 계속 도구만 호출하는 모델과 최대 4단계 제한
+        monkeypatch.setattr(shopping_agent_module, "AGENT_RECURSION_LIMIT", 4)
+        agent = ShoppingReactAgent("test-key", price_index=PriceIndex(":memory:"))
+        agent.query_cache = None
+        agent.context_manager = None
+        self._scripted_graph(agent, [
+            AIMessage(content="", tool_calls=[{"name": "fast_search", "args": {"query": "아이폰 15"}, "id": "call_1"}]),
+            AIMessage(content="", tool_calls=[{"name": "fast_search", "args": {"query": "쿠팡 아이폰 15"}, "id": "call_2"}])
+        ], self._mall_tools())
+        
+        # When: 검색
+        result = await agent.search_products("아이폰 15", "session-steps")
+        
+        # Then: 단계 초과 부분 답변
+        assert result["partial"] is True
+        assert result["partial_reason"] == "step_limit"
+        assert result["products"][0]["store"] == "쿠팡"
+        assert "최대 횟수" in result["response"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
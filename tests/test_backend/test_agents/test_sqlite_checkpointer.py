@@ -0,0 +1,133 @@
+"""
+SQLite Checkpointer 테스트
+"""
+import asyncio
+import pytest
+
+from backend.agents.sqlite_checkpointer import SqliteCheckpointSaver
+
+
+class TestSqliteCheckpointSaver:
+    """SqliteCheckpointSaver 테스트 클래스"""
+    
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "checkpoints.db")
+    
+    @pytest.mark.asyncio
+    async def test_conversation_survives_restart(self, db_path, make_graph, run_turns):
+        """프로세스 재시작(새 인스턴스) 후에도 대화 유지"""
+        # Given: 대화를 기록한 checkpointer
+        saver = SqliteCheckpointSaver(path=db_path)
+        config = await run_turns(make_graph(saver), "thread-1", 2)
+        saver.close()
+        
+        # When: 같은 파일로 새 checkpointer 생성
+        restarted = SqliteCheckpointSaver(path=db_path)
+        state = await make_graph(restarted).aget_state(config)
+        
+        # Then: 이전 대화가 그대로 복원됨
+        assert [m.content for m in state.values["messages"]] == ["질문 0", "응답", "질문 1", "응답"]
+        restarted.close()
+    
+    def test_wal_mode_and_thread_index(self, db_path):
+        """WAL 모드 및 thread_id 인덱스 생성"""
+        saver = SqliteCheckpointSaver(path=db_path)
+        
+        journal_mode = saver._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        indexes = {row[1] for row in saver._conn.execute("PRAGMA index_list(checkpoints)")}
+        
+        assert journal_mode == "wal"
+        assert "idx_checkpoints_thread_id" in indexes
+        saver.close()
+    
+    @pytest.mark.asyncio
+    async def test_writes_are_batched(self, db_path, make_graph, run_turns):
+        """쓰기가 버퍼링되었다가 읽기 시점에 한 번에 기록"""
+        saver = SqliteCheckpointSaver(path=db_path, batch_size=1000, flush_interval_seconds=3600)
+        await run_turns(make_graph(saver), "thread-1", 1)
+        
+        assert saver._pending_count() > 0
+        assert saver._conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0] == 0
+        
+        # 통계 조회는 버퍼를 기록하지 않음
+        assert saver.stats()["pending_writes"] == saver._pending_count()
+        assert saver._conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0] == 0
+        
+        assert saver.get_tuple({"configurable": {"thread_id": "thread-1"}}) is not None
+        assert saver._pending_count() == 0
+        saver.close()
+    
+    @pytest.mark.asyncio
+    async def test_async_writes_and_compaction_run_off_loop(self, db_path, make_graph, run_turns):
+        """시간 임계값으로 인한 기록과 주기 압축은 이벤트 루프가 아닌 스레드 풀에서 실행"""
+        import threading
+        
+        # Given: 매 쓰기마다 기록하고 압축 주기가 이미 지난 saver
+        saver = SqliteCheckpointSaver(
+            path=db_path, batch_size=1000, flush_interval_seconds=0, compact_interval_seconds=0.01
+        )
+        loop_thread = threading.get_ident()
+        io_threads = []
+        for name in ("_write_pending", "compact"):
+            original = getattr(saver, name)
+            
+            def traced(*args, _original=original, _name=name, **kwargs):
+                io_threads.append((_name, threading.get_ident()))
+                return _original(*args, **kwargs)
+            
+            setattr(saver, name, traced)
+        await asyncio.sleep(0.02)
+        
+        # When: 그래프 실행 후 압축 주기가 다시 지난 상태에서 한 턴 더 실행하고 백그라운드 압축 완료 대기
+        graph = make_graph(saver)
+        await run_turns(graph, "thread-1", 1)
+        await asyncio.sleep(0.02)
+        await run_turns(graph, "thread-2", 1)
+        if saver._compaction_task is not None:
+            await saver._compaction_task
+        
+        # Then: 기록과 압축 모두 실행되었고 루프 스레드에서는 실행되지 않음
+        assert {name for name, _ in io_threads} == {"_write_pending", "compact"}
+        assert all(thread != loop_thread for _, thread in io_threads)
+        saver.close()
+    
+    @pytest.mark.asyncio
+    async def test_compaction_keeps_latest_checkpoints(self, db_path, make_graph, run_turns):
+        """압축 시 스레드별 최근 체크포인트만 유지"""
+        saver = SqliteCheckpointSaver(path=db_path, keep_checkpoints=2, compact_interval_seconds=0)
+        graph = make_graph(saver)
+        config = await run_turns(graph, "thread-1", 3)
+        
+        result = saver.compact()
+        
+        assert result["deleted_checkpoints"] > 0
+        assert len(list(saver.list(config))) == 2
+        state = await graph.aget_state(config)
+        assert len(state.values["messages"]) == 6
+        saver.close()
+    
+    @pytest.mark.asyncio
+    async def test_compaction_removes_expired_threads(self, db_path, make_graph, run_turns):
+        """보존 기간이 지난 스레드 삭제"""
+        saver = SqliteCheckpointSaver(path=db_path, retention_seconds=-1, compact_interval_seconds=0)
+        await run_turns(make_graph(saver), "thread-1", 1)
+        
+        assert saver.compact()["expired_threads"] == 1
+        assert saver.stats()["threads"] == 0
+        saver.close()
+    
+    @pytest.mark.asyncio
+    async def test_delete_thread(self, db_path, make_graph, run_turns):
+        """스레드 삭제 시 다른 스레드는 유지"""
+        saver = SqliteCheckpointSaver(path=db_path)
+        graph = make_graph(saver)
+        await run_turns(graph, "a", 1)
+        await run_turns(graph, "b", 1)
+        
+        await saver.adelete_thread("a")
+        
+        assert saver.get_tuple({"configurable": {"thread_id": "a"}}) is None
+        assert saver.get_tuple({"configurable": {"thread_id": "b"}}) is not None
+        assert saver._conn.execute("SELECT COUNT(*) FROM writes WHERE thread_id = 'a'").fetchone()[0] == 0
+        saver.close()
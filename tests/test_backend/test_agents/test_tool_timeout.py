@@ -0,0 +1,49 @@
+"""
+도구 호출 제한 시간 테스트
+"""
+import asyncio
+import time
+import pytest
+from langchain_core.tools import StructuredTool
+
+from backend.agents.mcp_adapters.tool_timeout import with_timeout, wrap_tools_with_timeout
+
+
+def _make_search_tool(delay):
+    """지정한 시간 후 응답하는 검색 도구"""
+    async def web_search(query: str) -> str:
+        await asyncio.sleep(delay)
+        return f"{query} 검색 결과"
+
+    return StructuredTool.from_function(coroutine=web_search, name="web_search", description="웹 검색")
+
+
+class TestToolTimeout:
+    """도구 제한 시간 래퍼 테스트 클래스"""
+
+    @pytest.mark.asyncio
+    async def test_fast_call_passes_through(self):
+        """제한 시간 안에 끝난 호출은 결과 그대로 반환"""
+        tool = with_timeout(_make_search_tool(0.01), timeout_seconds=1)
+
+        assert await tool.ainvoke({"query": "아이폰 15"}) == "아이폰 15 검색 결과"
+        assert tool.name == "web_search"
+
+    @pytest.mark.asyncio
+    async def test_slow_call_returns_error_message(self):
+        """제한 시간을 넘긴 호출은 LLM에 전달할 오류 메시지로 반환"""
+        # Given: 10초 걸리는 도구에 0.1초 제한
+        tool = with_timeout(_make_search_tool(10), timeout_seconds=0.1)
+
+        # When: 도구 호출
+        started = time.perf_counter()
+        result = await tool.ainvoke({"query": "아이폰 15"})
+
+        # Then: 제한 시간 직후 예외 대신 안내 메시지 반환
+        assert time.perf_counter() - started < 1
+        assert "0.1초 안에 응답하지 않았습니다" in result
+
+    def test_zero_timeout_disables_wrapping(self):
+        """제한 시간이 0이면 도구를 감싸지 않음"""
+        tools = [_make_search_tool(0)]
+        assert wrap_tools_with_timeout(tools, 0) is tools
@@ -0,0 +1,163 @@
+"""
+요청 단위 트레이싱 테스트
+"""
+import asyncio
+import json
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import create_react_agent
+
+from backend.agents import tracing
+from backend.agents.tracing import (
+    STATUS_ERROR,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    Tracer,
+    TracingCallbackHandler,
+    trace_tool
+)
+
+
+class ToolThenAnswerModel(BaseChatModel):
+    """첫 호출은 도구 호출, 이후에는 최종 답변을 반환하는 가짜 LLM (토큰 사용량 포함)"""
+    
+    calls: int = 0
+    
+    @property
+    def _llm_type(self):
+        return "scripted"
+    
+    def bind_tools(self, tools, **kwargs):
+        return self
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            message = AIMessage(
+                content="",
+                tool_calls=[{"name": "web_search", "args": {"query": "아이폰 15"}, "id": "call_1"}],
+                usage_metadata={"input_tokens": 120, "output_tokens": 8, "total_tokens": 128}
+            )
+        else:
+            message = AIMessage(
+                content="최저가는 1,120,000원입니다.",
+                usage_metadata={"input_tokens": 300, "output_tokens": 20, "total_tokens": 320}
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """공용 Tracer를 메모리 exporter로 교체"""
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(tracing, "_tracer", Tracer(exporter))
+    return exporter
+
+
+class TestTracer:
+    """Tracer 테스트 클래스"""
+    
+    def test_exports_trace_when_root_span_ends(self, exporter):
+        """루트 span이 끝나면 같은 trace의 span을 부모 관계와 함께 한 번에 내보냄"""
+        # Given: 루트 span과 현재 span으로 연결된 자식 span
+        tracer = tracing.get_tracer()
+        root = tracer.start_span("POST /chat", root=True)
+        with tracer.use_span(root):
+            with tracer.start_as_current_span("agent.run") as run:
+                with tracer.start_as_current_span("tool.web_search") as tool:
+                    pass
+        
+        # Then: 루트 종료 전에는 내보내지 않음
+        assert exporter.spans == []
+        
+        # When: 루트 종료
+        root.end()
+        
+        # Then: trace 전체가 부모 관계와 함께 기록
+        assert [span.name for span in exporter.spans] == ["tool.web_search", "agent.run", "POST /chat"]
+        assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+        assert tool.parent_span_id == run.span_id
+        assert run.parent_span_id == root.span_id
+        assert len(root.trace_id) == 32 and len(root.span_id) == 16
+    
+    def test_records_exception(self, exporter):
+        """블록에서 발생한 예외를 오류 상태와 exception 이벤트로 기록"""
+        tracer = tracing.get_tracer()
+        with pytest.raises(RuntimeError):
+            with tracer.start_as_current_span("mcp.web_search"):
+                raise RuntimeError("연결 실패")
+        
+        span = exporter.spans[0]
+        assert span.status_code == STATUS_ERROR
+        assert span.events[0]["attributes"]["exception.type"] == "RuntimeError"
+    
+    def test_file_exporter_writes_otlp_json(self, tmp_path):
+        """파일 exporter는 trace 하나를 OTLP/JSON 한 줄로 기록"""
+        # Given: 파일 exporter를 사용하는 Tracer
+        path = tmp_path / "traces" / "spans.jsonl"
+        tracer = Tracer(FileSpanExporter(str(path), service_name="test-service"))
+        
+        # When: 두 trace 기록
+        for _ in range(2):
+            root = tracer.start_span("POST /chat", root=True, attributes={"session.id": "s1"})
+            tracer.start_span("llm.chat", parent=root, attributes={"gen_ai.usage.input_tokens": 10}).end()
+            root.end()
+        
+        # Then: trace당 한 줄, OTLP resourceSpans 구조
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        payload = json.loads(lines[0])
+        resource_spans = payload["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0] == {
+            "key": "service.name", "value": {"stringValue": "test-service"}
+        }
+        spans = resource_spans["scopeSpans"][0]["spans"]
+        assert [span["name"] for span in spans] == ["llm.chat", "POST /chat"]
+        assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+        assert spans[0]["attributes"] == [{"key": "gen_ai.usage.input_tokens", "value": {"intValue": "10"}}]
+        assert int(spans[1]["endTimeUnixNano"]) >= int(spans[1]["startTimeUnixNano"])
+
+
+@pytest.mark.asyncio
+async def test_graph_steps_llm_calls_and_tools_are_traced(exporter):
+    """턴 실행 중 그래프 단계, LLM 호출(토큰 수), 도구 호출(인자/결과 크기)을 span으로 기록"""
+    # Given: span 기록 래퍼를 씌운 검색 도구와 ReAct 그래프
+    async def web_search(query: str) -> str:
+        await asyncio.sleep(0.01)
+        return "아이폰 15 128GB 1,120,000원"
+    
+    tool = trace_tool(StructuredTool.from_function(coroutine=web_search, name="web_search", description="검색"))
+    agent = create_react_agent(model=ToolThenAnswerModel(), tools=[tool])
+    tracer = tracing.get_tracer()
+    
+    # When: 턴 span을 현재 span으로 두고 콜백 핸들러와 함께 실행
+    turn = tracer.start_span("agent.run", root=True)
+    with tracer.use_span(turn):
+        await agent.ainvoke(
+            {"messages": [("user", "아이폰 15 최저가")]},
+            config={"callbacks": [TracingCallbackHandler(turn)]}
+        )
+    turn.end()
+    
+    # Then: 모든 span이 턴 trace에 속하고 단계/LLM/도구 정보가 기록됨
+    spans = {span.span_id: span for span in exporter.spans}
+    by_name = {}
+    for span in exporter.spans:
+        by_name.setdefault(span.name, []).append(span)
+    assert {span.trace_id for span in exporter.spans} == {turn.trace_id}
+    
+    llm_spans = by_name["llm.chat"]
+    assert [span.attributes["gen_ai.usage.input_tokens"] for span in llm_spans] == [120, 300]
+    assert [span.attributes["llm.tool_calls"] for span in llm_spans] == [1, 0]
+    assert all(spans[span.parent_span_id].name == "graph.step.agent" for span in llm_spans)
+    assert [span.attributes["langgraph.step"] for span in by_name["graph.step.agent"]] == [1, 3]
+    assert len(by_name["graph.step.tools"]) == 1
+    
+    tool_span = by_name["tool.web_search"][0]
+    assert tool_span.parent_span_id == turn.span_id
+    assert tool_span.attributes["tool.args_bytes"] == len(json.dumps({"query": "아이폰 15"}, ensure_ascii=False).encode())
+    assert tool_span.attributes["tool.result_bytes"] == len("아이폰 15 128GB 1,120,000원".encode())
+    assert tool_span.duration_ms >= 10
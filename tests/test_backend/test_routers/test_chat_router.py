@@ -64,4 +64,180 @@ def test_chat_endpoint_invalid_request():
             "session_id": "user123"
         }
     )
-    assert response.status_code == 422  # Validation Error 
\ No newline at end of file
+    assert response.status_code == 422  # Validation Error 
+
+
+def test_clear_session_endpoint():
+    """세션 대화 기록 삭제 엔드포인트 테스트"""
+    from backend.routers.chat import get_chat_service
+    
+    mock_service = MagicMock()
+    mock_service.clear_conversation = AsyncMock(return_value={
+        "session_id": "user123",
+        "status": "cleared",
+        "message": "대화 기록이 초기화되었습니다."
+    })
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    try:
+        response = client.delete("/chat/sessions/user123")
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.status_code == 200
+    assert response.json()["status"] == "cleared"
+    mock_service.clear_conversation.assert_awaited_once_with("user123")
+
+
+def test_purge_idle_sessions_requires_admin_token(monkeypatch):
+    """유휴 세션 일괄 삭제 엔드포인트 관리자 토큰 검증 테스트"""
+    from backend.routers.chat import get_chat_service
+    
+    monkeypatch.setenv("ADMIN_API_TOKEN", "secret")
+    mock_service = MagicMock()
+    mock_service.purge_idle_sessions = AsyncMock(return_value={
+        "status": "purged",
+        "purged_count": 2,
+        "session_ids": ["a", "b"],
+        "memory": {"threads": 0}
+    })
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    try:
+        forbidden = client.delete("/chat/sessions")
+        response = client.delete(
+            "/chat/sessions",
+            params={"idle_seconds": 600},
+            headers={"X-Admin-Token": "secret"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert forbidden.status_code == 403
+    assert response.status_code == 200
+    assert response.json()["purged_count"] == 2
+    mock_service.purge_idle_sessions.assert_awaited_once_with(600)
+
+
+def test_chat_endpoint_rejects_when_full():
+    """실행 슬롯과 대기열이 가득 차면 429로 즉시 거절"""
+    from backend.routers.chat import get_admission_service, get_chat_service
+    from backend.services.admission_service import AdmissionService
+    
+    admission = AdmissionService(max_concurrent=1, max_queue=0, max_per_session=2)
+    admission.enqueue("other-session")
+    mock_service = MagicMock()
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_admission_service] = lambda: admission
+    
+    try:
+        response = client.post("/chat", json={"message": "아이폰 15", "session_id": "user123"})
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "5"
+    mock_service.process_message.assert_not_called()
+
+
+def test_chat_endpoint_releases_slot_after_stream():
+    """스트림이 끝나면 실행 슬롯 반납"""
+    from backend.routers.chat import get_admission_service, get_chat_service
+    from backend.services.admission_service import AdmissionService
+    from sse_starlette.sse import AppStatus
+    
+    # TestClient 요청마다 이벤트 루프가 달라지므로 sse-starlette 종료 이벤트 초기화
+    AppStatus.should_exit_event = None
+    admission = AdmissionService(max_concurrent=1, max_queue=1, max_per_session=2)
+    mock_service = MagicMock()
+    
+    async def fake_streaming_response(request, trace=None):
+        yield StreamingEvent(event_type="message", data="완료")
+    
+    mock_service.process_message.side_effect = fake_streaming_response
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_admission_service] = lambda: admission
+    
+    try:
+        response = client.post("/chat", json={"message": "아이폰 15", "session_id": "user123"})
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.status_code == 200
+    assert admission.running == 0
+    assert admission.stats()["admitted"] == 1
+
+
+def test_chat_endpoint_returns_trace_id(monkeypatch):
+    """요청마다 trace를 기록하고 trace id를 헤더와 이벤트로 전달"""
+    from backend.agents import tracing
+    from backend.routers.chat import get_admission_service, get_chat_service
+    from backend.services.admission_service import AdmissionService
+    from sse_starlette.sse import AppStatus
+    
+    AppStatus.should_exit_event = None
+    exporter = tracing.InMemorySpanExporter()
+    monkeypatch.setattr(tracing, "_tracer", tracing.Tracer(exporter))
+    mock_service = MagicMock()
+    
+    async def fake_streaming_response(request, trace=None):
+        # Agent 구간은 요청 span 아래에 기록
+        tracing.get_tracer().start_span("chat.turn", parent=trace).end()
+        yield StreamingEvent(event_type="message", data="완료")
+    
+    mock_service.process_message.side_effect = fake_streaming_response
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_admission_service] = lambda: AdmissionService()
+    
+    try:
+        response = client.post("/chat", json={"message": "아이폰 15", "session_id": "user123"})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Then: 헤더와 이벤트의 trace id가 기록된 trace와 일치
+    trace_id = response.headers["X-Trace-Id"]
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    assert [event["trace_id"] for event in events] == [trace_id]
+    
+    spans = {span.name: span for span in exporter.spans}
+    assert set(spans) == {"POST /chat", "admission.wait", "sse.stream", "chat.turn"}
+    assert {span.trace_id for span in exporter.spans} == {trace_id}
+    assert spans["chat.turn"].parent_span_id == spans["POST /chat"].span_id
+    assert spans["sse.stream"].attributes["sse.events"] == 1
+
+
+def test_chat_endpoint_logs_events_only_at_debug(capsys, caplog):
+    """이벤트는 표준 출력 없이 DEBUG 로그로만 기록 (직렬화 결과 재사용)"""
+    import logging
+    from backend.routers.chat import get_admission_service, get_chat_service
+    from backend.services.admission_service import AdmissionService
+    from sse_starlette.sse import AppStatus
+    
+    AppStatus.should_exit_event = None
+    mock_service = MagicMock()
+    
+    async def fake_streaming_response(request, trace=None):
+        yield StreamingEvent(event_type="message_delta", data="아이폰")
+        yield StreamingEvent(event_type="message", data="완료")
+    
+    mock_service.process_message.side_effect = fake_streaming_response
+    app.dependency_overrides[get_chat_service] = lambda: mock_service
+    app.dependency_overrides[get_admission_service] = lambda: AdmissionService()
+    
+    try:
+        # When: INFO 레벨에서 한 번, DEBUG 레벨에서 한 번 요청
+        with caplog.at_level(logging.INFO, logger="backend.routers.chat"):
+            client.post("/chat", json={"message": "아이폰 15", "session_id": "user123"})
+        info_records = [record for record in caplog.records if record.levelno == logging.DEBUG]
+        caplog.clear()
+        AppStatus.should_exit_event = None
+        with caplog.at_level(logging.DEBUG, logger="backend.routers.chat"):
+            response = client.post("/chat", json={"message": "아이폰 15", "session_id": "user123"})
+    finally:
+        app.dependency_overrides.clear()
+    
+    # Then: 표준 출력 없음, DEBUG에서만 이벤트별 구조화 로그
+    assert capsys.readouterr().out == ""
+    assert info_records == []
+    event_records = [record for record in caplog.records if record.getMessage() == "SSE event"]
+    assert [record.event_type for record in event_records] == ["message_delta", "message"]
+    sent = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert [record.event_bytes for record in event_records] == [len(data) for data in sent]
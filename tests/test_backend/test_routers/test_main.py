@@ -1,6 +1,7 @@
 import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
-from backend.main import app
+from backend.main import app, warmup_agent
 
 client = TestClient(app)
 
@@ -14,4 +15,46 @@ def test_health_check():
     """헬스체크 엔드포인트 테스트"""
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"} 
\ No newline at end of file
+    assert response.json() == {"status": "healthy"} 
+
+def test_health_live():
+    """liveness 엔드포인트는 외부 호출 없이 응답"""
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "alive"
+    assert data["uptime_seconds"] >= 0
+
+@pytest.mark.asyncio
+async def test_warmup_agent_records_phase_timings():
+    """사전 초기화는 ChatService 생성과 Agent 초기화 단계별 시간을 기록"""
+    mock_service = MagicMock()
+    mock_service.shopping_agent.warmup = AsyncMock(
+        return_value={"mcp_servers": {"exa": 0.1}, "mcp_tools_seconds": 0.1, "graph_compile_seconds": 0.01}
+    )
+    
+    with patch("backend.main.get_chat_service", return_value=mock_service):
+        timings = await warmup_agent()
+    
+    assert timings["status"] == "ready"
+    assert timings["mcp_servers"] == {"exa": 0.1}
+    assert "chat_service_seconds" in timings
+    assert "total_seconds" in timings
+
+@pytest.mark.asyncio
+async def test_warmup_agent_failure_does_not_raise():
+    """사전 초기화 실패 시에도 서버 기동은 계속됨"""
+    with patch("backend.main.get_chat_service", side_effect=Exception("MCP 연결 실패")):
+        timings = await warmup_agent()
+    
+    assert timings["status"] == "failed"
+    assert "MCP 연결 실패" in timings["error"]
+
+def test_metrics_endpoint():
+    """/metrics는 요청/수락 제어 메트릭을 Prometheus 텍스트 형식으로 반환"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE chat_streams_in_flight gauge" in response.text
+    assert "# TYPE chat_admission_running gauge" in response.text
+    assert "# TYPE chat_admission_admitted_total counter" in response.text
@@ -0,0 +1,162 @@
+"""수락 제어 서비스 테스트 모듈"""
+import asyncio
+import pytest
+
+from backend.services.admission_service import AdmissionRejected, AdmissionService
+
+
+async def _run(controller, session_id, started, hold_seconds=0.05):
+    """슬롯을 얻을 때까지 기다린 뒤 잠시 점유하는 요청"""
+    ticket = controller.enqueue(session_id)
+    try:
+        positions = [position async for position in ticket.updates()]
+        started.append(session_id)
+        await asyncio.sleep(hold_seconds)
+        return positions
+    finally:
+        ticket.release()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    """동시 실행 수 제한과 대기 순번 보고"""
+    # Given: 동시 실행 2개로 제한
+    controller = AdmissionService(max_concurrent=2, max_queue=10, max_per_session=2)
+    started = []
+    
+    # When: 서로 다른 세션 요청 5개
+    results = await asyncio.gather(*[_run(controller, f"s{index}", started) for index in range(5)])
+    
+    # Then: 처음 2개는 바로 실행, 나머지는 대기 순번을 받은 뒤 실행
+    assert results[0] == [] and results[1] == []
+    assert results[2][0] == 1 and results[4][0] == 3
+    assert results[4][-1] == 1
+    assert controller.stats()["admitted"] == 5
+    assert controller.running == 0 and controller.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_full():
+    """대기열이 가득 차면 즉시 거절"""
+    controller = AdmissionService(max_concurrent=1, max_queue=1, max_per_session=2)
+    running = controller.enqueue("a")
+    waiting = controller.enqueue("b")
+    
+    with pytest.raises(AdmissionRejected):
+        controller.enqueue("c")
+    
+    # 대기 중인 요청이 취소되면 다시 수락
+    waiting.release()
+    assert controller.enqueue("c").position() == 1
+    assert running.granted and controller.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_per_session_limit_and_round_robin():
+    """세션별 점유 한도와 세션 간 라운드 로빈 배정"""
+    # Given: 슬롯 하나를 다른 요청이 점유 중
+    controller = AdmissionService(max_concurrent=1, max_queue=10, max_per_session=2)
+    blocker = controller.enqueue("blocker")
+    
+    # When: 세션 a가 요청 2개를 먼저 넣고 세션 b가 1개를 넣음
+    a1 = controller.enqueue("a")
+    a2 = controller.enqueue("a")
+    b1 = controller.enqueue("b")
+    
+    # Then: 세션 a의 세 번째 요청은 거절, b가 a의 두 번째 요청보다 먼저 배정
+    with pytest.raises(AdmissionRejected, match="세션당 동시 요청 한도\\(2개\\)"):
+        controller.enqueue("a")
+    assert [a1.position(), b1.position(), a2.position()] == [1, 2, 3]
+    
+    blocker.release()
+    assert a1.granted
+    a1.release()
+    assert b1.granted and not a2.granted
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout():
+    """최대 대기 시간을 넘기면 TimeoutError"""
+    controller = AdmissionService(max_concurrent=1, max_queue=10, max_per_session=2)
+    controller.enqueue("a")
+    ticket = controller.enqueue("b")
+    
+    with pytest.raises(asyncio.TimeoutError):
+        async for _ in ticket.updates(timeout_seconds=0.05):
+            pass
+    ticket.release()
+    assert controller.stats()["timed_out"] == 1
+    assert controller.queued == 0
+
+
+def test_per_session_limit_is_shared_across_workers(tmp_path):
+    """공유 저장소가 있으면 세션별 점유 한도를 모든 워커에서 합산"""
+    from backend.agents.shared_store import SqliteSharedStore
+    
+    # Given: 같은 저장소 파일을 쓰는 두 워커의 수락 제어 (세션당 2개)
+    path = str(tmp_path / "shared.db")
+    worker_a = AdmissionService(max_concurrent=4, max_queue=4, max_per_session=2, store=SqliteSharedStore(path))
+    worker_b = AdmissionService(max_concurrent=4, max_queue=4, max_per_session=2, store=SqliteSharedStore(path))
+    
+    # When: 워커마다 같은 세션 요청 1개씩 점유
+    first = worker_a.enqueue("user123")
+    worker_b.enqueue("user123")
+    
+    # Then: 세 번째 요청은 어느 워커에서든 거절, 반납 후에는 다시 수락
+    with pytest.raises(AdmissionRejected):
+        worker_b.enqueue("user123")
+    first.release()
+    assert worker_b.enqueue("user123").granted
+
+
+@pytest.mark.asyncio
+async def test_async_enqueue_holds_shared_session_off_loop(tmp_path):
+    """이벤트 루프에서는 공유 저장소 점유 기록/해제를 스레드에서 실행"""
+    from backend.agents.shared_store import SqliteSharedStore
+    
+    # Given: 공유 저장소를 쓰는 수락 제어 (세션당 1개)
+    store = SqliteSharedStore(str(tmp_path / "shared.db"))
+    controller = AdmissionService(max_concurrent=4, max_queue=4, max_per_session=1, store=store)
+    
+    # When: 같은 세션 요청 2개 예약 후 첫 번째 반납
+    first = await controller.aenqueue("user123")
+    with pytest.raises(AdmissionRejected):
+        await controller.aenqueue("user123")
+    first.release()
+    await asyncio.gather(*controller._unhold_tasks)
+    
+    # Then: 반납이 반영되어 다시 수락
+    assert store.holders("admission:user123") == 0
+    assert (await controller.aenqueue("user123")).granted
+
+
+@pytest.mark.asyncio
+async def test_cancelled_async_enqueue_releases_after_acquire(tmp_path):
+    """점유 기록 중 취소되면 기록이 끝난 뒤 해제 (점유가 남지 않음)"""
+    import threading
+    from backend.agents.shared_store import SqliteSharedStore
+    
+    # Given: 점유 기록이 끝나지 않도록 막아 둔 공유 저장소
+    store = SqliteSharedStore(str(tmp_path / "shared.db"))
+    controller = AdmissionService(max_concurrent=4, max_queue=4, max_per_session=1, store=store)
+    unblock = threading.Event()
+    original = store.try_acquire
+    
+    def slow_try_acquire(*args, **kwargs):
+        unblock.wait(5)
+        return original(*args, **kwargs)
+    
+    store.try_acquire = slow_try_acquire
+    
+    # When: 점유 기록 중에 요청 취소 후 기록 완료
+    request = asyncio.ensure_future(controller.aenqueue("user123"))
+    await asyncio.sleep(0.05)
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+    unblock.set()
+    while controller._unhold_tasks:
+        await asyncio.gather(*controller._unhold_tasks)
+    
+    # Then: 늦게 기록된 점유도 해제됨
+    assert store.holders("admission:user123") == 0
@@ -73,4 +73,466 @@ async def test_call_agent():
     # 현재는 스텁 구현이므로 NotImplementedError 예외 발생 예상
     with pytest.raises(NotImplementedError):
         async for _ in chat_service._call_agent(request):
-            break  # 첫 번째 yield만 시도 
\ No newline at end of file
+            break  # 첫 번째 yield만 시도 
+
+@pytest.mark.asyncio
+async def test_process_message_streaming(monkeypatch):
+    """토큰 단위 스트리밍 이벤트 변환 테스트"""
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    chat_service = ChatService()
+    request = ChatRequest(message="아이폰 15", session_id="user123")
+    
+    async def fake_stream(query, session_id, deadline=None):
+        yield {"type": "tool_start", "tool_name": "web_search", "tool_input": {"query": query}}
+        yield {"type": "tool_end", "tool_name": "web_search", "output": "x" * 1000}
+        yield {"type": "token", "content": "최저가는 "}
+        yield {"type": "token", "content": "100원"}
+        yield {"type": "final", "content": "최저가는 100원"}
+    
+    with patch.object(chat_service.shopping_agent, "stream_search_products", side_effect=fake_stream):
+        events = [event async for event in chat_service.process_message(request)]
+    
+    assert [event.event_type for event in events] == [
+        "thinking", "search", "tool_start", "tool_end", "message_delta", "message_delta", "message"
+    ]
+    assert events[2].metadata["tool_name"] == "web_search"
+    assert len(events[3].data) == 500
+    assert "".join(event.data for event in events if event.event_type == "message_delta") == "최저가는 100원"
+    assert events[-1].data == "최저가는 100원"
+
+
+@pytest.mark.asyncio
+async def test_process_message_streaming_emits_products(monkeypatch):
+    """최종 답변의 구조화된 상품 목록을 products 이벤트로 전달"""
+    import json
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    chat_service = ChatService()
+    request = ChatRequest(message="아이폰 15", session_id="user123")
+    products = [{
+        "name": "아이폰 15", "price": 1200000, "store": "쿠팡",
+        "url": "https://www.coupang.com/vp/products/1", "image_url": None
+    }]
+    
+    async def fake_stream(query, session_id, deadline=None):
+        yield {"type": "final", "content": "1️⃣ 아이폰 15 - 1,200,000원", "products": products}
+    
+    with patch.object(chat_service.shopping_agent, "stream_search_products", side_effect=fake_stream):
+        events = [event async for event in chat_service.process_message(request)]
+    
+    assert [event.event_type for event in events] == ["thinking", "search", "message", "products"]
+    assert json.loads(events[-1].data) == products
+    assert events[-1].metadata == {"count": 1}
+
+
+@pytest.mark.asyncio
+async def test_process_message_partial_answer_and_deadline(monkeypatch):
+    """요청 제한 시간을 Agent에 전달하고 부분 답변은 partial_message 이벤트로 변환"""
+    import time
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    chat_service = ChatService()
+    request = ChatRequest(message="아이폰 15", session_id="user123", deadline_seconds=5)
+    received = {}
+    
+    async def fake_stream(query, session_id, deadline=None):
+        received["budget"] = deadline - time.monotonic()
+        yield {"type": "partial", "content": "⏱️ 지금까지 찾은 결과", "reason": "deadline", "products": []}
+    
+    with patch.object(chat_service.shopping_agent, "stream_search_products", side_effect=fake_stream):
+        events = [event async for event in chat_service.process_message(request)]
+    
+    assert 4 < received["budget"] <= 5
+    assert [event.event_type for event in events] == ["thinking", "search", "partial_message"]
+    assert events[-1].metadata == {"reason": "deadline"}
+
+
+@pytest.mark.asyncio
+async def test_same_session_turns_are_serialized(monkeypatch):
+    """같은 세션의 동시 요청은 순서대로 처리 (이전 요청 중단 비활성화)"""
+    import asyncio
+    from backend.services import chat_service as chat_service_module
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    monkeypatch.setattr(chat_service_module, "SESSION_SUPERSEDE_ENABLED", False)
+    chat_service = ChatService()
+    running = []
+    overlaps = []
+    
+    async def fake_stream(query, session_id, deadline=None):
+        if running:
+            overlaps.append(query)
+        running.append(query)
+        await asyncio.sleep(0.05)
+        running.remove(query)
+        yield {"type": "final", "content": f"{query} 답변"}
+    
+    async def collect(message):
+        request = ChatRequest(message=message, session_id="same-session")
+        return [event async for event in chat_service.process_message(request)]
+    
+    with patch.object(chat_service.shopping_agent, "stream_search_products", side_effect=fake_stream):
+        first, second = await asyncio.gather(collect("첫 번째"), collect("두 번째"))
+    
+    # 두 번째 요청은 첫 번째가 끝날 때까지 대기 후 실행
+    assert overlaps == []
+    assert first[-1].data == "첫 번째 답변"
+    assert [event.event_type for event in second] == ["thinking", "queued", "search", "message"]
+    assert chat_service._session_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_new_turn_supersedes_in_flight_turn(monkeypatch):
+    """같은 세션의 새 요청이 진행 중인 이전 실행을 취소"""
+    import asyncio
+    from backend.services import chat_service as chat_service_module
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    monkeypatch.setattr(chat_service_module, "SESSION_SUPERSEDE_ENABLED", True)
+    chat_service = ChatService()
+    cancelled = []
+    
+    async def fake_stream(query, session_id, deadline=None):
+        try:
+            await asyncio.sleep(0 if query == "두 번째" else 10)
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+        yield {"type": "final", "content": f"{query} 답변"}
+    
+    async def collect(message):
+        request = ChatRequest(message=message, session_id="same-session")
+        return [event async for event in chat_service.process_message(request)]
+    
+    with patch.object(chat_service.shopping_agent, "stream_search_products", side_effect=fake_stream):
+        first_task = asyncio.ensure_future(collect("첫 번째"))
+        await asyncio.sleep(0.05)
+        second = await asyncio.wait_for(collect("두 번째"), timeout=1)
+        first = await first_task
+    
+    # 이전 실행은 취소되고 새 요청만 답변
+    assert cancelled == ["첫 번째"]
+    assert first[-1].metadata == {"reason": "superseded"}
+    assert second[-1].data == "두 번째 답변"
+    assert chat_service.superseded_turns == 1
+
+
+@pytest.mark.asyncio
+async def test_same_session_turns_are_serialized_across_workers(monkeypatch, tmp_path):
+    """공유 저장소를 쓰는 두 워커에 같은 세션 요청이 오면 세션 실행 권한으로 순서대로 처리"""
+    import asyncio
+    from backend.agents.shared_store import SqliteSharedStore
+    from backend.services import chat_service as chat_service_module
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    monkeypatch.setattr(chat_service_module, "SESSION_SUPERSEDE_ENABLED", False)
+    monkeypatch.setattr(chat_service_module, "SESSION_LEASE_POLL_SECONDS", 0.01)
+    path = str(tmp_path / "shared.db")
+    workers = [ChatService(store=SqliteSharedStore(path)), ChatService(store=SqliteSharedStore(path))]
+    running = []
+    overlaps = []
+    
+    async def fake_stream(query, session_id, deadline=None):
+        if running:
+            overlaps.append(query)
+        running.append(query)
+        await asyncio.sleep(0.05)
+        running.remove(query)
+        yield {"type": "final", "content": f"{query} 답변"}
+    
+    async def collect(worker, message):
+        request = ChatRequest(message=message, session_id="same-session")
+        return [event async for event in worker.process_message(request)]
+    
+    with patch.object(workers[0].shopping_agent, "stream_search_products", side_effect=fake_stream), \
+            patch.object(workers[1].shopping_agent, "stream_search_products", side_effect=fake_stream):
+        first_task = asyncio.ensure_future(collect(workers[0], "첫 번째"))
+        await asyncio.sleep(0.01)
+        second = await collect(workers[1], "두 번째")
+        first = await first_task
+    
+    # 다른 워커의 요청은 첫 번째가 끝나고 권한이 반납된 뒤 실행
+    assert overlaps == []
+    assert first[-1].data == "첫 번째 답변"
+    assert [event.event_type for event in second] == ["thinking", "queued", "search", "message"]
+    assert workers[0].store.holders("session:same-session") == 0
+
+
+@pytest.mark.asyncio
+async def test_clear_conversation_deletes_session_generation(monkeypatch, tmp_path):
+    """대화 초기화/유휴 정리 시 공유 저장소의 세션 요청 번호도 삭제"""
+    from backend.agents.shared_store import SqliteSharedStore
+    from backend.services import chat_service as chat_service_module
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(chat_service_module, "SESSION_SUPERSEDE_ENABLED", True)
+    chat_service = ChatService(store=SqliteSharedStore(str(tmp_path / "shared.db")))
+    
+    async def fake_stream(query, session_id, deadline=None):
+        yield {"type": "final", "content": f"{query} 답변"}
+    
+    # Given: 두 세션에서 한 턴씩 처리 (세션별 요청 번호 생성)
+    with patch.object(chat_service.shopping_agent, "stream_search_products", side_effect=fake_stream):
+        for session_id in ("user123", "idle-user"):
+            request = ChatRequest(message="아이폰 15", session_id=session_id)
+            [event async for event in chat_service.process_message(request)]
+    assert chat_service.store.read("session_generation:user123") == 1
+    
+    # When: 한 세션은 초기화, 다른 세션은 유휴 정리
+    with patch.object(chat_service.shopping_agent, "clear_session", new=AsyncMock()), \
+            patch.object(chat_service.shopping_agent, "purge_idle_sessions", new=AsyncMock(return_value=["idle-user"])):
+        await chat_service.clear_conversation("user123")
+        await chat_service.purge_idle_sessions(0)
+    
+    # Then: 두 세션의 요청 번호가 모두 삭제됨
+    count = chat_service.store._connection().execute("SELECT COUNT(*) FROM counters").fetchone()[0]
+    assert count == 0
+
+
+@pytest.mark.asyncio
+async def test_new_turn_supersedes_in_flight_turn_on_other_worker(monkeypatch, tmp_path):
+    """다른 워커에 온 같은 세션의 새 요청이 진행 중인 이전 실행을 취소"""
+    import asyncio
+    from backend.agents.shared_store import SqliteSharedStore
+    from backend.services import chat_service as chat_service_module
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    monkeypatch.setattr(chat_service_module, "SESSION_SUPERSEDE_ENABLED", True)
+    monkeypatch.setattr(chat_service_module, "SESSION_LEASE_POLL_SECONDS", 0.01)
+    path = str(tmp_path / "shared.db")
+    workers = [ChatService(store=SqliteSharedStore(path)), ChatService(store=SqliteSharedStore(path))]
+    cancelled = []
+    
+    async def fake_stream(query, session_id, deadline=None):
+        try:
+            await asyncio.sleep(0 if query == "두 번째" else 10)
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+        yield {"type": "final", "content": f"{query} 답변"}
+    
+    async def collect(worker, message):
+        request = ChatRequest(message=message, session_id="same-session")
+        return [event async for event in worker.process_message(request)]
+    
+    with patch.object(workers[0].shopping_agent, "stream_search_products", side_effect=fake_stream), \
+            patch.object(workers[1].shopping_agent, "stream_search_products", side_effect=fake_stream):
+        first_task = asyncio.ensure_future(collect(workers[0], "첫 번째"))
+        await asyncio.sleep(0.05)
+        second = await asyncio.wait_for(collect(workers[1], "두 번째"), timeout=2)
+        first = await first_task
+    
+    # 첫 번째 워커의 실행은 취소되고 새 요청만 답변
+    assert cancelled == ["첫 번째"]
+    assert first[-1].metadata == {"reason": "superseded"}
+    assert second[-1].data == "두 번째 답변"
+
+
+@pytest.mark.asyncio
+async def test_context_summary_is_not_streamed_to_client(monkeypatch):
+    """대화 요약 LLM 호출의 토큰은 클라이언트로 전달되지 않고 최종 답변으로도 쓰이지 않음"""
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage, AIMessageChunk
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+    from langgraph.prebuilt import create_react_agent
+    from backend.agents.context import ContextManager, ShoppingAgentState
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    chat_service = ChatService()
+    agent = chat_service.shopping_agent
+    agent.query_cache = None
+    agent.price_index = None
+    
+    class StreamingModel(BaseChatModel):
+        """고정 문장을 토큰 단위로 스트리밍하는 모델"""
+        text: str
+        
+        @property
+        def _llm_type(self):
+            return "scripted"
+        
+        def bind_tools(self, tools, **kwargs):
+            return self
+        
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.text))])
+        
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+            for token in self.text.split(" "):
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=token + " "))
+                if run_manager is not None:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+    
+    # Given: 두 번째 턴부터 이전 턴을 요약하는 컨텍스트 관리
+    agent.context_manager = ContextManager(
+        max_recent_turns=1,
+        summarizer_model=StreamingModel(text="SUMMARY_TOKENS here"),
+        summary_batch_turns=1
+    )
+    agent.agent = create_react_agent(
+        model=StreamingModel(text="ANSWER text"),
+        tools=[],
+        checkpointer=agent.memory,
+        state_schema=ShoppingAgentState,
+        pre_model_hook=agent.context_manager.pre_model_hook
+    )
+    
+    async def collect(message):
+        request = ChatRequest(message=message, session_id="summary-session")
+        return [event async for event in chat_service.process_message(request)]
+    
+    # When: 요약이 일어나는 두 번째 턴까지 실행
+    await collect("아이폰 15")
+    second = await collect("갤럭시 S24")
+    
+    # Then: 요약은 수행되었지만 클라이언트에는 응답 모델의 토큰과 답변만 전달
+    assert agent.context_manager.stats["summaries"] == 1
+    streamed = "".join(event.data for event in second if event.event_type == "message_delta")
+    assert "SUMMARY" not in streamed
+    assert streamed.strip() == "ANSWER text"
+    assert second[-1].event_type == "message"
+    assert second[-1].data.strip() == "ANSWER text"
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_cancels_agent_run_and_tool_calls(monkeypatch):
+    """응답 스트림을 닫으면(클라이언트 연결 종료) LangGraph 실행과 진행 중인 MCP 도구 호출까지 취소"""
+    import asyncio
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+    from langchain_core.tools import StructuredTool
+    from langgraph.prebuilt import create_react_agent
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    chat_service = ChatService()
+    agent = chat_service.shopping_agent
+    agent.query_cache = None
+    agent.price_index = None
+    agent.context_manager = None
+    
+    # Given: 응답하지 않는 MCP 검색 도구 (도구 캐시 래퍼 포함)와 이를 호출하는 모델
+    tool_calls = []
+    cancelled = []
+    
+    async def web_search(query: str) -> str:
+        tool_calls.append(query)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+        return "결과"
+    
+    class ToolCallingModel(BaseChatModel):
+        @property
+        def _llm_type(self):
+            return "scripted"
+        
+        def bind_tools(self, tools, **kwargs):
+            return self
+        
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            message = AIMessage(content="", tool_calls=[
+                {"name": "web_search", "args": {"query": "아이폰 15"}, "id": "call_1"}
+            ])
+            return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    tools = agent.tool_cache.wrap_tools([
+        StructuredTool.from_function(coroutine=web_search, name="web_search", description="검색")
+    ])
+    agent.agent = create_react_agent(model=ToolCallingModel(), tools=tools, checkpointer=agent.memory)
+    
+    # When: 도구 호출이 시작된 뒤 스트림을 닫음
+    request = ChatRequest(message="아이폰 15", session_id="disconnect-session")
+    events = chat_service.process_message(request)
+    async for event in events:
+        if event.event_type == "tool_start":
+            break
+    while not tool_calls:
+        await asyncio.sleep(0.01)
+    await asyncio.wait_for(events.aclose(), timeout=1)
+    await asyncio.sleep(0.01)
+    
+    # Then: 도구 호출이 취소되고 세션/캐시 자원이 모두 해제됨
+    assert cancelled == ["아이폰 15"]
+    assert agent.tool_cache.stats()["inflight"] == 0
+    assert chat_service._session_turns == {}
+    assert chat_service._session_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_process_message_records_turn_spans(monkeypatch):
+    """턴 처리 구간(세션 대기, Agent 실행)을 요청 trace 아래 span으로 기록"""
+    from backend.agents import tracing
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    exporter = tracing.InMemorySpanExporter()
+    monkeypatch.setattr(tracing, "_tracer", tracing.Tracer(exporter))
+    chat_service = ChatService()
+    request = ChatRequest(message="아이폰 15", session_id="user123")
+    
+    async def fake_stream(query, session_id, deadline=None):
+        # Agent 내부 span은 실행 태스크의 현재 span(agent.run) 아래에 기록
+        with tracing.get_tracer().start_as_current_span("tool.search_all_malls"):
+            pass
+        yield {"type": "final", "content": "최저가는 100원", "cached": True}
+    
+    # Given: 라우터가 시작한 요청 span
+    root = tracing.get_tracer().start_span("POST /chat", root=True)
+    
+    # When: 메시지 처리
+    with patch.object(chat_service.shopping_agent, "stream_search_products", side_effect=fake_stream):
+        events = [event async for event in chat_service.process_message(request, trace=root)]
+    root.end()
+    
+    # Then: chat.turn → session.wait / agent.run → 도구 span 순으로 연결
+    assert events[-1].event_type == "message"
+    spans = {span.name: span for span in exporter.spans}
+    assert spans["chat.turn"].parent_span_id == root.span_id
+    assert spans["session.wait"].parent_span_id == spans["chat.turn"].span_id
+    assert spans["agent.run"].parent_span_id == spans["chat.turn"].span_id
+    assert spans["tool.search_all_malls"].parent_span_id == spans["agent.run"].span_id
+    assert spans["chat.turn"].attributes["chat.outcome"] == "message"
+    assert spans["agent.run"].attributes["agent.cached"] is True
+
+
+@pytest.mark.asyncio
+async def test_metrics_collector_reports_caches_and_runs(monkeypatch):
+    """/metrics 출력에 캐시 통계와 실행 중인 턴 수 포함"""
+    from backend.agents.metrics import get_registry
+    from backend.services.chat_service import AGENT_RUNS_IN_FLIGHT
+    
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("AGENT_STREAMING_ENABLED", "true")
+    chat_service = ChatService()
+    request = ChatRequest(message="아이폰 15", session_id="metrics-session")
+    running = []
+    
+    async def fake_stream(query, session_id, deadline=None):
+        running.append(AGENT_RUNS_IN_FLIGHT._default.value)
+        yield {"type": "final", "content": "최저가는 100원"}
+    
+    # When: 턴 처리 후 메트릭 출력
+    before = AGENT_RUNS_IN_FLIGHT._default.value
+    with patch.object(chat_service.shopping_agent, "stream_search_products", side_effect=fake_stream):
+        [event async for event in chat_service.process_message(request)]
+    text = get_registry().render()
+    
+    # Then: 실행 중에는 1 증가, 종료 후 원래 값 / 캐시 통계 포함
+    assert running == [before + 1]
+    assert AGENT_RUNS_IN_FLIGHT._default.value == before
+    assert "tool_cache_hits_total" in text
+    assert "query_cache_hit_rate" in text
+    assert "chat_superseded_turns_total 0" in text
@@ -0,0 +1,77 @@
+"""헬스 체크 서비스 테스트 모듈"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.services.health_service import HealthService
+
+
+@pytest.fixture
+def chat_service():
+    """모의 ChatService 픽스처"""
+    service = MagicMock()
+    service.shopping_agent.check_tools = AsyncMock(
+        return_value={"tool_count": 2, "tools": ["search", "fetch"]}
+    )
+    service.shopping_agent.health_check = AsyncMock(
+        return_value={"status": "healthy", "session_id": "health-x", "memory_enabled": True}
+    )
+    return service
+
+
+def test_liveness(chat_service):
+    """liveness는 ChatService를 사용하지 않음"""
+    provider = MagicMock(return_value=chat_service)
+    health_service = HealthService(provider)
+    
+    result = health_service.liveness()
+    
+    assert result["status"] == "alive"
+    provider.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_readiness_is_cached(chat_service):
+    """readiness 결과는 캐시 시간 동안 재사용"""
+    # Given: 도구가 로드되는 ChatService
+    health_service = HealthService(lambda: chat_service, readiness_cache_seconds=60)
+    
+    # When: 연속 두 번 점검
+    first = await health_service.readiness()
+    second = await health_service.readiness()
+    
+    # Then: 도구 점검은 한 번만 실행
+    assert first["status"] == "ready"
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert chat_service.shopping_agent.check_tools.await_count == 1
+    chat_service.shopping_agent.health_check.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_readiness_not_ready_without_tools(chat_service):
+    """도구가 없거나 초기화 실패 시 not_ready"""
+    chat_service.shopping_agent.check_tools.return_value = {"tool_count": 0, "tools": []}
+    health_service = HealthService(lambda: chat_service)
+    assert (await health_service.readiness())["status"] == "not_ready"
+    
+    failing = HealthService(MagicMock(side_effect=Exception("초기화 실패")))
+    result = await failing.readiness()
+    assert result["status"] == "not_ready"
+    assert "초기화 실패" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_deep_is_rate_limited(chat_service):
+    """deep 점검은 최소 간격 내 재호출 시 마지막 결과 반환"""
+    # Given: 최소 간격이 긴 HealthService
+    health_service = HealthService(lambda: chat_service, deep_min_interval_seconds=60)
+    
+    # When: 연속 두 번 점검
+    first = await health_service.deep()
+    second = await health_service.deep()
+    
+    # Then: LLM 점검은 일회용 세션으로 한 번만 실행
+    assert first["status"] == "healthy"
+    assert first["rate_limited"] is False
+    assert second["rate_limited"] is True
+    chat_service.shopping_agent.health_check.assert_awaited_once_with()
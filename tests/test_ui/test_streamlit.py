@@ -212,15 +212,17 @@ async def test_api_client_error_handling():
         assert "HTTP 오류" in result["error"]
 
 # 동기 API 래퍼 함수 테스트
-@patch('frontend.utils.api_client.APIClient.health_check')
-@patch('asyncio.run')
-def test_sync_api_functions(mock_run, mock_health_check):
-    """동기 API 래퍼 함수 테스트"""
+@patch('frontend.utils.api_client._run_sync')
+def test_sync_api_functions(mock_run):
+    """동기 API 래퍼 함수 테스트 (공유 백그라운드 루프에서 실행)"""
     from frontend.utils.api_client import sync_health_check, sync_send_message, sync_search_products
     
-    # 모의 응답 설정
+    # 모의 응답 설정 (전달된 코루틴은 닫아서 경고 방지)
     mock_response = {"status": "ok"}
-    mock_run.return_value = mock_response
+    def fake_run(coro):
+        coro.close()
+        return mock_response
+    mock_run.side_effect = fake_run
     
     # 헬스 체크 테스트
     result = sync_health_check()
@@ -232,6 +234,139 @@ def test_sync_api_functions(mock_run, mock_health_check):
     sync_search_products("아이폰")
     assert mock_run.call_count == 3
 
+def test_sync_api_functions_reuse_pooled_client(monkeypatch):
+    """동기 래퍼는 프로세스 공유 클라이언트와 연결 풀을 재사용"""
+    import httpx
+    from unittest.mock import AsyncMock
+    import frontend.utils.api_client as api_client
+    
+    monkeypatch.setattr(api_client, "_shared_client", None)
+    
+    with patch("httpx.AsyncClient") as mock_client:
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"status": "healthy"}
+        mock_async_client = MagicMock()
+        mock_async_client.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+        mock_client.return_value = mock_async_client
+        
+        # 여러 번 호출
+        results = [api_client.sync_health_check() for _ in range(3)]
+    
+    # httpx.AsyncClient는 한 번만 생성되고 연결 풀 설정이 전달됨
+    assert results == [{"status": "healthy"}] * 3
+    assert mock_client.call_count == 1
+    assert isinstance(mock_client.call_args.kwargs["limits"], httpx.Limits)
+    assert api_client.get_shared_client() is api_client.get_shared_client()
+    
+    api_client._run_sync(api_client.get_shared_client().aclose())
+
+def test_iter_send_message_stream_yields_incrementally(monkeypatch):
+    """스트리밍 이벤트는 스트림 종료 전에 도착하는 즉시 전달"""
+    import asyncio
+    import threading
+    import frontend.utils.api_client as api_client
+    
+    first_received = threading.Event()
+    
+    async def fake_stream(self, message, session_id):
+        yield {"event_type": "thinking", "data": "분석 중"}
+        # 첫 이벤트를 소비자가 받기 전까지 스트림을 끝내지 않음
+        while not first_received.is_set():
+            await asyncio.sleep(0.01)
+        yield {"event_type": "message", "data": "완료"}
+    
+    monkeypatch.setattr(api_client.APIClient, "send_message_stream", fake_stream)
+    
+    events = api_client.iter_send_message_stream("아이폰", "session123")
+    first = next(events)
+    assert first["event_type"] == "thinking"
+    first_received.set()
+    
+    assert [event["event_type"] for event in events] == ["message"]
+
+def test_iter_send_message_stream_close_cancels_request(monkeypatch):
+    """이터레이터를 닫으면 백그라운드 스트림 요청도 취소"""
+    import asyncio
+    import threading
+    import frontend.utils.api_client as api_client
+    
+    cancelled = threading.Event()
+    
+    async def endless_stream(self, message, session_id):
+        try:
+            yield {"event_type": "thinking", "data": "분석 중"}
+            while True:
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    monkeypatch.setattr(api_client.APIClient, "send_message_stream", endless_stream)
+    
+    events = api_client.iter_send_message_stream("아이폰", "session123")
+    next(events)
+    events.close()
+    
+    assert cancelled.wait(timeout=2)
+
+def test_bot_response_stream_renders_without_artificial_delay():
+    """스트리밍 응답 렌더링 시 인위적 지연 없이 이벤트별로 갱신"""
+    from frontend.components.chat_interface import ChatInterface
+    
+    session_manager = MagicMock()
+    chat_interface = ChatInterface(session_manager)
+    stream = (event for event in [
+        {"event_type": "thinking", "data": "분석 중"},
+        {"event_type": "message_delta", "data": "아이폰 "},
+        {"event_type": "message_delta", "data": "최저가"},
+        {"event_type": "message", "data": "아이폰 최저가"}
+    ])
+    
+    with patch("frontend.components.chat_interface.st") as mock_st, \
+         patch("frontend.components.chat_interface.iter_send_message_stream", return_value=stream), \
+         patch("frontend.components.chat_interface.time.sleep") as mock_sleep:
+        response_container = MagicMock()
+        status_container = MagicMock()
+        mock_st.empty.side_effect = [response_container, status_container]
+        
+        chat_interface._handle_bot_response_stream("아이폰")
+    
+    mock_sleep.assert_not_called()
+    assert [call.args[0] for call in response_container.markdown.call_args_list] == [
+        "아이폰 ", "아이폰 최저가", "아이폰 최저가"
+    ]
+    session_manager.add_message.assert_called_once_with("assistant", "아이폰 최저가")
+    timing = mock_st.session_state.last_response_timing
+    assert timing["first_paint_ms"] <= timing["first_token_ms"] <= timing["total_ms"]
+
+def test_bot_response_stream_stores_products():
+    """products 이벤트의 상품 목록을 세션에 저장"""
+    import json
+    from frontend.components.chat_interface import ChatInterface
+    
+    session_manager = MagicMock()
+    chat_interface = ChatInterface(session_manager)
+    products = [{"name": "아이폰 15", "price": 1200000, "store": "쿠팡", "url": "https://www.coupang.com/1"}]
+    stream = (event for event in [
+        {"event_type": "message", "data": "아이폰 15 - 1,200,000원"},
+        {"event_type": "products", "data": json.dumps(products, ensure_ascii=False)}
+    ])
+    
+    with patch("frontend.components.chat_interface.st"), \
+         patch("frontend.components.chat_interface.iter_send_message_stream", return_value=stream):
+        chat_interface._handle_bot_response_stream("아이폰")
+    
+    session_manager.set_current_products.assert_called_once_with(products)
+
+def test_product_price_helpers():
+    """정수/문자열 가격 모두 정렬 및 표시 가능"""
+    from frontend.components.product_card import format_price, price_value
+    
+    assert price_value({"price": 1200000}) == 1200000
+    assert price_value({"price": "1,250,000원"}) == 1250000
+    assert price_value({}) == 0
+    assert format_price({"price": 1200000}) == "1,200,000원"
+
 # ChatInterface 메서드 테스트
 def test_chat_interface_methods():
     """ChatInterface 메서드 테스트 (모킹 없이)"""